@@ -62,7 +62,7 @@ Provided by Honeybee 0.0.63
 """
 ghenv.Component.Name = "Honeybee_ Run Energy Simulation"
 ghenv.Component.NickName = 'runEnergySimulation'
-ghenv.Component.Message = 'VER 0.0.63\nMAR_02_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
@@ -86,12 +86,80 @@ import copy
 rc.Runtime.HostUtils.DisplayOleAlerts(False)
 
 
+class IDFObjectCollection(object):
+    """Names of one class of IDF objects in the order that they are added.
+    
+    It replaces the lists that were used to collect constructions, materials and
+    schedules. Checking for a name doesn't depend on the number of names and names
+    are compared case-insensitively the same way EnergyPlus does. Names that are
+    added during an iteration are included in the same iteration.
+    """
+    def __init__(self, registry, objectClass):
+        self.registry = registry
+        self.objectClass = objectClass
+        self.names = []
+    
+    def append(self, name):
+        key = (self.objectClass, name.upper())
+        if key in self.registry: return
+        self.registry[key] = name
+        self.names.append(name)
+    
+    def __contains__(self, name):
+        return (self.objectClass, name.upper()) in self.registry
+    
+    def __iter__(self):
+        count = 0
+        while count < len(self.names):
+            yield self.names[count]
+            count += 1
+    
+    def __len__(self):
+        return len(self.names)
+
+
+class IDFBuilder(object):
+    """Write an IDF file through a buffer and keep a registry of named objects.
+    
+    Strings are collected in memory and written to the file in large blocks.
+    The registry is keyed by (object class, NAME) and each class has an
+    IDFObjectCollection with the names in the order they are added.
+    """
+    def __init__(self, filePath, bufferSize = 1048576):
+        self.idfFile = open(filePath, "w")
+        self.bufferSize = bufferSize
+        self.buffer = []
+        self.bufferLength = 0
+        self.registry = {}
+        self.collections = {}
+    
+    def getCollection(self, objectClass):
+        if objectClass not in self.collections:
+            self.collections[objectClass] = IDFObjectCollection(self.registry, objectClass)
+        return self.collections[objectClass]
+    
+    def write(self, idfStr):
+        self.buffer.append(idfStr)
+        self.bufferLength += len(idfStr)
+        if self.bufferLength >= self.bufferSize:
+            self.flush()
+    
+    def flush(self):
+        self.idfFile.write("".join(self.buffer))
+        self.buffer = []
+        self.bufferLength = 0
+    
+    def close(self):
+        self.flush()
+        self.idfFile.close()
+
+
 class WriteIDF(object):
     # Add all HBcontext surfaces from both HBContext_ and HB generator here so that if user connects the same
     # HBcontext surfaces to both HB generator and HBcontext duplicate surfaces will be detected and an error thrown.
     
     checksurfaceduplicate = []
-    zonesurfaces = []
+    zonesurfaces = set()
     # Add the ID of all batteries from HB generator systems here to check for duplicate batteries.
     checkbatteryduplicate = []
     # Add the ID of all inverters from HB generator systems here to check for duplicate inverters.
@@ -111,6 +179,11 @@ class WriteIDF(object):
     def __init__(self, workingDir):
         self.fileBasedSchedules = {}
         self.workingDir = workingDir
+    
+    @staticmethod
+    def verticesStr(coordinates):
+        if len(coordinates) == 0: return '\t'
+        return '\t' + ',\n\t'.join([`pt.X` + ',\n\t' + `pt.Y` + ',\n\t' + `pt.Z` for pt in coordinates]) + ';\n\n'
 
     def EPZone(self, zone):
         if zone.isPlenum:
@@ -151,13 +224,7 @@ class WriteIDF(object):
                 '\t' + surface.groundViewFactor + ',\t!- View Factor to Ground\n' + \
                 '\t' + `len(coordinates)` + ',\t!- Number of Vertices\n'
         
-            str_2 = '\t';
-            
-            for ptCount, pt in enumerate(coordinates):
-                if ptCount < len (coordinates) - 1:
-                    str_2 = str_2 + `pt.X` + ',\n\t' + `pt.Y` + ',\n\t' + `pt.Z` + ',\n\t'
-                else:
-                    str_2 = str_2 + `pt.X` + ',\n\t' + `pt.Y` + ',\n\t' + `pt.Z` + ';\n\n'
+            str_2 = self.verticesStr(coordinates)
             
             fullString = str_1 + str_2
             
@@ -399,12 +466,7 @@ class WriteIDF(object):
                         '\t' + `childSrf.Multiplier`+ ',\t!- Multiplier\n' + \
                         '\t' + `len(glzCoordinates)` + ',\t!- Number of Vertices\n'
                 
-                    str_2 = '\t';
-                    for ptCount, pt in enumerate(glzCoordinates):
-                        if ptCount < len (glzCoordinates) - 1:
-                            str_2 = str_2 + `pt.X` + ',\n\t' + `pt.Y` + ',\n\t' + `pt.Z` + ',\n\t'
-                        else:
-                            str_2 = str_2 + `pt.X` + ',\n\t' + `pt.Y` + ',\n\t' + `pt.Z` + ';\n\n'
+                    str_2 = self.verticesStr(glzCoordinates)
                     
                     glzStr += str_1 + str_2
                 
@@ -429,21 +491,18 @@ class WriteIDF(object):
             # find filebased schedule name
             scheduleName = self.fileBasedSchedules[scheduleName.upper()]
         fullString = ''
+        # the name is only changed in the idf file so the surface can be shared with the hive
+        name = surface.name
         for count, coordinates in enumerate(coordinatesList):
             
             if surface.containsPVgen == None:
                 # Assign surface name here if containsPVgen surface name was assigned in PVgen component
-                surface.name = surface.name + '_' + `count`
+                name = name + '_' + `count`
             str_1 = '\nShading:Building:Detailed,\n' + \
-                    '\t' + surface.name + ',\t!- Name\n' + \
+                    '\t' + name + ',\t!- Name\n' + \
                     '\t' + scheduleName + ',\t!- Transmittance Schedule Name\n' + \
                     '\t' + `len(coordinates)` + ',\t!- Number of Vertices\n'    
-            str_2 = '\t';
-            for ptCount, pt in enumerate(coordinates):
-                if ptCount < len (coordinates) - 1:
-                    str_2 = str_2 + `pt.X` + ',\n\t' + `pt.Y` + ',\n\t' + `pt.Z` + ',\n\t'
-                else:
-                    str_2 = str_2 + `pt.X` + ',\n\t' + `pt.Y` + ',\n\t' + `pt.Z` + ';\n\n'
+            str_2 = self.verticesStr(coordinates)
             
             fullString = fullString + str_1 + str_2
         return fullString
@@ -1660,13 +1719,15 @@ def main(north, epwFileAddress, EPParameters, analysisPeriod, HBZones, HBContext
     hb_runIDF = sc.sticky["honeybee_RunIDF"]()
     
     # call the objects from the lib
+    # zones are changed by reEvaluateHBZones and while writing so each one is a copy
     thermalZonesPyClasses = hb_hive.callFromHoneybeeHive(HBZones)
     
     reEvaluate = hb_reEvaluateHBZones(thermalZonesPyClasses, meshSettings)
     reEvaluate.evaluateZones()
     
     idfFileFullName = workingDir + "\\" + idfFileName
-    idfFile = open(idfFileFullName, "w")
+    # buffered writer with a registry of the collected constructions, materials and schedules
+    idfFile = IDFBuilder(idfFileFullName)
     
     ################## HEADER ###################
     print "[1 of 8] Writing simulation parameters..."
@@ -1761,19 +1822,11 @@ def main(north, epwFileAddress, EPParameters, analysisPeriod, HBZones, HBContext
     # Geometry rules
     idfFile.write(hb_writeIDF.EPGeometryRules())
 
-    EPConstructionsCollection = []
-    EPMaterialCollection = []
-    EPScheduleCollection = []
-    shdCntrlCollection = []
+    EPConstructionsCollection = idfFile.getCollection('Construction')
+    EPMaterialCollection = idfFile.getCollection('Material')
+    EPScheduleCollection = idfFile.getCollection('Schedule')
+    shdCntrlCollection = idfFile.getCollection('WindowProperty:ShadingControl')
     
-    # Shading Surfaces
-    if HBContext and HBContext[0]!=None:
-        print "[2 of 8] Writing context surfaces..."
-       
-        # call the objects from the lib
-        shadingPyClasses = hb_hive.callFromHoneybeeHive(HBContext)
-       
-       
     def writeHBcontext(shadingPyClasses):
         
         for shading in shadingPyClasses:
@@ -1799,9 +1852,11 @@ def main(north, epwFileAddress, EPParameters, analysisPeriod, HBZones, HBContext
     if HBContext and HBContext[0]!=None:
         print "[2 of 8] Writing context surfaces..."
         # call the objects from the lib
-        shadingPyClasses = hb_hive.callFromHoneybeeHive(HBContext)
+        # context surfaces are only read unless they have to be scaled
+        shadingPyClasses = hb_hive.callFromHoneybeeHive(HBContext, readOnly=True)
         if sc.sticky["honeybee_ConversionFactor"] != 1:
             NUscale = rc.Geometry.Transform.Scale(rc.Geometry.Plane(rc.Geometry.Plane.WorldXY),sc.sticky["honeybee_ConversionFactor"],sc.sticky["honeybee_ConversionFactor"],sc.sticky["honeybee_ConversionFactor"])
+            shadingPyClasses = [hb_hive.copyHBObject(con) for con in shadingPyClasses]
             for con in shadingPyClasses:
                 con.transform(NUscale, "", False)
         
@@ -1829,7 +1884,7 @@ def main(north, epwFileAddress, EPParameters, analysisPeriod, HBZones, HBContext
         # create a unique key based on schedules and loads
         # zones with similar keys will be grouped
         key = ",".join(schedules.values() + loads.values())
-        if key not in ZoneCollectionBasedOnSchAndLoads.keys():
+        if key not in ZoneCollectionBasedOnSchAndLoads:
             ZoneCollectionBasedOnSchAndLoads[key] = []
         
         ZoneCollectionBasedOnSchAndLoads[key].append(zone)
@@ -1843,7 +1898,7 @@ def main(north, epwFileAddress, EPParameters, analysisPeriod, HBZones, HBContext
             # check if there is an energyPlus material
             
             # Add surface to a list so that zone surfaces can be checked against honeybee generator PV surfaces
-            WriteIDF.zonesurfaces.append(srf.name)
+            WriteIDF.zonesurfaces.add(srf.name)
             
             if srf.EPConstruction != None:
                 srf.construction = srf.EPConstruction
@@ -50,7 +50,7 @@ Provided by Ladybug 0.0.57
 
 ghenv.Component.Name = "Honeybee_Convert EnergyPlus Schedule to Values"
 ghenv.Component.NickName = 'convertEPSCHValues'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "07 | Energy | Schedule"
@@ -176,7 +176,7 @@ def getNationalHols(country, weekStartWith):
     
     return countries[country]
 
-def addHolidays(startVals, holidayValues, weekStartWith, epwFile, customHolidays, lb_preparation):
+def getHolidays(weekStartWith, epwFile, customHolidays, lb_preparation):
     holidayDOYs = []
     if epwFile:
         #get the base code from EPW
@@ -232,12 +232,6 @@ def addHolidays(startVals, holidayValues, weekStartWith, epwFile, customHolidays
             if item-1 not in holidayDOYs:
                 holidayDOYs.append(item-1)
     
-    # Edit the list of schedule values.
-    for day in holidayDOYs:
-        for interval in holidayValues:
-            if day >= interval[0]-1 and day <= interval[1]-1:
-                startVals[day] = interval[2]
-    
     # Build up a list of holidays
     def fromDayToDate(day, months):
         dateDay = date.fromordinal(date(2015, 1, 1).toordinal() + day) # 2015 is not leap year
@@ -249,7 +243,7 @@ def addHolidays(startVals, holidayValues, weekStartWith, epwFile, customHolidays
     for day in holidayDOYs:
         holidayDates.append(fromDayToDate(day, monthsDict))
     
-    return startVals, holidayDates
+    return holidayDOYs, holidayDates
 
 
 
@@ -320,9 +314,9 @@ def main(schName, startDayOfTheWeek, epwFile, customHol):
     if dataGotten == True:
         # Check for any holidays.
         if epwFile or customHol != []:
-            if len(values) == 365 and not schName.lower().endswith(".csv"):
-                holidayValues = readSchedules.getHolidaySchedValues(schName)
-                values, holidays = addHolidays(values, holidayValues, startDayOfTheWeek, epwFile, customHol, lb_preparation)
+            if readSchedules.schType in ("schedule:year", "schedule:compact") and not schName.lower().endswith(".csv"):
+                holidayDOYs, holidays = getHolidays(startDayOfTheWeek, epwFile, customHol, lb_preparation)
+                values = readSchedules.getAnnualValues(schName, [day + 1 for day in holidayDOYs])
         
         strToBeFound = 'key:location/dataType/units/frequency/startsAt/endsAt'
         d, m, t = lb_preparation.hour2Date(readSchedules.startHOY, True)
@@ -36,7 +36,7 @@ Provided by Honeybee 0.0.63
 
 ghenv.Component.Name = "Honeybee_Daysim Shading State"
 ghenv.Component.NickName = 'DSShadingState'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "03 | Daylight | Recipes"
@@ -72,7 +72,7 @@ def main(shdHBObjects, minIll, maxIll):
     # check if the objects are valid Honeybee objects
     # call the objects from the lib
     hb_hive = sc.sticky["honeybee_Hive"]()
-    HBObjectsFromHive = hb_hive.callFromHoneybeeHive(shdHBObjects)
+    HBObjectsFromHive = hb_hive.callFromHoneybeeHive(shdHBObjects, readOnly=True)
     
     if len(HBObjectsFromHive)==0 or len(HBObjectsFromHive)!= len(shdHBObjects):
         msg = "At the minimum one of the shdHBObjects is not a valid Honeybee object."
@@ -33,7 +33,7 @@ Provided by Honeybee 0.0.63
 """
 ghenv.Component.Name = "Honeybee_DecomposeHBZone"
 ghenv.Component.NickName = 'Decompose Honeybee Zone'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "00 | Honeybee"
@@ -68,7 +68,10 @@ def main(HBZone):
     # call the objects from the lib
     hb_hive = sc.sticky["honeybee_Hive"]()
     
-    HBO = hb_hive.callFromHoneybeeHive([HBZone])[0]
+    HBO = hb_hive.callFromHoneybeeHive([HBZone], readOnly=True)[0]
+    # surfaces get new IDs when they are added to the hive so they can't be shared.
+    # copy the zone once instead of each surface as every surface links to the zone.
+    HBO = hb_hive.copyHBObject(HBO)
     
     HBSurfaces  = hb_hive.addToHoneybeeHive(HBO.surfaces, ghenv.Component)
     
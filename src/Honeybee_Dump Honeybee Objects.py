@@ -25,6 +25,7 @@ Dump Honeybee Objects
 
 Use this component to dump Honeybee objects to a file on your system.
 You can use load Honeybee objects to load the file to Grasshopper.
+Each zone, surface, HVAC system, construction and schedule is written as a separate record with its geometry as plain vertex arrays so large files can be loaded in parts.
 WARNING: This component does not write custom schedules or materials within the file but it does write the names of the constructions and schedules.
 Accordingly, to properly load objects agian, you must connect the full strings of these objects to a "Add to EnergyPlus Library" component in any GH cript that loads the HBZones from the file.
 
@@ -43,7 +44,7 @@ Provided by Honeybee 0.0.63
 
 ghenv.Component.Name = "Honeybee_Dump Honeybee Objects"
 ghenv.Component.NickName = 'dumpHBObjects'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "00 | Honeybee"
@@ -53,7 +54,6 @@ try: ghenv.Component.AdditionalHelpFromDocStrings = "6"
 except: pass
 
 
-import cPickle as pickle
 import scriptcontext as sc
 import Grasshopper.Kernel as gh
 import os
@@ -66,6 +66,7 @@ def dumpHBObjects(HBObjects, fileName, workingDir=None):
     hb_ConstrLib = sc.sticky ["honeybee_constructionLib"]
     hb_EPScheduleAUX = sc.sticky["honeybee_EPScheduleAUX"]()
     hb_EPObjectsAux = sc.sticky["honeybee_EPObjectsAUX"]()
+    hb_objectFile = sc.sticky["honeybee_ObjectFile"]
     if workingDir == None:
         workingDir = sc.sticky["Honeybee_DefaultFolder"] 
     if not fileName.upper().endswith('.HB.'):
@@ -81,7 +82,17 @@ def dumpHBObjects(HBObjects, fileName, workingDir=None):
     if not os.path.isdir(os.path.split(filePath)[0]):
         raise ValueError("Can't find %s"%os.path.split(filePath)[0])
     
-    HBObjects = hb_hive.callFromHoneybeeHive(HBObjects)
+    # the objects are only read here and written to the file as dictionaries
+    # so they don't need to be copied unless they have to be scaled or the
+    # default schedules have to be assigned to them.
+    HBObjects = hb_hive.callFromHoneybeeHive(HBObjects, readOnly=True)
+    needsScaling = sc.sticky["honeybee_ConversionFactor"] != 1
+    for count, HBObject in enumerate(HBObjects):
+        if HBObject.objectType == 'HBZone':
+            if needsScaling or not HBObject.isSchedulesAssigned:
+                HBObjects[count] = hb_hive.copyHBObject(HBObject)
+        elif HBObject.objectType == 'HBSurface' and needsScaling:
+            HBObjects[count] = hb_hive.copyHBObject(HBObject)
     ids = [HBObject.ID for HBObject in HBObjects]
     # a global dictonary to collect data
     objs = {}
@@ -107,16 +118,17 @@ def dumpHBObjects(HBObjects, fileName, workingDir=None):
             NUscale = rc.Geometry.Transform.Scale(rc.Geometry.Plane(rc.Geometry.Plane.WorldXY),fac,fac,fac)
             HBZone.transform(NUscale, "", False)
         
+        zoneDict = HBZone.getPropertyDict()
+        
         # dump all surfaces and replace surfaces with ids.
-        surfaceIds = [srf.ID for srf in HBZone.surfaces]
         for surface in HBZone.surfaces:
             dumpHBSurface(surface)
-        HBZone.surfaces = surfaceIds
+        zoneDict['surfaces'] = [srf.ID for srf in HBZone.surfaces]
         
         # dump the HVAC system.
         if HBZone.HVACSystem.ID not in hvacIDs:
             dumpHBhvac(HBZone.HVACSystem)
-        HBZone.HVACSystem = HBZone.HVACSystem.ID
+        zoneDict['HVACSystem'] = HBZone.HVACSystem.ID
         
         # dump the schedules associated with the zone.
         schedules = HBZone.getCurrentSchedules(True)
@@ -139,7 +151,7 @@ def dumpHBObjects(HBObjects, fileName, workingDir=None):
                 dumpAllSchedules([HBZone.ETschedule])
         
         # add the zone to the master dictionary.
-        objs[HBZone.ID] = HBZone.__dict__
+        objs[HBZone.ID] = zoneDict
     
     def dumpHBSurface(HBSurface, checkTransform=False):
         # Scale everything if the units system is not meters.
@@ -148,19 +160,20 @@ def dumpHBObjects(HBObjects, fileName, workingDir=None):
             NUscale = rc.Geometry.Transform.Scale(rc.Geometry.Plane(rc.Geometry.Plane.WorldXY),fac,fac,fac)
             HBSurface.transform(NUscale, "", False)
         
+        srfDict = dict(HBSurface.__dict__)
+        
         # replace parent object with it's ID
         if HBSurface.parent != None:
             # make sure parent object is also in the list
             idsToBeChecked[HBSurface.parent.ID] = HBSurface.parent.name
             # replace parent object with ID
-            HBSurface.parent = HBSurface.parent.ID
+            srfDict['parent'] = HBSurface.parent.ID
         
         # dump windows
         if not HBSurface.isChild and HBSurface.hasChild:
-            childIds = [childSrf.ID for childSrf in HBSurface.childSrfs]
             for childSrf in HBSurface.childSrfs:
                 dumpHBSurface(childSrf)
-            HBSurface.childSrfs = childIds
+            srfDict['childSrfs'] = [childSrf.ID for childSrf in HBSurface.childSrfs]
         
         # dump blinds and shading control.
         if HBSurface.isChild and HBSurface.shadingControlName != []:
@@ -188,55 +201,56 @@ def dumpHBObjects(HBObjects, fileName, workingDir=None):
             if HBSurface.TransmittanceSCH != '' and HBSurface.TransmittanceSCH.upper() not in scheduleCollection:
                 scheduleCollection.append(HBSurface.TransmittanceSCH.upper())
                 dumpAllSchedules([HBSurface.TransmittanceSCH])
-            HBSurface.childSrfs = [childSrf.ID for childSrf in HBSurface.childSrfs]
+            srfDict['childSrfs'] = [childSrf.ID for childSrf in HBSurface.childSrfs]
         
         # This needs to be set to outdoors at first but will be replaced by the correct object on loading
         try:
             if HBSurface.BC.lower() in ["outdoors", "ground", "adiabatic"]:
-                HBSurface.BCObject = "Outdoors" #This will be replaced by the correct object on loading
+                srfDict['BCObject'] = "Outdoors" #This will be replaced by the correct object on loading
         except:
             pass
         
         # in case the surface is adjacent to another surface
-        if hasattr(HBSurface.BCObject, "ID"):
-            idsToBeChecked[HBSurface.BCObject.ID] = HBSurface.BCObject.name
+        if hasattr(srfDict['BCObject'], "ID"):
+            idsToBeChecked[srfDict['BCObject'].ID] = srfDict['BCObject'].name
             # replace parent object with ID
-            HBSurface.BCObject = HBSurface.BCObject.ID
+            srfDict['BCObject'] = srfDict['BCObject'].ID
         
-        objs[HBSurface.ID] = HBSurface.__dict__
+        objs[HBSurface.ID] = srfDict
     
     def dumpHBhvac(HBhvac):
         hvacID = HBhvac.ID
+        hvacDict = dict(HBhvac.__dict__)
         if HBhvac.airDetails != None:
             airID = HBhvac.airDetails.ID
-            airDetailsDict = HBhvac.airDetails.__dict__
+            airDetailsDict = dict(HBhvac.airDetails.__dict__)
             del airDetailsDict['sysProps']
-            HBhvac.airDetails = airID
+            hvacDict['airDetails'] = airID
             if airID not in airIDs:
                 airIDs.append(airID)
                 objs[airID] = airDetailsDict
         
         if HBhvac.heatingDetails != None:
             heatID = HBhvac.heatingDetails.ID
-            heatingDetailsDict = HBhvac.heatingDetails.__dict__
+            heatingDetailsDict = dict(HBhvac.heatingDetails.__dict__)
             del heatingDetailsDict['sysProps']
-            HBhvac.heatingDetails = heatID
+            hvacDict['heatingDetails'] = heatID
             if heatID not in heatIDs:
                 heatIDs.append(heatID)
                 objs[heatID] = heatingDetailsDict
         
         if HBhvac.coolingDetails != None:
             coolID = HBhvac.coolingDetails.ID
-            coolingDetailsDict = HBhvac.coolingDetails.__dict__
+            coolingDetailsDict = dict(HBhvac.coolingDetails.__dict__)
             del coolingDetailsDict['sysProps']
-            HBhvac.coolingDetails = coolID
+            hvacDict['coolingDetails'] = coolID
             if coolID not in coolIDs:
                 coolIDs.append(coolID)
                 objs[coolID] = coolingDetailsDict
         
         if hvacID not in hvacIDs:
             hvacIDs.append(hvacID)
-            objs[hvacID] = HBhvac.__dict__
+            objs[hvacID] = hvacDict
     
     def dumpHBConstr(constructionName):
         constructionData = hb_ConstrLib[constructionName]
@@ -350,8 +364,15 @@ def dumpHBObjects(HBObjects, fileName, workingDir=None):
         objs[radMatName] = radMaterialDict
     
     def dumpHBViewFactor(viewFacInfo):
+        viewFacDict = dict(viewFacInfo.__dict__)
+        # write the sky hits of each zone as plain lists of the values of each point
+        # so the file doesn't depend on the sky hit matrix classes.
+        for key in ('testPtBlockedVec', 'testPtBlockName'):
+            if viewFacDict.get(key) is not None:
+                viewFacDict[key] = [list(zoneSkyHits) for zoneSkyHits in viewFacDict[key]]
+        
         # add the view factor to the master dictionary.
-        objs[viewFacInfo.ID] = viewFacInfo.__dict__
+        objs[viewFacInfo.ID] = viewFacDict
     
     # cycle through the objects and dump everything.
     for id, HBO in zip(ids, HBObjects):
@@ -371,10 +392,9 @@ def dumpHBObjects(HBObjects, fileName, workingDir=None):
         assert id in keys,\
             " InputError: Adjacent object %s is not in the list of HBObjects."%name
     
-    HBData = {'ids':ids, 'objs': objs}
-    with open(filePath, "wb") as outf:
-        pickle.dump(HBData, outf)
-        print "Saved file to %s"%filePath
+    # write each object as a separate record so the file can be loaded in parts
+    hb_objectFile(filePath).write(ids, objs)
+    print "Saved file to %s"%filePath
     return filePath
 
 
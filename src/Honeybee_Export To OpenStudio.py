@@ -71,7 +71,7 @@ Provided by Honeybee 0.0.63
 
 ghenv.Component.Name = "Honeybee_Export To OpenStudio"
 ghenv.Component.NickName = 'exportToOpenStudio'
-ghenv.Component.Message = 'VER 0.0.63\nMAR_28_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
@@ -5045,6 +5045,7 @@ def main(HBZones, HBContext, north, epwWeatherFile, analysisPeriod, simParameter
             ghenv.Component.AddRuntimeMessage(w, warning)
             
     # call Honeybee objects from the hive
+    # zones are changed by reEvaluateHBZones so each one is a copy
     HBZones = hb_hive.callFromHoneybeeHive(HBZones)
     
     reEvaluate = hb_reEvaluateHBZones(HBZones, None, "UpperLeftCorner")
@@ -5184,9 +5185,11 @@ def main(HBZones, HBContext, north, epwWeatherFile, analysisPeriod, simParameter
 
     # add shading surfaces if any
     if HBContext!=[] and HBContext[0]!=None:
-        shdingSurfcaes = hb_hive.callFromHoneybeeHive(HBContext)
+        # context surfaces are only read unless they have to be scaled
+        shdingSurfcaes = hb_hive.callFromHoneybeeHive(HBContext, readOnly=True)
         if sc.sticky["honeybee_ConversionFactor"] != 1:
             NUscale = rc.Geometry.Transform.Scale(rc.Geometry.Plane(rc.Geometry.Plane.WorldXY),sc.sticky["honeybee_ConversionFactor"],sc.sticky["honeybee_ConversionFactor"],sc.sticky["honeybee_ConversionFactor"])
+            shdingSurfcaes = [hb_hive.copyHBObject(con) for con in shdingSurfcaes]
             for con in shdingSurfcaes:
                 con.transform(NUscale, "", False)
         hb_writeOPS.OPSShdSurface(shdingSurfcaes, model)
@@ -36,7 +36,7 @@ Provided by Honeybee 0.0.63
 """
 ghenv.Component.Name = "Honeybee_ExportEPC"
 ghenv.Component.NickName = 'Export to EPC'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "13 | WIP"
@@ -72,7 +72,7 @@ def main(HBZones):
     hb_hive = sc.sticky["honeybee_Hive"]()
     
     # Call Honeybee zones from the lib
-    HBZones = hb_hive.callFromHoneybeeHive(HBZones)
+    HBZones = hb_hive.callFromHoneybeeHive(HBZones, readOnly=True)
     
     # create an empty dictionary
     # the structure should be as {type : {construction: { orientation : {area of opaque : area , area of glass : area}}}
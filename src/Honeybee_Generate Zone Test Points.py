@@ -40,7 +40,7 @@ Provided by Honeybee 0.0.63
 
 ghenv.Component.Name = "Honeybee_Generate Zone Test Points"
 ghenv.Component.NickName = 'genHBZoneTestPts'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "03 | Daylight | Recipes"
@@ -150,7 +150,7 @@ def getHBZoneFloorSurfaces(HBZone):
     try:
         # call the objects from the lib
         hb_hive = sc.sticky["honeybee_Hive"]()
-        HBZone = hb_hive.callFromHoneybeeHive([HBZone])[0]
+        HBZone = hb_hive.callFromHoneybeeHive([HBZone], readOnly=True)[0]
 
         for HBS in HBZone.surfaces:
             if int(HBS.type) == 2:
@@ -38,7 +38,7 @@ Provided by Honeybee 0.0.63
 
 ghenv.Component.Name = "Honeybee_Get Zone EnergyPlus Schedules"
 ghenv.Component.NickName = 'getHBZoneEPSchedules'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "05 | Energy | Building Program"
@@ -71,7 +71,10 @@ def main(HBZone):
     
     # get Honeybee zone
     hb_hive = sc.sticky["honeybee_Hive"]()
-    HBZoneObject = hb_hive.callFromHoneybeeHive([HBZone])[0]
+    HBZoneObject = hb_hive.callFromHoneybeeHive([HBZone], readOnly=True)[0]
+    # the default schedules are assigned to the zone if it doesn't have any yet
+    if not HBZoneObject.isSchedulesAssigned:
+        HBZoneObject = hb_hive.copyHBObject(HBZoneObject)
     
     try:
         schedules = HBZoneObject.getCurrentSchedules(True, ghenv.Component)
@@ -44,7 +44,7 @@ Provided by Honeybee 0.0.63
 
 ghenv.Component.Name = "Honeybee_GrizzlyBear"
 ghenv.Component.NickName = 'grizzlyBear'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "13 | WIP"
@@ -1645,7 +1645,7 @@ if gbXMLIsReady and _location and _writegbXML and _workingDir:
             reEvaluate.evaluateZones()
             if HBContext_ and HBContext_[0]!=None:
                 # call the objects from the lib
-                HBContext = hb_hive.callFromHoneybeeHive(HBContext_)
+                HBContext = hb_hive.callFromHoneybeeHive(HBContext_, readOnly=True)
             else:
                 HBContext = []
                 
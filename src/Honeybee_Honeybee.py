@@ -79,10 +79,25 @@ import copy
 import urllib2 as urllib
 import cPickle as pickle
 import subprocess
+import threading
+import Queue
 import uuid
 import re
 import random
 import zipfile
+import base64
+import hashlib
+import struct
+import array
+import bisect
+try:
+    import mmap
+except ImportError:
+    mmap = None
+try:
+    import zlib
+except ImportError:
+    zlib = None
 
 PI = math.pi
 
@@ -333,13 +348,107 @@ class versionCheck(object):
         return isInputMissing
 
 
-class hb_findFolders():
+class hb_StartupProfile(object):
+    """Record how long each phase of Honeybee's start-up takes.
+        
+        Call mark() at the end of each phase. The time since the previous mark
+        is stored against the phase name and report() returns a printable
+        summary with the slowest phases first.
+    """
     
     def __init__(self):
-        self.RADPath, self.RADFile = self.which('rad.exe')
-        self.EPPath, self.EPFile = self.which('EnergyPlus.exe')
-        self.DSPath, self.DSFile = self.which('gen_dc.exe')
-        self.THERMPath, self.THERMFile = self.which('Therm7.exe')
+        self.startTime = time.time()
+        self.lastTime = self.startTime
+        self.timings = []
+    
+    def mark(self, phase):
+        currentTime = time.time()
+        self.timings.append((phase, currentTime - self.lastTime))
+        self.lastTime = currentTime
+    
+    def totalTime(self):
+        return self.lastTime - self.startTime
+    
+    def report(self):
+        lines = ["Honeybee start-up took %.2f seconds:"%self.totalTime()]
+        for phase, duration in sorted(self.timings, key = lambda t: t[1], reverse = True):
+            lines.append("  %-28s %6.2f s"%(phase, duration))
+        return "\n".join(lines)
+
+
+class hb_findFolders():
+    
+    programs = {"RAD": 'rad.exe', "EP": 'EnergyPlus.exe', "DS": 'gen_dc.exe', "THERM": 'Therm7.exe'}
+    cacheFileName = "honeybee_toolPaths.json"
+    
+    def __init__(self, cacheFolder = None):
+        if not cacheFolder: cacheFolder = sc.sticky.get("Honeybee_DefaultFolder")
+        self.cacheFile = os.path.join(cacheFolder, self.cacheFileName) if cacheFolder else None
+        
+        cachedPaths = self.readCache()
+        foundPaths = {}
+        missingPrograms = []
+        for key, program in self.programs.items():
+            if self.isCacheValid(cachedPaths.get(program)):
+                foundPaths[key] = tuple(cachedPaths[program][:2])
+            else:
+                missingPrograms.append(key)
+        
+        # probe the tools that are not in the cache in parallel. each probe walks
+        # the whole PATH so running them together hides the slow network drives
+        def probe(key):
+            foundPaths[key] = self.which(self.programs[key])
+        
+        threads = [threading.Thread(target = probe, args = (key,)) for key in missingPrograms]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+        
+        self.RADPath, self.RADFile = foundPaths.get("RAD", (None, None))
+        self.EPPath, self.EPFile = foundPaths.get("EP", (None, None))
+        self.DSPath, self.DSFile = foundPaths.get("DS", (None, None))
+        self.THERMPath, self.THERMFile = foundPaths.get("THERM", (None, None))
+        
+        if missingPrograms: self.writeCache(foundPaths)
+    
+    def readCache(self):
+        if not self.cacheFile or not os.path.isfile(self.cacheFile): return {}
+        try:
+            with open(self.cacheFile, "r") as inf:
+                return json.load(inf)
+        except:
+            return {}
+    
+    def writeCache(self, foundPaths):
+        """Write the found executables to the cache file.
+            
+            Tools that are not found are not written so they will be searched
+            for again the next time Honeybee flies.
+        """
+        if not self.cacheFile: return
+        cachedPaths = {}
+        for key, (path, exeFile) in foundPaths.items():
+            if exeFile: cachedPaths[self.programs[key]] = [path, exeFile, os.path.getmtime(exeFile)]
+        try:
+            with open(self.cacheFile, "w") as outf:
+                json.dump(cachedPaths, outf)
+        except:
+            pass
+    
+    @staticmethod
+    def isCacheValid(cachedPath):
+        """A cached path is valid if the executable has not been changed and it
+            is still on the system PATH.
+        """
+        if not cachedPath: return False
+        try:
+            path, exeFile, modifiedTime = cachedPath
+            if not os.path.isfile(exeFile) or os.path.getmtime(exeFile) != modifiedTime:
+                return False
+        except:
+            return False
+        
+        PATHs = [p.strip('"') for p in os.environ["PATH"].split(os.pathsep)]
+        return path in PATHs
     
     def which(self, program):
         """
@@ -382,14 +491,11 @@ class PrepareTemplateEPLibFiles(object):
     def __init__(self, downloadTemplate = False, workingDir = None):
         
         if not workingDir: workingDir = sc.sticky["Honeybee_DefaultFolder"]
-        if not sc.sticky.has_key("honeybee_constructionLib"): sc.sticky ["honeybee_constructionLib"] = {}
-        if not sc.sticky.has_key("honeybee_materialLib"): sc.sticky ["honeybee_materialLib"] = {}
-        if not sc.sticky.has_key("honeybee_windowMaterialLib"): sc.sticky ["honeybee_windowMaterialLib"] = {}
-        if not sc.sticky.has_key("honeybee_ScheduleLib"): sc.sticky["honeybee_ScheduleLib"] = {}
-        if not sc.sticky.has_key("honeybee_ScheduleTypeLimitsLib"): sc.sticky["honeybee_ScheduleTypeLimitsLib"] = {}
-        if not sc.sticky.has_key("honeybee_WindowPropLib"): sc.sticky["honeybee_WindowPropLib"] = {}
-        if not sc.sticky.has_key("honeybee_SpectralDataLib"): sc.sticky["honeybee_SpectralDataLib"] = {}
-        if not sc.sticky.has_key("honeybee_thermMaterialLib"): sc.sticky["honeybee_thermMaterialLib"] = {}
+        for libName in ("honeybee_constructionLib", "honeybee_materialLib", "honeybee_windowMaterialLib", \
+                        "honeybee_ScheduleLib", "honeybee_ScheduleTypeLimitsLib", "honeybee_WindowPropLib", \
+                        "honeybee_SpectralDataLib", "honeybee_thermMaterialLib"):
+            if not isinstance(sc.sticky.get(libName), hb_EPLibrary):
+                sc.sticky[libName] = hb_EPLibrary(sc.sticky.get(libName, {}))
         
         self.downloadTemplate = downloadTemplate
         self.workingDir = workingDir
@@ -401,16 +507,59 @@ class PrepareTemplateEPLibFiles(object):
         client.DownloadFile(url, localFilePath)
     
     def cleanHBLib(self):
-        sc.sticky ["honeybee_constructionLib"] = {}
-        sc.sticky ["honeybee_materialLib"] = {}
-        sc.sticky ["honeybee_windowMaterialLib"] = {}
-        sc.sticky["honeybee_ScheduleLib"] = {}
-        sc.sticky["honeybee_ScheduleTypeLimitsLib"] = {}
-        sc.sticky["honeybee_WindowPropLib"] = {}
-        sc.sticky["honeybee_SpectralDataLib"] = {}
+        sc.sticky ["honeybee_constructionLib"] = hb_EPLibrary()
+        sc.sticky ["honeybee_materialLib"] = hb_EPLibrary()
+        sc.sticky ["honeybee_windowMaterialLib"] = hb_EPLibrary()
+        sc.sticky["honeybee_ScheduleLib"] = hb_EPLibrary()
+        sc.sticky["honeybee_ScheduleTypeLimitsLib"] = hb_EPLibrary()
+        sc.sticky["honeybee_WindowPropLib"] = hb_EPLibrary()
+        sc.sticky["honeybee_SpectralDataLib"] = hb_EPLibrary()
     
     def cleanThermLib(self):
-        sc.sticky["honeybee_thermMaterialLib"] = {}
+        sc.sticky["honeybee_thermMaterialLib"] = hb_EPLibrary()
+    
+    def checkLibraryFiles(self, libFilePaths):
+        """Return the library files that are missing or empty.
+        
+        This is a quick check at fly time as the files are only read the first
+        time a component uses the libraries.
+        """
+        return [path for path in libFilePaths if not os.path.isfile(path) or os.path.getsize(path) == 0]
+    
+    def loadLibraries(self, libFilePaths, cleanLibs = False, failureMsg = ""):
+        """Import EnergyPlus and THERM libraries from files into Honeybee libraries.
+        
+        Args:
+            libFilePaths: List of library files from downloadTemplates.
+            cleanLibs: Set to True to clean the libraries before importing the first file.
+            failureMsg: Message to keep in failureMsg if loading the libraries fails.
+        
+        Returns:
+            True if the libraries are loaded successfully. Errors are raised
+            to the caller after failureMsg is set.
+        """
+        EPLibs = HB_GetEPLibraries()
+        try:
+            for pathCount, path in enumerate(libFilePaths):
+                cleanCurrentLib = cleanLibs and pathCount == 0
+                if path.endswith('.csv'): isMatFile = True
+                else: isMatFile = False
+                
+                EPLibs.importEPLibrariesFromFile(path, isMatFile, cleanCurrentLib, False)
+            
+            EPLibs.report()
+            sc.sticky["honeybee_materialLib"].update(EPLibs.getEPMaterials())
+            sc.sticky["honeybee_windowMaterialLib"].update(EPLibs.getEPWindowMaterial())
+            sc.sticky ["honeybee_constructionLib"].update(EPLibs.getEPConstructions())
+            sc.sticky["honeybee_ScheduleLib"].update(EPLibs.getEPSchedule())
+            sc.sticky["honeybee_ScheduleTypeLimitsLib"].update(EPLibs.getEPScheduleTypeLimits())
+            sc.sticky["honeybee_thermMaterialLib"].update(EPLibs.getTHERMMaterials())
+            sc.sticky["honeybee_WindowPropLib"].update(EPLibs.getEPWindowProp())
+            sc.sticky["honeybee_SpectralDataLib"].update(EPLibs.getEPSpectralData())
+        except:
+            self.failureMsg = failureMsg
+            raise
+        return True
     
     def downloadTemplates(self):
         
@@ -471,11 +620,10 @@ class PrepareTemplateEPLibFiles(object):
                 '\nPlease check your internet connection, and try again!'
             return -1
         else:
-            # load the json file
+            # the json file is large so it is only read the first time it is used
             filepath = os.path.join(workingDir, 'OpenStudio_Standards.json')
             try:
-                with open(filepath) as jsondata:
-                    openStudioStandardLib = json.load(jsondata)
+                openStudioStandardLib = hb_JSONLibrary(filepath)
                 
                 sc.sticky ["honeybee_OpenStudioStandardsFile"] = openStudioStandardLib
                 print "Standard template file is loaded from %s"%filepath
@@ -530,19 +678,211 @@ class PrepareTemplateEPLibFiles(object):
         return libFilePaths
 
 
+class hb_EPLibrary(dict):
+    """Dictionary of EnergyPlus library objects that are parsed on first access.
+        
+        Objects that are loaded from a library file are kept as the idf string of
+        the object and are converted to Honeybee's dictionary format
+        ({0: EPKey, 1: (value, comment), ...}) the first time they are used.
+        
+        Loading the library files can also be deferred with deferLoading. The
+        pending loader runs once, the first time any of the libraries is used.
+        If it fails, the failure is reported once as a warning and the libraries
+        are left as they are so objects can still be added to them.
+    """
+    
+    pendingLoader = None
+    pendingFailureMsg = ""
+    isLoading = False
+    loadFailure = None
+    loadLock = threading.RLock()
+    
+    @classmethod
+    def deferLoading(cls, loader, failureMsg):
+        """Set a function that fills the libraries and returns True if it succeeds."""
+        with cls.loadLock:
+            # keep the loader as a plain function and not a method of the class
+            cls.pendingLoader = staticmethod(loader)
+            cls.pendingFailureMsg = failureMsg
+            cls.loadFailure = None
+    
+    @classmethod
+    def setLoadFailure(cls, failureMsg):
+        """Keep the failure message of libraries that are not loaded without a pending loader."""
+        with cls.loadLock:
+            cls.pendingLoader = None
+            cls.loadFailure = failureMsg
+    
+    @classmethod
+    def loadPending(cls):
+        # isLoading is set before the loader is removed so other threads never
+        # see an empty library as loaded. They wait on the lock instead.
+        if cls.pendingLoader is not None or cls.isLoading:
+            with cls.loadLock:
+                loader = cls.pendingLoader
+                if loader is not None:
+                    cls.isLoading = True
+                    # the loader fills the libraries so it is removed before it runs
+                    cls.pendingLoader = None
+                    try:
+                        if not loader(): cls.loadFailure = cls.pendingFailureMsg
+                    except Exception, e:
+                        cls.loadFailure = cls.pendingFailureMsg + "Error: " + str(e)
+                    finally:
+                        cls.isLoading = False
+                    if cls.loadFailure is not None: cls.reportLoadFailure()
+    
+    @classmethod
+    def reportLoadFailure(cls):
+        print cls.loadFailure
+        try: ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, cls.loadFailure)
+        except: pass
+    
+    def __contains__(self, name):
+        self.loadPending()
+        return dict.__contains__(self, name)
+    
+    def has_key(self, name):
+        return name in self
+    
+    def __iter__(self):
+        self.loadPending()
+        return dict.__iter__(self)
+    
+    def __len__(self):
+        self.loadPending()
+        return dict.__len__(self)
+    
+    def keys(self):
+        self.loadPending()
+        return dict.keys(self)
+    
+    def iterkeys(self):
+        return iter(self)
+    
+    def __setitem__(self, name, value):
+        self.loadPending()
+        dict.__setitem__(self, name, value)
+    
+    def __delitem__(self, name):
+        self.loadPending()
+        dict.__delitem__(self, name)
+    
+    def update(self, *args, **kwargs):
+        self.loadPending()
+        dict.update(self, *args, **kwargs)
+    
+    def clear(self):
+        self.loadPending()
+        dict.clear(self)
+    
+    def __getitem__(self, name):
+        self.loadPending()
+        value = dict.__getitem__(self, name)
+        if isinstance(value, basestring):
+            value = HB_GetEPLibraries.parseEPObject(value)[2]
+            dict.__setitem__(self, name, value)
+        return value
+    
+    def get(self, name, default = None):
+        if name in self: return self[name]
+        return default
+    
+    def setdefault(self, name, default = None):
+        if name not in self: dict.__setitem__(self, name, default)
+        return self[name]
+    
+    def pop(self, name, *default):
+        if name in self:
+            value = self[name]
+            dict.__delitem__(self, name)
+            return value
+        return dict.pop(self, name, *default)
+    
+    def iteritems(self):
+        for name in self.keys():
+            yield name, self[name]
+    
+    def items(self):
+        return list(self.iteritems())
+    
+    def itervalues(self):
+        for name in self.keys():
+            yield self[name]
+    
+    def values(self):
+        return list(self.itervalues())
+    
+    def copy(self):
+        self.loadPending()
+        return hb_EPLibrary(self)
+    
+    def __reduce__(self):
+        return hb_EPLibrary, (dict(self.iteritems()),)
+
+
+class hb_JSONLibrary(dict):
+    """Dictionary from a json file that is read the first time it is used."""
+    
+    def __init__(self, filePath):
+        dict.__init__(self)
+        self.filePath = filePath
+        self.isLoaded = False
+        self.loadLock = threading.Lock()
+    
+    def load(self):
+        if self.isLoaded: return
+        with self.loadLock:
+            if self.isLoaded: return
+            with open(self.filePath) as jsondata:
+                dict.update(self, json.load(jsondata))
+            # only mark the library as loaded once the data is in it
+            self.isLoaded = True
+    
+    def __getitem__(self, key):
+        self.load()
+        return dict.__getitem__(self, key)
+    
+    def __contains__(self, key):
+        self.load()
+        return dict.__contains__(self, key)
+    
+    def __iter__(self):
+        self.load()
+        return dict.__iter__(self)
+    
+    def __len__(self):
+        self.load()
+        return dict.__len__(self)
+    
+    def get(self, key, default = None):
+        self.load()
+        return dict.get(self, key, default)
+    
+    def keys(self):
+        self.load()
+        return dict.keys(self)
+    
+    def items(self):
+        self.load()
+        return dict.items(self)
+    
+    def values(self):
+        self.load()
+        return dict.values(self)
+    
+    def __reduce__(self):
+        self.load()
+        return dict, (dict(dict.items(self)),)
+
+
 class HB_GetEPLibraries:
     
+    libraryKeys = ("Material", "WindowMaterial", "Construction", "Schedule", "ScheduleTypeLimits", \
+                   "ThermMaterial", "WindowProperty", "MaterialProperty")
+    
     def __init__(self):
-        self.libraries = {
-            "Material": {},
-            "WindowMaterial": {},
-            "Construction": {},
-            "Schedule" : {},
-            "ScheduleTypeLimits": {},
-            "ThermMaterial": {},
-            "WindowProperty": {},
-            "MaterialProperty": {}
-            }
+        self.cleanHBLibs()
     
     def getEPMaterials(self):
         return self.libraries["Material"]
@@ -574,8 +914,7 @@ class HB_GetEPLibraries:
         
         if isMatFile == False:
             print "Loading EP materials, constructions, schedules and material properties from %s"%EPfile
-            EPObjects = self.getEnergyPlusObjectsFromFile(EPfile)
-            self.loadEPConstructionsMaterialsAndSchedules(EPObjects, cleanCurrentLib)
+            self.loadEPLibraryIndex(EPfile, cleanCurrentLib)
         else:
             print "Loading THERM materials from %s"%EPfile
             self.getThermObjectsFromFile(EPfile)
@@ -584,83 +923,127 @@ class HB_GetEPLibraries:
             self.report()
     
     def cleanHBLibs(self):
-        self.libraries = {
-            "Material": {},
-            "WindowMaterial": {},
-            "Construction": {},
-            "Schedule" : {},
-            "ScheduleTypeLimits": {},
-            "ThermMaterial": {},
-            "WindowProperty": {},
-            "MaterialProperty": {}
-            }
+        self.libraries = dict((key, hb_EPLibrary()) for key in self.libraryKeys)
+    
+    def loadEPLibraryIndex(self, EPfile, cleanCurrentLib = True):
+        """Load the objects of an EnergyPlus library file without parsing them.
+            
+            The (library, name, idf string) index of the file is pickled next to
+            the file and is reused as long as the content of the file is the same.
+            Objects are parsed the first time they are used (see hb_EPLibrary).
+        """
+        if cleanCurrentLib: self.cleanHBLibs()
+        
+        with open(EPfile, "rb") as inf:
+            fileHash = hashlib.md5(inf.read()).hexdigest()
+        
+        indexFile = EPfile + ".hbindex"
+        index = None
+        if os.path.isfile(indexFile):
+            try:
+                with open(indexFile, "rb") as inf:
+                    indexHash, index = pickle.load(inf)
+                if indexHash != fileHash: index = None
+            except:
+                index = None
+        
+        if index is None:
+            index = []
+            for EPObjectStr in self.getEnergyPlusObjectsFromFile(EPfile):
+                EPObject = self.parseEPObject(EPObjectStr)
+                if EPObject is not None:
+                    index.append((EPObject[0], EPObject[1], EPObjectStr))
+            try:
+                with open(indexFile, "wb") as outf:
+                    pickle.dump((fileHash, index), outf, 2)
+            except Exception, e:
+                print "Failed to write the library index for %s: %s"%(EPfile, str(e))
+        
+        for shortKey, name, EPObjectStr in index:
+            self.libraries[shortKey][name] = EPObjectStr
+    
+    @classmethod
+    def parseEPObject(cls, EPObjectStr):
+        """Parse an EnergyPlus object string to Honeybee's library format.
             
+            Returns:
+                (library key, object name, object dictionary) or None if the object
+                doesn't belong to any of the libraries.
+        """
+        rawLines = EPObjectStr.strip().split("\n")
+        lines = []
+        for line in rawLines:
+            if line.strip() == '' or line.startswith('!'): continue
+            lines.append(line)
+        
+        if not lines:
+            return None
+        
+        if lines[0].startswith('MaterialProperty:GlazingSpectralData'):
+            key = 'MaterialProperty:GlazingSpectralData'
+            shortKey = 'MaterialProperty'
+            name = lines[1].split(",")[0].strip().upper()
+            objData = dict() # create an empty dictonary
+            objData[0] = key
+            # store the data into the dictionary
+            for lineCount, line in enumerate(lines):
+                objValue = line.split("!")[0].strip()
+                try: objDescription = line.split("!")[1].strip()
+                except:  objDescription = ""
+                if lineCount == 0:
+                    objData[lineCount] = objValue[:-1]
+                elif lineCount == 1:
+                    pass # name is already there as the key
+                elif objValue.endswith(","):
+                    objData[lineCount-1] = objValue[:-1], objDescription
+                elif objValue.endswith(";"):
+                    objData[lineCount-1] = objValue[:-1], objDescription
+            return shortKey, name, objData
+        
+        if len(lines) < 2: return None
+        
+        if lines[0].split(",")[0].strip().isupper():
+            key = lines[0].split(",")[0].strip().title()
+        else:
+            key = lines[0].split(",")[0].strip()
+        shortKey = key.split(":")[0]
+        
+        if shortKey not in cls.libraryKeys: return None
+        
+        name = lines[1].split(",")[0].strip().upper()
+        values = lines[2:]
+        # it's a two line object such as Any Number scheduleTypeLimit
+        if values == []:
+            name = lines[1].split(";")[0].strip().upper() # name is the last input
+        
+        objData = dict() # create an empty dictonary
+        objData[0] = key
+        
+        count = 1
+        delimiter = ","
+        for value in values:
+            if not len(value.strip()): continue #pass empty lines
+            if count==len(values): delimiter = ";"
+            v = value.split(delimiter)[0].strip() # find the  value
+            if value.find("!")!= -1:
+                c = value.split("!")[-1].rstrip() # find the  value
+            else:
+                c = ""
+            objData[count] = v, c
+            count += 1
+        
+        return shortKey, name, objData
+    
     # TODO: Support parsing for files with no next line
-    # TODO: Check if keys can be case insensitive
     # TODO: Create EPObjects and not dictionaries
     def loadEPConstructionsMaterialsAndSchedules(self, EPObjectsString, cleanCurrentLib = True):
         if cleanCurrentLib: self.cleanHBLibs()
         
         for EPObjectStr in EPObjectsString:
-            rawLines = EPObjectStr.strip().split("\n")
-            lines = []
-            for line in rawLines:
-                if line.strip() == '' or line.startswith('!'): continue
-                lines.append(line)
-            
-            if not lines:
-                continue
-            
-            if lines[0].startswith('MaterialProperty:GlazingSpectralData'):
-                key = 'MaterialProperty:GlazingSpectralData'
-                shortKey = 'MaterialProperty'
-                name = lines[1].split(",")[0].strip().upper()
-                self.libraries[shortKey][name] = dict() # create an empty dictonary
-                self.libraries[shortKey][name][0] = key
-                # store the data into the dictionary
-                for lineCount, line in enumerate(lines):
-                    objValue = line.split("!")[0].strip()
-                    try: objDescription = line.split("!")[1].strip()
-                    except:  objDescription = ""
-                    if lineCount == 0:
-                        self.libraries[shortKey][name][lineCount] = objValue[:-1]
-                    elif lineCount == 1:
-                        pass # name is already there as the key
-                    elif objValue.endswith(","):
-                        self.libraries[shortKey][name][lineCount-1] = objValue[:-1], objDescription
-                    elif objValue.endswith(";"):
-                        self.libraries[shortKey][name][lineCount-1] = objValue[:-1], objDescription
-            else:
-                if len(lines) < 2: continue
-                
-                if lines[0].split(",")[0].strip().isupper():
-                    key = lines[0].split(",")[0].strip().title()
-                else:
-                    key = lines[0].split(",")[0].strip()
-                shortKey = key.split(":")[0]
-                
-                name = lines[1].split(",")[0].strip().upper()
-                values = lines[2:]
-                # it's a two line object such as Any Number scheduleTypeLimit
-                if values == []:
-                    name = lines[1].split(";")[0].strip().upper() # name is the last input
-                    
-                if shortKey in self.libraries:
-                    self.libraries[shortKey][name] = dict() # create an empty dictonary
-                    self.libraries[shortKey][name][0] = key
-                    
-                    count = 1
-                    delimiter = ","
-                    for value in values:
-                        if not len(value.strip()): continue #pass empty lines
-                        if count==len(values): delimiter = ";"
-                        v = value.split(delimiter)[0].strip() # find the  value
-                        if value.find("!")!= -1:
-                            c = value.split("!")[-1].rstrip() # find the  value
-                        else:
-                            c = ""
-                        self.libraries[shortKey][name][count] = v, c
-                        count += 1
+            EPObject = self.parseEPObject(EPObjectStr)
+            if EPObject is None: continue
+            shortKey, name, objData = EPObject
+            self.libraries[shortKey][name] = objData
     
     def report(self): 
         # Report findings
@@ -1246,7 +1629,7 @@ class RADMaterialAux(object):
             # if it is just the name of the material make sure it is already defined
             if len(RADMaterial.split(" ")) == 1:
                 # if the material is not in the library add it to the library
-                if RADMaterial not in sc.sticky ["honeybee_RADMaterialLib"].keys():
+                if RADMaterial not in sc.sticky ["honeybee_RADMaterialLib"]:
                     warningMsg = "Can't find " + RADMaterial + " in RAD Material Library.\n" + \
                                 "Add the material to the library and try again."
                     component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, warningMsg)
@@ -1623,6 +2006,112 @@ class hb_MSHToRAD(object):
     
         return matFile, radFile
 
+class hb_OctreeCache(object):
+    """Cache of octrees and ambient files for Radiance studies.
+        
+        Files are named after the hash of their inputs so an unchanged scene
+        can be found without re-running oconv or warming up the ambient file.
+        The modified time of a file is updated every time it is used and the
+        least recently used files are removed once the cache gets larger than
+        maxSize. Use clear to remove all the cached files.
+        
+        Args:
+            cacheFolder: Folder to keep the cached files.
+            maxSize: Maximum size of the cache folder in bytes (Default: 1 GB).
+    """
+    
+    def __init__(self, cacheFolder, maxSize = 1024 ** 3):
+        self.cacheFolder = cacheFolder
+        self.maxSize = maxSize
+        self.pendingFiles = []
+    
+    @staticmethod
+    def getHash(filePaths, *args):
+        """Return a hash of the name and the content of the files and the args."""
+        md5 = hashlib.md5()
+        for filePath in filePaths:
+            md5.update(filePath + "\n")
+            with open(filePath, "rb") as inf:
+                while True:
+                    data = inf.read(1048576)
+                    if not data: break
+                    md5.update(data)
+        
+        for arg in args:
+            md5.update(str(arg) + "\n")
+        
+        return md5.hexdigest()
+    
+    def getCachedFile(self, key, extension):
+        """Return the address of the cached file or None if it's not cached."""
+        cachedFile = os.path.join(self.cacheFolder, key + extension)
+        if os.path.isfile(cachedFile) and os.path.getsize(cachedFile) > 0:
+            # mark the file as recently used
+            try: os.utime(cachedFile, None)
+            except: pass
+            return cachedFile
+    
+    def copyFromCache(self, key, extension, targetFile):
+        """Copy the cached file to targetFile. Returns False if it's not cached."""
+        cachedFile = self.getCachedFile(key, extension)
+        if not cachedFile: return False
+        
+        try:
+            shutil.copyfile(cachedFile, targetFile)
+            return True
+        except Exception, e:
+            print "Failed to copy %s from the cache: %s"%(cachedFile, str(e))
+            return False
+    
+    def addToCache(self, sourceFile, key, extension):
+        """Add sourceFile to the cache once the study is done (see storePending)."""
+        self.pendingFiles.append((sourceFile, key, extension))
+    
+    def storePending(self):
+        """Copy the files that are generated by the study to the cache."""
+        for sourceFile, key, extension in self.pendingFiles:
+            if not os.path.isfile(sourceFile) or os.path.getsize(sourceFile) == 0:
+                continue
+            try:
+                if not os.path.isdir(self.cacheFolder): os.makedirs(self.cacheFolder)
+                shutil.copyfile(sourceFile, os.path.join(self.cacheFolder, key + extension))
+            except Exception, e:
+                print "Failed to add %s to the cache: %s"%(sourceFile, str(e))
+        
+        self.pendingFiles = []
+        self.removeOldFiles()
+    
+    def getCachedFiles(self):
+        """Return (modified time, size, path) of the cached files."""
+        cachedFiles = []
+        if not os.path.isdir(self.cacheFolder): return cachedFiles
+        for fileName in os.listdir(self.cacheFolder):
+            filePath = os.path.join(self.cacheFolder, fileName)
+            if os.path.isfile(filePath):
+                cachedFiles.append((os.path.getmtime(filePath), os.path.getsize(filePath), filePath))
+        return cachedFiles
+    
+    def removeOldFiles(self):
+        """Remove the least recently used files until the cache is smaller than maxSize."""
+        cachedFiles = sorted(self.getCachedFiles())
+        totalSize = sum(size for modifiedTime, size, filePath in cachedFiles)
+        for modifiedTime, size, filePath in cachedFiles:
+            if totalSize <= self.maxSize: break
+            try:
+                os.remove(filePath)
+                totalSize -= size
+            except Exception, e:
+                print "Failed to remove %s from the cache: %s"%(filePath, str(e))
+    
+    def clear(self):
+        """Remove all the cached files."""
+        for modifiedTime, size, filePath in self.getCachedFiles():
+            try:
+                os.remove(filePath)
+            except Exception, e:
+                print "Failed to remove %s from the cache: %s"%(filePath, str(e))
+
+
 class hb_WriteRAD(object):
     
     def __init__(self, component = ghenv.Component):
@@ -1643,6 +2132,21 @@ class hb_WriteRAD(object):
         self.hb_DSCore = hb_folders["DSCorePath"]
         self.hb_DSLibPath = hb_folders["DSLibPath"]
         
+        # grid-based studies are split into small chunks of points that are
+        # handed to a fixed pool of workers so a slow part of the grid doesn't
+        # keep the other cpus idle
+        self.chunksPerCPU = 8
+        self.minPtsInEachChunk = 25
+        self.numOfWorkers = None
+        
+        # reuse octrees and ambient files when the scene doesn't change
+        self.useOctreeCache = True
+        self.octreeCacheSize = 1024 ** 3
+        self.octreeCache = None
+        # number of test points that are used to warm up the ambient file
+        # before the chunks of a grid-based study run in parallel
+        self.numOfWarmUpPts = 1000
+        
         
     def writeRADAndMaterialFiles(self, originalHBObjects, subWorkingDir, radFileName, \
                                  analysisRecipe, meshParameters, exportInteriorWalls):
@@ -1992,6 +2496,7 @@ class hb_WriteRAD(object):
         batchFiles = []
         fileNames = [] # list of only names of the files
         pcompFileName = ""
+        self.numOfWorkers = None
         
         # initiate RAD Parameters
         if analysisRecipe.radParameters==None:
@@ -2189,6 +2694,13 @@ class hb_WriteRAD(object):
                         sceneRadFiles.append(additionalFile)
                 
             OCTLine = self.hb_writeRADAUX.oconvLine(OCTFileName, sceneRadFiles)
+            ambFileName = None
+            if readyOCTFile ==None and self.useOctreeCache:
+                OCTLine, ambFileName, ambIsCached = self.prepareCachedOctree(subWorkingDir, \
+                                OCTFileName, sceneRadFiles, radSkyFileName, analysisRecipe)
+                # the ambient file is already warmed up
+                if ambIsCached: runOverture = False
+            
             if readyOCTFile ==None: batchFile.write(OCTLine)
             
             if analysisRecipe.type == 0:
@@ -2201,6 +2713,15 @@ class hb_WriteRAD(object):
                 overtureLine = self.hb_writeRADAUX.overtureLine(viewLine, OCTFileName, view, analysisRecipe.radParameters, int(analysisRecipe.type))
                 if runOverture: batchFile.write(overtureLine)
             
+            elif ambFileName and runOverture:
+                # warm up the ambient file in a single pass with a sample of the
+                # test points. The chunks only run on copies of it.
+                warmUpFileName = self.writeWarmUpPts(subWorkingDir, radFileName, numOfCPUs)
+                RTRACELine = self.hb_writeRADAUX.rtraceLine(warmUpFileName, OCTFileName, \
+                             analysisRecipe.radParameters, int(analysisRecipe.simulationType), 0, ambFileName)
+                batchFile.write(RTRACELine)
+                batchFile.write("del " + warmUpFileName + "_0.pts " + warmUpFileName + "_0.res\n")
+            
         if analysisRecipe.type == 0:
             # write view files
             if len(self.rhinoViewNames)==0:
@@ -2286,31 +2807,186 @@ class hb_WriteRAD(object):
         else:
             fileNames = []
             RADResultFilesAddress = []
+            self.numOfWorkers = numOfCPUs
+            resultChunks = []
             for cpuCount in range(numOfCPUs):
-                # create a batch file
-                batchFileName = os.path.join(subWorkingDir, radFileName + '_' + `cpuCount` + '_RAD.bat')
-                batchFiles.append(batchFileName)
+                RADResultFile = os.path.join(subWorkingDir, radFileName + '_' + `cpuCount` + '.res')
+                RADResultFilesAddress.append(RADResultFile)
                 
-                RADResultFilesAddress.append(os.path.join(subWorkingDir, radFileName + '_' + `cpuCount` + '.res'))
+                # split the test points of this cpu into smaller chunks
+                chunkFileNames = self.writeTestPtChunks(subWorkingDir, radFileName, cpuCount)
                 
-                fileNames.append(batchFileName.split("\\")[-1])
-                batchFile = open(batchFileName, "w")
-                # write path files
-                batchFile.write(pathStr)
-                batchFile.write(os.path.splitdrive(subWorkingDir)[0] + "\n")
-                batchFile.write("cd " + subWorkingDir + "\n")
-                
-                # 3.4. add rtrace lin
-                RTRACELine = self.hb_writeRADAUX.rtraceLine(radFileName, OCTFileName, analysisRecipe.radParameters, int(analysisRecipe.simulationType), cpuCount)
-                batchFile.write(RTRACELine)
+                for chunkCount, chunkFileName in enumerate(chunkFileNames):
+                    # create a batch file
+                    batchFileName = os.path.join(subWorkingDir, chunkFileName + '_RAD.bat')
+                    batchFiles.append(batchFileName)
+                    
+                    fileNames.append(batchFileName.split("\\")[-1])
+                    batchFile = open(batchFileName, "w")
+                    # write path files
+                    batchFile.write(pathStr)
+                    batchFile.write(os.path.splitdrive(subWorkingDir)[0] + "\n")
+                    batchFile.write("cd " + subWorkingDir + "\n")
+                    
+                    # each chunk uses its own copy of the ambient file as Radiance
+                    # doesn't lock the file for the processes that run in parallel
+                    chunkAmbFileName = None
+                    if ambFileName:
+                        chunkAmbFileName = chunkFileName + ".amb"
+                        batchFile.write("copy /Y " + ambFileName + " " + chunkAmbFileName + " > NUL\n")
+                    
+                    # 3.4. add rtrace lin
+                    RTRACELine = self.hb_writeRADAUX.rtraceLine(radFileName + '_' + `cpuCount` + '_chunk', OCTFileName, \
+                                 analysisRecipe.radParameters, int(analysisRecipe.simulationType), chunkCount, chunkAmbFileName)
+                    batchFile.write(RTRACELine)
+                    
+                    if chunkAmbFileName: batchFile.write("del " + chunkAmbFileName + "\n")
+                    
+                    # close the file
+                    batchFile.close()
                 
-                # close the file
-                batchFile.close()
+                resultChunks.append((os.path.basename(RADResultFile), chunkFileNames))
             
+            # put the results of the chunks back together after all of them are done
+            pcompFileName = os.path.join(subWorkingDir, radFileName + '_MERGE.bat')
+            with open(pcompFileName, "w") as mergeFile:
+                mergeFile.write(os.path.splitdrive(subWorkingDir)[0] + "\n")
+                mergeFile.write("cd " + subWorkingDir + "\n")
+                mergeFile.write(self.mergeChunksLines(resultChunks))
             
             return initBatchFileName, batchFiles, fileNames, pcompFileName, RADResultFilesAddress
+    
+    def prepareCachedOctree(self, subWorkingDir, OCTFileName, sceneRadFiles, radSkyFileName, analysisRecipe):
+        """Write the oconv lines for a study using the cached octrees if the scene
+            is already calculated.
+            
+            The octree of the scene without the sky is kept separately so when
+            only the sky changes it is only added to the cached octree (oconv -i).
+            The ambient file is reused if the scene, the sky and the parameters
+            are the same.
+            
+            Returns:
+                OCTLine: oconv lines for the init batch file.
+                ambFileName: Name of the ambient file for the study.
+                ambIsCached: True if the ambient file is copied from the cache.
+        """
+        cacheFolder = os.path.join(os.path.dirname(os.path.normpath(subWorkingDir)), "octreeCache")
+        self.octreeCache = hb_OctreeCache(cacheFolder, self.octreeCacheSize)
+        
+        staticRadFiles = [radFile for radFile in sceneRadFiles if radFile != radSkyFileName]
+        sceneKey = self.octreeCache.getHash(staticRadFiles)
+        octKey = self.octreeCache.getHash([radSkyFileName], sceneKey)
+        ambKey = self.octreeCache.getHash([], octKey, analysisRecipe.type, \
+                                          analysisRecipe.simulationType, \
+                                          sorted(analysisRecipe.radParameters.items()))
+        
+        OCTFile = os.path.join(subWorkingDir, OCTFileName + ".oct")
+        sceneOCTFileName = OCTFileName + "_scene"
+        ambFileName = OCTFileName + ".amb"
+        
+        OCTLine = ""
+        if self.octreeCache.copyFromCache(octKey, ".oct", OCTFile):
+            print "Octree is loaded from the cache."
+        else:
+            cachedSceneOCT = self.octreeCache.getCachedFile(sceneKey, ".oct")
+            if cachedSceneOCT:
+                print "Scene octree is loaded from the cache. Only the sky will be added."
+                inputOCTFile = cachedSceneOCT
+            else:
+                # scene octree shouldn't be frozen so the sky can be added to it later
+                OCTLine += self.hb_writeRADAUX.oconvLine(sceneOCTFileName, staticRadFiles, freeze = False)
+                inputOCTFile = sceneOCTFileName + ".oct"
+                self.octreeCache.addToCache(os.path.join(subWorkingDir, inputOCTFile), sceneKey, ".oct")
+            
+            OCTLine += self.hb_writeRADAUX.oconvLine(OCTFileName, [radSkyFileName], inputOCTFile)
+            self.octreeCache.addToCache(OCTFile, octKey, ".oct")
+        
+        ambIsCached = self.octreeCache.copyFromCache(ambKey, ".amb", os.path.join(subWorkingDir, ambFileName))
+        if ambIsCached:
+            print "Ambient file is loaded from the cache."
+        else:
+            # only the warmed up file is cached. A cached file is not stored
+            # again so it doesn't grow every time it is used.
+            self.octreeCache.addToCache(os.path.join(subWorkingDir, ambFileName), ambKey, ".amb")
+        
+        return OCTLine, ambFileName, ambIsCached
+    
+    def writeWarmUpPts(self, subWorkingDir, radFileName, numOfCPUs):
+        """Write a sample of the test points of all the cpus that is used to
+            warm up the ambient file.
+            
+            Returns:
+                Name of the sample (radFileName_warmUp). The test points are
+                written to radFileName_warmUp_0.pts
+        """
+        lines = []
+        for cpuCount in range(numOfCPUs):
+            ptsFile = open(os.path.join(subWorkingDir, radFileName + '_' + `cpuCount` + '.pts'), "r")
+            lines.extend([line for line in ptsFile if line.strip()!=""])
+            ptsFile.close()
+        
+        step = max(1, len(lines) // self.numOfWarmUpPts)
+        
+        warmUpFileName = radFileName + '_warmUp'
+        warmUpFile = open(os.path.join(subWorkingDir, warmUpFileName + '_0.pts'), "w")
+        warmUpFile.writelines(lines[::step])
+        warmUpFile.close()
         
-    def executeBatchFiles(self, batchFileNames, maxPRuns = None, shell = False, waitingTime = 0.5):
+        return warmUpFileName
+    
+    def writeTestPtChunks(self, subWorkingDir, radFileName, cpuCount):
+        """Split the test point file of a cpu into smaller files.
+            
+            Args:
+                subWorkingDir: Study folder.
+                radFileName: Name of the study.
+                cpuCount: Index of the cpu.
+            
+            Returns:
+                A list of chunk names in order (radFileName_cpuCount_chunk_i). The
+                test points of each chunk are written to chunkName.pts
+        """
+        ptsFile = open(os.path.join(subWorkingDir, radFileName + '_' + `cpuCount` + '.pts'), "r")
+        lines = [line for line in ptsFile if line.strip()!=""]
+        ptsFile.close()
+        
+        numOfChunks = min(self.chunksPerCPU, len(lines) // self.minPtsInEachChunk)
+        if numOfChunks < 1: numOfChunks = 1
+        
+        chunkFileNames = []
+        for chunkCount in range(numOfChunks):
+            chunkFileName = radFileName + '_' + `cpuCount` + '_chunk_' + `chunkCount`
+            start = (len(lines) * chunkCount) // numOfChunks
+            end = (len(lines) * (chunkCount + 1)) // numOfChunks
+            
+            chunkFile = open(os.path.join(subWorkingDir, chunkFileName + '.pts'), "w")
+            chunkFile.writelines(lines[start:end])
+            chunkFile.close()
+            chunkFileNames.append(chunkFileName)
+        
+        return chunkFileNames
+    
+    def mergeChunksLines(self, resultChunks):
+        """Return the batch lines that put the results of the chunks back together
+            in the original order of the test points.
+            
+            Args:
+                resultChunks: A list of (result file of a cpu, chunk names of the cpu).
+            
+            Returns:
+                Lines that write the results of each cpu to its result file and
+                remove the files of the chunks.
+        """
+        lines = ""
+        for RADResultFile, chunkFileNames in resultChunks:
+            for chunkCount, chunkFileName in enumerate(chunkFileNames):
+                redirect = " > " if chunkCount == 0 else " >> "
+                lines += "type " + chunkFileName + ".res" + redirect + RADResultFile + "\n"
+            for chunkFileName in chunkFileNames:
+                lines += "del " + chunkFileName + ".res " + chunkFileName + ".pts\n"
+        return lines
+    
+    def executeBatchFiles(self, batchFileNames, maxPRuns = None, shell = False):
     
         """Run a number of batch files in parallel and
             wait to end of the analysis.
@@ -2328,45 +3004,47 @@ class hb_WriteRAD(object):
         if maxPRuns < 1: maxPRuns = 1
         if maxPRuns > total: maxPRuns = total
         
-        running = 0
-        done = False
-        jobs = []
-        pid = 0
+        # workers take the next file from the queue as soon as their
+        # current process is finished
+        jobs = Queue.Queue()
+        for batchFileName in batchFileNames:
+            jobs.put(batchFileName)
         
-        try:
-            while not done:
-                if running < maxPRuns and pid < total:
-                    # execute the files
-                    jobs.append(subprocess.Popen(batchFileNames[pid].replace("\\", "/") , shell = shell))
-                    pid+=1
-                    time.sleep(waitingTime)
-                
-                # count how many jobs are running and how many are done
-                running = 0
-                finished = 0
-                for job in jobs:
-                    if job.poll() is None:
-                        #one job is still running
-                        running += 1
-                    else:
-                        finished += 1
+        errors = []
         
-                if running == maxPRuns:
-                    # wait for half a second
-                    #print "waiting..."
-                    time.sleep(waitingTime)
+        def worker():
+            while True:
+                try:
+                    batchFileName = jobs.get_nowait()
+                except Queue.Empty:
+                    return
+                try:
+                    subprocess.Popen(batchFileName.replace("\\", "/") , shell = shell).wait()
+                except Exception, e:
+                    errors.append(str(e))
         
-                if finished ==  total:
-                    done = True
+        workers = [threading.Thread(target = worker) for count in range(maxPRuns)]
+        for thread in workers: thread.start()
+        for thread in workers: thread.join()
         
-        except Exception, e:
-            print "Something went wrong: %s"%str(e) 
+        for e in errors:
+            print "Something went wrong: %s"%e
     
     def runBatchFiles(self, initBatchFileName, batchFileNames, fileNames, \
-                      pcompBatchFile, waitingTime, runInBackground = False):
+                      pcompBatchFile, runInBackground = False):
+        
+        self.executeBatchFiles([initBatchFileName], maxPRuns = 1, shell = runInBackground)
         
-        self.executeBatchFiles([initBatchFileName], maxPRuns = 1, shell = runInBackground, waitingTime = waitingTime)
-        self.executeBatchFiles(batchFileNames, maxPRuns = len(batchFileNames), shell = runInBackground, waitingTime = waitingTime)
+        if self.numOfWorkers:
+            # run the chunks on a fixed number of workers
+            maxPRuns = self.numOfWorkers
+        else:
+            maxPRuns = len(batchFileNames)
+        
+        self.executeBatchFiles(batchFileNames, maxPRuns = maxPRuns, shell = runInBackground)
+        
+        if self.octreeCache:
+            self.octreeCache.storePending()
         
         if pcompBatchFile!="":
             os.system(pcompBatchFile) # put all the files together
@@ -3067,13 +3745,21 @@ class hb_WriteRADAUX(object):
             
         return view + " "
     
-    def oconvLine(self, octFileName, radFilesList):
+    def oconvLine(self, octFileName, radFilesList, inputOctFile = None, freeze = True):
         # sence files
         r = 1024 * 2
         senceFiles = ""
         for address in radFilesList: senceFiles = senceFiles + address.replace("\\" , "/") + " "
         
-        line = "oconv -r " + str(r) + " -f " +  senceFiles + " > " + octFileName + ".oct\n"
+        if inputOctFile:
+            # add the files to an existing octree
+            line = "oconv -i " + inputOctFile.replace("\\" , "/") + " "
+        else:
+            line = "oconv -r " + str(r) + " "
+        
+        if freeze: line += "-f "
+        
+        line += senceFiles + " > " + octFileName + ".oct\n"
         
         return line
     
@@ -3159,7 +3845,7 @@ class hb_WriteRADAUX(object):
            "ra_gif " + projectName + "_" + viewName + "_FalseColored.pic " + projectName + "_" + viewName + "_FalseColored.gif\n"
         return line
 
-    def rtraceLine(self, projectName, octFileName, radParameters, simulationType = 0, cpuCount = 0):
+    def rtraceLine(self, projectName, octFileName, radParameters, simulationType = 0, cpuCount = 0, ambFile = None):
         ptsFile = projectName + "_" + str(cpuCount) + ".pts"
         outputFile = projectName + "_" + str(cpuCount) + ".res"
         if simulationType == 0:
@@ -3178,6 +3864,8 @@ class hb_WriteRADAUX(object):
                 " -ad " + str(radParameters["_ad_"]) + " -as " + str(radParameters["_as_"]) + \
                 " -ar " + str(radParameters["_ar_"]) + " -aa " + str(radParameters["_aa_"])
         
+        if ambFile: line1_1 += " -af " + ambFile
+        
         line1_2 = " "
         if radParameters.has_key("additional"):
             for par in radParameters["additional"]:
@@ -3561,49 +4249,1150 @@ class hb_ReadAnnualResultsAux(object):
                 stateName = fileName
                 stateNumber = -1 # no states
             
-            # create an empty dictionary
-            if groupName not in illFilesDict.keys():
-                illFilesDict[groupName] = {}
+            # create an empty dictionary
+            if groupName not in illFilesDict.keys():
+                illFilesDict[groupName] = {}
+            
+            # create an empty dictionary for each state
+            if stateName not in illFilesDict[groupName].keys():
+                illFilesDict[groupName][stateName] = []
+            
+            # append the file to the list
+            illFilesDict[groupName][stateName].append(fullPath)
+        
+        # sort the keys
+        illFiles = DataTree[System.Object]()
+        shadingGroupCount = 0
+        
+        for key, fileListDict in illFilesDict.items():
+            stateCount = 0
+            shadingGroupCount+=1
+            for state, fileList in fileListDict.items():
+                if key== -1:
+                    p = GH_Path(0)
+                    shadingGroupCount-=1
+                else:
+                    p = GH_Path(shadingGroupCount, stateCount)
+                    stateCount+=1
+                    
+                try:
+                    if fileName.endswith("_down.ill") or fileName.endswith("_up.ill"):
+                        # conceptual blind
+                        if fileList[0].endswith("_down.ill"):
+                            p = GH_Path(1,0)
+                        else:
+                            p = GH_Path(0)
+                        
+                        illFiles.AddRange(sorted(fileList, key=lambda fileName: int(fileName.split(".")[-2].split("_")[-2])), p)
+                    else:
+                        illFiles.AddRange(sorted(fileList, key=lambda fileName: int(fileName.split(".")[-2].split("_")[-1])), p)
+                        
+                except Exception, e:
+                    # failed to sort!
+                    illFiles.AddRange(fileList, p)
+        
+        return illFiles
+
+class hb_IllFileCache(object):
+    """
+    Binary cache for a single Daysim .ill file.
+    
+    The .ill file is converted once to a float32 matrix of hours x sensors and
+    saved next to the source file (fileName.ill.hbc). The cache is memory-mapped
+    so hour or sensor slices can be read without loading the whole year. It will
+    be rebuilt if the size or modification time of the .ill file changes.
+    
+    Set illFile to None to open a matrix which is written by Honeybee using writeMatrix.
+    """
+    
+    magic = "HBIL"
+    version = 1
+    headerFormat = "<4sIIIdq"
+    headerSize = 64
+    valueSize = 4
+    
+    def __init__(self, illFile, cacheFile = None):
+        self.illFile = illFile
+        if cacheFile: self.cacheFile = cacheFile
+        else: self.cacheFile = illFile + ".hbc"
+        self.hourCount = 0
+        self.sensorCount = 0
+        self.data = None
+        self.dataFile = None
+        
+        if not self.isCacheValid():
+            if illFile is None:
+                raise IOError("%s is not a valid Honeybee illuminance matrix." % self.cacheFile)
+            self.writeCache()
+        self.open()
+    
+    def getSourceStamp(self):
+        if self.illFile is None: return 0.0, 0
+        stat = os.stat(self.illFile)
+        return float(stat.st_mtime), int(stat.st_size)
+    
+    def isCacheValid(self):
+        if not os.path.isfile(self.cacheFile): return False
+        try:
+            with open(self.cacheFile, "rb") as inf:
+                header = inf.read(struct.calcsize(self.headerFormat))
+            magic, version, hourCount, sensorCount, mtime, size = \
+                struct.unpack(self.headerFormat, header)
+        except (IOError, struct.error):
+            return False
+        
+        if magic != self.magic or version != self.version: return False
+        if (mtime, size) != self.getSourceStamp(): return False
+        
+        expectedSize = self.headerSize + hourCount * sensorCount * self.valueSize
+        if os.path.getsize(self.cacheFile) != expectedSize: return False
+        
+        self.hourCount = hourCount
+        self.sensorCount = sensorCount
+        return True
+    
+    @classmethod
+    def packHeader(cls, hourCount, sensorCount, sourceStamp):
+        mtime, size = sourceStamp
+        header = struct.pack(cls.headerFormat, cls.magic, cls.version, \
+                             hourCount, sensorCount, mtime, size)
+        return header + "\0" * (cls.headerSize - len(header))
+    
+    @classmethod
+    def writeMatrix(cls, cacheFile, hourlyValues, sensorCount):
+        """Write a list of hourly float arrays to cacheFile and return it as an opened cache."""
+        hourCount = 0
+        with open(cacheFile, "wb") as outf:
+            outf.write("\0" * cls.headerSize)
+            for values in hourlyValues:
+                if len(values) != sensorCount:
+                    raise ValueError("Hour %d has %d values. Expected %d." % \
+                        (hourCount + 1, len(values), sensorCount))
+                values = array.array("f", values)
+                if sys.byteorder != "little": values.byteswap()
+                values.tofile(outf)
+                hourCount += 1
+            outf.seek(0)
+            outf.write(cls.packHeader(hourCount, sensorCount, (0.0, 0)))
+        
+        return cls(None, cacheFile)
+    
+    def writeCache(self):
+        """Convert the .ill file to the binary cache in a single pass."""
+        self.close()
+        self.hourCount = 0
+        self.sensorCount = 0
+        
+        try:
+            with open(self.illFile, "r") as inf, open(self.cacheFile, "wb") as outf:
+                # place holder for the header. It will be written once the size is known
+                outf.write("\0" * self.headerSize)
+                for line in inf:
+                    if line.startswith("#"): continue
+                    # month, day, hour, sensor values
+                    lineSeg = line.split()[3:]
+                    if not lineSeg: continue
+                    if self.sensorCount == 0:
+                        self.sensorCount = len(lineSeg)
+                    elif len(lineSeg) != self.sensorCount:
+                        raise ValueError("Line %d of %s has %d values. Expected %d." % \
+                            (self.hourCount + 1, self.illFile, len(lineSeg), self.sensorCount))
+                    
+                    values = array.array("f", map(float, lineSeg))
+                    if sys.byteorder != "little": values.byteswap()
+                    values.tofile(outf)
+                    self.hourCount += 1
+                
+                outf.seek(0)
+                outf.write(self.packHeader(self.hourCount, self.sensorCount, self.getSourceStamp()))
+        except:
+            # don't leave a half written cache behind
+            if os.path.isfile(self.cacheFile):
+                try: os.remove(self.cacheFile)
+                except: pass
+            raise
+    
+    def open(self):
+        if self.data is not None: return
+        self.dataFile = open(self.cacheFile, "rb")
+        self.data = self.dataFile
+        if mmap is not None and self.hourCount * self.sensorCount != 0:
+            try:
+                self.data = mmap.mmap(self.dataFile.fileno(), 0, access = mmap.ACCESS_READ)
+            except Exception:
+                # memory mapping is not available. values will be read from the file
+                self.data = self.dataFile
+    
+    def close(self):
+        if self.data is not None and self.data is not self.dataFile:
+            self.data.close()
+        if self.dataFile is not None:
+            self.dataFile.close()
+        self.data = None
+        self.dataFile = None
+    
+    def readValues(self, index, count):
+        """Read count values starting from a flat index in the matrix."""
+        values = array.array("f")
+        if count <= 0: return values
+        start = self.headerSize + index * self.valueSize
+        end = start + count * self.valueSize
+        if self.data is self.dataFile:
+            self.dataFile.seek(start)
+            values.fromstring(self.dataFile.read(end - start))
+        else:
+            values.fromstring(self.data[start:end])
+        if sys.byteorder != "little": values.byteswap()
+        return values
+    
+    @staticmethod
+    def checkRange(start, end, length):
+        if end is None or end > length: end = length
+        if start < 0: start = 0
+        if end < start: end = start
+        return start, end
+    
+    def getHourValues(self, hour, sensorStart = 0, sensorEnd = None):
+        """Return values of sensors [sensorStart:sensorEnd] for an hour (0 based)."""
+        sensorStart, sensorEnd = self.checkRange(sensorStart, sensorEnd, self.sensorCount)
+        return self.readValues(hour * self.sensorCount + sensorStart, sensorEnd - sensorStart)
+    
+    def getSensorValues(self, sensor, hourStart = 0, hourEnd = None):
+        """Return values of a sensor (0 based) for hours [hourStart:hourEnd]."""
+        hourStart, hourEnd = self.checkRange(hourStart, hourEnd, self.hourCount)
+        values = array.array("f")
+        for hour in xrange(hourStart, hourEnd):
+            values.extend(self.readValues(hour * self.sensorCount + sensor, 1))
+        return values
+    
+    def getBlock(self, hourStart = 0, hourEnd = None, sensorStart = 0, sensorEnd = None):
+        """Return a list of hourly arrays for hours [hourStart:hourEnd] and sensors [sensorStart:sensorEnd]."""
+        hourStart, hourEnd = self.checkRange(hourStart, hourEnd, self.hourCount)
+        return [self.getHourValues(hour, sensorStart, sensorEnd) for hour in xrange(hourStart, hourEnd)]
+
+
+class hb_AnnualIllResults(object):
+    """
+    Read a list of .ill files as a single hours x sensors matrix.
+    
+    Daysim writes the results of each CPU to a separate .ill file. This class
+    puts the sensors of the files next to each other in the order of the input
+    list so results can be sliced using the index of the test points.
+    """
+    
+    def __init__(self, illFiles):
+        self.illFiles = list(illFiles)
+        self.caches = [hb_IllFileCache(illFile) for illFile in self.illFiles]
+        
+        # index of the first sensor of each file
+        self.sensorOffsets = [0]
+        for cache in self.caches:
+            self.sensorOffsets.append(self.sensorOffsets[-1] + cache.sensorCount)
+        self.sensorCount = self.sensorOffsets[-1]
+        
+        hourCounts = set(cache.hourCount for cache in self.caches)
+        if len(hourCounts) > 1:
+            raise ValueError("Number of hours in .ill files doesn't match:\n" + \
+                             "\n".join(self.illFiles))
+        self.hourCount = hourCounts.pop() if hourCounts else 0
+    
+    def close(self):
+        for cache in self.caches: cache.close()
+    
+    def getFileIndex(self, sensor):
+        """Return index of the file which includes the sensor and the sensor index in the file."""
+        fileIndex = bisect.bisect_right(self.sensorOffsets, sensor) - 1
+        fileIndex = min(max(fileIndex, 0), len(self.caches) - 1)
+        return fileIndex, sensor - self.sensorOffsets[fileIndex]
+    
+    def getHourValues(self, hour, sensorStart = 0, sensorEnd = None):
+        """Return values of sensors [sensorStart:sensorEnd] for an hour (0 based)."""
+        sensorStart, sensorEnd = hb_IllFileCache.checkRange(sensorStart, sensorEnd, self.sensorCount)
+        values = array.array("f")
+        for cacheCount, cache in enumerate(self.caches):
+            offset = self.sensorOffsets[cacheCount]
+            if offset >= sensorEnd: break
+            if self.sensorOffsets[cacheCount + 1] <= sensorStart: continue
+            values.extend(cache.getHourValues(hour, sensorStart - offset, sensorEnd - offset))
+        return values
+    
+    def getSensorValues(self, sensor, hourStart = 0, hourEnd = None):
+        """Return values of a sensor (0 based) for hours [hourStart:hourEnd]."""
+        fileIndex, localIndex = self.getFileIndex(sensor)
+        return self.caches[fileIndex].getSensorValues(localIndex, hourStart, hourEnd)
+    
+    def getBlock(self, hourStart = 0, hourEnd = None, sensorStart = 0, sensorEnd = None):
+        """Return a list of hourly arrays for hours [hourStart:hourEnd] and sensors [sensorStart:sensorEnd]."""
+        hourStart, hourEnd = hb_IllFileCache.checkRange(hourStart, hourEnd, self.hourCount)
+        return [self.getHourValues(hour, sensorStart, sensorEnd) for hour in xrange(hourStart, hourEnd)]
+
+class hb_DynamicShadingResolver(object):
+    """
+    Build the illuminance matrix with the blinds in effect for all the spaces.
+    
+    Args:
+        illFileSets: Dictionary of .ill files as {shadingGroup: [[files of state 1], [files of state 2], ...]}.
+            Shading group 0 is the results with no dynamic shading. This is the same
+            structure as the branches of honeybee_ReadAnnualResultsAux.sortIllFiles.
+        annualProfiles: List of Daysim annual profiles (*_intgain.csv) for each space.
+        numOfPtsInEachSpace: Number of test points in each space.
+    """
+    
+    def __init__(self, illFileSets, annualProfiles, numOfPtsInEachSpace):
+        self.numOfPtsInEachSpace = list(numOfPtsInEachSpace)
+        
+        # index of the first sensor of each space
+        self.sensorOffsets = [0]
+        for numOfPts in self.numOfPtsInEachSpace:
+            self.sensorOffsets.append(self.sensorOffsets[-1] + numOfPts)
+        
+        self.illResults = {}
+        for shadingGroup, stateFiles in illFileSets.items():
+            self.illResults[shadingGroup] = [hb_AnnualIllResults(files) for files in stateFiles]
+            for illResults in self.illResults[shadingGroup]:
+                if illResults.sensorCount != self.sensorOffsets[-1]:
+                    self.close()
+                    raise ValueError("Number of points in .ill files: %d doesn't match the number of test points: %d" % \
+                                     (illResults.sensorCount, self.sensorOffsets[-1]))
+        
+        self.shadingProfiles = [self.readShadingProfiles(filePath) for filePath in annualProfiles]
+        if not self.shadingProfiles:
+            self.shadingProfiles = [[] for numOfPts in self.numOfPtsInEachSpace]
+        
+        self.hourCount = self.illResults[0][0].hourCount
+        self.groupInEffect = []
+        self.stateInEffect = []
+    
+    @staticmethod
+    def readShadingProfiles(filePath):
+        """Read blind profiles of each shading group from a Daysim annual profile."""
+        headings = []
+        resultDict = {}
+        with open(filePath, "r") as inf:
+            for lineCount, line in enumerate(inf):
+                if lineCount == 3:
+                    headings = line.strip().split(",")[3:]
+                    resultDict = dict((heading, array.array("f")) for heading in range(len(headings)))
+                elif lineCount > 3:
+                    results = line.strip().split(",")[3:]
+                    for resCount, result in enumerate(results):
+                        resultDict[resCount].append(float(result))
+        
+        return [resultDict[headingCount] for headingCount, heading in enumerate(headings) \
+                if heading.strip().startswith("blind")]
+    
+    def getSpaceState(self, spaceCount, hour):
+        """
+        Return shading group and state number of a space for an hour of the year (0 based).
+        State numbers start from 1 and 0 means the first state of the group.
+        """
+        groupInEffect = 0
+        stateInEffect = 0
+        shadingProfiles = self.shadingProfiles[spaceCount]
+        for shadingGroup in (1, 2):
+            if len(self.illResults.get(shadingGroup, [])) == 0 or \
+               len(shadingProfiles) < shadingGroup:
+                continue
+            blindProfile = shadingProfiles[shadingGroup - 1][hour]
+            if blindProfile > 0:
+                numberOfStates = len(self.illResults[shadingGroup])
+                stateInEffect = int(round(numberOfStates * blindProfile))
+                groupInEffect = shadingGroup
+        
+        return groupInEffect, stateInEffect
+    
+    def iterateHours(self):
+        """Yield the hourly illuminance values of all the sensors with blinds in effect."""
+        sensorOffsets = self.sensorOffsets
+        spaceCount = len(self.numOfPtsInEachSpace)
+        self.groupInEffect = [array.array("b", [0]) * self.hourCount for s in range(spaceCount)]
+        self.stateInEffect = [array.array("h", [0]) * self.hourCount for s in range(spaceCount)]
+        
+        for hour in xrange(self.hourCount):
+            # read each group/state for the hour only once and only if it is used
+            hourValues = {}
+            values = array.array("f", [0]) * sensorOffsets[-1]
+            for space in xrange(spaceCount):
+                group, stateNumber = self.getSpaceState(space, hour)
+                self.groupInEffect[space][hour] = group
+                self.stateInEffect[space][hour] = stateNumber
+                
+                groupState = group, max(stateNumber - 1, 0)
+                if groupState not in hourValues:
+                    hourValues[groupState] = self.illResults[group][groupState[1]].getHourValues(hour)
+                
+                start, end = sensorOffsets[space], sensorOffsets[space + 1]
+                values[start:end] = hourValues[groupState][start:end]
+            yield values
+    
+    def resolve(self, cacheFile):
+        """Write the illuminance values with blinds in effect to cacheFile and return it as hb_IllFileCache."""
+        return hb_IllFileCache.writeMatrix(cacheFile, self.iterateHours(), self.sensorOffsets[-1])
+    
+    def close(self):
+        for stateResults in self.illResults.values():
+            for illResults in stateResults: illResults.close()
+
+class hb_AnnualDaylightMetrics(object):
+    """
+    Calculate annual daylight metrics from an hourly illuminance matrix.
+    
+    The values of every occupied hour are binned once against all the thresholds
+    and UDI bin edges. DA, cDA and UDI for any of the thresholds are derived from
+    the bins so a sweep of thresholds only needs a single pass over the results.
+    
+    Args:
+        thresholds: List of illuminance thresholds for DA, cDA and sDA in lux.
+        UDIBins: Edges of the useful daylight illuminance bins in lux. Default [100, 2000]
+            results in three bins: < 100, 100-2000 and >= 2000.
+        sDAFraction: Fraction of occupied hours that a sensor should meet the threshold
+            to count toward sDA. Default is .5.
+        ASEThreshold: Illuminance threshold for annual sunlight exposure. ASE is only
+            meaningful if the illuminance values are from direct sunlight. Default is 1000 lux.
+        ASEHours: Number of hours that a sensor should exceed ASEThreshold to count
+            toward ASE. Default is 250 hours.
+    """
+    
+    def __init__(self, thresholds = [300], UDIBins = [100, 2000], sDAFraction = .5, \
+                 ASEThreshold = 1000, ASEHours = 250):
+        self.thresholds = [float(t) for t in thresholds]
+        self.UDIBins = sorted(float(b) for b in UDIBins)
+        self.sDAFraction = sDAFraction
+        self.ASEThreshold = float(ASEThreshold)
+        self.ASEHours = ASEHours
+        
+        # all the values that the illuminance should be compared with
+        self.edges = sorted(set(self.thresholds + self.UDIBins + [self.ASEThreshold]))
+        self.binCount = len(self.edges) + 1
+        self.sensorCount = 0
+        self.occupiedHours = 0
+        self.counts = array.array("l")
+        self.sums = array.array("d")
+    
+    @staticmethod
+    def readOccupancyFile(occFile, hourCount = 8760):
+        """Read a Daysim occupancy file as a list of 0 and 1 values for each hour."""
+        occupancy = []
+        with open(occFile, "r") as inf:
+            for line in inf:
+                if line.startswith("#") or not line.strip(): continue
+                try: occ = float(line.strip().split(",")[-1])
+                except ValueError: continue
+                occupancy.append(1 if occ > 0 else 0)
+        
+        if len(occupancy) < hourCount:
+            occupancy.extend([0] * (hourCount - len(occupancy)))
+        return occupancy[:hourCount]
+    
+    def calculate(self, illResults, occupancy = None, sensorStart = 0, sensorEnd = None):
+        """
+        Bin the values of sensors [sensorStart:sensorEnd] for all occupied hours.
+        
+        Args:
+            illResults: An object with hourCount, sensorCount and getHourValues(hour, start, end)
+                such as honeybee_AnnualIllResults.
+            occupancy: List of 0 and 1 values for each hour. Default is all hours occupied.
+        """
+        if sensorEnd is None or sensorEnd > illResults.sensorCount:
+            sensorEnd = illResults.sensorCount
+        self.sensorCount = max(sensorEnd - sensorStart, 0)
+        self.occupiedHours = 0
+        
+        binCount = self.binCount
+        edges = self.edges
+        counts = array.array("l", [0]) * (self.sensorCount * binCount)
+        sums = array.array("d", [0]) * (self.sensorCount * binCount)
+        bisectRight = bisect.bisect_right
+        
+        for hour in xrange(illResults.hourCount):
+            if occupancy is not None and (hour >= len(occupancy) or not occupancy[hour]):
+                continue
+            self.occupiedHours += 1
+            values = illResults.getHourValues(hour, sensorStart, sensorEnd)
+            index = 0
+            for value in values:
+                binIndex = index + bisectRight(edges, value)
+                counts[binIndex] += 1
+                sums[binIndex] += value
+                index += binCount
+        
+        self.counts = counts
+        self.sums = sums
+        return self
+    
+    def getBinIndex(self, threshold):
+        """Index of the first bin with values at or above the threshold."""
+        threshold = float(threshold)
+        if threshold not in self.edges:
+            raise ValueError("%s is not one of the thresholds of this analysis: %s" % (threshold, self.edges))
+        return bisect.bisect_right(self.edges, threshold)
+    
+    def countAbove(self, threshold, sensor):
+        """Number of occupied hours that the sensor is at or above the threshold."""
+        first = sensor * self.binCount + self.getBinIndex(threshold)
+        return sum(self.counts[first:(sensor + 1) * self.binCount])
+    
+    def percentage(self, hours):
+        if self.occupiedHours == 0: return 0
+        return 100.0 * hours / self.occupiedHours
+    
+    def getDA(self, threshold = None):
+        """Daylight autonomy of each sensor as percentage of the occupied hours."""
+        if threshold is None: threshold = self.thresholds[0]
+        return [self.percentage(self.countAbove(threshold, sensor)) for sensor in xrange(self.sensorCount)]
+    
+    def getCDA(self, threshold = None):
+        """Continuous daylight autonomy of each sensor."""
+        if threshold is None: threshold = self.thresholds[0]
+        threshold = float(threshold)
+        binCount = self.binCount
+        firstAbove = self.getBinIndex(threshold)
+        CDA = []
+        for sensor in xrange(self.sensorCount):
+            start = sensor * binCount
+            # hours above the threshold count completely and the ones below partially
+            hours = sum(self.counts[start + firstAbove:start + binCount]) + \
+                    sum(self.sums[start:start + firstAbove]) / threshold
+            CDA.append(self.percentage(hours))
+        return CDA
+    
+    def getUDI(self):
+        """Useful daylight illuminance of each sensor for each bin in UDIBins."""
+        binCount = self.binCount
+        UDIEdges = [self.getBinIndex(b) for b in self.UDIBins]
+        UDIEdges = [0] + UDIEdges + [binCount]
+        UDI = [[] for b in range(len(UDIEdges) - 1)]
+        for sensor in xrange(self.sensorCount):
+            start = sensor * binCount
+            for UDICount in range(len(UDIEdges) - 1):
+                hours = sum(self.counts[start + UDIEdges[UDICount]:start + UDIEdges[UDICount + 1]])
+                UDI[UDICount].append(self.percentage(hours))
+        return UDI
+    
+    def getsDA(self, threshold = None):
+        """Percentage of the sensors that meet the threshold for sDAFraction of the occupied hours."""
+        if self.sensorCount == 0: return 0
+        DA = self.getDA(threshold)
+        return 100.0 * len([d for d in DA if d >= self.sDAFraction * 100]) / self.sensorCount
+    
+    def getASE(self):
+        """Percentage of the sensors that receive more than ASEThreshold for more than ASEHours."""
+        if self.sensorCount == 0: return 0
+        exposed = [sensor for sensor in xrange(self.sensorCount) \
+                   if self.countAbove(self.ASEThreshold, sensor) > self.ASEHours]
+        return 100.0 * len(exposed) / self.sensorCount
+
+class hb_MicroclimateMatrix(object):
+    """
+    Chunked binary file for the result matrices of the Microclimate Map Analysis.
+    
+    The first item of a microclimate matrix is the header string and the rest are
+    lists of point values for each hour. Values are saved as float64 in chunks of
+    chunkSize hours so they are read back exactly as they were calculated. Each
+    chunk is compressed separately so a range of hours can be read without
+    decoding the whole file. The index of the chunks is written at
+    the end of the file.
+    
+    An opened matrix behaves like the original list. Item 0 is the header and the
+    other items are hb_MicroclimateMatrixRow objects which only read their chunk
+    once the values are requested.
+    """
+    
+    magic = "HBMM"
+    version = 2
+    headerFormat = "<4sIIIIIIq"
+    headerSize = 64
+    indexFormat = "<qI"
+    extension = ".hbmtx"
+    maxCachedChunks = 4
+    
+    def __init__(self, filePath):
+        self.filePath = filePath
+        self.chunks = {}
+        self.cachedChunks = []
+        self.sourceStamp = self.getSourceStamp()
+        
+        with open(filePath, "rb") as inf:
+            try:
+                magic, version, self.pointCount, self.hourCount, self.chunkSize, \
+                    self.compressed, textLength, indexOffset = \
+                    struct.unpack(self.headerFormat, inf.read(struct.calcsize(self.headerFormat)))
+            except struct.error:
+                magic, version = None, None
+            if magic != self.magic:
+                raise IOError("%s is not a valid microclimate matrix." % filePath)
+            if version != self.version:
+                raise IOError("%s is written by a different version of Honeybee. Re-run the analysis to write the file again." % filePath)
+            
+            inf.seek(self.headerSize)
+            self.header = inf.read(textLength).decode("utf-8")
+            
+            if self.chunkSize == 0: chunkCount = 0
+            else: chunkCount = (self.hourCount + self.chunkSize - 1) // self.chunkSize
+            indexSize = struct.calcsize(self.indexFormat)
+            inf.seek(indexOffset)
+            indexData = inf.read(chunkCount * indexSize)
+        
+        if len(indexData) != chunkCount * indexSize:
+            raise IOError("%s is incomplete. Re-run the analysis to write the file again." % filePath)
+        if self.compressed and zlib is None:
+            raise IOError("zlib is not available to read the compressed matrix: %s" % filePath)
+        
+        self.chunkIndex = [struct.unpack_from(self.indexFormat, indexData, chunk * indexSize) \
+                           for chunk in xrange(chunkCount)]
+    
+    def getSourceStamp(self):
+        stat = os.stat(self.filePath)
+        return float(stat.st_mtime), int(stat.st_size)
+    
+    @classmethod
+    def isMatrixFile(cls, filePath):
+        """Check if a file is a binary microclimate matrix."""
+        try:
+            with open(filePath, "rb") as inf:
+                return inf.read(len(cls.magic)) == cls.magic
+        except IOError:
+            return False
+    
+    @classmethod
+    def writeMatrix(cls, filePath, matrix, chunkSize = 168, compress = True):
+        """
+        Write a microclimate matrix to a binary file.
+        
+        Args:
+            filePath: Path to the output file.
+            matrix: A list that starts with the header string followed by the point values of each hour.
+            chunkSize: Number of hours in each chunk. Default is 168 (a week).
+            compress: Set to True to compress the chunks with zlib. Chunks won't be
+                compressed if zlib is not available.
+        Returns:
+            filePath.
+        """
+        hourCount = len(matrix) - 1
+        if hourCount > 0: pointCount = len(matrix[1])
+        else: pointCount = 0
+        
+        writer = hb_MicroclimateMatrixWriter(filePath, matrix[0], pointCount, chunkSize, compress)
+        try:
+            for hourStart in xrange(1, hourCount + 1, chunkSize):
+                writer.addHours(matrix[hourStart:hourStart + chunkSize])
+            writer.close()
+        except:
+            # don't leave a half written matrix behind
+            writer.close()
+            if os.path.isfile(filePath):
+                try: os.remove(filePath)
+                except: pass
+            raise
+        
+        return filePath
+    
+    @staticmethod
+    def writeCSV(csvPath, matrix, formatValue = str):
+        """Write a microclimate matrix to a csv file which can be read by the Read Microclimate Matrix component."""
+        with open(csvPath, "wb") as outf:
+            for lineCount, line in enumerate(matrix):
+                if lineCount == 0: outf.write(line + "\n")
+                else: outf.write(",".join(map(formatValue, line)) + "\n")
+        return csvPath
+    
+    def toCSV(self, csvPath = None):
+        """Convert the binary matrix to a csv file. By default the csv file is written next to the binary file."""
+        if csvPath is None: csvPath = os.path.splitext(self.filePath)[0] + ".csv"
+        return self.writeCSV(csvPath, self)
+    
+    def readChunk(self, chunk):
+        """Return the values of a chunk as a flat array of hours x points."""
+        if chunk in self.chunks: return self.chunks[chunk]
+        
+        if self.getSourceStamp() != self.sourceStamp:
+            raise IOError("%s has changed since it was opened. Read the file again." % self.filePath)
+        
+        offset, size = self.chunkIndex[chunk]
+        with open(self.filePath, "rb") as inf:
+            inf.seek(offset)
+            data = inf.read(size)
+        if self.compressed: data = zlib.decompress(data)
+        values = array.array("d")
+        values.fromstring(data)
+        if sys.byteorder != "little": values.byteswap()
+        
+        # keep the last few chunks for reading consecutive hours
+        self.chunks[chunk] = values
+        self.cachedChunks.append(chunk)
+        if len(self.cachedChunks) > self.maxCachedChunks:
+            del self.chunks[self.cachedChunks.pop(0)]
+        return values
+    
+    def checkHour(self, hour):
+        if hour < 0 or hour >= self.hourCount:
+            raise IndexError("Hour %d is out of the range of the matrix." % hour)
+    
+    def getValue(self, hour, point):
+        """Return the value of a point (0 based) for an hour of the matrix (0 based)."""
+        values = self.readChunk(hour // self.chunkSize)
+        return values[(hour % self.chunkSize) * self.pointCount + point]
+    
+    def getHourValues(self, hour, pointStart = 0, pointEnd = None):
+        """Return values of points [pointStart:pointEnd] for an hour of the matrix (0 based)."""
+        self.checkHour(hour)
+        pointStart, pointEnd = hb_IllFileCache.checkRange(pointStart, pointEnd, self.pointCount)
+        values = self.readChunk(hour // self.chunkSize)
+        start = (hour % self.chunkSize) * self.pointCount
+        return values[start + pointStart:start + pointEnd]
+    
+    def getPointValues(self, point, hourStart = 0, hourEnd = None):
+        """Return values of a point (0 based) for hours [hourStart:hourEnd]."""
+        if point < 0 or point >= self.pointCount:
+            raise IndexError("Point %d is out of the range of the matrix." % point)
+        hourStart, hourEnd = hb_IllFileCache.checkRange(hourStart, hourEnd, self.hourCount)
+        values = array.array("d")
+        for hour in xrange(hourStart, hourEnd):
+            values.append(self.getValue(hour, point))
+        return values
+    
+    def getBlock(self, hourStart = 0, hourEnd = None, pointStart = 0, pointEnd = None):
+        """Return a list of hourly arrays for hours [hourStart:hourEnd] and points [pointStart:pointEnd]."""
+        hourStart, hourEnd = hb_IllFileCache.checkRange(hourStart, hourEnd, self.hourCount)
+        return [self.getHourValues(hour, pointStart, pointEnd) for hour in xrange(hourStart, hourEnd)]
+    
+    def __len__(self):
+        return self.hourCount + 1
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in xrange(*index.indices(len(self)))]
+        if index < 0: index += len(self)
+        if index == 0: return self.header
+        if index < 0 or index > self.hourCount:
+            raise IndexError("matrix index out of range")
+        return hb_MicroclimateMatrixRow(self, index - 1)
+    
+    def __iter__(self):
+        yield self.header
+        for hour in xrange(self.hourCount):
+            yield hb_MicroclimateMatrixRow(self, hour)
+    
+    def __repr__(self):
+        return "Microclimate Matrix: %s (%d hours x %d points)" % \
+            (self.header.split(";")[0], self.hourCount, self.pointCount)
+
+
+class hb_MicroclimateMatrixWriter(object):
+    """
+    Write a microclimate matrix to a binary file one chunk of hours at a time.
+    
+    The chunk index and the header are updated after each chunk so the file is
+    always a valid hb_MicroclimateMatrix of the hours that are written so far.
+    New chunks are written after the last index and the old index is left in
+    the file which only adds a few bytes for each chunk.
+    
+    Args:
+        filePath: Path to the output file.
+        header: Header string of the matrix.
+        pointCount: Number of points in each hour.
+        chunkSize: Number of hours in each chunk. All the chunks except the last one must be full.
+        compress: Set to True to compress the chunks with zlib if it is available.
+        resume: Set to True to add to the hours of an existing file. The file will be
+            started from the beginning if its header, number of points or chunk size
+            doesn't match.
+    """
+    
+    def __init__(self, filePath, header, pointCount, chunkSize = 168, compress = True, resume = False):
+        self.filePath = filePath
+        if isinstance(header, unicode): header = header.encode("utf-8")
+        self.header = header
+        self.pointCount = pointCount
+        self.chunkSize = chunkSize
+        self.compress = bool(compress) and zlib is not None
+        self.hourCount = 0
+        self.chunkIndex = []
+        self.outf = None
+        
+        if resume and self.canResume():
+            self.outf = open(filePath, "r+b")
+            self.outf.seek(0, 2)
+        else:
+            self.outf = open(filePath, "wb")
+            self.outf.write("\0" * hb_MicroclimateMatrix.headerSize)
+            self.outf.write(self.header)
+            self.writeIndex()
+    
+    def canResume(self):
+        if not os.path.isfile(self.filePath): return False
+        try:
+            matrix = hb_MicroclimateMatrix(self.filePath)
+        except Exception:
+            return False
+        if matrix.header.encode("utf-8") != self.header or matrix.pointCount != self.pointCount or \
+           matrix.chunkSize != self.chunkSize or bool(matrix.compressed) != self.compress:
+            return False
+        self.hourCount = matrix.hourCount
+        self.chunkIndex = list(matrix.chunkIndex)
+        return True
+    
+    def writeIndex(self):
+        """Write the chunk index at the end of the file and point the header to it."""
+        indexOffset = self.outf.tell()
+        for offset, size in self.chunkIndex:
+            self.outf.write(struct.pack(hb_MicroclimateMatrix.indexFormat, offset, size))
+        self.outf.flush()
+        
+        self.outf.seek(0)
+        self.outf.write(struct.pack(hb_MicroclimateMatrix.headerFormat, hb_MicroclimateMatrix.magic, \
+            hb_MicroclimateMatrix.version, self.pointCount, self.hourCount, self.chunkSize, \
+            int(self.compress), len(self.header), indexOffset))
+        self.outf.flush()
+        self.outf.seek(0, 2)
+    
+    def addHours(self, rows):
+        """Add a chunk of hours to the file. rows is a list of point values for each hour."""
+        if len(rows) == 0: return
+        if len(rows) > self.chunkSize:
+            raise ValueError("Number of hours in a chunk can't be more than %d." % self.chunkSize)
+        if self.hourCount % self.chunkSize != 0:
+            raise ValueError("Hours can't be added after a chunk which is not full.")
+        
+        values = array.array("d")
+        for rowCount, row in enumerate(rows):
+            if len(row) != self.pointCount:
+                raise ValueError("Hour %d of the matrix has %d values. Expected %d." % \
+                    (self.hourCount + rowCount + 1, len(row), self.pointCount))
+            values.extend(row)
+        if sys.byteorder != "little": values.byteswap()
+        data = values.tostring()
+        if self.compress: data = zlib.compress(data, 6)
+        
+        self.chunkIndex.append((self.outf.tell(), len(data)))
+        self.outf.write(data)
+        self.hourCount += len(rows)
+        self.writeIndex()
+    
+    def truncate(self, hourCount):
+        """Remove the hours after hourCount. hourCount should be at the end of a chunk."""
+        if hourCount >= self.hourCount: return
+        if hourCount % self.chunkSize != 0:
+            raise ValueError("Matrix can only be truncated at the end of a chunk.")
+        self.chunkIndex = self.chunkIndex[:hourCount // self.chunkSize]
+        self.hourCount = hourCount
+        self.writeIndex()
+    
+    def close(self):
+        if self.outf is not None:
+            self.outf.close()
+            self.outf = None
+
+
+class hb_MicroclimateMatrixRow(object):
+    """Point values of an hour of hb_MicroclimateMatrix. Values are read once they are requested."""
+    
+    __slots__ = ("matrix", "hour")
+    
+    def __init__(self, matrix, hour):
+        self.matrix = matrix
+        self.hour = hour
+    
+    def __len__(self):
+        return self.matrix.pointCount
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.tolist()[index]
+        if index < 0: index += self.matrix.pointCount
+        if index < 0 or index >= self.matrix.pointCount:
+            raise IndexError("row index out of range")
+        return self.matrix.getValue(self.hour, index)
+    
+    def __iter__(self):
+        return iter(self.matrix.getHourValues(self.hour))
+    
+    def tolist(self):
+        return self.matrix.getHourValues(self.hour).tolist()
+    
+    def __repr__(self):
+        return "Microclimate Matrix Hour %d" % (self.hour + 1)
+
+
+class hb_EPCSVReader(object):
+    """Read EnergyPlus result csv files column by column.
+        
+        The header is parsed once into an index of
+        (object, variable, unit, frequency) -> column. The parsed header is
+        cached for each file and is only re-parsed when the file changes.
+        
+        Args:
+            csvFile: Path to an EnergyPlus result csv file (e.g. eplusout.csv).
+    """
+    
+    # csvFile: ((mtime, size), header, columns, index)
+    headerCache = {}
+    
+    def __init__(self, csvFile):
+        self.csvFile = csvFile
+        self.header, self.columns, self.index = self.readHeader(csvFile)
+    
+    @classmethod
+    def readHeader(cls, csvFile):
+        """Return the header, the parsed columns and the column index of a csv file."""
+        stamp = (os.path.getmtime(csvFile), os.path.getsize(csvFile))
+        cached = cls.headerCache.get(csvFile)
+        if cached and cached[0] == stamp:
+            return cached[1:]
+        
+        with open(csvFile, "r") as inf:
+            header = inf.readline().rstrip("\r\n").split(",")
+        
+        columns = [cls.parseColumnName(column) for column in header]
+        index = {}
+        for columnCount, column in enumerate(columns):
+            if column not in index: index[column] = columnCount
+        
+        cls.headerCache[csvFile] = (stamp, header, columns, index)
+        return header, columns, index
+    
+    @staticmethod
+    def parseColumnName(column):
+        """Split an EnergyPlus column name into (object, variable, unit, frequency).
+            
+            e.g. 'ZONE_1:Zone Mean Air Temperature [C](Hourly)' ->
+                ('ZONE_1', 'Zone Mean Air Temperature', 'C', 'Hourly')
+        """
+        column = column.strip()
+        frequency = ""
+        if column.endswith(")") and "(" in column:
+            column, frequency = column[:-1].rsplit("(", 1)
+            column = column.strip()
+        
+        unit = ""
+        if column.endswith("]") and "[" in column:
+            column, unit = column[:-1].rsplit("[", 1)
+            column = column.strip()
+        
+        if ":" in column:
+            obj, variable = column.rsplit(":", 1)
+        else:
+            obj, variable = "", column
+        
+        return obj.strip(), variable.strip(), unit, frequency
+    
+    @staticmethod
+    def getReader(resultFile):
+        """Return an eso reader for .eso files and a csv reader for the other files."""
+        if resultFile.lower().endswith(".eso"):
+            return hb_EPESOReader(resultFile)
+        return hb_EPCSVReader(resultFile)
+    
+    @staticmethod
+    def readZoneFloorAreas(eioFile):
+        """Read the name and the floor area of the zones from the Zone Information table of an eio file.
+            
+            Returns:
+                zoneNames: Zone names as they are written in the file.
+                floorAreas: Floor area of each zone in m2.
+        """
+        zoneNames = []
+        floorAreas = []
+        areaIndex = None
+        with open(eioFile, "r") as inf:
+            for line in inf:
+                values = line.rstrip("\r\n").split(",")
+                recordName = values[0].strip()
+                if recordName == "! <Zone Information>":
+                    areaIndex = [v.strip() for v in values].index("Floor Area {m2}")
+                elif recordName == "Zone Information" and areaIndex is not None:
+                    zoneNames.append(values[1])
+                    floorAreas.append(float(values[areaIndex]))
+        return zoneNames, floorAreas
+    
+    def getColumn(self, obj, variable, unit, frequency):
+        """Return the index of a column or -1 if it's not in the file."""
+        return self.index.get((obj, variable, unit, frequency), -1)
+    
+    def findColumns(self, variable = None, obj = None, unit = None, frequency = None):
+        """Return the index of all the columns that match the input values.
+            
+            Inputs that are None are not checked. Object names are not case sensitive.
+        """
+        if obj is not None: obj = obj.upper()
+        matched = []
+        for columnCount, (o, v, u, f) in enumerate(self.columns):
+            if variable is not None and v != variable: continue
+            if obj is not None and o.upper() != obj: continue
+            if unit is not None and u != unit: continue
+            if frequency is not None and f != frequency: continue
+            matched.append(columnCount)
+        return matched
+    
+    def iterRows(self, columns = None):
+        """Stream the rows of the file after the header.
             
-            # create an empty dictionary for each state
-            if stateName not in illFilesDict[groupName].keys():
-                illFilesDict[groupName][stateName] = []
+            Args:
+                columns: Optional list of column indices. If None all the
+                    values of each row will be returned.
             
-            # append the file to the list
-            illFilesDict[groupName][stateName].append(fullPath)
+            Yields:
+                A list of the values of each row as strings.
+        """
+        with open(self.csvFile, "r") as inf:
+            inf.readline()
+            for line in inf:
+                values = line.rstrip("\r\n").split(",")
+                if columns is None:
+                    yield values
+                else:
+                    yield [values[columnCount] for columnCount in columns]
+    
+    def readColumns(self, columns, typecode = "d"):
+        """Read the values of the columns in one pass over the file.
+            
+            Returns:
+                A list of arrays. One array for each column in columns.
+        """
+        data = [array.array(typecode) for columnCount in columns]
+        for values in self.iterRows(columns):
+            for columnData, value in itertools.izip(data, values):
+                columnData.append(float(value))
+        return data
+
+class hb_EPESOReader(hb_EPCSVReader):
+    """Read EnergyPlus results directly from an eso file.
         
-        # sort the keys
-        illFiles = DataTree[System.Object]()
-        shadingGroupCount = 0
+        The reader has the same interface as hb_EPCSVReader and the header is
+        formatted the same way as the csv file that ReadVarsESO writes, so the
+        results can be read without converting the eso file to csv. Values of
+        less frequent outputs (e.g. Daily) are written to the last row of their
+        period and are empty in the other rows.
         
-        for key, fileListDict in illFilesDict.items():
-            stateCount = 0
-            shadingGroupCount+=1
-            for state, fileList in fileListDict.items():
-                if key== -1:
-                    p = GH_Path(0)
-                    shadingGroupCount-=1
+        Only the rows of the weather file run period are read. EnergyPlus runs
+        the sizing periods (design days) before the run period so it is the last
+        environment of the file.
+        
+        Args:
+            esoFile: Path to an EnergyPlus eso file (e.g. eplusout.eso).
+    """
+    
+    # esoFile: ((mtime, size), header, columns, index, variableIds, rowRecord, dataStart)
+    headerCache = {}
+    
+    # id of the time stamp record of each reporting frequency
+    timeRecords = {"Each Call": "2", "TimeStep": "2", "Hourly": "2", "Daily": "3", \
+                   "Monthly": "4", "RunPeriod": "5", "Annual": "6"}
+    
+    # time stamp records from the most to the least frequent
+    rowRecordOrder = ("2", "3", "4", "5", "6")
+    
+    def __init__(self, esoFile):
+        self.csvFile = esoFile
+        self.header, self.columns, self.index, self.variableIds, self.rowRecord, \
+            self.dataStart = self.readHeader(esoFile)
+    
+    @classmethod
+    def readHeader(cls, esoFile):
+        """Read the data dictionary of the eso file."""
+        stamp = (os.path.getmtime(esoFile), os.path.getsize(esoFile))
+        cached = cls.headerCache.get(esoFile)
+        if cached and cached[0] == stamp:
+            return cached[1:]
+        
+        header = ["Date/Time"]
+        variableIds = {}
+        recordIds = set()
+        dataStart = None
+        with open(esoFile, "rb") as inf:
+            # program version
+            inf.readline()
+            for line in iter(inf.readline, ""):
+                if line.startswith("End of Data Dictionary"): break
+                if "!" not in line: continue
+                
+                # e.g. 7,1,ZONE_1,Zone Mean Air Temperature [C] !Hourly
+                variable, frequency = line.split("!", 1)
+                frequency = frequency.strip().split(" [")[0]
+                values = variable.strip().split(",", 2)
+                if values[0] in cls.timeRecords.values() or values[0] == "1" or len(values) < 3:
+                    continue
+                
+                if "," in values[2]:
+                    # key value and variable name
+                    columnName = ":".join(values[2].split(",", 1))
                 else:
-                    p = GH_Path(shadingGroupCount, stateCount)
-                    stateCount+=1
-                    
-                try:
-                    if fileName.endswith("_down.ill") or fileName.endswith("_up.ill"):
-                        # conceptual blind
-                        if fileList[0].endswith("_down.ill"):
-                            p = GH_Path(1,0)
-                        else:
-                            p = GH_Path(0)
-                        
-                        illFiles.AddRange(sorted(fileList, key=lambda fileName: int(fileName.split(".")[-2].split("_")[-2])), p)
-                    else:
-                        illFiles.AddRange(sorted(fileList, key=lambda fileName: int(fileName.split(".")[-2].split("_")[-1])), p)
-                        
-                except Exception, e:
-                    # failed to sort!
-                    illFiles.AddRange(fileList, p)
+                    # meters don't have a key value
+                    columnName = values[2]
+                
+                variableIds[values[0]] = len(header)
+                header.append(columnName.strip() + "(" + frequency + ")")
+                recordIds.add(cls.timeRecords.get(frequency, "2"))
+            
+            # find where the last environment starts
+            while True:
+                position = inf.tell()
+                line = inf.readline()
+                if not line or line.startswith("End of Data"): break
+                if line.startswith("1,"): dataStart = position
+        
+        # rows follow the time stamps of the most frequent output
+        rowRecord = "2"
+        for recordId in cls.rowRecordOrder:
+            if recordId in recordIds:
+                rowRecord = recordId
+                break
         
-        return illFiles
+        columns = [cls.parseColumnName(column) for column in header]
+        index = {}
+        for columnCount, column in enumerate(columns):
+            if column not in index: index[column] = columnCount
+        
+        cls.headerCache[esoFile] = (stamp, header, columns, index, variableIds, rowRecord, dataStart)
+        return header, columns, index, variableIds, rowRecord, dataStart
+    
+    @staticmethod
+    def getTimeStamp(values):
+        """Format a time stamp record the same way as ReadVarsESO."""
+        try:
+            if values[0] == "2":
+                # day of simulation, month, day, dst, hour, start minute, end minute
+                minutes = (int(values[5]) - 1) * 60 + int(round(float(values[7])))
+                return " %02d/%02d  %02d:%02d:00"%(int(values[2]), int(values[3]), minutes // 60, minutes % 60)
+            elif values[0] == "3":
+                return " %02d/%02d"%(int(values[2]), int(values[3]))
+        except (ValueError, IndexError):
+            pass
+        return ",".join(values[1:])
+    
+    def iterRows(self, columns = None):
+        """Stream the rows of the file. One row is written for each time stamp of
+            the most frequent output.
+            
+            Args:
+                columns: Optional list of column indices. If None all the
+                    values of each row will be returned.
+            
+            Yields:
+                A list of the values of each row as strings.
+        """
+        rowSize = len(self.header)
+        variableIds = self.variableIds
+        row = None
+        if self.dataStart is None: return
+        with open(self.csvFile, "rb") as inf:
+            inf.seek(self.dataStart)
+            
+            for line in inf:
+                if line.startswith("End of Data"): break
+                values = line.rstrip("\r\n").split(",")
+                recordId = values[0]
+                if recordId in variableIds:
+                    if row is not None: row[variableIds[recordId]] = values[1]
+                elif recordId == self.rowRecord:
+                    if row is not None:
+                        if columns is None: yield row
+                        else: yield [row[columnCount] for columnCount in columns]
+                    row = [""] * rowSize
+                    row[0] = self.getTimeStamp(values)
+        
+        if row is not None:
+            if columns is None: yield row
+            else: yield [row[columnCount] for columnCount in columns]
 
 class hb_EnergySimulatioParameters(object):
     
@@ -3920,9 +5709,9 @@ class EPMaterialAux(object):
         """
         Check if material or construction exist
         """
-        if name in sc.sticky ["honeybee_constructionLib"].keys(): return True
-        if name in sc.sticky ["honeybee_materialLib"].keys(): return True
-        if name in sc.sticky ["honeybee_windowMaterialLib"].keys(): return True
+        if name in sc.sticky ["honeybee_constructionLib"]: return True
+        if name in sc.sticky ["honeybee_materialLib"]: return True
+        if name in sc.sticky ["honeybee_windowMaterialLib"]: return True
         
         return False
     
@@ -3931,15 +5720,15 @@ class EPMaterialAux(object):
         This function should work for materials, and counstructions
         """
         objectData = None
-        if objectName in sc.sticky ["honeybee_windowMaterialLib"].keys():
+        if objectName in sc.sticky ["honeybee_windowMaterialLib"]:
             objectData = sc.sticky ["honeybee_windowMaterialLib"][objectName]
-        elif objectName in sc.sticky ["honeybee_materialLib"].keys():
+        elif objectName in sc.sticky ["honeybee_materialLib"]:
             objectData = sc.sticky ["honeybee_materialLib"][objectName]
-        elif objectName in sc.sticky ["honeybee_constructionLib"].keys():
+        elif objectName in sc.sticky ["honeybee_constructionLib"]:
             objectData = sc.sticky ["honeybee_constructionLib"][objectName]
-        elif objectData in sc.sticky["honeybee_WindowPropLib"].keys():
+        elif objectName in sc.sticky["honeybee_WindowPropLib"]:
             objectData = sc.sticky["honeybee_WindowPropLib"][objectName]
-        elif objectName in sc.sticky["honeybee_SpectralDataLib"].keys():
+        elif objectName in sc.sticky["honeybee_SpectralDataLib"]:
             objectData = sc.sticky["honeybee_SpectralDataLib"][objectName]
         
         if objectData!=None:
@@ -4107,23 +5896,23 @@ class EPScheduleAux(object):
 class EPObjectsAux(object):
     
     def isEPMaterial(self, matName):
-        return matName.upper() in sc.sticky["honeybee_materialLib"].keys() or \
-               matName.upper() in sc.sticky["honeybee_windowMaterialLib"].keys()
+        return matName.upper() in sc.sticky["honeybee_materialLib"] or \
+               matName.upper() in sc.sticky["honeybee_windowMaterialLib"]
     
     def isEPConstruction(self, matName):
-        return matName.upper() in sc.sticky["honeybee_constructionLib"].keys()
+        return matName.upper() in sc.sticky["honeybee_constructionLib"]
     
     def isSchedule(self, scheduleName):
-        return scheduleName.upper() in sc.sticky["honeybee_ScheduleLib"].keys()
+        return scheduleName.upper() in sc.sticky["honeybee_ScheduleLib"]
     
     def isScheduleTypeLimits(self, scheduleName):
-        return scheduleName.upper() in sc.sticky["honeybee_ScheduleTypeLimitsLib"].keys()
+        return scheduleName.upper() in sc.sticky["honeybee_ScheduleTypeLimitsLib"]
     
     def isWindowProperty(self, winPropName):
-        return winPropName.upper() in sc.sticky["honeybee_WindowPropLib"].keys()
+        return winPropName.upper() in sc.sticky["honeybee_WindowPropLib"]
     
     def isSpectralData(self, spectName):
-        return spectName.upper() in sc.sticky["honeybee_SpectralDataLib"].keys()
+        return spectName.upper() in sc.sticky["honeybee_SpectralDataLib"]
     
     def customizeEPObject(self, EPObjectName, indexes, inValues):
         hb_EPScheduleAUX = EPScheduleAux()
@@ -4253,19 +6042,19 @@ class EPObjectsAux(object):
         
         objectName = objectName.upper()
         
-        if objectName in sc.sticky ["honeybee_windowMaterialLib"].keys():
+        if objectName in sc.sticky ["honeybee_windowMaterialLib"]:
             objectData = sc.sticky ["honeybee_windowMaterialLib"][objectName]
-        elif objectName in sc.sticky ["honeybee_materialLib"].keys():
+        elif objectName in sc.sticky ["honeybee_materialLib"]:
             objectData = sc.sticky ["honeybee_materialLib"][objectName]
-        elif objectName in sc.sticky ["honeybee_constructionLib"].keys():
+        elif objectName in sc.sticky ["honeybee_constructionLib"]:
             objectData = sc.sticky ["honeybee_constructionLib"][objectName]
-        elif objectName in sc.sticky["honeybee_ScheduleLib"].keys():
+        elif objectName in sc.sticky["honeybee_ScheduleLib"]:
             objectData = sc.sticky ["honeybee_ScheduleLib"][objectName]
-        elif objectName in sc.sticky["honeybee_ScheduleTypeLimitsLib"].keys():
+        elif objectName in sc.sticky["honeybee_ScheduleTypeLimitsLib"]:
             objectData = sc.sticky ["honeybee_ScheduleTypeLimitsLib"][objectName]
-        elif objectName in sc.sticky["honeybee_WindowPropLib"].keys():
+        elif objectName in sc.sticky["honeybee_WindowPropLib"]:
             objectData = sc.sticky["honeybee_WindowPropLib"][objectName]
-        elif objectName in sc.sticky["honeybee_SpectralDataLib"].keys():
+        elif objectName in sc.sticky["honeybee_SpectralDataLib"]:
             objectData = sc.sticky["honeybee_SpectralDataLib"][objectName]
         
         return objectData
@@ -4342,6 +6131,12 @@ class EPObjectsAux(object):
 
 class ReadEPSchedules(object):
     
+    # annual schedules that are already compiled. they are shared between all
+    # the components that read schedules and are keyed by schedule name,
+    # start day of the week, holidays and timestep.
+    compiledSchedules = {}
+    weekDays = ('sunday', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday')
+    
     def __init__(self, schName, startDayOfTheWeek):
         self.hb_EPScheduleAUX = sc.sticky["honeybee_EPScheduleAUX"]()
         self.hb_EPObjectsAUX = sc.sticky["honeybee_EPObjectsAUX"]()
@@ -4382,18 +6177,7 @@ class ReadEPSchedules(object):
         lowerLimit, upperLimit, numericType, unitType = \
                 self.getScheduleTypeLimitsData(typeLimitName)
                 
-        numberOfDaySch = int((len(values) - 3) /2)
-        
-        hourlyValues = range(24)
-        startHour = 0
-        for i in range(numberOfDaySch):
-            value = float(values[2 * i + 4])
-            untilTime = map(int, values[2 * i + 3].split(":"))
-            endHour = int(untilTime[0] +  untilTime[1]/60)
-            for hour in range(startHour, endHour):
-                hourlyValues[hour] = value
-            
-            startHour = endHour
+        hourlyValues = self.getDayProfile(values)
         
         if numericType.strip().lower() == "district":
             hourlyValues = map(int, hourlyValues)
@@ -4462,7 +6246,7 @@ class ReadEPSchedules(object):
         
         if numericType.strip().lower() == "district":
             hourlyValues = map(int, hourlyValues)
-        return scheduleConstant
+        return hourlyValues
     
     
     def getCompactEPScheduleValues(self, schName):
@@ -4474,110 +6258,23 @@ class ReadEPSchedules(object):
         lowerLimit, upperLimit, numericType, unitType = \
                 self.getScheduleTypeLimitsData(typeLimitName)
         
-        #Separate out the different periods.
-        totalValues = []
-        periodValues = []
-        headerDone = False
-        for val in values:
-            newPeriod = False
-            for word in self.comapctKeywords:
-                if word in val: newPeriod = True
-            if newPeriod == True:
-                if headerDone == True:
-                    totalValues.append(periodValues)
-                periodValues = [val]
-                headerDone = True
-            elif headerDone == True:
-                periodValues.append(val)
-        totalValues.append(periodValues)
-        
-        #For each day period, construct a day schedule.
-        dayType = []
-        dayValues = []
-        for dayVals in totalValues:
-            dayType.append(dayVals[0].title().split('For: ')[-1])
-            numberOfDaySch = int((len(dayVals) - 1) /2)
-            
-            hourlyValues = range(24)
-            startHour = 0
-            for i in range(numberOfDaySch):
-                value = float(dayVals[2 * i + 2])
-                untilTime = map(int, dayVals[2 * i + 1].split(":")[1:])
-                endHour = int(untilTime[0] +  untilTime[1]/60)
-                for hour in range(startHour, endHour):
-                    hourlyValues[hour] = value
-                
-                startHour = endHour
-            dayValues.append(hourlyValues)
-        
-        #Construct a week schedule from the day schedules.
-        #Map the dayTypes to the days of the week.
-        ['Weekdays', 'Weekends', 'Alldays', 'AllOtherDays', 'Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-        weekVals = [-1, -1, -1, -1, -1, -1, -1]
-        for typeCount, type in enumerate(dayType):
-            if type == 'Alldays':
-                for count, val in enumerate(weekVals):
-                    weekVals[count] = typeCount
-            elif type == 'Weekdays':
-                for count, val in enumerate(weekVals):
-                    if count < 6 and count != 0: weekVals[count] = typeCount
-            elif type == 'Weekends':
-                weekVals[0] = typeCount
-                weekVals[-1] = typeCount
-            elif type == 'Sunday': weekVals[0] = typeCount
-            elif type == 'Monday': weekVals[1] = typeCount
-            elif type == 'Tuesday': weekVals[2] = typeCount
-            elif type == 'Wednesday': weekVals[3] = typeCount
-            elif type == 'Thursday': weekVals[4] = typeCount
-            elif type == 'Friday': weekVals[5] = typeCount
-            elif type == 'Saturday': weekVals[6] = typeCount
-            elif type == 'Allotherdays':
-                for count, val in enumerate(weekVals):
-                    if val == -1: weekVals[count] = typeCount
-        
-        #Turn the week schedule into a year schedule.
-        hourlyValues = []
-        dayVals = []
-        dayofWeek = -1
-        for day in range(365):
-            if dayofWeek == 6: dayofWeek = 0
-            else: dayofWeek += 1
-            dayVals.append(weekVals[dayofWeek])
-        for day in dayVals:
-            hourlyValues.extend(dayValues[day])
-        
-        print hourlyValues
-        return hourlyValues
+        # update last day of schedule
+        self.endHOY = 8760
+        
+        return self.getAnnualValues(schName)
     
     
     def getYearlyEPScheduleValues(self, schName = None):
-        # place holder for 365 days
-        hourlyValues = range(365)
-        
-        # update last day of schedule
-        self.endHOY = 8760
         
         if schName == None:
             schName = self.schName
         
-        values, comments = self.hb_EPScheduleAUX.getScheduleDataByName(schName.upper(), ghenv.Component)
-        
-        # generate weekly schedules
-        numOfWeeklySchedules = int((len(values)-2)/5)
+        # update last day of schedule
+        self.endHOY = 8760
         
-        for i in range(numOfWeeklySchedules):
-            weekDayScheduleName = values[5 * i + 2]
-            
-            startDay = int(self.lb_preparation.getJD(int(values[5 * i + 3]), int(values[5 * i + 4])))
-            endDay = int(self.lb_preparation.getJD(int(values[5 * i + 5]), int(values[5 * i + 6])))
-            
-            # 7 list for 7 days of the week
-            hourlyValuesForTheWeek = self.getScheduleValues(weekDayScheduleName)
-            
-            for day in range(startDay-1, endDay):
-                hourlyValues[day] = hourlyValuesForTheWeek[day%7]
-            
-        return hourlyValues
+        # a list of 24 values for each of the 365 days
+        annualValues = self.getAnnualValues(schName)
+        return [annualValues[24 * day:24 * (day + 1)] for day in xrange(365)]
     
     
     def getScheduleValues(self, schName = None):
@@ -4629,6 +6326,225 @@ class ReadEPSchedules(object):
                     hourlyValues.append([startDay,endDay,holidaySchedule])
         
         return hourlyValues
+    
+    def getAnnualValues(self, schName = None, holidays = None, timestep = 1):
+        """Get the values of a schedule for every timestep of the year.
+        
+        The schedule is compiled once and the values are cached in
+        compiledSchedules. The cached values are used as long as the schedules
+        that they are compiled from are not changed in the library.
+        
+        Args:
+            schName: Name of a Schedule:Year, Schedule:Compact, Schedule:Week:Daily,
+                Schedule:Day:Interval, Schedule:Day:Hourly or Schedule:Constant.
+            holidays: An optional list of holidays as days of the year (1-365).
+            timestep: Number of timesteps per hour. Default is 1.
+        
+        Returns:
+            A list of 8760 * timestep values.
+        """
+        if schName == None: schName = self.schName
+        holidays = tuple(sorted(set(int(day) for day in holidays))) if holidays else ()
+        key = schName.upper(), self.startDayOfTheWeek, holidays, int(timestep)
+        
+        compiled = self.compiledSchedules.get(key)
+        if compiled is None or not self.isCompiledScheduleValid(compiled[1]):
+            compiled = self.compileSchedule(schName.upper(), holidays, int(timestep))
+            self.compiledSchedules[key] = compiled
+        
+        values, definitions, self.schType, self.unit = compiled
+        self.startHOY = 1
+        self.endHOY = 8760
+        
+        return list(values)
+    
+    @staticmethod
+    def isCompiledScheduleValid(definitions):
+        for libName, name, definition in definitions:
+            try:
+                if sc.sticky[libName][name] != definition: return False
+            except KeyError:
+                return False
+        return True
+    
+    def getDefinition(self, schName, libName = "honeybee_ScheduleLib"):
+        """Get the values of a schedule and keep track of it for compileSchedule."""
+        if libName == "honeybee_ScheduleLib":
+            values, comments = self.hb_EPScheduleAUX.getScheduleDataByName(schName.upper(), ghenv.Component)
+        else:
+            values, comments = self.hb_EPScheduleAUX.getScheduleTypeLimitsDataByName(schName.upper(), ghenv.Component)
+        
+        if values is None or comments == "csv":
+            raise ValueError("Failed to find %s in the Honeybee schedule library."%schName)
+        
+        self.definitions.append((libName, schName.upper(), dict(sc.sticky[libName][schName.upper()])))
+        return [str(value).strip() for value in values]
+    
+    def compileSchedule(self, schName, holidays, timestep):
+        """Expand a schedule to a value for every timestep of the year.
+        
+        Returns:
+            values: An array of 8760 * timestep values.
+            definitions: List of (library, name, definition) for schedules
+                that are used to compile the schedule.
+            schType: Type of the schedule.
+            unit: Unit type of the schedule.
+        """
+        self.definitions = []
+        self.dayProfiles = {}
+        values = self.getDefinition(schName)
+        schType = values[0].lower()
+        
+        # each value is a dictionary that maps day types to a day profile
+        # and is used for every day until the end day of the period (1-365)
+        if schType == "schedule:year":
+            typeLimitName = values[1]
+            periods = []
+            for i in range(int((len(values) - 2) / 5)):
+                startDay = int(self.lb_preparation.getJD(int(values[5 * i + 3]), int(values[5 * i + 4])))
+                endDay = int(self.lb_preparation.getJD(int(values[5 * i + 5]), int(values[5 * i + 6])))
+                periods.append((startDay, endDay, self.getWeekProfiles(values[5 * i + 2], timestep)))
+        elif schType == "schedule:compact":
+            typeLimitName = values[1]
+            periods = self.getCompactPeriods(values, timestep)
+        elif schType == "schedule:week:daily":
+            typeLimitName = None
+            periods = [(1, 365, self.getWeekProfiles(schName, timestep))]
+        elif schType in ("schedule:day:interval", "schedule:day:hourly"):
+            typeLimitName = values[1]
+            dayProfile = self.getDayProfile(values, timestep)
+            periods = [(1, 365, dict.fromkeys(self.weekDays + ('holiday',), dayProfile))]
+        elif schType == "schedule:constant":
+            typeLimitName = values[1]
+            dayProfile = [float(values[2])] * (24 * timestep)
+            periods = [(1, 365, dict.fromkeys(self.weekDays + ('holiday',), dayProfile))]
+        else:
+            raise ValueError("Honeybee doesn't support " + schType + " currently.")
+        
+        dayTypes = []
+        for day in xrange(1, 366):
+            if day in holidays: dayTypes.append('holiday')
+            else: dayTypes.append(self.weekDays[(self.startDayOfTheWeek + day - 1) % 7])
+        
+        annualValues = array.array('d', [0]) * (8760 * timestep)
+        dayLength = 24 * timestep
+        for startDay, endDay, profiles in periods:
+            for day in xrange(startDay, endDay + 1):
+                dayType = dayTypes[day - 1]
+                if dayType not in profiles:
+                    # use the normal day of the week if holidays are not defined
+                    dayType = self.weekDays[(self.startDayOfTheWeek + day - 1) % 7]
+                annualValues[(day - 1) * dayLength:day * dayLength] = array.array('d', profiles[dayType])
+        
+        unit = "unknown"
+        if not typeLimitName and self.dayProfiles:
+            typeLimitName = self.dayTypeLimitName
+        if typeLimitName and self.hb_EPObjectsAUX.isScheduleTypeLimits(typeLimitName):
+            self.getDefinition(typeLimitName, "honeybee_ScheduleTypeLimitsLib")
+            lowerLimit, upperLimit, numericType, unitType = self.getScheduleTypeLimitsData(typeLimitName)
+            unit = self.unit
+            if numericType.strip().lower() == "district":
+                annualValues = [int(value) for value in annualValues]
+        
+        return annualValues, self.definitions, schType, unit
+    
+    @staticmethod
+    def getUntilMinutes(untilTime):
+        # works for both "HH:MM" and "Until: HH:MM"
+        hour, minute = untilTime.split(":")[-2:]
+        return 60 * int(hour) + int(minute)
+    
+    @staticmethod
+    def getProfileFromUntilValues(untilValues, timestep = 1):
+        """Get a day profile from a list of (until minutes, value).
+            
+            Each timestep gets the value that is in effect at the end of the
+            timestep similar to EnergyPlus when values are not interpolated.
+        """
+        timestepLength = 60.0 / timestep
+        profile = []
+        index = 0
+        for count in xrange(24 * timestep):
+            endTime = (count + 1) * timestepLength
+            while index < len(untilValues) - 1 and untilValues[index][0] < endTime - 1e-6:
+                index += 1
+            profile.append(untilValues[index][1])
+        
+        return profile
+    
+    def getDayProfile(self, values, timestep = 1):
+        """Schedule:Day:Interval or Schedule:Day:Hourly to a list of 24 * timestep values."""
+        if values[0].lower() == "schedule:day:hourly":
+            return [float(value) for value in values[2:26] for count in range(timestep)]
+        
+        numberOfDaySch = int((len(values) - 3) /2)
+        untilValues = [(self.getUntilMinutes(values[2 * i + 3]), float(values[2 * i + 4]))                        for i in range(numberOfDaySch)]
+        return self.getProfileFromUntilValues(untilValues, timestep)
+    
+    def getWeekProfiles(self, schName, timestep):
+        """Get the day profiles of a Schedule:Week:Daily for each day type."""
+        values = self.getDefinition(schName)
+        dayNames = values[1:8] + [values[8]]
+        
+        profiles = {}
+        for dayType, dayName in zip(self.weekDays + ('holiday',), dayNames):
+            if dayName.upper() not in self.dayProfiles:
+                dayValues = self.getDefinition(dayName)
+                if not self.dayProfiles: self.dayTypeLimitName = dayValues[1]
+                self.dayProfiles[dayName.upper()] = self.getDayProfile(dayValues, timestep)
+            profiles[dayType] = self.dayProfiles[dayName.upper()]
+        
+        return profiles
+    
+    def getCompactPeriods(self, values, timestep):
+        """Get the periods of a Schedule:Compact as (start day, end day, profiles)."""
+        periods = []
+        startDay = 1
+        dayGroups = []
+        untilTime = None
+        
+        def addPeriod(endDay):
+            profiles = {}
+            for dayTypes, untilValues in dayGroups:
+                profile = self.getProfileFromUntilValues(untilValues, timestep)
+                for dayType in dayTypes:
+                    if dayType == 'allotherdays':
+                        for day in self.weekDays + ('holiday',):
+                            profiles.setdefault(day, profile)
+                    elif dayType == 'alldays':
+                        profiles.update(dict.fromkeys(self.weekDays + ('holiday',), profile))
+                    elif dayType == 'weekdays':
+                        profiles.update(dict.fromkeys(self.weekDays[1:6], profile))
+                    elif dayType == 'weekends':
+                        profiles.update(dict.fromkeys((self.weekDays[0], self.weekDays[6]), profile))
+                    elif dayType in ('holiday', 'holidays'):
+                        profiles['holiday'] = profile
+                    elif dayType in self.weekDays:
+                        profiles[dayType] = profile
+            periods.append((startDay, endDay, profiles))
+        
+        for value in values[2:]:
+            field = value.lower()
+            if field.startswith("through:"):
+                if dayGroups:
+                    addPeriod(endDay)
+                    startDay = endDay + 1
+                    dayGroups = []
+                month, day = field.split(":", 1)[1].strip().split("/")
+                endDay = int(self.lb_preparation.getJD(int(month), int(day)))
+            elif field.startswith("for:"):
+                dayTypes = field.split(":", 1)[1].split()
+                dayGroups.append((dayTypes, []))
+            elif field.startswith("until:"):
+                untilTime = self.getUntilMinutes(field)
+            elif field.startswith("interpolate:") or not field:
+                continue
+            else:
+                dayGroups[-1][1].append((untilTime, float(value)))
+        
+        if dayGroups: addPeriod(endDay)
+        
+        return periods
 
 class EPTypes(object):
     def __init__(self):
@@ -4953,10 +6869,93 @@ class EPHvac(object):
         self.heatingDetails = heatingDetails
         self.coolingDetails = coolingDetails
 
+class hb_ZonePropertyGroup(object):
+    """A group of zone properties that most zones never set.
+    
+    The group is only created when one of its attributes is first used so
+    zones without air mixing, natural ventilation or internal masses don't
+    carry a set of empty lists around.
+    """
+    __slots__ = ()
+    
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, [])
+    
+    def __getstate__(self):
+        return dict((name, getattr(self, name)) for name in self.__slots__)
+    
+    def __setstate__(self, state):
+        for name, value in state.iteritems():
+            setattr(self, name, value)
+
+class hb_ZoneAirMixing(hb_ZonePropertyGroup):
+    """Air mixing with adjacent zones"""
+    __slots__ = ('mixAirZoneList', 'mixAirFlowList', 'mixAirFlowSched')
+
+class hb_ZoneNatVent(hb_ZonePropertyGroup):
+    """Natural ventilation properties"""
+    __slots__ = ('natVentType', 'natVentMinIndoorTemp', 'natVentMaxIndoorTemp',
+                 'natVentMinOutdoorTemp', 'natVentMaxOutdoorTemp', 'natVentDeltaTemp',
+                 'windowOpeningArea', 'windowHeightDiff', 'natVentSchedule',
+                 'natVentWindDischarge', 'natVentStackDischarge', 'windowAngle',
+                 'fanFlow', 'FanEfficiency', 'FanPressure')
+
+class hb_ZoneInternalMass(hb_ZonePropertyGroup):
+    """Zone internal masses (or furniture)"""
+    __slots__ = ('internalMassNames', 'internalMassSrfAreas', 'internalMassConstructions')
+
 class EPZone(object):
     """This calss represents a honeybee zone that will be used for energy and daylighting
     simulatios"""
     
+    # attributes that live in lazily created property groups
+    # {attribute name: (key of the group in __dict__, group class)}
+    propertyGroups = {}
+    for groupKey, groupClass in (('_airMixing', hb_ZoneAirMixing),
+                                 ('_natVent', hb_ZoneNatVent),
+                                 ('_internalMass', hb_ZoneInternalMass)):
+        for attrName in groupClass.__slots__:
+            propertyGroups[attrName] = (groupKey, groupClass)
+    del groupKey, groupClass, attrName
+    
+    def __getattr__(self, name):
+        # only called when the normal lookup fails
+        try:
+            groupKey, groupClass = EPZone.propertyGroups[name]
+        except KeyError:
+            raise AttributeError("'EPZone' object has no attribute '%s'"%name)
+        try:
+            group = self.__dict__[groupKey]
+        except KeyError:
+            group = self.__dict__[groupKey] = groupClass()
+        return getattr(group, name)
+    
+    def __setattr__(self, name, value):
+        if name in EPZone.propertyGroups and name not in self.__dict__:
+            groupKey, groupClass = EPZone.propertyGroups[name]
+            try:
+                group = self.__dict__[groupKey]
+            except KeyError:
+                group = self.__dict__[groupKey] = groupClass()
+            setattr(group, name, value)
+        else:
+            object.__setattr__(self, name, value)
+    
+    def getPropertyDict(self):
+        """Return a copy of zone attributes with the property groups expanded.
+        
+        Use this instead of __dict__ to dump the zone so the dumped data only
+        includes plain attributes.
+        """
+        propDict = dict(self.__dict__)
+        for name, (groupKey, groupClass) in EPZone.propertyGroups.iteritems():
+            propDict.pop(groupKey, None)
+            if name in propDict: continue
+            group = self.__dict__.get(groupKey)
+            propDict[name] = getattr(group, name) if group is not None else []
+        return propDict
+    
     def __init__(self, zoneBrep, zoneID, zoneName, program = [None, None], isConditioned = True):
         self.north = 0
         self.objectType = "HBZone"
@@ -4979,34 +6978,15 @@ class EPZone(object):
         self.hasInternalEdge = False
         
         # Air Mixing with Adjacent Zones
+        # mixing lists are in hb_ZoneAirMixing and are created on first use
         self.mixAir = False
-        self.mixAirZoneList = []
-        self.mixAirFlowList = []
         self.mixAirFlowRate = 0.0963
-        self.mixAirFlowSched = []
         
         # Natural Ventilation Properties
+        # ventilation lists are in hb_ZoneNatVent and are created on first use
         self.natVent = False
-        self.natVentType = []
-        self.natVentMinIndoorTemp = []
-        self.natVentMaxIndoorTemp = []
-        self.natVentMinOutdoorTemp = []
-        self.natVentMaxOutdoorTemp = []
-        self.natVentDeltaTemp = []
-        self.windowOpeningArea = []
-        self.windowHeightDiff = []
-        self.natVentSchedule = []
-        self.natVentWindDischarge = []
-        self.natVentStackDischarge = []
-        self.windowAngle = []
-        self.fanFlow = []
-        self.FanEfficiency = []
-        self.FanPressure = []
-        
-        # Zone Internal Masses (or Furniture)
-        self.internalMassNames = []
-        self.internalMassSrfAreas = []
-        self.internalMassConstructions = []
+        
+        # Zone Internal Masses (or Furniture) are in hb_ZoneInternalMass
         
         # Zone Surfaces
         self.surfaces = []
@@ -5086,9 +7066,10 @@ class EPZone(object):
         # Update air mixing accross air walls to refernce new zones
         if clearSurfacesBC == True:
             self.mixAir = False
-            self.mixAirZoneList = []
-            self.mixAirFlowList = []
-            self.mixAirFlowSched = []
+            if '_airMixing' in self.__dict__ or 'mixAirZoneList' in self.__dict__:
+                self.mixAirZoneList = []
+                self.mixAirFlowList = []
+                self.mixAirFlowSched = []
         else:
             for count, mixZ in enumerate(self.mixAirZoneList):
                 self.mixAirZoneList[count] = mixZ + newKey
@@ -5991,6 +7972,91 @@ class hb_reEvaluateHBZones(object):
 
 class hb_EPSurface(object):
     
+    # The type, construction, boundary condition and exposure tables are shared by all surfaces.
+    # 4 represents an Air Wall
+    srfType = {0:'WALL',
+       0.5: 'UndergroundWall',
+       1:'ROOF',
+       1.5: 'UndergroundCeiling',
+       2:'FLOOR',
+       2.25: 'UndergroundSlab',
+       2.5: 'SlabOnGrade',
+       2.75: 'ExposedFloor',
+       3:'CEILING',
+       4:'AIRWALL',
+       5:'WINDOW',
+       6:'SHADING',
+       'WALL': 'WALL',
+       'ROOF':'ROOF',
+       'FLOOR': 'FLOOR',
+       'CEILING': 'CEILING',
+       'WINDOW':'WINDOW',
+       'SHADING': 'SHADING'}
+       
+    cnstrSet = {0:'Exterior Wall',
+            0.5: 'Exterior Wall',
+            1: 'Exterior Roof',
+            1.5: 'Exterior Roof',
+            2:'Interior Floor',
+            2.25: 'Exterior Floor',
+            2.5: 'Exterior Floor',
+            2.75: 'Exterior Floor',
+            3:'Interior Ceiling',
+            4:'Air Wall',
+            5:'Exterior Window',
+            6:'Interior Wall'}
+    
+    intCnstrSet = {
+            0:'Interior Wall',
+            0.5: 'Exterior Wall',
+            1:'Exterior Roof',
+            1.5:'Exterior Roof',
+            2:'Interior Floor',
+            2.25: 'Exterior Floor',
+            2.5: 'Exterior Floor',
+            2.75: 'Exterior Floor',
+            3:'Interior Ceiling',
+            4:'Air Wall',
+            5:'Interior Window',
+            6:'Interior Wall'}
+    
+    srfBC = {0:'Outdoors',
+                 0.5: 'ground',
+                 1:'Outdoors',
+                 1.5: 'ground',
+                 2: 'outdoors', # this will be changed to surface once solveAdjacency is used 
+                 2.25: 'ground',
+                 2.5: 'ground',
+                 2.75: 'outdoors',
+                 3: 'outdoors', # this will be changed to surface once solveAdjacency is used 
+                 4: 'surface',
+                 5: 'Outdoors',
+                 6: 'surface'}
+     
+    srfSunExposure = {0:'SunExposed',
+                 0.5:'NoSun',
+                 1:'SunExposed',
+                 1.5:'NoSun', 
+                 2:'NoSun',
+                 2.25: 'NoSun',
+                 2.5: 'NoSun',
+                 2.75: 'SunExposed',
+                 3:'NoSun',
+                 4:'NoSun',
+                 6: 'NoSun'}
+         
+    srfWindExposure = {0:'WindExposed',
+                 0.5:'NoWind',
+                 1:'WindExposed',
+                 1.5:'NoWind',
+                 2:'NoWind',
+                 2.25:'NoWind',
+                 2.5:'NoWind',
+                 2.75:'WindExposed',
+                 3:'NoWind',
+                 4:'NoWind',
+                 6:'NoWind'}
+    
     def __init__(self, surface, srfNumber, srfID, *arg):
         """EP surface Class
             surface: surface geometry as a Brep
@@ -6033,90 +8099,6 @@ class hb_EPSurface(object):
         
         self.containsPVgen = False
         
-        # 4 represents an Air Wall
-        self.srfType = {0:'WALL',
-           0.5: 'UndergroundWall',
-           1:'ROOF',
-           1.5: 'UndergroundCeiling',
-           2:'FLOOR',
-           2.25: 'UndergroundSlab',
-           2.5: 'SlabOnGrade',
-           2.75: 'ExposedFloor',
-           3:'CEILING',
-           4:'AIRWALL',
-           5:'WINDOW',
-           6:'SHADING',
-           'WALL': 'WALL',
-           'ROOF':'ROOF',
-           'FLOOR': 'FLOOR',
-           'CEILING': 'CEILING',
-           'WINDOW':'WINDOW',
-           'SHADING': 'SHADING'}
-           
-        self.cnstrSet = {0:'Exterior Wall',
-                0.5: 'Exterior Wall',
-                1: 'Exterior Roof',
-                1.5: 'Exterior Roof',
-                2:'Interior Floor',
-                2.25: 'Exterior Floor',
-                2.5: 'Exterior Floor',
-                2.75: 'Exterior Floor',
-                3:'Interior Ceiling',
-                4:'Air Wall',
-                5:'Exterior Window',
-                6:'Interior Wall'}
-        
-        self.intCnstrSet = {
-                0:'Interior Wall',
-                0.5: 'Exterior Wall',
-                1:'Exterior Roof',
-                1.5:'Exterior Roof',
-                2:'Interior Floor',
-                2.25: 'Exterior Floor',
-                2.5: 'Exterior Floor',
-                2.75: 'Exterior Floor',
-                3:'Interior Ceiling',
-                4:'Air Wall',
-                5:'Interior Window',
-                6:'Interior Wall'}
-        
-        self.srfBC = {0:'Outdoors',
-                     0.5: 'ground',
-                     1:'Outdoors',
-                     1.5: 'ground',
-                     2: 'outdoors', # this will be changed to surface once solveAdjacency is used 
-                     2.25: 'ground',
-                     2.5: 'ground',
-                     2.75: 'outdoors',
-                     3: 'outdoors', # this will be changed to surface once solveAdjacency is used 
-                     4: 'surface',
-                     5: 'Outdoors',
-                     6: 'surface'}
-         
-        self.srfSunExposure = {0:'SunExposed',
-                     0.5:'NoSun',
-                     1:'SunExposed',
-                     1.5:'NoSun', 
-                     2:'NoSun',
-                     2.25: 'NoSun',
-                     2.5: 'NoSun',
-                     2.75: 'SunExposed',
-                     3:'NoSun',
-                     4:'NoSun',
-                     6: 'NoSun'}
-             
-        self.srfWindExposure = {0:'WindExposed',
-                     0.5:'NoWind',
-                     1:'WindExposed',
-                     1.5:'NoWind',
-                     2:'NoWind',
-                     2.25:'NoWind',
-                     2.5:'NoWind',
-                     2.75:'WindExposed',
-                     3:'NoWind',
-                     4:'NoWind',
-                     6:'NoWind'}
-        
         self.numOfVertices = 'autocalculate'
         
         if len(arg) == 0:
@@ -7912,8 +9894,8 @@ class thermPolygon(object):
         self.warning = None
         
         #Check if the material exists in the THERM Library and, if not, add it.
-        if material.upper() in sc.sticky["honeybee_materialLib"].keys() or material.upper() in sc.sticky["honeybee_windowMaterialLib"].keys(): material = self.makeThermMatFromEPMat(material, RGBColor)
-        elif material.upper() in sc.sticky["honeybee_thermMaterialLib"].keys():
+        if material.upper() in sc.sticky["honeybee_materialLib"] or material.upper() in sc.sticky["honeybee_windowMaterialLib"]: material = self.makeThermMatFromEPMat(material, RGBColor)
+        elif material.upper() in sc.sticky["honeybee_thermMaterialLib"]:
             if RGBColor == None: RGBColor = sc.sticky["honeybee_thermMaterialLib"][material.upper()]["RGBColor"]
             elif sc.sticky["honeybee_thermMaterialLib"][material.upper()]["RGBColor"] == RGBColor: pass
             else:
@@ -8156,6 +10138,376 @@ class thermBC(object):
                '\nFilm Coefficient: ' + str(self.BCProperties['H']) + ' W/m2-K' + \
                '\n-------------------------------------'
 
+class hb_MeshBVH(object):
+    """Bounding volume hierarchy over the triangles of a list of meshes.
+        
+        The tree and the ray tests only use tuples of floats so the same class
+        can be built from Rhino meshes or from plain triangles outside of Rhino.
+        Ray parameters are in units of the ray direction, like MeshRay.
+        
+        Args:
+            triangles: A list of (meshIndex, vertexA, vertexB, vertexC) where
+                each vertex is an (x, y, z) tuple.
+            leafSize: Maximum number of triangles in a leaf of the tree.
+    """
+    
+    epsilon = 1e-9
+    bigNumber = 1e300
+    
+    def __init__(self, triangles, leafSize=4):
+        self.leafSize = max(1, int(leafSize))
+        
+        items = []
+        for meshIndex, a, b, c in triangles:
+            items.append((meshIndex, tuple(a), tuple(b), tuple(c)))
+        
+        self.meshCount = max([item[0] for item in items]) + 1 if items else 0
+        self.nodeBounds = []
+        self.nodeChildren = []
+        self.nodeTriangles = []
+        
+        if items: self.buildNode(items, 0, len(items))
+        
+        #Keep the triangles in the leaf order as a corner and two edges for the ray test.
+        self.meshIds = []
+        self.triangles = []
+        for meshIndex, a, b, c in items:
+            self.meshIds.append(meshIndex)
+            self.triangles.append((a[0], a[1], a[2], \
+                b[0] - a[0], b[1] - a[1], b[2] - a[2], \
+                c[0] - a[0], c[1] - a[1], c[2] - a[2]))
+    
+    @classmethod
+    def fromMeshes(cls, meshes, leafSize=4):
+        """Build the tree from a list of Rhino meshes. Quads are split in two triangles."""
+        triangles = []
+        for meshIndex, mesh in enumerate(meshes):
+            if mesh is None: continue
+            vertices = [(v.X, v.Y, v.Z) for v in mesh.Vertices]
+            for face in mesh.Faces:
+                triangles.append((meshIndex, vertices[face.A], vertices[face.B], vertices[face.C]))
+                if face.IsQuad:
+                    triangles.append((meshIndex, vertices[face.A], vertices[face.C], vertices[face.D]))
+        
+        bvh = cls(triangles, leafSize)
+        bvh.meshCount = len(meshes)
+        return bvh
+    
+    def buildNode(self, items, start, end):
+        nodeIndex = len(self.nodeBounds)
+        self.nodeBounds.append(None)
+        self.nodeChildren.append(None)
+        self.nodeTriangles.append(None)
+        
+        bounds = [self.bigNumber] * 3 + [-self.bigNumber] * 3
+        centerBounds = [self.bigNumber] * 3 + [-self.bigNumber] * 3
+        for meshIndex, a, b, c in items[start:end]:
+            for axis in xrange(3):
+                low = min(a[axis], b[axis], c[axis])
+                high = max(a[axis], b[axis], c[axis])
+                center = (low + high) / 2.0
+                if low < bounds[axis]: bounds[axis] = low
+                if high > bounds[axis + 3]: bounds[axis + 3] = high
+                if center < centerBounds[axis]: centerBounds[axis] = center
+                if center > centerBounds[axis + 3]: centerBounds[axis + 3] = center
+        self.nodeBounds[nodeIndex] = tuple(bounds)
+        
+        #Split the triangles at the median of the widest axis of their centers.
+        extents = [centerBounds[axis + 3] - centerBounds[axis] for axis in xrange(3)]
+        axis = extents.index(max(extents))
+        if end - start <= self.leafSize or extents[axis] <= 0:
+            self.nodeTriangles[nodeIndex] = (start, end)
+            return nodeIndex
+        
+        def center(item):
+            return min(item[1][axis], item[2][axis], item[3][axis]) + \
+                max(item[1][axis], item[2][axis], item[3][axis])
+        
+        items[start:end] = sorted(items[start:end], key=center)
+        middle = (start + end) // 2
+        left = self.buildNode(items, start, middle)
+        right = self.buildNode(items, middle, end)
+        self.nodeChildren[nodeIndex] = (left, right)
+        return nodeIndex
+    
+    def prepareRays(self, directions):
+        """Return the directions as tuples with their inverse for the box tests.
+        
+        Prepare the directions once and use them for all the points of a batch.
+        """
+        rays = []
+        for direction in directions:
+            try: dx, dy, dz = direction.X, direction.Y, direction.Z
+            except AttributeError: dx, dy, dz = direction
+            inverse = []
+            for value in (dx, dy, dz):
+                if value == 0: inverse.append(self.bigNumber)
+                else: inverse.append(1.0 / value)
+            rays.append((dx, dy, dz, inverse[0], inverse[1], inverse[2]))
+        return rays
+    
+    def intersectTriangle(self, triangleIndex, ox, oy, oz, dx, dy, dz):
+        """Return the ray parameter of the hit with a triangle or -1 if it is missed."""
+        ax, ay, az, e1x, e1y, e1z, e2x, e2y, e2z = self.triangles[triangleIndex]
+        px = dy * e2z - dz * e2y
+        py = dz * e2x - dx * e2z
+        pz = dx * e2y - dy * e2x
+        det = e1x * px + e1y * py + e1z * pz
+        if -self.epsilon < det < self.epsilon: return -1
+        invDet = 1.0 / det
+        tx, ty, tz = ox - ax, oy - ay, oz - az
+        u = (tx * px + ty * py + tz * pz) * invDet
+        if u < 0 or u > 1: return -1
+        qx = ty * e1z - tz * e1y
+        qy = tz * e1x - tx * e1z
+        qz = tx * e1y - ty * e1x
+        v = (dx * qx + dy * qy + dz * qz) * invDet
+        if v < 0 or u + v > 1: return -1
+        t = (e2x * qx + e2y * qy + e2z * qz) * invDet
+        if t > self.epsilon: return t
+        return -1
+    
+    def castRay(self, origin, ray, mode=0):
+        """Trace one prepared ray through the tree.
+        
+        Args:
+            origin: The (x, y, z) start of the ray.
+            ray: A ray from prepareRays.
+            mode: 0 for the index of the nearest mesh that is hit (-1 for none),
+                1 for True if any mesh is hit and 2 for the sorted indices
+                of all the meshes that are hit.
+        """
+        ox, oy, oz = origin
+        dx, dy, dz, ix, iy, iz = ray
+        nodeBounds = self.nodeBounds
+        nodeChildren = self.nodeChildren
+        nodeTriangles = self.nodeTriangles
+        meshIds = self.meshIds
+        
+        nearestT = self.bigNumber
+        nearestMesh = -1
+        hitMeshes = set()
+        stack = [0] if nodeBounds else []
+        while stack:
+            node = stack.pop()
+            minX, minY, minZ, maxX, maxY, maxZ = nodeBounds[node]
+            t1 = (minX - ox) * ix
+            t2 = (maxX - ox) * ix
+            if t1 > t2: t1, t2 = t2, t1
+            t3 = (minY - oy) * iy
+            t4 = (maxY - oy) * iy
+            if t3 > t4: t3, t4 = t4, t3
+            t5 = (minZ - oz) * iz
+            t6 = (maxZ - oz) * iz
+            if t5 > t6: t5, t6 = t6, t5
+            tNear = max(t1, t3, t5)
+            tFar = min(t2, t4, t6, nearestT)
+            if tNear > tFar or tFar < 0: continue
+            
+            children = nodeChildren[node]
+            if children is not None:
+                stack.extend(children)
+                continue
+            
+            start, end = nodeTriangles[node]
+            for triangleIndex in xrange(start, end):
+                if mode == 2 and meshIds[triangleIndex] in hitMeshes: continue
+                t = self.intersectTriangle(triangleIndex, ox, oy, oz, dx, dy, dz)
+                if t == -1: continue
+                if mode == 1: return True
+                elif mode == 2: hitMeshes.add(meshIds[triangleIndex])
+                elif t < nearestT:
+                    nearestT = t
+                    nearestMesh = meshIds[triangleIndex]
+        
+        if mode == 1: return False
+        elif mode == 2: return sorted(hitMeshes)
+        return nearestMesh
+    
+    def nearestHits(self, origin, rays):
+        """Return the index of the nearest mesh hit by each ray or -1 if it hits nothing."""
+        return [self.castRay(origin, ray, 0) for ray in rays]
+    
+    def anyHits(self, origin, rays):
+        """Return True for each ray that hits any of the meshes."""
+        return [self.castRay(origin, ray, 1) for ray in rays]
+    
+    def allHits(self, origin, rays):
+        """Return the sorted indices of all the meshes hit by each ray."""
+        return [self.castRay(origin, ray, 2) for ray in rays]
+
+
+class hb_SkyHitMatrix(object):
+    """Compact storage of the sky rays of a zone's test points that pass the opaque geometry.
+        
+        Each combination of windows that a ray passes through gets an integer id and
+        the rays of each point are kept in CSR arrays so that blocked rays and
+        repeated window lists take no memory. The matrix reads like the old list of
+        per-ray transmissivities for each point. The sky view of an hour is a sparse
+        product of the per-point combination counts with the combination values.
+        
+        Args:
+            rayCount: Number of sky rays that are traced from each point.
+            isOutdoor: Set to True for outdoor points where the rays have no windows.
+    """
+    
+    def __init__(self, rayCount, isOutdoor=False):
+        self.rayCount = rayCount
+        self.isOutdoor = isOutdoor
+        self.windowNames = []
+        self.combos = []
+        self.comboIndex = {}
+        self.comboValues = []
+        
+        #The unblocked rays of each point and the window combination of each of them.
+        self.rayPtr = array.array('l', [0])
+        self.rayIds = array.array('H')
+        self.rayCombos = array.array('l')
+        
+        #The number of rays of each point that pass through each window combination.
+        self.comboPtr = array.array('l', [0])
+        self.comboIds = array.array('l')
+        self.comboCounts = array.array('H')
+    
+    def addPoint(self, rayHits):
+        """Add a point from a list with the sorted window indices of each ray or None if the ray is blocked."""
+        pointCombos = {}
+        for rayIndex, winHits in enumerate(rayHits):
+            if winHits is None: continue
+            combo = tuple(winHits)
+            comboId = self.comboIndex.get(combo)
+            if comboId is None:
+                comboId = len(self.combos)
+                self.comboIndex[combo] = comboId
+                self.combos.append(combo)
+                self.comboValues.append(1)
+            self.rayIds.append(rayIndex)
+            self.rayCombos.append(comboId)
+            pointCombos[comboId] = pointCombos.get(comboId, 0) + 1
+        
+        self.rayPtr.append(len(self.rayIds))
+        for comboId in sorted(pointCombos):
+            self.comboIds.append(comboId)
+            self.comboCounts.append(pointCombos[comboId])
+        self.comboPtr.append(len(self.comboIds))
+    
+    def getComboProducts(self, windowValues):
+        """Multiply the values of the windows of each combination.
+        
+        A window with a value of None ends the product of its combinations so
+        that windows with no data keep the value of the windows before them.
+        """
+        values = []
+        for combo in self.combos:
+            value = 1
+            for winIndex in combo:
+                if windowValues[winIndex] is None: break
+                value = value * windowValues[winIndex]
+            values.append(value)
+        return values
+    
+    def reweight(self, comboValues, windowNames=None):
+        """Return a matrix that shares the rays of this one with new combination values."""
+        newMatrix = copy.copy(self)
+        newMatrix.comboValues = comboValues
+        if windowNames is not None: newMatrix.windowNames = [name.upper() for name in windowNames]
+        return newMatrix
+    
+    def setWindows(self, windowTransmiss, windowNames):
+        """Return a matrix weighted with the transmissivity and named after the windows of the zone."""
+        return self.reweight(self.getComboProducts(windowTransmiss), windowNames)
+    
+    def getSkyView(self):
+        """Return the sky view of each point as the sparse product of the combination counts and values."""
+        comboPtr, comboIds, comboCounts, comboValues = self.comboPtr, self.comboIds, self.comboCounts, self.comboValues
+        divisor = float(self.rayCount)
+        skyView = []
+        for ptCount in xrange(len(comboPtr) - 1):
+            total = 0
+            for k in xrange(comboPtr[ptCount], comboPtr[ptCount + 1]):
+                total += comboCounts[k] * comboValues[comboIds[k]]
+            skyView.append(total / divisor)
+        return skyView
+    
+    def getRayValues(self, rayIndex):
+        """Return the value of one ray for all of the points. Blocked rays are 0."""
+        rayPtr, rayIds, rayCombos, comboValues = self.rayPtr, self.rayIds, self.rayCombos, self.comboValues
+        values = []
+        for ptCount in xrange(len(rayPtr) - 1):
+            start, end = rayPtr[ptCount], rayPtr[ptCount + 1]
+            k = bisect.bisect_left(rayIds, rayIndex, start, end)
+            if k < end and rayIds[k] == rayIndex: values.append(comboValues[rayCombos[k]])
+            else: values.append(0)
+        return values
+    
+    def getWindowNames(self, ptCount):
+        """Return the list of window names of each ray of a point. Blocked rays are 0."""
+        row = [0] * self.rayCount
+        if self.isOutdoor: return row
+        for k in xrange(self.rayPtr[ptCount], self.rayPtr[ptCount + 1]):
+            row[self.rayIds[k]] = [self.windowNames[winIndex] for winIndex in self.combos[self.rayCombos[k]]]
+        return row
+    
+    def nameRows(self):
+        """Return a list-like view with the window names of the rays of each point."""
+        return hb_SkyHitNames(self)
+    
+    def __len__(self):
+        return len(self.rayPtr) - 1
+    
+    def __getitem__(self, ptCount):
+        if isinstance(ptCount, slice):
+            return [self[i] for i in xrange(*ptCount.indices(len(self)))]
+        if ptCount < 0: ptCount += len(self)
+        if not 0 <= ptCount < len(self): raise IndexError("point index out of range")
+        
+        row = [0] * self.rayCount
+        for k in xrange(self.rayPtr[ptCount], self.rayPtr[ptCount + 1]):
+            row[self.rayIds[k]] = self.comboValues[self.rayCombos[k]]
+        return row
+    
+    def __iter__(self):
+        for ptCount in xrange(len(self)):
+            yield self[ptCount]
+    
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and list(self) == list(other)
+        return self is other
+    
+    def __ne__(self, other):
+        return not self.__eq__(other)
+    
+    def __repr__(self):
+        return "Sky Hit Matrix: %d points, %d rays, %d window combinations" % (len(self), self.rayCount, len(self.combos))
+
+
+class hb_SkyHitNames(object):
+    """List-like view of the window names of the rays of each point in a hb_SkyHitMatrix."""
+    
+    __slots__ = ("matrix",)
+    
+    def __init__(self, matrix):
+        self.matrix = matrix
+    
+    def __len__(self):
+        return len(self.matrix)
+    
+    def __getitem__(self, ptCount):
+        if isinstance(ptCount, slice):
+            return [self[i] for i in xrange(*ptCount.indices(len(self)))]
+        if ptCount < 0: ptCount += len(self)
+        if not 0 <= ptCount < len(self): raise IndexError("point index out of range")
+        return self.matrix.getWindowNames(ptCount)
+    
+    def __iter__(self):
+        for ptCount in xrange(len(self)):
+            yield self[ptCount]
+    
+    def __repr__(self):
+        return "Sky Hit Window Names: %d points" % len(self)
+
+
 class viewFactorInfo(object):
     
     def __init__(self, testPtViewFactor=None, zoneSrfNames=None, testPtSkyView=None, testPtBlockedVec=None, testPtZoneWeights=None, \
@@ -8328,7 +10680,73 @@ class hb_Hive(object):
         HBID = '{}#{}'.format(baseKey, key)
         return 'Honeybee View Factor Info - ' + HBID
     
-    def callFromHoneybeeHive(self, geometryList):
+    def copyHBObject(self, HBObject):
+        """Return a private copy of a Honeybee zone or surface from the hive."""
+        # after the first round meshedFace makes copy.deepcopy crash
+        # so I need to regenerate meshFaces
+        bc = []
+        if HBObject.objectType == "HBZone":
+            for surface in HBObject.surfaces:
+                newMesh = rc.Geometry.Mesh()
+                newMesh.Append(surface.meshedFace)
+                surface.meshedFace = newMesh
+                
+                # keep track of boundary conditions
+                # and then set them to None not to create
+                # memory issues for large models.
+                bc.append(copy.copy(surface.BCObject))
+                surface.BCObject = None
+                for csrf in surface.childSrfs:
+                    bc.append(copy.copy(csrf.BCObject))
+                    csrf.BCObject = None
+                    
+        elif HBObject.objectType == "HBSurface": 
+            newMesh = rc.Geometry.Mesh()
+            newMesh.Append(HBObject.meshedFace)
+            HBObject.meshedFace = newMesh
+            # keep track of boundary conditions
+            # and then set them to None not to create
+            # memory issues for large models.
+            bc.append(copy.copy(HBObject.BCObject))
+            HBObject.BCObject = None
+            for csrf in HBObject.childSrfs:
+                bc.append(copy.copy(csrf.BCObject))
+                csrf.BCObject = None                    
+        
+        newObject = copy.deepcopy(HBObject)
+        
+        # put the boundary condition objects back
+        count = 0
+        if HBObject.objectType == "HBZone":
+            for c, surface in enumerate(newObject.surfaces):
+                surface.BCObject = bc[count]
+                HBObject.surfaces[c].BCObject = bc[count]
+                count += 1
+                for cc, csrf in enumerate(surface.childSrfs):
+                    csrf.BCObject = bc[count]
+                    HBObject.surfaces[c].childSrfs[cc].BCObject = bc[count]
+                    count += 1
+                    
+        elif HBObject.objectType == "HBSurface": 
+            newObject.BCObject = bc[count]
+            HBObject.BCObject = bc[count]
+            count += 1
+            for cc, csrf in enumerate(newObject.childSrfs):
+                csrf.BCObject = bc[count]
+                HBObject.childSrfs[cc].BCObject = bc[count]
+                count += 1
+        
+        return newObject
+    
+    def callFromHoneybeeHive(self, geometryList, readOnly=False):
+        """Call the Honeybee objects of the input geometries from the hive.
+        
+        By default each object is a private copy that the component can change.
+        Components that only read the objects should set readOnly to True. They
+        get the objects that are stored in the hive, which are shared with every
+        other component and must not be changed, so no copy is made. Use
+        copyHBObject to get a private copy of any of them that has to change.
+        """
         HBObjects = []
         for geometry in geometryList:
             try:
@@ -8350,63 +10768,12 @@ class hb_Hive(object):
                 except:
                     pass
                 
+                if readOnly:
+                    HBObjects.append(HBObject)
+                    continue
+                
                 try:
-                    # after the first round meshedFace makes copy.deepcopy crash
-                    # so I need to regenerate meshFaces
-                    bc = []
-                    if HBObject.objectType == "HBZone":
-                        for surface in HBObject.surfaces:
-                            newMesh = rc.Geometry.Mesh()
-                            newMesh.Append(surface.meshedFace)
-                            surface.meshedFace = newMesh
-                            
-                            # keep track of boundary conditions
-                            # and then set them to None not to create
-                            # memory issues for large models.
-                            bc.append(copy.copy(surface.BCObject))
-                            surface.BCObject = None
-                            for csrf in surface.childSrfs:
-                                bc.append(copy.copy(csrf.BCObject))
-                                csrf.BCObject = None
-                                
-                    elif HBObject.objectType == "HBSurface": 
-                        newMesh = rc.Geometry.Mesh()
-                        newMesh.Append(HBObject.meshedFace)
-                        HBObject.meshedFace = newMesh
-                        # keep track of boundary conditions
-                        # and then set them to None not to create
-                        # memory issues for large models.
-                        bc.append(copy.copy(HBObject.BCObject))
-                        HBObject.BCObject = None
-                        for csrf in HBObject.childSrfs:
-                            bc.append(copy.copy(csrf.BCObject))
-                            csrf.BCObject = None                    
-                    
-                    newObject = copy.deepcopy(HBObject)
-                    
-                    # put the boundary condition objects back
-                    count = 0
-                    if HBObject.objectType == "HBZone":
-                        for c, surface in enumerate(newObject.surfaces):
-                            surface.BCObject = bc[count]
-                            HBObject.surfaces[c].BCObject = bc[count]
-                            count += 1
-                            for cc, csrf in enumerate(surface.childSrfs):
-                                csrf.BCObject = bc[count]
-                                HBObject.surfaces[c].childSrfs[cc].BCObject = bc[count]
-                                count += 1
-                                
-                    elif HBObject.objectType == "HBSurface": 
-                        newObject.BCObject = bc[count]
-                        HBObject.BCObject = bc[count]
-                        count += 1
-                        for cc, csrf in enumerate(newObject.childSrfs):
-                            csrf.BCObject = bc[count]
-                            HBObject.childSrfs[cc].BCObject = bc[count]
-                            count += 1
-                    
-                    HBObjects.append(newObject)
-                    del(bc)
+                    HBObjects.append(self.copyHBObject(HBObject))
                 except Exception, e:
                     print `e`
                     print "Failed to copy the object. Returning the original objects...\n" +\
@@ -8577,6 +10944,295 @@ class SerializeObjects(object):
             self.data = pickle.load(inf)
 
 
+class hb_ObjectFile(object):
+    """Versioned file of Honeybee objects written by Dump Honeybee Objects.
+    
+    The file is line based. The first line is a header, every following line
+    is one JSON record (a zone, surface, HVAC system, construction, schedule...)
+    and the last two lines are an index with the byte offset of each record and
+    a fixed width pointer to that index. Planar breps, meshes and points are
+    written as plain vertex arrays so the file can be read record by record or
+    only in parts without unpickling the whole model.
+    """
+    formatName = "HBObjects"
+    version = 1
+    headerStart = '{"format": "HBObjects"'
+    indexPointer = "HBINDEX %016d\n"
+    indexPointerLength = 25
+    # text objects that are added to the libraries and are loaded with any selection
+    libraryTypes = ('HBConstr', 'HBMat', 'HBsched', 'HBShdCntrl', 'HBRadMat')
+    
+    def __init__(self, filePath):
+        self.filePath = filePath
+        self.header = None
+        self.ids = None
+        self.index = None
+    
+    # writing
+    def write(self, ids, objs):
+        """Write dumped objects to the file.
+        
+        Args:
+            ids: IDs of the objects that were dumped in the order they were input.
+            objs: A dictionary of {id: attribute dictionary} for the dumped objects
+                and the objects that they reference. Links between objects should
+                already be replaced by IDs.
+        """
+        records = {}
+        with open(self.filePath, "wb") as outf:
+            outf.write('%s, "version": %d}\n'%(self.headerStart, self.version))
+            for objId, objDict in objs.iteritems():
+                refs, weakRefs = self.getRecordRefs(objDict)
+                records[objId] = {'offset': outf.tell(),
+                                  'type': objDict.get('objectType'),
+                                  'name': objDict.get('name'),
+                                  'refs': refs,
+                                  'weakRefs': weakRefs,
+                                  'meta': self.getRecordMeta(objDict)}
+                record = {'id': objId, 'data': self.encodeValue(objDict)}
+                outf.write(json.dumps(record, separators=(',', ':')) + "\n")
+            indexOffset = outf.tell()
+            outf.write(json.dumps({'ids': ids, 'records': records}, separators=(',', ':')) + "\n")
+            outf.write(self.indexPointer%indexOffset)
+    
+    def getRecordRefs(self, objDict):
+        """Return IDs that a record needs to be loaded (refs) and IDs that it only
+        points to (weakRefs) such as the adjacent surface of an interior wall."""
+        refs, weakRefs = [], []
+        objectType = objDict.get('objectType')
+        if objectType == 'HBZone':
+            refs.extend(objDict['surfaces'])
+            refs.append(objDict['HVACSystem'])
+        elif objectType == 'HBHvac':
+            for key in ('airDetails', 'heatingDetails', 'coolingDetails'):
+                if objDict[key] != None: refs.append(objDict[key])
+        elif objectType == 'HBSurface':
+            if objDict.get('parent') != None: refs.append(objDict['parent'])
+            childSrfs = objDict.get('childSrfs')
+            if isinstance(childSrfs, list):
+                refs.extend([childId for childId in childSrfs if isinstance(childId, basestring)])
+            BCObject = objDict.get('BCObject')
+            if isinstance(BCObject, basestring) and str(objDict.get('BC')).lower() == 'surface':
+                weakRefs.append(BCObject)
+        return refs, weakRefs
+    
+    def getRecordMeta(self, objDict):
+        """Return values that can be used to select records without reading them."""
+        meta = {}
+        for key in ('bldgProgram', 'zoneProgram', 'type', 'BC', 'isConditioned'):
+            value = objDict.get(key)
+            if isinstance(value, (basestring, int, float)): meta[key] = value
+        geometry = objDict.get('geometry')
+        if isinstance(geometry, rc.Geometry.GeometryBase):
+            bb = geometry.GetBoundingBox(True)
+            meta['minZ'] = bb.Min.Z
+            meta['maxZ'] = bb.Max.Z
+        return meta
+    
+    def encodeValue(self, value):
+        if value is None or isinstance(value, (bool, int, long, float, basestring)):
+            return value
+        elif isinstance(value, list):
+            return [self.encodeValue(item) for item in value]
+        elif isinstance(value, tuple):
+            return {'__hb__': 'tuple', 'items': [self.encodeValue(item) for item in value]}
+        elif isinstance(value, dict):
+            if '__hb__' not in value and all(isinstance(key, basestring) for key in value):
+                return dict((key, self.encodeValue(item)) for key, item in value.iteritems())
+            return {'__hb__': 'dict', 'items': [[self.encodeValue(key), self.encodeValue(item)] \
+                for key, item in value.iteritems()]}
+        elif isinstance(value, rc.Geometry.Point3d):
+            return {'__hb__': 'Point3d', 'xyz': [value.X, value.Y, value.Z]}
+        elif isinstance(value, rc.Geometry.Vector3d):
+            return {'__hb__': 'Vector3d', 'xyz': [value.X, value.Y, value.Z]}
+        elif isinstance(value, rc.Geometry.Mesh):
+            return self.encodeMesh(value)
+        elif isinstance(value, rc.Geometry.Brep):
+            encoded = self.encodeBrep(value)
+            if encoded != None: return encoded
+        # anything else (curved breps, planes, ...) is pickled the way older files were
+        return {'__hb__': 'pickle', 'data': base64.b64encode(pickle.dumps(value))}
+    
+    def encodeBrep(self, brep):
+        """Return the faces of a brep as vertex loops or None if the brep has
+        curved faces or curved edges."""
+        tol = sc.doc.ModelAbsoluteTolerance
+        faces = []
+        for face in brep.Faces:
+            if not face.IsPlanar(tol): return None
+            loops = []
+            for loop in face.Loops:
+                success, polyline = loop.To3dCurve().TryGetPolyline()
+                if not success: return None
+                pts = [[pt.X, pt.Y, pt.Z] for pt in polyline]
+                if loop.LoopType == rc.Geometry.BrepLoopType.Outer: loops.insert(0, pts)
+                else: loops.append(pts)
+            faces.append({'loops': loops, 'normal': self.getFaceNormal(face)})
+        return {'__hb__': 'Brep', 'faces': faces}
+    
+    def getFaceNormal(self, face):
+        normal = face.NormalAt(face.Domain(0).Mid, face.Domain(1).Mid)
+        if face.OrientationIsReversed: normal.Reverse()
+        return [normal.X, normal.Y, normal.Z]
+    
+    def encodeMesh(self, mesh):
+        vertices = []
+        for pt in mesh.Vertices: vertices.extend((float(pt.X), float(pt.Y), float(pt.Z)))
+        faces = []
+        for face in mesh.Faces: faces.extend((face.A, face.B, face.C, face.D))
+        return {'__hb__': 'Mesh', 'vertices': vertices, 'faces': faces}
+    
+    # reading
+    @classmethod
+    def isObjectFile(cls, filePath):
+        """Check if a file is written in this format rather than pickled by older versions."""
+        with open(filePath, "rb") as inf:
+            return inf.read(len(cls.headerStart)) == cls.headerStart
+    
+    def readIndex(self):
+        """Read the header and the index of the file."""
+        with open(self.filePath, "rb") as inf:
+            header = json.loads(inf.readline())
+            if header.get('format') != self.formatName:
+                raise ValueError("%s is not a Honeybee objects file."%self.filePath)
+            if header['version'] > self.version:
+                raise ValueError("%s is written by a newer version of Honeybee.\n"%self.filePath + \
+                    "Update Honeybee to load this file.")
+            inf.seek(-self.indexPointerLength, 2)
+            pointer = inf.read()
+            if not pointer.startswith("HBINDEX "):
+                raise ValueError("%s is incomplete. The index is missing."%self.filePath)
+            inf.seek(int(pointer[8:]))
+            index = json.loads(inf.readline())
+        self.header = header
+        self.ids = index['ids']
+        self.index = index['records']
+    
+    def selectIds(self, objectType='HBZone', filterFunc=None):
+        """Select records from the index.
+        
+        Args:
+            objectType: Type of the records (e.g. HBZone, HBSurface). Use None for all types.
+            filterFunc: An optional function that takes the index entry of a record
+                and returns True for records that should be selected. The entry
+                has name, type, refs and meta. For zones meta includes bldgProgram,
+                zoneProgram and minZ/maxZ of the geometry in meters.
+        Returns:
+            A list of record IDs in file order.
+        """
+        if self.index == None: self.readIndex()
+        selected = [(entry['offset'], objId) for objId, entry in self.index.iteritems() \
+            if (objectType == None or entry['type'] == objectType) and (filterFunc == None or filterFunc(entry))]
+        selected.sort()
+        return [objId for offset, objId in selected]
+    
+    def getRequiredIds(self, ids):
+        """Return IDs of records that should be read to load the objects in ids.
+        Library records are always included."""
+        if self.index == None: self.readIndex()
+        required = set()
+        toCheck = list(ids)
+        while toCheck:
+            objId = toCheck.pop()
+            if objId in required: continue
+            required.add(objId)
+            toCheck.extend(self.index[objId]['refs'])
+        for objId, entry in self.index.iteritems():
+            if entry['type'] in self.libraryTypes: required.add(objId)
+        return required
+    
+    def iterRecords(self, ids=None):
+        """Yield (id, attribute dictionary) for records one at a time.
+        
+        Args:
+            ids: An optional collection of record IDs. By default all records
+                are read in the order they are written.
+        """
+        if self.index == None: self.readIndex()
+        with open(self.filePath, "rb") as inf:
+            if ids == None:
+                inf.readline()
+                offsets = sorted(entry['offset'] for entry in self.index.itervalues())
+                for offset in offsets:
+                    record = json.loads(inf.readline())
+                    yield record['id'], self.decodeValue(record['data'])
+            else:
+                for offset in sorted(self.index[objId]['offset'] for objId in ids):
+                    inf.seek(offset)
+                    record = json.loads(inf.readline())
+                    yield record['id'], self.decodeValue(record['data'])
+    
+    def readData(self, ids=None):
+        """Read objects into the {'ids': ids, 'objs': objs} dictionary that
+        Load Honeybee Objects uses.
+        
+        Args:
+            ids: Optional IDs of the objects to load (e.g. from selectIds).
+                Records that these objects need are loaded too. Adjacent surfaces
+                in objects that are not selected are not loaded. By default all
+                the objects in the file are loaded.
+        """
+        if self.index == None: self.readIndex()
+        if ids == None:
+            return {'ids': self.ids, 'objs': dict(self.iterRecords())}
+        ids = list(ids)
+        return {'ids': ids, 'objs': dict(self.iterRecords(self.getRequiredIds(ids)))}
+    
+    def decodeValue(self, value):
+        if isinstance(value, list):
+            return [self.decodeValue(item) for item in value]
+        elif not isinstance(value, dict):
+            return value
+        
+        hbType = value.get('__hb__')
+        if hbType == None:
+            return dict((str(key), self.decodeValue(item)) for key, item in value.iteritems())
+        elif hbType == 'tuple':
+            return tuple(self.decodeValue(item) for item in value['items'])
+        elif hbType == 'dict':
+            return dict((self.decodeValue(key), self.decodeValue(item)) for key, item in value['items'])
+        elif hbType == 'Point3d':
+            return rc.Geometry.Point3d(*value['xyz'])
+        elif hbType == 'Vector3d':
+            return rc.Geometry.Vector3d(*value['xyz'])
+        elif hbType == 'Mesh':
+            return self.decodeMesh(value)
+        elif hbType == 'Brep':
+            return self.decodeBrep(value)
+        elif hbType == 'pickle':
+            return pickle.loads(base64.b64decode(value['data']))
+        else:
+            raise ValueError("Unknown value type in %s: %s"%(self.filePath, hbType))
+    
+    def decodeBrep(self, value):
+        faces = []
+        for faceData in value['faces']:
+            curves = [rc.Geometry.Polyline([rc.Geometry.Point3d(*pt) for pt in loop]).ToNurbsCurve() \
+                for loop in faceData['loops']]
+            faceBrep = rc.Geometry.Brep.CreatePlanarBreps(curves)[0]
+            normal = rc.Geometry.Vector3d(*faceData['normal'])
+            if normal * rc.Geometry.Vector3d(*self.getFaceNormal(faceBrep.Faces[0])) < 0:
+                faceBrep.Flip()
+            faces.append(faceBrep)
+        
+        if len(faces) == 1: return faces[0]
+        joined = rc.Geometry.Brep.JoinBreps(faces, sc.doc.ModelAbsoluteTolerance)
+        if joined != None and len(joined) == 1: return joined[0]
+        brep = rc.Geometry.Brep()
+        for faceBrep in faces: brep.Append(faceBrep)
+        return brep
+    
+    def decodeMesh(self, value):
+        mesh = rc.Geometry.Mesh()
+        vertices = value['vertices']
+        for i in xrange(0, len(vertices), 3):
+            mesh.Vertices.Add(vertices[i], vertices[i + 1], vertices[i + 2])
+        faces = value['faces']
+        for i in xrange(0, len(faces), 4):
+            mesh.Faces.AddFace(faces[i], faces[i + 1], faces[i + 2], faces[i + 3])
+        mesh.Normals.ComputeNormals()
+        return mesh
+
 class hb_hvacProperties(object):
     def __init__(self):
         
@@ -8705,7 +11361,7 @@ class hb_hvacProperties(object):
         error = None
         schedule= schedule.upper()
         
-        if schedule!=None and not schedule.lower().endswith(".csv") and schedule not in sc.sticky["honeybee_ScheduleLib"].keys():
+        if schedule!=None and not schedule.lower().endswith(".csv") and schedule not in sc.sticky["honeybee_ScheduleLib"]:
             error = "Cannot find " + schedule + " in Honeybee schedule library."
             return False, error
         elif schedule!=None and schedule.lower().endswith(".csv"):
@@ -9361,7 +12017,10 @@ class hb_NonConvexChecking(object):
         return (check, faultyGeometry)
 
 
+startupProfile = hb_StartupProfile()
+
 checkIn = CheckIn(defaultFolder_)
+startupProfile.mark("check in")
 
 letItFly = True
 
@@ -9377,6 +12036,7 @@ try:
 except:
     # no internet connection
     downloadTemplate = False
+startupProfile.mark("check for updates")
 
 GHPythonTargetVersion = "0.6.0.3"
 
@@ -9396,7 +12056,9 @@ if checkIn.letItFly:
     if not sc.sticky.has_key("honeybee_release") or True:
         w = gh.GH_RuntimeMessageLevel.Warning
         sc.sticky["honeybee_release"] = versionCheck()
+        startupProfile.mark("version check")
         folders = hb_findFolders()
+        startupProfile.mark("find tool folders")
         
         # Function to sort vrsions of software
         def getversion(filePath):
@@ -9530,6 +12192,7 @@ if checkIn.letItFly:
         sc.sticky["honeybee_folders"]["OSQtPath"] = QtFolder
         sc.sticky["honeybee_folders"]["EPPath"] = folders.EPPath  
         sc.sticky["honeybee_folders"]["EPVersion"] = EPVersion.replace("-", ".")[1:]
+        startupProfile.mark("EnergyPlus and OpenStudio")
         
         
         # Check for an installation of Radiance.
@@ -9567,6 +12230,7 @@ if checkIn.letItFly:
         
         sc.sticky["honeybee_folders"]["RADPath"] = folders.RADPath
         sc.sticky["honeybee_folders"]["RADLibPath"] = hb_RADLibPath
+        startupProfile.mark("Radiance")
         
         
         # Check for installation of DAYSIM
@@ -9598,6 +12262,7 @@ if checkIn.letItFly:
         sc.sticky["honeybee_folders"]["DSPath"] = folders.DSPath
         sc.sticky["honeybee_folders"]["DSCorePath"] = hb_DSCore
         sc.sticky["honeybee_folders"]["DSLibPath"] = hb_DSLibPath
+        startupProfile.mark("Daysim")
         
         
         # Check for an installation of THERM.
@@ -9648,6 +12313,7 @@ if checkIn.letItFly:
         
         sc.sticky["honeybee_folders"]["THERMPath"] = folders.THERMPath
         sc.sticky["honeybee_folders"]["ThermSettings"] = THERMSettingsFile
+        startupProfile.mark("THERM")
         
         
         # initiate an empty library in case this is the first time honeybee is flying in this document
@@ -9659,6 +12325,7 @@ if checkIn.letItFly:
         # set up radiance materials
         RADMaterialAux = RADMaterialAux(True, sc.sticky["honeybee_RADMaterialLib"], sc.sticky["Honeybee_DefaultFolder"])
         sc.sticky["honeybee_RADMaterialAUX"] = RADMaterialAux
+        startupProfile.mark("Radiance materials")
         
         # Download EP libraries
         templateFilesPrep = PrepareTemplateEPLibFiles(downloadTemplate)
@@ -9667,40 +12334,26 @@ if checkIn.letItFly:
                   "Download the files from address below and copy them to: " + sc.sticky["Honeybee_DefaultFolder"] + \
                   "\nhttps://github.com/mostaphaRoudsari/Honeybee/tree/master/resources\n"
         if libFilePaths != -1:
-            EPLibs = HB_GetEPLibraries()
-            
-            try:
-                for pathCount, path in enumerate(libFilePaths):
-                    if "honeybee_Hive" not in sc.sticky:
-                        # This is first time loading so clean the library
-                        cleanLibs = True if pathCount == 0 else False
-                    else:
-                        cleanLibs = False
-                    if path.endswith('.csv'): isMatFile = True
-                    else: isMatFile = False
-                    
-                    EPLibs.importEPLibrariesFromFile(path, isMatFile, cleanLibs, False)                
-                
-                EPLibs.report()
-                sc.sticky["honeybee_materialLib"].update(EPLibs.getEPMaterials())
-                sc.sticky["honeybee_windowMaterialLib"].update(EPLibs.getEPWindowMaterial())
-                sc.sticky ["honeybee_constructionLib"].update(EPLibs.getEPConstructions())
-                sc.sticky["honeybee_ScheduleLib"].update(EPLibs.getEPSchedule())
-                sc.sticky["honeybee_ScheduleTypeLimitsLib"].update(EPLibs.getEPScheduleTypeLimits())
-                sc.sticky["honeybee_thermMaterialLib"].update(EPLibs.getTHERMMaterials())
-                sc.sticky["honeybee_WindowPropLib"].update(EPLibs.getEPWindowProp())
-                sc.sticky["honeybee_SpectralDataLib"].update(EPLibs.getEPSpectralData())
-            except:
-                print msg
-                ghenv.Component.AddRuntimeMessage(w, msg)
+            # This is first time loading so clean the library
+            cleanLibs = "honeybee_Hive" not in sc.sticky
+            # the libraries are loaded the first time a component uses them
+            hb_EPLibrary.deferLoading(lambda: templateFilesPrep.loadLibraries(libFilePaths, cleanLibs, msg), msg)
+            invalidFiles = templateFilesPrep.checkLibraryFiles(libFilePaths)
+            if len(invalidFiles) != 0:
+                invalidMsg = msg + "These files are missing or empty:\n" + "\n".join(invalidFiles)
+                print invalidMsg
+                ghenv.Component.AddRuntimeMessage(w, invalidMsg)
         else:
+            hb_EPLibrary.setLoadFailure(msg)
             print msg
             ghenv.Component.AddRuntimeMessage(w, msg)
+        startupProfile.mark("EnergyPlus templates")
         
         
         sc.sticky["honeybee_Hive"] = hb_Hive
         sc.sticky["honeybee_generationHive"] = generationhb_hive
         sc.sticky["honeybee_GetEPLibs"] = HB_GetEPLibraries
+        sc.sticky["honeybee_EPLibrary"] = hb_EPLibrary
         sc.sticky["honeybee_DefaultMaterialLib"] = materialLibrary
         sc.sticky["honeybee_DefaultSurfaceLib"] = EPSurfaceLib
         sc.sticky["honeybee_EPMaterialAUX"] = EPMaterialAux
@@ -9717,6 +12370,8 @@ if checkIn.letItFly:
         sc.sticky["honeybee_ThermBC"] = thermBC
         sc.sticky["honeybee_ThermDefault"] = thermDefaults
         sc.sticky["honeybee_ViewFactors"] = viewFactorInfo
+        sc.sticky["honeybee_MeshBVH"] = hb_MeshBVH
+        sc.sticky["honeybee_SkyHitMatrix"] = hb_SkyHitMatrix
         sc.sticky["PVgen"] = PV_gen
         sc.sticky["PVinverter"] = PVinverter
         sc.sticky["HB_generatorsystem"] = HB_generatorsystem
@@ -9737,13 +12392,23 @@ if checkIn.letItFly:
         sc.sticky["honeybee_DLAnalysisRecipe"] = DLAnalysisRecipe
         sc.sticky["honeybee_MeshToRAD"] = hb_MSHToRAD
         sc.sticky["honeybee_WriteRAD"] = hb_WriteRAD
+        sc.sticky["honeybee_OctreeCache"] = hb_OctreeCache
         sc.sticky["honeybee_WriteRADAUX"] = hb_WriteRADAUX
         sc.sticky["honeybee_WriteDS"] = hb_WriteDS
         sc.sticky["honeybee_RADParameters"] = hb_RADParameters
         sc.sticky["honeybee_DSParameters"] = hb_DSParameters
         sc.sticky["honeybee_ReadAnnualResultsAux"] = hb_ReadAnnualResultsAux
+        sc.sticky["honeybee_IllFileCache"] = hb_IllFileCache
+        sc.sticky["honeybee_AnnualIllResults"] = hb_AnnualIllResults
+        sc.sticky["honeybee_DynamicShadingResolver"] = hb_DynamicShadingResolver
+        sc.sticky["honeybee_AnnualDaylightMetrics"] = hb_AnnualDaylightMetrics
+        sc.sticky["honeybee_MicroclimateMatrix"] = hb_MicroclimateMatrix
+        sc.sticky["honeybee_MicroclimateMatrixWriter"] = hb_MicroclimateMatrixWriter
         sc.sticky["honeybee_EPParameters"] = hb_EnergySimulatioParameters
+        sc.sticky["honeybee_EPCSVReader"] = hb_EPCSVReader
+        sc.sticky["honeybee_EPESOReader"] = hb_EPESOReader
         sc.sticky["honeybee_SerializeObjects"] = SerializeObjects
+        sc.sticky["honeybee_ObjectFile"] = hb_ObjectFile
         sc.sticky["honeybee_GridBasedDLResults"] = CalculateGridBasedDLAnalysisResults
         sc.sticky["honeybee_DLAnalaysisTypes"] = {0: ["0: illuminance" , "lux"],
                                                   1: ["1: radiation" , "wh/m2"],
@@ -9754,6 +12419,9 @@ if checkIn.letItFly:
                                                   5: ["5: annual analysis", "var"]}
         sc.sticky["honeybee_NonConvexChecking"] = hb_NonConvexChecking
         sc.sticky["honeybee_ConversionFactor"] = checkUnits()
+        sc.sticky["honeybee_StartupProfile"] = startupProfile
+        startupProfile.mark("register classes")
+        print startupProfile.report()
         
         # done! sharing the happiness.
         print "Hooohooho...Flying!!\nVviiiiiiizzz..."
@@ -41,7 +41,7 @@ Provided by Honeybee 0.0.63
         ============: ...
         parallel_: Set to "True" to run the calculation with multiple cores and "False" to run it with a single core.  Multiple cores can increase the speed of the calculation substantially and is recommended if you are not running other big or important processes.  The default is set to "True."
         _buildMesh: Set boolean to "True" to generate a mesh based on your zones and the input distFromFloorOrSrf_ and gridSize_.  This is a necessary step before calculating view factors from each test point to the surrounding zone surfaces.
-        _runIt: Set boolean to "True" to run the component and calculate viewFactors from each test point to surrounding surfaces.
+        _runIt: Set boolean to "True" to run the component and calculate viewFactors from each test point to surrounding surfaces.  Zones whose geometry, gridSize_ and viewResolution_ have not changed since the last run are recalled instead of being calculated again and a change to only the window transmissivities does not require any new rays to be traced.
     Returns:
         readMe!: ...
         ==========: ...
@@ -58,7 +58,7 @@ Provided by Honeybee 0.0.63
 
 ghenv.Component.Name = "Honeybee_Indoor View Factor Calculator"
 ghenv.Component.NickName = 'IndoorViewFactor'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
@@ -76,9 +76,9 @@ from Grasshopper.Kernel.Data import GH_Path
 import Rhino as rc
 import rhinoscriptsyntax as rs
 import scriptcontext as sc
-import operator
 import System.Threading.Tasks as tasks
 import time
+import hashlib
 
 w = gh.GH_RuntimeMessageLevel.Warning
 tol = sc.doc.ModelAbsoluteTolerance
@@ -1217,10 +1217,7 @@ def checkViewResolution(viewResolution, lb_preparation):
     
     return newVecs, skyViewVecs, newVecsAreas, skyViewVecsAreas
 
-def allSame(items):
-    return all(x == items[0] for x in items)
-
-def parallel_projection(zoneSrfsMesh, viewVectors, pointList):
+def parallel_projection(zoneSrfsMesh, viewVectors, pointList, runParallel=True):
     #Placeholder for the outcome of the parallel projection.
     pointIntList = []
     for point in pointList: pointIntList.append([])
@@ -1228,106 +1225,85 @@ def parallel_projection(zoneSrfsMesh, viewVectors, pointList):
     #Keep track of the divisor.
     divisor = len(viewVectors)
     
+    #Build one ray tracer for all of the surfaces of the zone and prepare the rays once for all points.
+    zoneTracer = hb_meshBVH.fromMeshes(zoneSrfsMesh)
+    pointRays = zoneTracer.prepareRays(viewVectors)
+    
     def intersect(i):
         point = pointList[i]
-        #Create the rays to be projected from each point.
-        pointRays = []
-        for vec in viewVectors: pointRays.append(rc.Geometry.Ray3d(point, vec))
         
         #Create a list that will hold the intersection hits of each surface
         srfHits = []
-        for srf in zoneSrfsMesh: srfHits.append([])
-        
-        #Perform the intersection of the rays with the mesh.
-        pointIntersectList = []
-        for rayCount, ray in enumerate(pointRays):
-            pointIntersectList.append([])
-            for srf in zoneSrfsMesh:
-                intersect = rc.Geometry.Intersect.Intersection.MeshRay(srf, ray)
-                if intersect == -1: intersect = "N"
-                pointIntersectList[rayCount].append(intersect)
+        for srf in zoneSrfsMesh: srfHits.append(0)
         
-        #Find the intersection that was the closest for each ray.
-        for list in pointIntersectList:
-            if allSame(list) == False:
-                minIndex, minValue = min(enumerate(list), key=operator.itemgetter(1))
-                srfHits[minIndex].append(1)
+        #Find the surface that was the closest for each ray.
+        for srfIndex in zoneTracer.nearestHits((point.X, point.Y, point.Z), pointRays):
+            if srfIndex != -1: srfHits[srfIndex] += 1
         
-        #Sum up the lists and divide by the total rays to get the view factor.
-        for hitList in srfHits:
-            pointIntList[i].append(sum(hitList)/divisor)
+        #Divide the hits by the total rays to get the view factor.
+        for hitCount in srfHits:
+            pointIntList[i].append(hitCount/divisor)
     
-    tasks.Parallel.ForEach(range(len(pointList)), intersect)
+    if runParallel: tasks.Parallel.ForEach(range(len(pointList)), intersect)
+    else:
+        for i in range(len(pointList)): intersect(i)
     
     return pointIntList
 
 
-def parallel_skyProjection(zoneOpaqueMesh, skyViewVecs, skyViewVecsAreas, pointList, zoneWindowMesh, zoneWindowTransmiss, zoneHasWindows, zoneWindowNames):
-    #Placeholder for the outcome of the parallel projection.
-    pointIntList = []
-    skyBlockedList = []
-    skyBlockWindowNameCount = []
-    for num in range(len(pointList)):
-        pointIntList.append(0.0)
-        skyBlockedList.append([])
-        skyBlockWindowNameCount.append([])
+def parallel_skyProjection(zoneOpaqueMesh, skyViewVecs, pointList, zoneWindowMesh, zoneHasWindows, runParallel=True):
+    #Build the ray tracers for the opaque and the window meshes and prepare the rays once for all points.
+    opaqueTracer = hb_meshBVH.fromMeshes(zoneOpaqueMesh)
+    windowTracer = hb_meshBVH.fromMeshes(zoneWindowMesh)
+    skyRays = opaqueTracer.prepareRays(skyViewVecs)
     
-    #Keep track of the divisor.
-    divisor = len(skyViewVecs)
+    #The window hits of the rays are kept in a compact matrix.  The points are traced in chunks so that only the chunk's ray lists are in memory.
+    skyHits = hb_skyHitMatrix(len(skyViewVecs), zoneHasWindows == 2)
+    chunkSize = 1000
     
     def intersect(i):
-        point = pointList[i]
-        #Create the rays to be projected from each point.
-        pointRays = []
-        for vec in skyViewVecs: pointRays.append(rc.Geometry.Ray3d(point, vec))
-        
-        #Perform the intersection of the rays with the opaque mesh.
-        pointIntersectList = []
-        for rayCount, ray in enumerate(pointRays):
-            pointIntersectList.append([])
-            for srf in zoneOpaqueMesh:
-                intersect = rc.Geometry.Intersect.Intersection.MeshRay(srf, ray)
-                if intersect == -1: pass
-                else: pointIntersectList[rayCount].append(1)
-        
-        #See if the ray passed all of the context meshes.
-        finalIntersectList = []
-        for ray in pointRays:
-            finalIntersectList.append([])
-        for listCt, rayList in enumerate(pointIntersectList):
-            for intersect in rayList:
-                finalIntersectList[listCt].append(intersect)
+        point = pointList[chunkStart + i]
+        origin = (point.X, point.Y, point.Z)
         
-        finalViewCount = []
-        finalWindowNameCount = []
-        for rayListCount, rayList in enumerate(finalIntersectList):
-            if sum(rayList) == 0:
-                if zoneHasWindows == 2:
-                    finalViewCount.append(1)
-                    finalWindowNameCount.append(0)
-                else:
-                    transmiss = 1
-                    winNameList = []
-                    for winCount, winMesh in enumerate(zoneWindowMesh):
-                        intersect = rc.Geometry.Intersect.Intersection.MeshRay(winMesh, pointRays[rayListCount])
-                        if intersect == -1: pass
-                        else:
-                            transmiss = transmiss * zoneWindowTransmiss[winCount]
-                            winNameList.append(zoneWindowNames[winCount].upper())
-                    finalViewCount.append(transmiss)
-                    finalWindowNameCount.append(winNameList)
-            else:
-                finalViewCount.append(0)
-                finalWindowNameCount.append(0)
+        #See if the rays are blocked by any of the opaque meshes.
+        rayBlocked = opaqueTracer.anyHits(origin, skyRays)
         
-        #Sum up the lists and divide by the total rays to get the view factor.
-        skyBlockedList[i] = finalViewCount
-        skyBlockWindowNameCount[i] = finalWindowNameCount
-        pointIntList[i] = sum(finalViewCount)/divisor
+        #Blocked rays are None and the others get the indices of the windows that they pass through.
+        rayHits = []
+        for rayCount, blocked in enumerate(rayBlocked):
+            if blocked: rayHits.append(None)
+            elif zoneHasWindows == 2: rayHits.append([])
+            else: rayHits.append(windowTracer.castRay(origin, skyRays[rayCount], 2))
+        pointRayHits[i] = rayHits
     
-    tasks.Parallel.ForEach(range(len(pointList)), intersect)
+    for chunkStart in range(0, len(pointList), chunkSize):
+        chunkLength = min(chunkSize, len(pointList) - chunkStart)
+        pointRayHits = [None] * chunkLength
+        if runParallel: tasks.Parallel.ForEach(range(chunkLength), intersect)
+        else:
+            for i in range(chunkLength): intersect(i)
+        for rayHits in pointRayHits: skyHits.addPoint(rayHits)
     
-    return pointIntList, skyBlockedList, skyBlockWindowNameCount
+    return skyHits
+
+
+def hashGeometry(md5, item):
+    #Add the coordinates of meshes and points to a hash so that a zone can be recognized between runs.
+    if isinstance(item, (list, tuple)):
+        for subItem in item: hashGeometry(md5, subItem)
+    elif isinstance(item, rc.Geometry.Mesh):
+        md5.update(" ".join(["%.6f,%.6f,%.6f" % (v.X, v.Y, v.Z) for v in item.Vertices]))
+        md5.update(" ".join(["%d,%d,%d,%d" % (f.A, f.B, f.C, f.D) for f in item.Faces]))
+    elif isinstance(item, rc.Geometry.Point3d):
+        md5.update("%.6f,%.6f,%.6f" % (item.X, item.Y, item.Z))
+    else:
+        md5.update(str(item))
+    md5.update(";")
+
+def getZoneKey(*args):
+    md5 = hashlib.md5()
+    for arg in args: hashGeometry(md5, arg)
+    return md5.hexdigest()
 
 def checkOutdoorViewFac(outdoorTestPtViewFactor, testPtSkyView):
     outdoorNonSrfViewFac = []
@@ -1336,128 +1312,50 @@ def checkOutdoorViewFac(outdoorTestPtViewFactor, testPtSkyView):
     return outdoorNonSrfViewFac
 
 
-def skyViewCalc(testPts, zoneOpaqueMesh, skyViewVecs, skyViewVecsAreas, zoneHasWindows, zoneWindowMesh, zoneWindowTransmiss, zoneWindowNames):
+def skyViewCalc(testPts, zoneOpaqueMesh, skyViewVecs, skyViewVecsAreas, zoneHasWindows, zoneWindowMesh, zoneWindowTransmiss, zoneWindowNames, skyCache, settingsKey):
     testPtSkyView = []
     testPtSkyBlockedList = []
     testPtBlockName = []
+    runParallel = parallel_ == True or parallel_ == None
+    newSkyCache = {}
     
     for zoneCount, pointList in enumerate(testPts):
         if zoneHasWindows[zoneCount] > 0:
-            if parallel_ == True or parallel_ == None:
-                skyViewFactors, skyBlockedList, finalWindowNameCount = parallel_skyProjection(zoneOpaqueMesh[zoneCount], skyViewVecs, skyViewVecsAreas, testPts[zoneCount], zoneWindowMesh[zoneCount], zoneWindowTransmiss[zoneCount], zoneHasWindows[zoneCount], zoneWindowNames[zoneCount])
-                testPtSkyView.append(skyViewFactors)
-                testPtSkyBlockedList.append(skyBlockedList)
-                testPtBlockName.append(finalWindowNameCount)
-            else:
-                testPtSkyView.append([])
-                testPtSkyBlockedList.append([])
-                testPtBlockName.append([])
-                for pointCount, point in enumerate(pointList):
-                    #Make the list that will eventually hold the view factors of each surface.
-                    divisor = len(skyViewVecs)
-                    
-                    #Create the rays to be projected from each point.
-                    pointRays = []
-                    for vec in skyViewVecs: pointRays.append(rc.Geometry.Ray3d(point, vec))
-                    
-                    #Perform the intersection of the rays with the opaque mesh.
-                    pointIntersectList = []
-                    for rayCount, ray in enumerate(pointRays):
-                        pointIntersectList.append([])
-                        for srf in zoneOpaqueMesh[zoneCount]:
-                            intersect = rc.Geometry.Intersect.Intersection.MeshRay(srf, ray)
-                            if intersect == -1: pointIntersectList[rayCount].append(0)
-                            else: pointIntersectList[rayCount].append(1)
-                    
-                    #See if the ray passed all of the context meshes.
-                    finalIntersectList = []
-                    for ray in pointRays:
-                        finalIntersectList.append([])
-                    for listCt, rayList in enumerate(pointIntersectList):
-                        for intersect in rayList:
-                            finalIntersectList[listCt].append(intersect)
-                    
-                    finalViewCount = []
-                    finalWindowNameCount = []
-                    for rayListCount, rayList in enumerate(finalIntersectList):
-                        if sum(rayList) == 0:
-                            if zoneHasWindows[zoneCount] == 2:
-                                finalViewCount.append(1) #This is the code to indicate that the point is outside and there is no need to calculate a window transmissivity.
-                                finalWindowNameCount.append(0)
-                            else:
-                                #The ray is not blocked but it is hitting a window and so we need to factor in the window transmissivity.
-                                transmiss = 1
-                                winNameList = []
-                                for winCount, winMesh in enumerate(zoneWindowMesh[zoneCount]):
-                                    intersect = rc.Geometry.Intersect.Intersection.MeshRay(winMesh, pointRays[rayListCount])
-                                    if intersect == -1: pass
-                                    else:
-                                        transmiss = transmiss * zoneWindowTransmiss[zoneCount][winCount]
-                                        winNameList.append(zoneWindowNames[zoneCount][winCount].upper())
-                                finalViewCount.append(transmiss)
-                                finalWindowNameCount.append(winNameList)
-                        else:
-                            #The ray has been blocked by an opaque surface.
-                            finalViewCount.append(0)
-                            finalWindowNameCount.append(0)
-                    
-                    #Sum up the lists and divide by the total rays to get the view factor.
-                    testPtSkyBlockedList[zoneCount].append(finalViewCount)
-                    testPtSkyView[zoneCount].append(sum(finalViewCount)/divisor)
-                    testPtBlockName[zoneCount].append(finalWindowNameCount)
+            #Only trace the rays of zones whose geometry has changed.  New transmissivities only re-weight the stored window hits.
+            zoneKey = getZoneKey(zoneOpaqueMesh[zoneCount], zoneWindowMesh[zoneCount], pointList, zoneHasWindows[zoneCount], settingsKey)
+            if zoneKey in newSkyCache: skyHits = newSkyCache[zoneKey]
+            elif zoneKey in skyCache: skyHits = skyCache[zoneKey]
+            else: skyHits = parallel_skyProjection(zoneOpaqueMesh[zoneCount], skyViewVecs, testPts[zoneCount], zoneWindowMesh[zoneCount], zoneHasWindows[zoneCount], runParallel)
+            newSkyCache[zoneKey] = skyHits
+            
+            #Weight the rays with the window transmissivities.  The matrix reads like a list of per-ray transmissivities for each point.
+            zoneSkyHits = skyHits.setWindows(zoneWindowTransmiss[zoneCount], zoneWindowNames[zoneCount])
+            testPtSkyView.append(zoneSkyHits.getSkyView())
+            testPtSkyBlockedList.append(zoneSkyHits)
+            testPtBlockName.append(zoneSkyHits.nameRows())
         else:
             testPtSkyView.append(0)
             testPtSkyBlockedList.append([range(len(skyViewVecs))])
             testPtBlockName.append([range(len(skyViewVecs))])
     
-    return testPtSkyView, testPtSkyBlockedList, testPtBlockName
+    return testPtSkyView, testPtSkyBlockedList, testPtBlockName, newSkyCache
 
 
-def main(testPts, zoneSrfsMesh, viewVectors, includeOutdoor):
+def main(testPts, zoneSrfsMesh, viewVectors, includeOutdoor, srfCache, settingsKey):
     testPtViewFactor = []
+    runParallel = parallel_ == True or parallel_ == None
+    newSrfCache = {}
     
     for zoneCount, pointList in enumerate(testPts):
-        if parallel_ == True  or parallel_ == None:
-            viewFactors = parallel_projection(zoneSrfsMesh[zoneCount], viewVectors, testPts[zoneCount])
-            testPtViewFactor.append(viewFactors)
-        else:
-            testPtViewFactor.append([])
-            for pointCount, point in enumerate(pointList):
-                #Make the list that will eventually hold the view factors of each surface.
-                testPtViewFactor[zoneCount].append([])
-                divisor = len(viewVectors)
-                
-                #Create the rays to be projected from each point.
-                pointRays = []
-                for vec in viewVectors: pointRays.append(rc.Geometry.Ray3d(point, vec))
-                
-                #Create a list that will hold the intersection hits of each surface
-                srfHits = []
-                for srf in zoneSrfsMesh[zoneCount]: srfHits.append([])
-                
-                #Perform the intersection of the rays with the mesh.
-                pointIntersectList = []
-                for rayCount, ray in enumerate(pointRays):
-                    pointIntersectList.append([])
-                    for srf in zoneSrfsMesh[zoneCount]:
-                        intersect = rc.Geometry.Intersect.Intersection.MeshRay(srf, ray)
-                        if intersect == -1: intersect = "N"
-                        pointIntersectList[rayCount].append(intersect)
-                
-                #Find the intersection that was the closest for each ray.
-                for list in pointIntersectList:
-                    try:
-                        if allSame(list) == False:
-                            minIndex, minValue = min(enumerate(list), key=operator.itemgetter(1))
-                            srfHits[minIndex].append(1)
-                    except: pass
-                
-                #Sum up the lists and divide by the total rays to get the view factor.
-                for hitList in srfHits:
-                    testPtViewFactor[zoneCount][pointCount].append(sum(hitList)/divisor)
+        #Only trace the rays of zones whose geometry has changed.
+        zoneKey = getZoneKey(zoneSrfsMesh[zoneCount], pointList, settingsKey)
+        if zoneKey in newSrfCache: viewFactors = newSrfCache[zoneKey]
+        elif zoneKey in srfCache: viewFactors = srfCache[zoneKey]
+        else: viewFactors = parallel_projection(zoneSrfsMesh[zoneCount], viewVectors, testPts[zoneCount], runParallel)
+        newSrfCache[zoneKey] = viewFactors
+        testPtViewFactor.append([list(ptViewFactors) for ptViewFactors in viewFactors])
     
-    
-    return testPtViewFactor
+    return testPtViewFactor, newSrfCache
 
 
 def computeFloorReflect(testPts, testPtViewFactor, zoneSrfTypes, flrRefList):
@@ -1566,6 +1464,8 @@ if initCheck == True:
         lb_preparation = sc.sticky["ladybug_Preparation"]()
         hb_viewFactor = sc.sticky["honeybee_ViewFactors"]
         hb_hive = sc.sticky["honeybee_Hive"]()
+        hb_meshBVH = sc.sticky["honeybee_MeshBVH"]
+        hb_skyHitMatrix = sc.sticky["honeybee_SkyHitMatrix"]
         checkData, gridSize, distFromFloor, viewResolution, removeInt, sectionMethod, sectionBreps, includeOutdoor, constantTransmis, addShdTransmiss = checkTheInputs()
 
 #Create a mesh of the area to calculate the view factor from.
@@ -1598,8 +1498,21 @@ if checkData == True and buildMesh == True:
 if checkData == True and _runIt == True and geoCheck == True and buildMesh == True:
     start = time.clock()
     viewVectors, skyViewVecs, newVecsAreas, skyViewVecsAreas = checkViewResolution(viewResolution, lb_preparation)
-    testPtViewFactor = main(testPtsInit, zoneSrfsMesh, viewVectors, includeOutdoor)
-    testPtSkyView, testPtBlockedVec, testPtBlockName = skyViewCalc(testPtsInit, zoneOpaqueMesh, skyViewVecs, skyViewVecsAreas, zoneHasWindows, zoneWindowMesh, zoneWindowTransmiss, zoneWindowNames)
+    
+    #Recall the view factors of the zones from the last run of this component so that only changed zones are traced again.
+    cacheKey = "Honeybee_ViewFactorCache_" + ghenv.Component.InstanceGuid.ToString()
+    if not sc.sticky.has_key(cacheKey): sc.sticky[cacheKey] = [{}, {}]
+    srfCache, skyCache = sc.sticky[cacheKey]
+    settingsKey = [gridSize, viewResolution]
+    
+    testPtViewFactor, newSrfCache = main(testPtsInit, zoneSrfsMesh, viewVectors, includeOutdoor, srfCache, settingsKey)
+    testPtSkyView, testPtBlockedVec, testPtBlockName, newSkyCache = skyViewCalc(testPtsInit, zoneOpaqueMesh, skyViewVecs, skyViewVecsAreas, zoneHasWindows, zoneWindowMesh, zoneWindowTransmiss, zoneWindowNames, skyCache, settingsKey)
+    sc.sticky[cacheKey] = [newSrfCache, newSkyCache]
+    
+    tracedZones = len([key for key in newSrfCache if key not in srfCache])
+    tracedSkyZones = len([key for key in newSkyCache if key not in skyCache])
+    print "Surface view factors were traced for " + str(tracedZones) + " of " + str(len(newSrfCache)) + " zones and sky view factors for " + \
+    str(tracedSkyZones) + " of " + str(len(newSkyCache)) + " zones.  The other zones were recalled from the last run."
     
     outdoorNonSrfViewFac = []
     if sectionMethod != 0 and includeOutdoor == True:
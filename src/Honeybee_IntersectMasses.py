@@ -38,7 +38,7 @@ Provided by Honeybee 0.0.63
 """
 ghenv.Component.Name = "Honeybee_IntersectMasses"
 ghenv.Component.NickName = 'IntersectMass'
-ghenv.Component.Message = 'VER 0.0.63\nMAR_26_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "00 | Honeybee"
@@ -238,7 +238,7 @@ if sc.sticky.has_key('ladybug_release')and sc.sticky.has_key('honeybee_release')
         hb_hive = sc.sticky["honeybee_Hive"]()
         try:
             for HZone in _bldgMassesBefore:
-                zone = hb_hive.callFromHoneybeeHive([HZone])[0]
+                zone = hb_hive.callFromHoneybeeHive([HZone], readOnly=True)[0]
                 Hzones = True
         except: pass
     
@@ -24,7 +24,7 @@
 Load Honeybee Objects
 
 Use this component to load Honeybee objects from a file on your system.
-The valid files are created by dump Honeybee objects component.
+The valid files are created by dump Honeybee objects component. Files from older versions of the dump component can still be loaded.
 -
 Provided by Honeybee 0.0.63
 
@@ -38,7 +38,7 @@ Provided by Honeybee 0.0.63
 
 ghenv.Component.Name = "Honeybee_Load Honeybee Objects"
 ghenv.Component.NickName = 'loadHBObjects'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "00 | Honeybee"
@@ -132,7 +132,7 @@ def loadHBObjects(HBData):
         
         # update fields in HBZone
         for key, value in HBZoneData.iteritems():
-            HBZone.__dict__[key] = value
+            setattr(HBZone, key, value)
         
         HBObjects[HBZone.ID] = HBZone
         
@@ -189,6 +189,14 @@ def loadHBObjects(HBData):
                 HBObject.BCObject = outdoorBCObject()
                 
             if HBObject.type!=6 and HBObject.BC.lower() == "surface":
+                if HBObject.BCObject not in HBObjects:
+                    # the adjacent zone is not part of the loaded objects
+                    missingAdjacencies.append(HBObject.name)
+                    HBObject.BC = "Adiabatic"
+                    HBObject.sunExposure = "NoSun"
+                    HBObject.windExposure = "NoWind"
+                    HBObject.BCObject = outdoorBCObject()
+                    continue
                 # replace parent object with ID
                 HBObject.BCObject = HBObjects[HBObject.BCObject]
     
@@ -222,7 +230,13 @@ def loadHBObjects(HBData):
             loadHBSurface(HBO)
     
     #replace ids with objects in surfaces
+    missingAdjacencies = []
     updateHoneybeeObjects()
+    if len(missingAdjacencies) != 0:
+        warning = "%d surfaces are adjacent to zones that are not loaded.\n"%len(missingAdjacencies) + \
+            "Their boundary condition is set to adiabatic."
+        print warning
+        ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, warning)
     
     #Scale everything if units are not meters.
     if sc.sticky["honeybee_ConversionFactor"] != 1:
@@ -246,6 +260,11 @@ def main(filePath):
     if not os.path.isfile(filePath):
         raise ValueError("Can't find %s"%filePath)
     
+    hb_objectFile = sc.sticky["honeybee_ObjectFile"]
+    if hb_objectFile.isObjectFile(filePath):
+        return loadHBObjects(hb_objectFile(filePath).readData())
+    
+    # files from older versions of dump Honeybee objects are pickled
     with open(filePath, "rb") as inf:
         return loadHBObjects(pickle.load(inf))
 
@@ -22,7 +22,7 @@
 
 
 """
-Use this component runs an annual comfort assessment off of EnergyPlus results and write all values into csv files.
+Use this component runs an annual comfort assessment off of EnergyPlus results and write all values into result files.
 The results in these files can be used for creating indoor comfort maps.
 -
 Provided by Honeybee 0.0.63
@@ -35,7 +35,7 @@ Provided by Honeybee 0.0.63
         =============: ...
         analysisPeriodOrHOY_: An analysis period from the 'Ladybug Analysis Period' component or an hour of the analysis between 1 and 8760 for which you want to conduct the analysis. If no value is connected here, the component will run for only noon on the winter solstice.  A single HOY is used by default as longer analysis periods can take a very long time.
         =============: ...
-        writeResultFile_: Set to 1 or 'True' to have the component write all results into CSV result files and set to 0 or 'False' to not have the component write these files.  The default is set to 'True' as these simulations can be long and you usually want a copy of your results.  You may want to set it to 'False' if you are just scrolling through key hours and want the fastest run possible.  Set to 2 if you want the component to only write the results of the last two matrices (comfort results and degFromTarget).
+        writeResultFile_: Set to 1 or 'True' to have the component write all results into result files and set to 0 or 'False' to not have the component write these files.  The default is set to 'True' as these simulations can be long and you usually want a copy of your results.  You may want to set it to 'False' if you are just scrolling through key hours and want the fastest run possible.  Set to 2 if you want the component to only write the results of the last two matrices (comfort results and degFromTarget).  Result files are written as compact binary .hbmtx files that the 'Honeybee_Read Microclimate Matrix' component can read hour by hour without loading the whole file.  These files are written during the analysis one week of hours at a time so, if the analysis is stopped, running the component again with the same inputs will resume it from the last saved week.  Set to 3 to write all results into CSV files instead or set to 4 to only write the last two matrices into CSV files.
         parallel_: Set to "True" to run the component using multiple CPUs.  This can dramatically decrease calculation time but can interfere with other intense computational processes that might be running on your machine.  For this reason, the default is set to 'False.'
         _runIt: Set boolean to "True" to run the component and generate files for an annual indoor comfort assessment.
     Returns:
@@ -47,17 +47,17 @@ Provided by Honeybee 0.0.63
         adaptComfMtx: A python matrix containing adaptive comfort data for every hour of the analysis to be plugged into the 'Honeybee_Visualize Annual Comfort Results' component.
         degFromTargetMtx: A python matrix containing degrees from tartget temperature data for every hour of the analysis to be plugged into the 'Honeybee_Visualize Annual Comfort Results' component.
         ===============: ...
-        radTempResult: A csv file address containing the radiant temperature resultsfor each point for every hour of the analysis.
-        airTempResult: A csv file address containing the air temperature results for each point for every hour of the analysis.
-        operativeTempResult: A csv file address containing the operative temperature results for each point for every hour of the analysis.
-        adaptComfResult: A csv file address containing the a series of 0's and 1's indicating whether a certain point is comfortable for every hour of the analysis.
-        degFromTargetResult: A csv file address containing the a series of numbers indicating the degrees that a certain point is from the neutral temperature for every hour of the analysis.
+        radTempResult: A result file address containing the radiant temperature resultsfor each point for every hour of the analysis.
+        airTempResult: A result file address containing the air temperature results for each point for every hour of the analysis.
+        operativeTempResult: A result file address containing the operative temperature results for each point for every hour of the analysis.
+        adaptComfResult: A result file address containing the a series of 0's and 1's indicating whether a certain point is comfortable for every hour of the analysis.
+        degFromTargetResult: A result file address containing the a series of numbers indicating the degrees that a certain point is from the neutral temperature for every hour of the analysis.
 
 """
 
 ghenv.Component.Name = "Honeybee_Microclimate Map Analysis"
 ghenv.Component.NickName = 'MicroclimateMap'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
@@ -77,7 +77,18 @@ import Rhino as rc
 import scriptcontext as sc
 import math
 import os
+import array
+import bisect
+import json
+import hashlib
+import threading
+import collections
 import System.Threading.Tasks as tasks
+try:
+    import numpy
+except ImportError:
+    # IronPython
+    numpy = None
 
 
 w = gh.GH_RuntimeMessageLevel.Warning
@@ -94,11 +105,11 @@ outputsDictAdapt = {
 5: ["adaptComfMtx", "A python matrix containing adaptive comfort data for every hour of the analysis to be plugged into the 'Honeybee_Visualize Annual Comfort Results' component."],
 6: ["degFromTargetMtx", "A python matrix containing degrees from tartget temperature data for every hour of the analysis to be plugged into the 'Honeybee_Visualize Annual Comfort Results' component."],
 7: ["===============", "..."],
-8: ["radTempResult", "A csv file address containing the radiant temperature resultsfor each point for every hour of the analysis."],
-9: ["airTempResult", "A csv file address containing the air temperature results for each point for every hour of the analysis."],
-10: ["operativeTempResult", "A csv file address containing the operative temperature results for each point for every hour of the analysis."],
-11: ["adaptComfResult", "A csv file address containing the a series of 0's and 1's indicating whether a certain point is comfortable for every hour of the analysis."],
-12: ["degFromTargetResult", "A csv file address containing the a series of numbers indicating the degrees that a certain point is from the neutral temperature for every hour of the analysis."]
+8: ["radTempResult", "A result file address containing the radiant temperature resultsfor each point for every hour of the analysis."],
+9: ["airTempResult", "A result file address containing the air temperature results for each point for every hour of the analysis."],
+10: ["operativeTempResult", "A result file address containing the operative temperature results for each point for every hour of the analysis."],
+11: ["adaptComfResult", "A result file address containing the a series of 0's and 1's indicating whether a certain point is comfortable for every hour of the analysis."],
+12: ["degFromTargetResult", "A result file address containing the a series of numbers indicating the degrees that a certain point is from the neutral temperature for every hour of the analysis."]
 }
 
 outputsDictPMV = {
@@ -111,11 +122,11 @@ outputsDictPMV = {
 5: ["PMVComfMtx", "A python matrix containing PMV comfort data for every hour of the analysis to be plugged into the 'Honeybee_Visualize Annual Comfort Results' component."],
 6: ["PMV_Mtx", "A python matrix containing predicted mean vote (PMV) data for every hour of the analysis to be plugged into the 'Honeybee_Visualize Annual Comfort Results' component."],
 7: ["===============", "..."],
-8: ["radTempResult", "A csv file address containing the radiant temperature resultsfor each point for every hour of the analysis."],
-9: ["airTempResult", "A csv file address containing the air temperature results for each point for every hour of the analysis."],
-10: ["SET_Result", "A csv file address containing the standard effective temperature (SET) results for each point for every hour of the analysis."],
-11: ["PMVComfResult", "A csv file address containing the a series of 0's and 1's indicating whether a certain point is comfortable for every hour of the analysis."],
-12: ["PMV_Result", "A csv file address containing predicted mean vote (PMV) results indicating the distance that a certain point is from the neutral temperature for every hour of the analysis."]
+8: ["radTempResult", "A result file address containing the radiant temperature resultsfor each point for every hour of the analysis."],
+9: ["airTempResult", "A result file address containing the air temperature results for each point for every hour of the analysis."],
+10: ["SET_Result", "A result file address containing the standard effective temperature (SET) results for each point for every hour of the analysis."],
+11: ["PMVComfResult", "A result file address containing the a series of 0's and 1's indicating whether a certain point is comfortable for every hour of the analysis."],
+12: ["PMV_Result", "A result file address containing predicted mean vote (PMV) results indicating the distance that a certain point is from the neutral temperature for every hour of the analysis."]
 }
 
 outputsDictUTCI = {
@@ -128,11 +139,11 @@ outputsDictUTCI = {
 5: ["OutdoorComfMtx", "A python matrix containing outdoor (UTCI) comfort data for every hour of the analysis to be plugged into the 'Honeybee_Visualize Annual Comfort Results' component."],
 6: ["DegFromNeutralMtx", "A python matrix containing the degrees from the neutral UTCI value of 20 C for every hour of the analysis to be plugged into the 'Honeybee_Visualize Annual Comfort Results' component."],
 7: ["===============", "..."],
-8: ["radTempResult", "A csv file address containing the radiant temperature resultsfor each point for every hour of the analysis."],
-9: ["airTempResult", "A csv file address containing the air temperature results for each point for every hour of the analysis."],
-10: ["UTCI_Result", "A csv file address containing universal thermal climate index (UTCI) results for each point for every hour of the analysis."],
-11: ["OutdoorComfResult", "A csv file address containing the a series of 0's and 1's indicating whether a certain point is comfortable for every hour of the analysis."],
-12: ["DegFromNeutralResult", "A csv file address containing the degrees from the neutral UTCI value of 20 C indicating the distance that a certain point is from the neutral temperature for every hour of the analysis."]
+8: ["radTempResult", "A result file address containing the radiant temperature resultsfor each point for every hour of the analysis."],
+9: ["airTempResult", "A result file address containing the air temperature results for each point for every hour of the analysis."],
+10: ["UTCI_Result", "A result file address containing universal thermal climate index (UTCI) results for each point for every hour of the analysis."],
+11: ["OutdoorComfResult", "A result file address containing the a series of 0's and 1's indicating whether a certain point is comfortable for every hour of the analysis."],
+12: ["DegFromNeutralResult", "A result file address containing the degrees from the neutral UTCI value of 20 C indicating the distance that a certain point is from the neutral temperature for every hour of the analysis."]
 }
 
 outputsDictPET = {
@@ -145,11 +156,11 @@ outputsDictPET = {
 5: ["PET_ComfMtx", "A python matrix containing PET comfort data for every hour of the analysis to be plugged into the 'Honeybee_Visualize Annual Comfort Results' component."],
 6: ["PET_CategoryMtx", "A python matrix containing the categories of PET. These are either: -4 = Very Cold, -3 = Cold, -2 = Cool, -1 = Slightly Cool, 0 = Comfortable, 1 = Slightly Warm, 2 = Warm, 3 = Hot, 4 = Very Hot"],
 7: ["===============", "..."],
-8: ["radTempResult", "A csv file address containing the radiant temperature resultsfor each point for every hour of the analysis."],
-9: ["airTempResult", "A csv file address containing the air temperature results for each point for every hour of the analysis."],
-10: ["PET_Result", "A csv file address containing physiological equivalent temperature (PET) results for each point for every hour of the analysis."],
-11: ["PETComfResult", "A csv file address containing the a series of 0's and 1's indicating whether a certain point is comfortable for every hour of the analysis."],
-12: ["PETCategoryResult", "A csv file address containing the categories of PET.   These are either: -4 = Very Cold, -3 = Cold, -2 = Cool, -1 = Slightly Cool, 0 = Comfortable, 1 = Slightly Warm, 2 = Warm, 3 = Hot, 4 = Very Hot"]
+8: ["radTempResult", "A result file address containing the radiant temperature resultsfor each point for every hour of the analysis."],
+9: ["airTempResult", "A result file address containing the air temperature results for each point for every hour of the analysis."],
+10: ["PET_Result", "A result file address containing physiological equivalent temperature (PET) results for each point for every hour of the analysis."],
+11: ["PETComfResult", "A result file address containing the a series of 0's and 1's indicating whether a certain point is comfortable for every hour of the analysis."],
+12: ["PETCategoryResult", "A result file address containing the categories of PET.   These are either: -4 = Very Cold, -3 = Cold, -2 = Cool, -1 = Slightly Cool, 0 = Comfortable, 1 = Slightly Warm, 2 = Warm, 3 = Hot, 4 = Very Hot"]
 }
 
 
@@ -212,7 +223,7 @@ def manageOutput(comfortModel):
             ghenv.Component.Params.Output[input].NickName = "__________"
             ghenv.Component.Params.Output[input].Name = "."
             ghenv.Component.Params.Output[input].Description = " "
-        elif input > 7 and input < 11 and writeResultFile_ == 2:
+        elif input > 7 and input < 11 and (writeResultFile_ == 2 or writeResultFile_ == 4):
             ghenv.Component.Params.Output[input].NickName = "__________"
             ghenv.Component.Params.Output[input].Name = "."
             ghenv.Component.Params.Output[input].Description = " "
@@ -282,42 +293,126 @@ def processPrevailOutdoorTemp(prevailingOutdoorTemp, avgMonthOrRunMean):
     return prevailTemp, coldTimes
 
 
-def calculatePointMRT(srfTempDict, testPtsViewFactor, hour, originalHour, outdoorClac, outSrfTempDict, outdoorNonSrfViewFac, prevailingOutdoorTemp):
-    #Calculate the MRT for each point.
-    pointMRTValues = []
-    for zoneCount, pointList in enumerate(testPtsViewFactor):
-        if outdoorClac == False or zoneCount != len(testPtsViewFactor)-1:
-            pointMRTValues.append([])
-            for pointViewFactor in pointList:
-                pointMRT = 0
-                for srfCount, srfView in enumerate(pointViewFactor):
-                    path  = str([zoneCount,srfCount])
-                    weightedSrfTemp = srfView*(math.pow((srfTempDict[path]["srfTemp"][hour] + 273.15),4))
-                    pointMRT = pointMRT+weightedSrfTemp
-                pointMRT = math.pow(pointMRT,0.25) - 273.15
-                pointMRTValues[zoneCount].append(round(pointMRT, 3))
-        else:
-            pointMRTValues.append([])
+class PointMRTMatrix(object):
+    """Sparse matrix of point-to-surface view factors to compute the MRT of all points at once.
+    
+    The MRT of the points for a set of hours is the view factor matrix (points x surfaces)
+    multiplied by the matrix of surface temperatures to the fourth power (surfaces x hours).
+    Outdoor points get the outdoor temperature as an extra surface, which sees the part of
+    the view that is not covered by surfaces. NumPy is used when it is available and a pure
+    Python computation with arrays is used otherwise (e.g. in IronPython).
+    """
+    
+    def __init__(self, srfTempDict, testPtsViewFactor, outdoorClac, outSrfTempDict, outdoorNonSrfViewFac, outdoorTemp):
+        #The temperature series of every surface and the sparse rows of (surface index, view factor) for each point.
+        self.srfTemps = []
+        self.rows = []
+        self.zonePtCounts = []
+        
+        srfIndices = {}
+        def getSrfIndex(tempDict, path):
+            key = id(tempDict), path
+            if key not in srfIndices:
+                srfIndices[key] = len(self.srfTemps)
+                self.srfTemps.append(tempDict[path]["srfTemp"])
+            return srfIndices[key]
+        
+        for zoneCount, pointList in enumerate(testPtsViewFactor):
+            isOutdoor = outdoorClac == True and zoneCount == len(testPtsViewFactor)-1
+            tempDict = outSrfTempDict if isOutdoor else srfTempDict
+            self.zonePtCounts.append(len(pointList))
             for ptCount, pointViewFactor in enumerate(pointList):
-                pointMRT = 0
+                row = []
                 for srfCount, srfView in enumerate(pointViewFactor):
-                    path  = str([zoneCount,srfCount])
-                    weightedSrfTemp = srfView*(math.pow((outSrfTempDict[path]["srfTemp"][hour]+273.15),4))
-                    pointMRT = pointMRT+weightedSrfTemp
-                
-                weightedSrfTemp = outdoorNonSrfViewFac[ptCount]*(math.pow((prevailingOutdoorTemp[originalHour]+273.15),4))
-                pointMRT = pointMRT+weightedSrfTemp
-                pointMRT = pointMRT / (sum(pointViewFactor) + outdoorNonSrfViewFac[ptCount])
-                pointMRT = math.pow(pointMRT,0.25) - 273.15
-                pointMRTValues[zoneCount].append(round(pointMRT, 3))
+                    if srfView != 0:
+                        row.append((getSrfIndex(tempDict, str([zoneCount,srfCount])), float(srfView)))
+                if isOutdoor:
+                    #Normalize the view factors of the outdoor points with the part of the view that sees the sky.
+                    nonSrfView = outdoorNonSrfViewFac[ptCount]
+                    totalView = sum(pointViewFactor) + nonSrfView
+                    row = [(srfIndex, srfView / totalView) for srfIndex, srfView in row]
+                    if nonSrfView != 0:
+                        if "outdoor" not in srfIndices:
+                            srfIndices["outdoor"] = len(self.srfTemps)
+                            self.srfTemps.append(outdoorTemp)
+                        row.append((srfIndices["outdoor"], nonSrfView / totalView))
+                self.rows.append(row)
+        
+        self.isOutdoorTemp = [False] * len(self.srfTemps)
+        if "outdoor" in srfIndices: self.isOutdoorTemp[srfIndices["outdoor"]] = True
     
-    return pointMRTValues
+    def computeMRT(self, hours, originalHours):
+        """Compute the MRT of all the points for a list of hours.
+        
+        Args:
+            hours: List of indices of the hours in the surface temperature data.
+            originalHours: List of indices of the same hours in the outdoor temperature data.
+        
+        Returns:
+            A list with the MRT values of the points for each hour, grouped by zone.
+        """
+        if numpy is not None:
+            mrtByHour = self.computeMRTNumpy(hours, originalHours)
+        else:
+            mrtByHour = [self.computeHourMRTArray(hour, originalHour) for hour, originalHour in zip(hours, originalHours)]
+        
+        return [self.groupByZone(hourMRT) for hourMRT in mrtByHour]
+    
+    def computeHourMRT(self, hour, originalHour):
+        """Compute the MRT of all the points for a single hour without NumPy.
+        
+        This is used inside the parallel loop over the hours so each hour only
+        keeps its own row in memory.
+        """
+        return self.groupByZone(self.computeHourMRTArray(hour, originalHour))
+    
+    def groupByZone(self, hourMRT):
+        zoneMRT = []
+        start = 0
+        for ptCount in self.zonePtCounts:
+            zoneMRT.append(hourMRT[start:start+ptCount])
+            start += ptCount
+        return zoneMRT
+    
+    def getHourIndices(self, srfCount, hours, originalHours):
+        if self.isOutdoorTemp[srfCount]: return originalHours
+        return hours
+    
+    def computeMRTNumpy(self, hours, originalHours):
+        viewFactors = numpy.zeros((len(self.rows), len(self.srfTemps)))
+        for ptCount, row in enumerate(self.rows):
+            for srfIndex, srfView in row: viewFactors[ptCount, srfIndex] = srfView
+        
+        srfTemp4 = numpy.empty((len(self.srfTemps), len(hours)))
+        for srfCount, srfTemp in enumerate(self.srfTemps):
+            hourIndices = self.getHourIndices(srfCount, hours, originalHours)
+            srfTemp4[srfCount] = numpy.asarray(srfTemp, dtype=float)[hourIndices]
+        srfTemp4 = (srfTemp4 + 273.15) ** 4
+        
+        pointMRT = numpy.round(numpy.dot(viewFactors, srfTemp4) ** 0.25 - 273.15, 3)
+        return pointMRT.T.tolist()
+    
+    def computeHourMRTArray(self, hour, originalHour):
+        srfTemp4 = array.array('d', [(srfTemp[originalHour if self.isOutdoorTemp[srfCount] else hour] + 273.15) ** 4 \
+            for srfCount, srfTemp in enumerate(self.srfTemps)])
+        return [round(sum([srfView * srfTemp4[srfIndex] for srfIndex, srfView in row]) ** 0.25 - 273.15, 3) for row in self.rows]
 
 def computeHourShadeDrawing(hour, testPtSkyView, testPtBlockedVec, winShdDict, testPtBlockName, outdoorClac):
     #Build a new testPtBlockedVec that checks with the window transmissivity status.
     newTestPtBlockedVec = []
     newTestPtSkyView = []
     for zoneCount, zone in enumerate(testPtBlockedVec):
+        if hasattr(zone, "getComboProducts"):
+            #The rays are stored as window combinations so only the combinations need the status of the hour.
+            windowValues = []
+            for window in zone.windowNames:
+                try: windowValues.append(winShdDict[window][hour-1])
+                except: windowValues.append(None)
+            hourZone = zone.reweight(zone.getComboProducts(windowValues))
+            newTestPtBlockedVec.append(hourZone)
+            newTestPtSkyView.append(hourZone.getSkyView())
+            continue
+        
         newTestPtBlockedVec.append([])
         newTestPtSkyView.append([])
         for ptCount, vecList in enumerate(zone):
@@ -337,33 +432,74 @@ def computeHourShadeDrawing(hour, testPtSkyView, testPtBlockedVec, winShdDict, t
     
     return newTestPtSkyView, newTestPtBlockedVec
 
+class SkyPatchIndex(object):
+    """Closed-form lookup of the sky patch that a sun vector falls in.
+    
+    The patches of the Tregenza/Reinhart sky are rows of equal altitude bands that are
+    split into equal azimuth sectors. The rows and sectors are read once from the
+    centers of the sky patch meshes so the patch indices match the order of the
+    testPtBlockedVec lists. A sun vector is then assigned to a patch by its altitude
+    and azimuth without intersecting the patches.
+    """
+    
+    def __init__(self, skyPatchMeshes):
+        patches = []
+        for patchCount, patch in enumerate(skyPatchMeshes):
+            center = rc.Geometry.AreaMassProperties.Compute(patch).Centroid
+            altitude, azimuth = self.getAltitudeAzimuth(center)
+            patches.append((altitude, azimuth, patchCount))
+        patches.sort()
+        
+        #Group the patches in rows of the same altitude.
+        rows = []
+        for altitude, azimuth, patchCount in patches:
+            if rows == [] or altitude - rows[-1][0] > 0.5:
+                rows.append((altitude, []))
+            rows[-1][1].append((azimuth, patchCount))
+        
+        #The border of the rows is half way between the altitude of the row centers.
+        self.rowBorders = [(rows[i][0] + rows[i+1][0]) / 2 for i in range(len(rows)-1)]
+        self.rowAzimuths = [[azimuth for azimuth, patchCount in sorted(row)] for altitude, row in rows]
+        self.rowPatches = [[patchCount for azimuth, patchCount in sorted(row)] for altitude, row in rows]
+    
+    @staticmethod
+    def getAltitudeAzimuth(vector):
+        length = math.sqrt(vector.X*vector.X + vector.Y*vector.Y + vector.Z*vector.Z)
+        altitude = math.degrees(math.asin(max(-1, min(1, vector.Z / length))))
+        azimuth = math.degrees(math.atan2(vector.X, vector.Y)) % 360
+        return altitude, azimuth
+    
+    def getPatch(self, sunVec):
+        """Return the index of the sky patch for a sun vector or None if the sun is below the horizon."""
+        if sunVec == None or sunVec.Z <= 0: return None
+        altitude, azimuth = self.getAltitudeAzimuth(sunVec)
+        
+        rowCount = bisect.bisect(self.rowBorders, altitude)
+        azimuths = self.rowAzimuths[rowCount]
+        
+        #Find the closest patch center in the row.
+        index = bisect.bisect(azimuths, azimuth)
+        candidates = [index % len(azimuths), (index - 1) % len(azimuths)]
+        def azimuthDistance(i):
+            difference = abs(azimuths[i] - azimuth) % 360
+            return min(difference, 360 - difference)
+        closest = min(candidates, key=azimuthDistance)
+        
+        return self.rowPatches[rowCount][closest]
+
+
 def computeSkyTemp(La):
     # formula by Man-ENvironment heat EXchange model (MENEX_2005)
     skyTemp = (((La) / (0.95*5.667*(10**(-8))))**(0.25)) - 273
     
     return skyTemp
 
-def calculateSolarAdjustedMRT(pointMRTValues, stepOfSimulation, originalHour, diffSolarRad, directSolarRad, globHorizRadList, count, sunVecInfo, testPtSkyView, testPtBlockedVec, winTrans, cloA, floorR, skyPatchMeshes, zoneHasWindows, outdoorClac, outHorizInfrared, lb_comfortModels):
-    #Pull out the correct sun vector.
+def calculateSolarAdjustedMRT(pointMRTValues, stepOfSimulation, originalHour, diffSolarRad, directSolarRad, globHorizRadList, count, sunVecInfo, testPtSkyView, testPtBlockedVec, winTrans, cloA, floorR, zoneHasWindows, outdoorClac, outHorizInfrared, lb_comfortModels):
+    #Pull out the correct sun vector and the sky patch that it falls in.
     sunVec = sunVecInfo[0][count]
     altitude = sunVecInfo[1][count]
     azimuth = sunVecInfo[2][count]
-    
-    #Assign the sun vector to a sky patch that aligns with the testPtBlockedVec list.
-    vectorskyPatches = []
-    
-    if sunVec != None:
-        intersected = False
-        ray = rc.Geometry.Ray3d(rc.Geometry.Point3d.Origin, sunVec)
-        for patchCount, patch in enumerate(skyPatchMeshes):
-            if rc.Geometry.Intersect.Intersection.MeshRay(patch, ray) >= 0:
-                vectorskyPatches.append(patchCount)
-                intersected = True
-        if intersected == False:
-            vectorskyPatches.append(None)
-    else:
-        vectorskyPatches.append(None)
-    
+    sunPatch = sunVecInfo[3][count]
     
     ##Calculate the diffuse, direct, and global horizontal components of the solar radiation at the hour.
     diffRad = diffSolarRad[originalHour-1]
@@ -393,71 +529,120 @@ def calculateSolarAdjustedMRT(pointMRTValues, stepOfSimulation, originalHour, di
     radTransCoeff = 6.012
     
     # If outdoor conditions are requested, then compute the sky temperature.
+    skyTemp = 0
     if outdoorClac == True:
         skyTemp = computeSkyTemp(outdoorHorizInfrared)
     
-    #Compute the solar adjusted temperature for each point.
+    #Compute the solar adjusted temperature for all points of each zone at once.
+    #Note that, while the direct radiation is multiplied by the specific window transmissivity here, the diffuse window transmissivity is already accounted for in the sky view.
     solarAdjustedPointMRTValues = []
     if sunVec != None:
         for zoneCount, zonePtsList in enumerate(pointMRTValues):
             if zoneHasWindows[zoneCount] != 0:
-                solarAdjustedPointMRTValues.append([])
-                for pointCount, pointMRT in enumerate(zonePtsList):
-                    #Check if the sunray is blocked.
-                    if vectorskyPatches[0] != None:
-                        if testPtBlockedVec[zoneCount][pointCount][vectorskyPatches[0]] == 0: sunBlocked = True
-                        else: sunBlocked = False
-                    else: sunBlocked = True
-                    
-                    #If the ray was not blocked, then adjust then get rid of direct solar radiation.
-                    #Note that, while the direct radiation is multiplied by the specific window transmissivity here, the diffuse window transmissivity is already accounted for in the sky view.
-                    if sunBlocked == True:
-                        dirRadFinal = 0.0
-                        globHorizRadFinal = diffRad
-                    else:
-                        dirRadFinal = dirNormRad*(testPtBlockedVec[zoneCount][pointCount][vectorskyPatches[0]])
-                        globHorizRadFinal = globHorizRad
-                    
-                    if outdoorClac == False or zoneCount != len(pointMRTValues)-1:
-                        hourERF = ((0.5*fracEff*testPtSkyView[zoneCount][pointCount]*(diffRad + (globHorizRadFinal*floorR[zoneCount][pointCount]))+ (fracEff*ProjAreaFac*dirRadFinal))*winTrans[originalHour-1])*(cloA/0.95)
-                        mrtDelt = (hourERF/(fracEff*radTransCoeff))
-                        hourMRT = mrtDelt + pointMRT
-                    else:
-                        hourERF = ((0.5*fracEff*testPtSkyView[zoneCount][pointCount]*(diffRad + (globHorizRadFinal*floorR[zoneCount][pointCount]))+ (fracEff*ProjAreaFac*dirRadFinal)))*(cloA/0.95)
-                        mrtDelt = (hourERF/(fracEff*radTransCoeff))
-                        hourMRT = mrtDelt + (skyTemp*(testPtSkyView[zoneCount][pointCount]/2) + pointMRT*(1-(testPtSkyView[zoneCount][pointCount]/2)))
-                    
-                    solarAdjustedPointMRTValues[zoneCount].append(round(hourMRT, 3))
+                #The transmissivity of the sun ray for each point, which is 0 if the ray is blocked.
+                if sunPatch != None and hasattr(testPtBlockedVec[zoneCount], "getRayValues"): sunTransmiss = testPtBlockedVec[zoneCount].getRayValues(sunPatch)
+                elif sunPatch != None: sunTransmiss = [vecList[sunPatch] for vecList in testPtBlockedVec[zoneCount]]
+                else: sunTransmiss = [0] * len(zonePtsList)
+                
+                if outdoorClac == False or zoneCount != len(pointMRTValues)-1:
+                    trans = winTrans[originalHour-1]
+                    skyFac = 0
+                else:
+                    trans = 1
+                    skyFac = 1
+                
+                solarAdjustedPointMRTValues.append(solarAdjustZone(zonePtsList, testPtSkyView[zoneCount], floorR[zoneCount], sunTransmiss, diffRad, dirNormRad, globHorizRad, ProjAreaFac, fracEff, radTransCoeff, trans, cloA, skyFac, skyTemp))
             else:
-                solarAdjustedPointMRTValues.append([])
-                for pointCount, pointMRT in enumerate(zonePtsList):
-                    solarAdjustedPointMRTValues[zoneCount].append(round(pointMRT, 3))
+                solarAdjustedPointMRTValues.append([round(pointMRT, 3) for pointMRT in zonePtsList])
     else:
         solarAdjustedPointMRTValues = pointMRTValues
     
     return solarAdjustedPointMRTValues
 
+def solarAdjustZone(pointMRT, skyView, floorR, sunTransmiss, diffRad, dirNormRad, globHorizRad, ProjAreaFac, fracEff, radTransCoeff, trans, cloA, skyFac, skyTemp):
+    """Add the ERF of the solar radiation to the MRT of all points of a zone.
+    
+    Points with a sunTransmiss of 0 only get the diffuse radiation. skyFac is 1 for outdoor
+    points, which exchange radiation with the sky for half of their sky view.
+    """
+    if numpy is not None:
+        pointMRT = numpy.asarray(pointMRT, dtype=float)
+        skyView = numpy.asarray(skyView, dtype=float)
+        sunTransmiss = numpy.asarray(sunTransmiss, dtype=float)
+        globHorizRadFinal = numpy.where(sunTransmiss == 0, diffRad, globHorizRad)
+        hourERF = ((0.5*fracEff*skyView*(diffRad + (globHorizRadFinal*numpy.asarray(floorR, dtype=float)))+ (fracEff*ProjAreaFac*dirNormRad*sunTransmiss))*trans)*(cloA/0.95)
+        mrtDelt = (hourERF/(fracEff*radTransCoeff))
+        hourMRT = mrtDelt + skyFac*skyTemp*(skyView/2) + pointMRT*(1-skyFac*(skyView/2))
+        return numpy.round(hourMRT, 3).tolist()
+    
+    hourMRTs = []
+    for ptCount, ptMRT in enumerate(pointMRT):
+        if sunTransmiss[ptCount] == 0: globHorizRadFinal = diffRad
+        else: globHorizRadFinal = globHorizRad
+        hourERF = ((0.5*fracEff*skyView[ptCount]*(diffRad + (globHorizRadFinal*floorR[ptCount]))+ (fracEff*ProjAreaFac*dirNormRad*sunTransmiss[ptCount]))*trans)*(cloA/0.95)
+        mrtDelt = (hourERF/(fracEff*radTransCoeff))
+        hourMRT = mrtDelt + skyFac*skyTemp*(skyView[ptCount]/2) + ptMRT*(1-skyFac*(skyView[ptCount]/2))
+        hourMRTs.append(round(hourMRT, 3))
+    
+    return hourMRTs
 
-def getAirPointValue(airTempDict, testPtZoneWeights, testPtsViewFactor, hour, originalHour, outdoorClac, prevailingOutdoorTemp):
-    #Calculate the value for each point.
-    pointValues = []
-    for zoneCount, pointList in enumerate(testPtsViewFactor):
-        if outdoorClac == False or zoneCount != len(testPtsViewFactor)-1:
-            pointValues.append([])
-            for pointWeght in testPtZoneWeights[zoneCount]:
-                pointValue = 0
-                for Count, weight in enumerate(pointWeght):
-                    path  = Count
-                    weightedPointVal = weight*(airTempDict[path]["airTemp"][hour])
-                    pointValue = pointValue+weightedPointVal
-                pointValues[zoneCount].append(round(pointValue, 3))
-        else:
-            pointValues.append([])
-            for pointWeght in pointList:
-                pointValue = prevailingOutdoorTemp[originalHour]
-                pointValues[zoneCount].append(round(pointValue, 3))
-    
-    return pointValues
+
+class PointAirMatrix(object):
+    """Sparse zone weights of the points to compute the air temperature or humidity of all points at once.
+    
+    The value of a point is the sum of the values of the zones weighted by testPtZoneWeights,
+    which are mostly zero. Only the non-zero weights are kept and points with the same weights,
+    like all of the points of a zone without air walls, share one row so that the weighted sum
+    is computed once per row and hour.
+    """
+    
+    def __init__(self, testPtZoneWeights, testPtsViewFactor, outdoorClac):
+        #The distinct rows of (zone index, weight) and the row of each point of each zone.
+        self.rows = []
+        self.pointRows = []
+        self.zonePtCounts = []
+        self.isOutdoorZone = []
+        
+        rowIndices = {}
+        for zoneCount, pointList in enumerate(testPtsViewFactor):
+            isOutdoor = not (outdoorClac == False or zoneCount != len(testPtsViewFactor)-1)
+            self.isOutdoorZone.append(isOutdoor)
+            self.zonePtCounts.append(len(pointList))
+            zoneRows = array.array('l')
+            if not isOutdoor:
+                for pointWeight in testPtZoneWeights[zoneCount]:
+                    row = tuple([(path, weight) for path, weight in enumerate(pointWeight) if weight != 0])
+                    if row not in rowIndices:
+                        rowIndices[row] = len(self.rows)
+                        self.rows.append(row)
+                    zoneRows.append(rowIndices[row])
+            self.pointRows.append(zoneRows)
+    
+    def getValues(self, zoneDict, hour, originalHour, outdoorValues, dataKey="airTemp"):
+        """Return the values of all the points for an hour, grouped by zone.
+        
+        Args:
+            zoneDict: Dictionary of the zone data from createZoneDict.
+            hour: Index of the hour in the zone data.
+            originalHour: Index of the hour in outdoorValues, which are used for the outdoor points.
+            outdoorValues: The outdoor values for every hour.
+            dataKey: The key of the data in zoneDict.
+        """
+        rowValues = []
+        for row in self.rows:
+            pointValue = 0
+            for path, weight in row:
+                pointValue = pointValue + weight*(zoneDict[path][dataKey][hour])
+            rowValues.append(round(pointValue, 3))
+        
+        pointValues = []
+        for zoneCount, zoneRows in enumerate(self.pointRows):
+            if self.isOutdoorZone[zoneCount]:
+                pointValues.append([round(outdoorValues[originalHour], 3)] * self.zonePtCounts[zoneCount])
+            else:
+                pointValues.append([rowValues[rowIndex] for rowIndex in zoneRows])
+        
+        return pointValues
 
 
 def warpByHeight(pointAirTempValues, ptHeightWeights, flowVolValues, heatGainValues, adjacentList, adjacentNameList, groupedInletArea, groupedZoneHeights, groupedGlzHeights, groupedWinCeilDiffs, outdoorClac, prevailingOutdoorTemp):
@@ -531,33 +716,21 @@ def warpByHeight(pointAirTempValues, ptHeightWeights, flowVolValues, heatGainVal
             dimInterfHeights.append(0)
     
     #Calculate the dimensionless temperature at the dimensionless height and convert to final temperature.
+    #The profile of each zone is applied to the heights of all of its points at once.
     for zoneCount, zone in enumerate(pointAirTempValues):
         if len(zone) != 0:
             if outdoorClac == False or zoneCount != len(pointAirTempValues)-1:
+                heights = ptHeightWeights[zoneCount]
+                cielTemp = cielTemps[zoneCount]
+                tempDelta = dimTempDeltas[zoneCount]*tempChanges[zoneCount]
                 if archimedesNumbers[zoneCount] < 59 and dimTempDeltas[zoneCount] != 0:
                     #Linear stratification profile.
-                    cielTemp = cielTemps[zoneCount]
-                    dimTempDelta = dimTempDeltas[zoneCount]
-                    for ptCount, ptValue in enumerate(zone):
-                        ptTemp = ptValue + cielTemp - dimTempDelta*tempChanges[zoneCount]*(1-ptHeightWeights[zoneCount][ptCount])
-                        pointAirTempValues[zoneCount][ptCount] = round(ptTemp, 3)
+                    pointAirTempValues[zoneCount] = [round(ptValue + cielTemp - tempDelta*(1-height), 3) for ptValue, height in zip(zone, heights)]
                 elif dimTempDeltas[zoneCount] != 0:
                     #Two-Layer stratification profile.
-                    cielTemp = cielTemps[zoneCount]
-                    dimTempDelta = dimTempDeltas[zoneCount]
                     dimInterHeight = dimInterfHeights[zoneCount]
-                    
-                    for ptCount, ptValue in enumerate(zone):
-                        if ptHeightWeights[zoneCount][ptCount] < dimInterHeight:
-                            ptTemp = ptValue + cielTemp - dimTempDelta*tempChanges[zoneCount]*(dimInterHeight - ptHeightWeights[zoneCount][ptCount])
-                        else:
-                            ptTemp = ptValue + cielTemp
-                        pointAirTempValues[zoneCount][ptCount] = round(ptTemp, 3)
-                else: pass
-            else: pass
-        else:
-            pass
-    
+                    pointAirTempValues[zoneCount] = [round(ptValue + cielTemp - tempDelta*(dimInterHeight - height), 3) if height < dimInterHeight \
+                        else round(ptValue + cielTemp, 3) for ptValue, height in zip(zone, heights)]
     
     return pointAirTempValues
 
@@ -737,7 +910,306 @@ def computeGroupedRoomProperties(testPtZoneWeights, testPtZoneNames, zoneInletIn
     return adjacentList, adjacentNameList, groupedInletArea, groupedZoneHeights, groupedGlzHeights, groupedWinCeilDiffs, groupedTotalVol
 
 
-def mainAdapt(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNumbers, airTempDataHeaders, flowVolDataHeaders, flowVolDataNumbers, heatGainDataHeaders, heatGainDataNumbers, zoneSrfNames, testPtsViewFactor, viewFactorMesh, latitude, longitude, timeZone, diffSolarRad, directSolarRad, globHorizRad, testPtSkyView, testPtBlockedVec, numSkyPatchDivs, winTrans, cloA, floorR, testPtZoneNames, testPtZoneWeights, ptHeightWeights, zoneInletInfo, inletHeightOverride, prevailingOutdoorTemp, ASHRAEorEN, comfClass, avgMonthOrRunMean, levelOfConditioning, mixedAirOverride, zoneHasWindows, outdoorClac, outSrfTempHeaders, outSrfTempNumbers, outdoorNonSrfViewFac, dataAnalysisPeriod, outWindSpeed, d, a, outdoorPtHeightWeights, allWindowShadesSame, winStatusHeaders, testPtBlockName, zoneWindowTransmiss, zoneWindowNames, allWindSpeedsSame, winSpeedNumbers, outHorizInfrared, northAngle, lb_preparation, lb_sunpath, lb_comfortModels, lb_wind):
+resultFileNames = {
+"Adaptive": ["RadiantTemp", "AirTemp", "OperativeTemp", "AdaptComf", "DegFromTarget"],
+"PMV": ["RadiantTemp", "AirTemp", "SET", "PPD", "PMV"],
+"UTCI": ["RadiantTemp", "AirTemp", "UTCI", "OutdoorComf", "DegFromTarget"],
+"PET": ["RadiantTemp", "AirTemp", "PET", "PETComf", "PETCategory"]
+}
+
+
+def getInputSignature(inputs):
+    #Make a fingerprint of the inputs to find out if the saved results of a previous run belong to the same analysis.
+    signature = hashlib.md5()
+    def addItem(item):
+        if isinstance(item, (list, tuple)):
+            signature.update("[" + str(len(item)))
+            if len(item) != 0 and isinstance(item[0], (int, long, float, str, unicode)):
+                signature.update(repr(item))
+            else:
+                for subItem in item: addItem(subItem)
+            signature.update("]")
+        elif isinstance(item, dict):
+            for key in sorted(item.keys()):
+                addItem(key)
+                addItem(item[key])
+        elif isinstance(item, rc.Geometry.Mesh):
+            signature.update("Mesh")
+            addItem(list(item.Vertices.ToFloatArray()))
+            addItem(list(item.Faces.ToIntArray(False)))
+        elif isinstance(item, array.array):
+            signature.update("array" + item.typecode + item.tostring())
+        elif hasattr(item, "rayPtr"):
+            #Sky hit matrix of the view factor info.  Its repr only has the counts so the rays and window values are added.
+            signature.update("SkyHitMatrix" + repr((item.rayCount, item.isOutdoor)))
+            for arr in (item.rayPtr, item.rayIds, item.rayCombos, item.comboPtr, item.comboIds, item.comboCounts):
+                addItem(arr)
+            addItem(item.combos)
+            addItem(item.comboValues)
+            addItem(item.windowNames)
+        elif hasattr(item, "matrix") and hasattr(item.matrix, "rayPtr"):
+            #Window names of the rays of a sky hit matrix.
+            signature.update("SkyHitNames")
+            addItem(item.matrix)
+        elif isinstance(item, (int, long, float)):
+            signature.update(repr(item))
+        else:
+            signature.update(str(item))
+    
+    addItem(inputs)
+    return signature.hexdigest()
+
+
+class ResultCheckpoint(object):
+    """Save the result matrices to binary files one chunk of hours at a time.
+    
+    The progress is recorded next to the result files together with a signature of
+    the inputs. Running the analysis again with the same inputs resumes it from the
+    last completed chunk and only the results of one chunk are kept in memory.
+    """
+    
+    chunkSize = 168
+    
+    def __init__(self, workingDir, fileName, mtxNames, signature):
+        self.hb_MicroclimateMatrix = sc.sticky["honeybee_MicroclimateMatrix"]
+        self.hb_MicroclimateMatrixWriter = sc.sticky["honeybee_MicroclimateMatrixWriter"]
+        self.filePaths = [os.path.join(workingDir, fileName + mtxName + self.hb_MicroclimateMatrix.extension) for mtxName in mtxNames]
+        self.progressFile = os.path.join(workingDir, fileName + "Progress.json")
+        self.signature = signature
+        self.writers = []
+        self.hourCount = 0
+        self.hoursCompleted = 0
+    
+    def readProgress(self):
+        try:
+            with open(self.progressFile, "r") as inf:
+                return json.load(inf)
+        except (IOError, ValueError):
+            return {}
+    
+    def writeProgress(self):
+        progress = {"signature": self.signature, "hourCount": self.hourCount, "hoursCompleted": self.hoursCompleted}
+        with open(self.progressFile, "w") as outf:
+            json.dump(progress, outf)
+    
+    def start(self, headers, pointCount, hourCount):
+        """Open the result files and return the number of hours that are already completed."""
+        self.hourCount = hourCount
+        progress = self.readProgress()
+        resume = progress.get("signature") == self.signature and progress.get("hourCount") == hourCount
+        self.writers = [self.hb_MicroclimateMatrixWriter(filePath, header, pointCount, self.chunkSize, resume = resume) \
+                        for filePath, header in zip(self.filePaths, headers)]
+        
+        #The files can be one chunk apart if the last run was stopped while they were being written.
+        self.hoursCompleted = min(writer.hourCount for writer in self.writers)
+        for writer in self.writers: writer.truncate(self.hoursCompleted)
+        self.writeProgress()
+        return self.hoursCompleted
+    
+    def addChunk(self, chunkRows):
+        for writer, rows in zip(self.writers, chunkRows): writer.addHours(rows)
+        self.hoursCompleted += len(chunkRows[0])
+        self.writeProgress()
+    
+    def close(self):
+        for writer in self.writers: writer.close()
+    
+    def getMatrices(self):
+        """Return the result matrices.  The hours are read from the files once they are needed."""
+        return [list(self.hb_MicroclimateMatrix(filePath)) for filePath in self.filePaths]
+
+
+#The results of the iterative comfort models are cached for the exact inputs so they are the same as solving the model for each point.
+#Set roundComfortInputs to True to round the inputs to the number of decimals below before they are cached.  Many more results are
+#then reused but each of them is the result of the rounded inputs.  Use None for an input that should not be rounded.
+#PMV: airTemp, radTemp, windSpeed, relHumid, met, clo
+#PET: airTemp, radTemp, relHumid, windSpeed, Icl
+roundComfortInputs = False
+comfortCachePrecisions = {
+"PMV": (1, 1, 2, 0, 2, 2),
+"PET": (1, 1, 0, 2, 2)
+}
+comfortCacheSize = 100000
+
+
+class ComfortModelCache(object):
+    """LRU cache for the results of a comfort model.
+    
+    Points in the same zone usually share the air temperature, humidity and wind
+    speed so the model is solved once for each input tuple. The inputs can also be
+    rounded to a number of decimals so that points with very close MRT values share
+    a result.
+    
+    Args:
+        comfortFunction: The comfort model function.
+        precisions: Number of decimals for each input of the function. None for the
+            inputs that should not be rounded. Set to None to cache the exact inputs.
+        maxSize: Maximum number of results to keep in the cache.
+    """
+    
+    def __init__(self, comfortFunction, precisions = None, maxSize = 100000):
+        self.comfortFunction = comfortFunction
+        self.precisions = precisions
+        self.maxSize = maxSize
+        self.results = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def quantize(self, inputs):
+        if self.precisions == None: return tuple(inputs)
+        return tuple([value if precision == None else round(value, precision) for value, precision in zip(inputs, self.precisions)])
+    
+    def __call__(self, *inputs):
+        key = self.quantize(inputs)
+        with self.lock:
+            if key in self.results:
+                #Move the result to the end of the cache as the most recently used one.
+                result = self.results.pop(key)
+                self.results[key] = result
+                self.hits += 1
+                return result
+            self.misses += 1
+        
+        result = self.comfortFunction(*key)
+        with self.lock:
+            self.results[key] = result
+            if len(self.results) > self.maxSize: self.results.popitem(last = False)
+        return result
+
+
+class ComfortBatch(object):
+    """Evaluate a comfort model for the points of a chunk of hours in one batch.
+    
+    The comfort models (PMV/SET, UTCI and PET) are much slower than the rest of the
+    analysis. The input tuples of all the points and hours of a chunk are collected
+    first, identical tuples are only evaluated once and the unique tuples are split
+    into blocks which run on all of the CPUs when parallel_ is True.
+    
+    Args:
+        comfortFunction: A function that takes the items of an input tuple and returns
+            a tuple of the values for the three comfort matrices.
+    """
+    
+    blockSize = 256
+    
+    def __init__(self, comfortFunction):
+        self.comfortFunction = comfortFunction
+        self.inputCount = 0
+        self.evaluatedCount = 0
+    
+    def evaluate(self, hourInputs):
+        """Evaluate the comfort model for a list of input tuples of the points for each hour.
+        
+        Returns:
+            A list with the rows of the three comfort matrices for each hour.
+        """
+        #Find the unique inputs.
+        uniqueIndices = {}
+        uniqueInputs = []
+        hourIndices = []
+        quantize = getattr(self.comfortFunction, "quantize", None)
+        for inputs in hourInputs:
+            indices = []
+            for inputTuple in inputs:
+                if quantize != None: inputTuple = quantize(inputTuple)
+                index = uniqueIndices.get(inputTuple)
+                if index == None:
+                    index = uniqueIndices[inputTuple] = len(uniqueInputs)
+                    uniqueInputs.append(inputTuple)
+                indices.append(index)
+            hourIndices.append(indices)
+        self.inputCount += sum(len(indices) for indices in hourIndices)
+        self.evaluatedCount += len(uniqueInputs)
+        
+        #Evaluate the unique inputs in blocks.
+        results = [None for inputTuple in uniqueInputs]
+        blockCount = (len(uniqueInputs) + self.blockSize - 1) // self.blockSize
+        def evaluateBlock(blockIndex):
+            #Ability to cancel with Esc
+            if gh.GH_Document.IsEscapeKeyDown(): assert False
+            for index in xrange(blockIndex * self.blockSize, min((blockIndex + 1) * self.blockSize, len(uniqueInputs))):
+                results[index] = self.comfortFunction(*uniqueInputs[index])
+        
+        if parallel_ == True and blockCount > 1:
+            tasks.Parallel.ForEach(range(blockCount), evaluateBlock)
+        else:
+            for blockIndex in range(blockCount): evaluateBlock(blockIndex)
+        
+        #Put the results back in the order of the points.
+        hourRows = []
+        for indices in hourIndices:
+            rows = ([], [], [])
+            for index in indices:
+                for row, value in zip(rows, results[index]): row.append(value)
+            hourRows.append(rows)
+        return hourRows
+    
+    def report(self):
+        if self.inputCount == 0: return
+        msg = "The comfort model was evaluated for " + str(self.evaluatedCount) + " unique conditions out of " + str(self.inputCount) + " point-hours."
+        if isinstance(self.comfortFunction, ComfortModelCache):
+            msg = msg + "\nComfort model cache: " + str(self.comfortFunction.hits) + " hits and " + str(self.comfortFunction.misses) + " solver calls."
+        print msg
+        ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Remark, msg)
+
+
+def runClimateMap(climateMap, HOYs, originalHOYs, pointMRTMatrix, resultMtxs, resultCheckpoint, comfortBatch = None):
+    #Run the hours in chunks.  If there is a checkpoint, each chunk is saved as soon as it is finished and the hours that are saved by a previous run are skipped.
+    hourCount = len(HOYs)
+    if resultCheckpoint != None:
+        chunkSize = resultCheckpoint.chunkSize
+        startCount = resultCheckpoint.start([mtx[0] for mtx in resultMtxs], len(pointMRTMatrix.rows), hourCount)
+        if startCount == hourCount: print "All the hours of the analysis are read from the saved result files."
+        elif startCount != 0: print "Resuming the analysis from hour " + str(startCount + 1) + " of " + str(hourCount) + "."
+    else:
+        chunkSize = max(hourCount, 1)
+        startCount = 0
+    
+    try:
+        for chunkStart in range(startCount, hourCount, chunkSize):
+            chunkCounts = range(chunkStart, min(chunkStart + chunkSize, hourCount))
+            
+            #With NumPy, compute the radiant temperature of all the points for all of the hours of the chunk at once.
+            #Otherwise each hour computes its own radiant temperatures inside the (parallel) loop over the hours.
+            if numpy is not None:
+                chunkMRTValues = pointMRTMatrix.computeMRT([HOYs[count]-1 for count in chunkCounts], [originalHOYs[count]-1 for count in chunkCounts])
+            else: chunkMRTValues = None
+            
+            chunkResults = [None for count in chunkCounts]
+            def runHour(chunkCount):
+                count = chunkCounts[chunkCount]
+                if chunkMRTValues != None: pointMRTValues = chunkMRTValues[chunkCount]
+                else: pointMRTValues = pointMRTMatrix.computeHourMRT(HOYs[count]-1, originalHOYs[count]-1)
+                chunkResults[chunkCount] = climateMap(count, pointMRTValues)
+            
+            if parallel_ == True and hourCount != 1:
+                tasks.Parallel.ForEach(range(len(chunkCounts)), runHour)
+            else:
+                for chunkCount in range(len(chunkCounts)):
+                    #Ability to cancel with Esc
+                    if gh.GH_Document.IsEscapeKeyDown(): assert False
+                    runHour(chunkCount)
+            
+            #Evaluate the comfort model for all of the points and hours of the chunk at once.
+            if comfortBatch != None:
+                comfortRows = comfortBatch.evaluate([hourResult[2] for hourResult in chunkResults])
+                chunkResults = [hourResult[:2] + hourComfortRows for hourResult, hourComfortRows in zip(chunkResults, comfortRows)]
+            
+            #Sort the results of the hours into the rows of each matrix.
+            chunkRows = zip(*chunkResults)
+            if resultCheckpoint != None: resultCheckpoint.addChunk(chunkRows)
+            else:
+                for mtx, rows in zip(resultMtxs, chunkRows): mtx.extend(rows)
+    finally:
+        if resultCheckpoint != None: resultCheckpoint.close()
+    
+    if comfortBatch != None: comfortBatch.report()
+    if resultCheckpoint != None: return resultCheckpoint.getMatrices()
+    return resultMtxs
+
+
+def mainAdapt(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNumbers, airTempDataHeaders, flowVolDataHeaders, flowVolDataNumbers, heatGainDataHeaders, heatGainDataNumbers, zoneSrfNames, testPtsViewFactor, viewFactorMesh, latitude, longitude, timeZone, diffSolarRad, directSolarRad, globHorizRad, testPtSkyView, testPtBlockedVec, numSkyPatchDivs, winTrans, cloA, floorR, testPtZoneNames, testPtZoneWeights, ptHeightWeights, zoneInletInfo, inletHeightOverride, prevailingOutdoorTemp, ASHRAEorEN, comfClass, avgMonthOrRunMean, levelOfConditioning, mixedAirOverride, zoneHasWindows, outdoorClac, outSrfTempHeaders, outSrfTempNumbers, outdoorNonSrfViewFac, dataAnalysisPeriod, outWindSpeed, d, a, outdoorPtHeightWeights, allWindowShadesSame, winStatusHeaders, testPtBlockName, zoneWindowTransmiss, zoneWindowNames, allWindSpeedsSame, winSpeedNumbers, outHorizInfrared, northAngle, lb_preparation, lb_sunpath, lb_comfortModels, lb_wind, resultCheckpoint):
     #Set up matrices to be filled.
     radTempMtx = ['Radiant Temperature;' + str(analysisPeriod[0]) + ";" + str(analysisPeriod[1])]
     airTempMtx = ['Air Temperature;' + str(analysisPeriod[0]) + ";" + str(analysisPeriod[1])]
@@ -767,15 +1239,10 @@ def mainAdapt(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataN
         ghenv.Component.AddRuntimeMessage(w, warning)
         return -1
     else:
-        #Create placeholders for all of the hours.
+        #Get the months and days of the analysis.
         months = []
         dayNums = []
         for hour in HOYs:
-            radTempMtx.append(0)
-            airTempMtx.append(0)
-            operativeTempMtx.append(0)
-            adaptComfMtx.append(0)
-            degFromTargetMtx.append(0)
             d, m, t = lb_preparation.hour2Date(hour, True)
             if m not in months: months.append(m)
             if avgMonthOrRunMean == False:
@@ -832,6 +1299,7 @@ def mainAdapt(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataN
             skyPatchMeshes = []
             for patch in skyPatches:
                 skyPatchMeshes.append(rc.Geometry.Mesh.CreateFromBrep(patch, rc.Geometry.MeshingParameters.Coarse)[0])
+            skyPatchIndex = SkyPatchIndex(skyPatchMeshes)
             
             #Initiate the sun vector calculator.
             lb_sunpath.initTheClass(float(latitude), northAngle, rc.Geometry.Point3d.Origin, 100, float(longitude), float(timeZone))
@@ -851,7 +1319,8 @@ def mainAdapt(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataN
                 sunVecs.append(sunVec)
                 altitudes.append(altitude)
                 azimuths.append(azimuth)
-            sunVecInfo = [sunVecs, altitudes, azimuths]
+            sunPatches = [skyPatchIndex.getPatch(sunVec) for sunVec in sunVecs]
+            sunVecInfo = [sunVecs, altitudes, azimuths, sunPatches]
         
         #Make a dictionary that will relate the testPtZoneNames to the air temperatures.
         airTempDict = createZoneDict(testPtZoneNames, "zoneName", "airTemp", airTempDataHeaders, airTempDataNumbers)
@@ -870,7 +1339,10 @@ def mainAdapt(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataN
         #Run through every hour of the analysis to fill up the matrices.
         calcCancelled = False
         try:
-            def climateMap(count):
+            pointMRTMatrix = PointMRTMatrix(srfTempDict, testPtsViewFactor, outdoorClac, outSrfTempDict, outdoorNonSrfViewFac, prevailingOutdoorTemp)
+            pointAirMatrix = PointAirMatrix(testPtZoneWeights, testPtsViewFactor, outdoorClac)
+            
+            def climateMap(count, pointMRTValues):
                 #Ability to cancel with Esc
                 if gh.GH_Document.IsEscapeKeyDown(): assert False
                 
@@ -885,27 +1357,23 @@ def mainAdapt(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataN
                 for zoneVal in heatGainDataNumbers: heatGainValues.append(zoneVal[hour-1])
                 
                 #Compute the radiant temperature.
-                pointMRTValues = calculatePointMRT(srfTempDict, testPtsViewFactor, hour-1, originalHour-1, outdoorClac, outSrfTempDict, outdoorNonSrfViewFac, prevailingOutdoorTemp)
                 if sum(zoneHasWindows) != 0:
-                    if allWindowShadesSame == True: pointMRTValues = calculateSolarAdjustedMRT(pointMRTValues, hour, originalHour, diffSolarRad, directSolarRad, globHorizRad, count, sunVecInfo, testPtSkyView, testPtBlockedVec, winTrans, cloA, floorR, skyPatchMeshes, zoneHasWindows, outdoorClac, outHorizInfrared, lb_comfortModels)
+                    if allWindowShadesSame == True: pointMRTValues = calculateSolarAdjustedMRT(pointMRTValues, hour, originalHour, diffSolarRad, directSolarRad, globHorizRad, count, sunVecInfo, testPtSkyView, testPtBlockedVec, winTrans, cloA, floorR, zoneHasWindows, outdoorClac, outHorizInfrared, lb_comfortModels)
                     else:
                         #To factor in the effect of blocked sunlight, I have to re-make the testPtSkyView and the testPtBlockedVec to reflect the conditions for the given hour.
                         hourTestPtSkyView, hourTestPtBlockedVec = computeHourShadeDrawing(hour, testPtSkyView, testPtBlockedVec, winShdDict, testPtBlockName, outdoorClac)
-                        pointMRTValues = calculateSolarAdjustedMRT(pointMRTValues, hour, originalHour, diffSolarRad, directSolarRad, globHorizRad, count, sunVecInfo, hourTestPtSkyView, hourTestPtBlockedVec, neutralWinTransList, cloA, floorR, skyPatchMeshes, zoneHasWindows, outdoorClac, outHorizInfrared, lb_comfortModels)
+                        pointMRTValues = calculateSolarAdjustedMRT(pointMRTValues, hour, originalHour, diffSolarRad, directSolarRad, globHorizRad, count, sunVecInfo, hourTestPtSkyView, hourTestPtBlockedVec, neutralWinTransList, cloA, floorR, zoneHasWindows, outdoorClac, outHorizInfrared, lb_comfortModels)
                 pointMRTValues = lb_preparation.flattenList(pointMRTValues)
-                radTempMtx[count+1] = pointMRTValues
                 
                 #Compute the air temperature.
-                pointAirTempValues = getAirPointValue(airTempDict, testPtZoneWeights, testPtsViewFactor, hour-1, originalHour-1, outdoorClac, prevailingOutdoorTemp)
+                pointAirTempValues = pointAirMatrix.getValues(airTempDict, hour-1, originalHour-1, prevailingOutdoorTemp)
                 if mixedAirOverride[hour-1] == 0: pointAirTempValues = warpByHeight(pointAirTempValues, ptHeightWeights, flowVolValues, heatGainValues, adjacentList, adjacentNameList, groupedInletArea, groupedZoneHeights, groupedGlzHeights, groupedWinCeilDiffs, outdoorClac, prevailingOutdoorTemp)
                 pointAirTempValues = lb_preparation.flattenList(pointAirTempValues)
-                airTempMtx[count+1] = pointAirTempValues
                 
                 #Compute the operative temperature.
                 pointOpTempValues = []
                 for ptCount, airTemp in enumerate(pointAirTempValues):
                     pointOpTempValues.append((airTemp+pointMRTValues[ptCount])/2)
-                operativeTempMtx[count+1] = pointOpTempValues
                 
                 #Compute the wind speed.
                 pointWindSpeedValues = []
@@ -939,21 +1407,16 @@ def mainAdapt(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataN
                     adaptComfPointValues.append(int(comf))
                     degFromTargetPointValues.append(distFromTarget)
                 
-                adaptComfMtx[count+1] = adaptComfPointValues
-                degFromTargetMtx[count+1] = degFromTargetPointValues
+                return pointMRTValues, pointAirTempValues, pointOpTempValues, adaptComfPointValues, degFromTargetPointValues
             
             #Run through every hour of the analysis to fill up the matrices.
-            if parallel_ == True and len(HOYs) != 1:
-                tasks.Parallel.ForEach(range(len(HOYs)), climateMap)
-            else:
-                for hour in range(len(HOYs)):
-                    #Ability to cancel with Esc
-                    #if gh.GH_Document.IsEscapeKeyDown(): assert False
-                    climateMap(hour)
+            radTempMtx, airTempMtx, operativeTempMtx, adaptComfMtx, degFromTargetMtx = runClimateMap(climateMap, HOYs, originalHOYs, pointMRTMatrix, [radTempMtx, airTempMtx, operativeTempMtx, adaptComfMtx, degFromTargetMtx], resultCheckpoint)
         except:
             print "The calculation has been terminated by the user!"
             e = gh.GH_RuntimeMessageLevel.Warning
             ghenv.Component.AddRuntimeMessage(e, "The calculation has been terminated by the user!")
+            if resultCheckpoint != None and resultCheckpoint.hoursCompleted != 0:
+                print str(resultCheckpoint.hoursCompleted) + " hours of the analysis are saved.  Run the component again with the same inputs to resume the analysis."
             calcCancelled = True
         
         
@@ -962,7 +1425,7 @@ def mainAdapt(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataN
         else:
             return -1
 
-def mainPMV(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNumbers, airTempDataHeaders, flowVolDataHeaders, flowVolDataNumbers, heatGainDataHeaders, heatGainDataNumbers, relHumidDataHeaders, relHumidDataNumbers, clothingLevel, metabolicRate, zoneSrfNames, testPtsViewFactor, viewFactorMesh, latitude, longitude, timeZone, diffSolarRad, directSolarRad, globHorizRad, testPtSkyView, testPtBlockedVec, numSkyPatchDivs, winTrans, cloA, floorR, testPtZoneNames, testPtZoneWeights, ptHeightWeights, zoneInletInfo, inletHeightOverride, PPDComfortThresh, humidRatioUp, humidRatioLow, mixedAirOverride, zoneHasWindows, outdoorClac, outSrfTempHeaders, outSrfTempNumbers, outdoorNonSrfViewFac, outDryBulbTemp, outRelHumid, outWindSpeed, d, a, outdoorPtHeightWeights, allWindowShadesSame, winStatusHeaders, testPtBlockName, zoneWindowTransmiss, zoneWindowNames, allWindSpeedsSame, winSpeedNumbers, dataAnalysisPeriod, northAngle, horizInfraredRadiation, lb_preparation, lb_sunpath, lb_comfortModels, lb_wind):
+def mainPMV(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNumbers, airTempDataHeaders, flowVolDataHeaders, flowVolDataNumbers, heatGainDataHeaders, heatGainDataNumbers, relHumidDataHeaders, relHumidDataNumbers, clothingLevel, metabolicRate, zoneSrfNames, testPtsViewFactor, viewFactorMesh, latitude, longitude, timeZone, diffSolarRad, directSolarRad, globHorizRad, testPtSkyView, testPtBlockedVec, numSkyPatchDivs, winTrans, cloA, floorR, testPtZoneNames, testPtZoneWeights, ptHeightWeights, zoneInletInfo, inletHeightOverride, PPDComfortThresh, humidRatioUp, humidRatioLow, mixedAirOverride, zoneHasWindows, outdoorClac, outSrfTempHeaders, outSrfTempNumbers, outdoorNonSrfViewFac, outDryBulbTemp, outRelHumid, outWindSpeed, d, a, outdoorPtHeightWeights, allWindowShadesSame, winStatusHeaders, testPtBlockName, zoneWindowTransmiss, zoneWindowNames, allWindSpeedsSame, winSpeedNumbers, dataAnalysisPeriod, northAngle, horizInfraredRadiation, lb_preparation, lb_sunpath, lb_comfortModels, lb_wind, resultCheckpoint):
     #Set up matrices to be filled.
     radTempMtx = ['Radiant Temperature;' + str(analysisPeriod[0]) + ";" + str(analysisPeriod[1])]
     airTempMtx = ['Air Temperature;' + str(analysisPeriod[0]) + ";" + str(analysisPeriod[1])]
@@ -992,14 +1455,6 @@ def mainPMV(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
         ghenv.Component.AddRuntimeMessage(w, warning)
         return -1
     else:
-        #Create placeholders for all of the hours.
-        for hour in HOYs:
-            radTempMtx.append(0)
-            airTempMtx.append(0)
-            SET_Mtx.append(0)
-            PMVComfMtx.append(0)
-            PMV_Mtx.append(0)
-        
         #Make sure that the EPW Data does not include headers.
         outDryBulbTemp = outDryBulbTemp[7:]
         outRelHumid = outRelHumid[7:]
@@ -1027,6 +1482,7 @@ def mainPMV(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
             skyPatchMeshes = []
             for patch in skyPatches:
                 skyPatchMeshes.append(rc.Geometry.Mesh.CreateFromBrep(patch, rc.Geometry.MeshingParameters.Coarse)[0])
+            skyPatchIndex = SkyPatchIndex(skyPatchMeshes)
             
             #Initiate the sun vector calculator.
             lb_sunpath.initTheClass(float(latitude), northAngle, rc.Geometry.Point3d.Origin, 100, float(longitude), float(timeZone))
@@ -1046,7 +1502,8 @@ def mainPMV(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
                 sunVecs.append(sunVec)
                 altitudes.append(altitude)
                 azimuths.append(azimuth)
-            sunVecInfo = [sunVecs, altitudes, azimuths]
+            sunPatches = [skyPatchIndex.getPatch(sunVec) for sunVec in sunVecs]
+            sunVecInfo = [sunVecs, altitudes, azimuths, sunPatches]
         
         #Make a dictionary that will relate the testPtZoneNames to the air temperatures.
         airTempDict = createZoneDict(testPtZoneNames, "zoneName", "airTemp", airTempDataHeaders, airTempDataNumbers)
@@ -1066,7 +1523,10 @@ def mainPMV(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
         #Run through every hour of the analysis to fill up the matrices.
         calcCancelled = False
         try:
-            def climateMapPMV(count):
+            pointMRTMatrix = PointMRTMatrix(srfTempDict, testPtsViewFactor, outdoorClac, outSrfTempDict, outdoorNonSrfViewFac, outDryBulbTemp)
+            pointAirMatrix = PointAirMatrix(testPtZoneWeights, testPtsViewFactor, outdoorClac)
+            
+            def climateMapPMV(count, pointMRTValues):
                 #Ability to cancel with Esc
                 if gh.GH_Document.IsEscapeKeyDown(): assert False
                 
@@ -1081,24 +1541,21 @@ def mainPMV(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
                 for zoneVal in heatGainDataNumbers: heatGainValues.append(zoneVal[hour-1])
                 
                 #Compute the radiant temperature.
-                pointMRTValues = calculatePointMRT(srfTempDict, testPtsViewFactor, hour-1, originalHour-1, outdoorClac, outSrfTempDict, outdoorNonSrfViewFac, outDryBulbTemp)
                 if sum(zoneHasWindows) != 0:
-                    if allWindowShadesSame == True: pointMRTValues = calculateSolarAdjustedMRT(pointMRTValues, hour, originalHour, diffSolarRad, directSolarRad, globHorizRad, count, sunVecInfo, testPtSkyView, testPtBlockedVec, winTrans, cloA, floorR, skyPatchMeshes, zoneHasWindows, outdoorClac, horizInfraredRadiation, lb_comfortModels)
+                    if allWindowShadesSame == True: pointMRTValues = calculateSolarAdjustedMRT(pointMRTValues, hour, originalHour, diffSolarRad, directSolarRad, globHorizRad, count, sunVecInfo, testPtSkyView, testPtBlockedVec, winTrans, cloA, floorR, zoneHasWindows, outdoorClac, horizInfraredRadiation, lb_comfortModels)
                     else:
                         #To factor in the effect of blocked sunlight, I have to re-make the testPtSkyView and the testPtBlockedVec to reflect the conditions for the given hour.
                         hourTestPtSkyView, hourTestPtBlockedVec = computeHourShadeDrawing(hour, testPtSkyView, testPtBlockedVec, winShdDict, testPtBlockName, outdoorClac)
-                        pointMRTValues = calculateSolarAdjustedMRT(pointMRTValues, hour, originalHour, diffSolarRad, directSolarRad, globHorizRad, count, sunVecInfo, hourTestPtSkyView, hourTestPtBlockedVec, neutralWinTransList, cloA, floorR, skyPatchMeshes, zoneHasWindows, outdoorClac, horizInfraredRadiation, lb_comfortModels)
+                        pointMRTValues = calculateSolarAdjustedMRT(pointMRTValues, hour, originalHour, diffSolarRad, directSolarRad, globHorizRad, count, sunVecInfo, hourTestPtSkyView, hourTestPtBlockedVec, neutralWinTransList, cloA, floorR, zoneHasWindows, outdoorClac, horizInfraredRadiation, lb_comfortModels)
                 pointMRTValues = lb_preparation.flattenList(pointMRTValues)
-                radTempMtx[count+1] = pointMRTValues
                 
                 #Compute the air temperature.
-                pointAirTempValues = getAirPointValue(airTempDict, testPtZoneWeights, testPtsViewFactor, hour-1, originalHour-1, outdoorClac, outDryBulbTemp)
+                pointAirTempValues = pointAirMatrix.getValues(airTempDict, hour-1, originalHour-1, outDryBulbTemp)
                 if mixedAirOverride[hour-1] == 0: pointAirTempValues = warpByHeight(pointAirTempValues, ptHeightWeights, flowVolValues, heatGainValues, adjacentList, adjacentNameList, groupedInletArea, groupedZoneHeights, groupedGlzHeights, groupedWinCeilDiffs, outdoorClac, outDryBulbTemp)
                 pointAirTempValues = lb_preparation.flattenList(pointAirTempValues)
-                airTempMtx[count+1] = pointAirTempValues
                 
                 #Compute the relative humidity.
-                pointRelHumidValues = getAirPointValue(relHumidDict, testPtZoneWeights, testPtsViewFactor, hour-1, originalHour-1, outdoorClac, outRelHumid)
+                pointRelHumidValues = pointAirMatrix.getValues(relHumidDict, hour-1, originalHour-1, outRelHumid)
                 pointRelHumidValues = lb_preparation.flattenList(pointRelHumidValues)
                 
                 #Compute the wind speed.
@@ -1123,44 +1580,39 @@ def mainPMV(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
                                 windFlowVal = lb_wind.powerLawWind(outWindSpeed[originalHour-1], outdoorPtHeightWeights[valCount], d, a, 270, 0.14)
                                 pointWindSpeedValues.append(windFlowVal)
                 
+                #Collect the inputs of the SET and PMV comfort model.  The model is evaluated for all the hours of the chunk at once.
+                met = metabolicRate[originalHour-1]
+                clo = clothingLevel[originalHour-1]
+                comfInputs = [(airTemp, pointMRTValues[ptCount], pointWindSpeedValues[ptCount], pointRelHumidValues[ptCount], met, clo) for ptCount, airTemp in enumerate(pointAirTempValues)]
+                
+                return pointMRTValues, pointAirTempValues, comfInputs
+            
+            def comfortPMV(airTemp, radTemp, windSpeed, relHumid, met, clo):
                 #Compute the SET and PMV comfort.
-                setPointValues = []
-                pmvComfPointValues = []
-                pmvPointValues = []
+                try:
+                    pmv, ppd, set, taAdj, coolingEffect = lb_comfortModels.comfPMVElevatedAirspeed(airTemp, radTemp, windSpeed, relHumid, met, clo, 0.0)
+                except:
+                    print 'These conditions caused a failure of the PMV model convergence: Ta = ' + str(airTemp) + "; Tr = " + str(radTemp) + "; Vel = " + str(windSpeed) + "; RH = " + str(relHumid) + "; met = " + str(met) + "; clo= " + str(clo)
+                    pmv, ppd, set, taAdj, coolingEffect = 0.0, 5.0, 21.0, 0.0, 0.0
                 
-                for ptCount, airTemp in enumerate(pointAirTempValues):
-                    try:
-                        pmv, ppd, set, taAdj, coolingEffect = lb_comfortModels.comfPMVElevatedAirspeed(airTemp, pointMRTValues[ptCount], pointWindSpeedValues[ptCount], pointRelHumidValues[ptCount], metabolicRate[originalHour-1], clothingLevel[originalHour-1], 0.0)
-                    except:
-                        print 'These conditions caused a failure of the PMV model convergence: Ta = ' + str(airTemp) + "; Tr = " + str(pointMRTValues[ptCount]) + "; Vel = " + str(pointWindSpeedValues[ptCount]) + "; RH = " + str(pointRelHumidValues[ptCount]) + "; met = " + str(metabolicRate[originalHour-1]) + "; clo= " + str(clothingLevel[originalHour-1])
-                        pmv, ppd, set, taAdj, coolingEffect = 0.0, 5.0, 21.0, 0.0, 0.0
-                    
-                    setPointValues.append(set)
-                    if humidRatioUp != 0.03 or humidRatioLow != 0.0:
-                        HR, EN, vapPress, satPress = lb_comfortModels.calcHumidRatio(airTemp, pointRelHumidValues[ptCount], 101325)
-                        if ppd < PPDComfortThresh and HR < humidRatioUp and HR > humidRatioLow: comfortableOrNot.append(1)
-                        else: comfortableOrNot.append(0)
-                    else:
-                        if ppd < PPDComfortThresh: pmvComfPointValues.append(1)
-                        else: pmvComfPointValues.append(0)
-                    pmvPointValues.append(pmv)
+                if humidRatioUp != 0.03 or humidRatioLow != 0.0:
+                    HR, EN, vapPress, satPress = lb_comfortModels.calcHumidRatio(airTemp, relHumid, 101325)
+                    if ppd < PPDComfortThresh and HR < humidRatioUp and HR > humidRatioLow: pmvComf = 1
+                    else: pmvComf = 0
+                else:
+                    if ppd < PPDComfortThresh: pmvComf = 1
+                    else: pmvComf = 0
                 
-                SET_Mtx[count+1] = setPointValues
-                PMVComfMtx[count+1] = pmvComfPointValues
-                PMV_Mtx[count+1] = pmvPointValues
+                return set, pmvComf, pmv
             
             #Run through every hour of the analysis to fill up the matrices.
-            if parallel_ == True and len(HOYs) != 1:
-                tasks.Parallel.ForEach(range(len(HOYs)), climateMapPMV)
-            else:
-                for hour in range(len(HOYs)):
-                    #Ability to cancel with Esc
-                    if gh.GH_Document.IsEscapeKeyDown(): assert False
-                    climateMapPMV(hour)
+            radTempMtx, airTempMtx, SET_Mtx, PMVComfMtx, PMV_Mtx = runClimateMap(climateMapPMV, HOYs, originalHOYs, pointMRTMatrix, [radTempMtx, airTempMtx, SET_Mtx, PMVComfMtx, PMV_Mtx], resultCheckpoint, ComfortBatch(ComfortModelCache(comfortPMV, comfortCachePrecisions["PMV"] if roundComfortInputs else None, comfortCacheSize)))
         except:
             print "The calculation has been terminated by the user!"
             e = gh.GH_RuntimeMessageLevel.Warning
             ghenv.Component.AddRuntimeMessage(e, "The calculation has been terminated by the user!")
+            if resultCheckpoint != None and resultCheckpoint.hoursCompleted != 0:
+                print str(resultCheckpoint.hoursCompleted) + " hours of the analysis are saved.  Run the component again with the same inputs to resume the analysis."
             calcCancelled = True
         
         
@@ -1169,7 +1621,7 @@ def mainPMV(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
         else:
             return -1
 
-def mainUTCI(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNumbers, airTempDataHeaders, flowVolDataHeaders, flowVolDataNumbers, heatGainDataHeaders, heatGainDataNumbers, relHumidDataHeaders, relHumidDataNumbers, zoneSrfNames, testPtsViewFactor, viewFactorMesh, latitude, longitude, timeZone, diffSolarRad, directSolarRad, globHorizRad, testPtSkyView, testPtBlockedVec, numSkyPatchDivs, winTrans, cloA, floorR, testPtZoneNames, testPtZoneWeights, ptHeightWeights, zoneInletInfo, inletHeightOverride, mixedAirOverride, zoneHasWindows, outdoorClac, outSrfTempHeaders, outSrfTempNumbers, outdoorNonSrfViewFac, outDryBulbTemp, outRelHumid, outWindSpeed, d, a, outdoorPtHeightWeights, allWindowShadesSame, winStatusHeaders, testPtBlockName, zoneWindowTransmiss, zoneWindowNames, allWindSpeedsSame, winSpeedNumbers, dataAnalysisPeriod, northAngle, horizInfraredRadiation, lb_preparation, lb_sunpath, lb_comfortModels, lb_wind):
+def mainUTCI(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNumbers, airTempDataHeaders, flowVolDataHeaders, flowVolDataNumbers, heatGainDataHeaders, heatGainDataNumbers, relHumidDataHeaders, relHumidDataNumbers, zoneSrfNames, testPtsViewFactor, viewFactorMesh, latitude, longitude, timeZone, diffSolarRad, directSolarRad, globHorizRad, testPtSkyView, testPtBlockedVec, numSkyPatchDivs, winTrans, cloA, floorR, testPtZoneNames, testPtZoneWeights, ptHeightWeights, zoneInletInfo, inletHeightOverride, mixedAirOverride, zoneHasWindows, outdoorClac, outSrfTempHeaders, outSrfTempNumbers, outdoorNonSrfViewFac, outDryBulbTemp, outRelHumid, outWindSpeed, d, a, outdoorPtHeightWeights, allWindowShadesSame, winStatusHeaders, testPtBlockName, zoneWindowTransmiss, zoneWindowNames, allWindSpeedsSame, winSpeedNumbers, dataAnalysisPeriod, northAngle, horizInfraredRadiation, lb_preparation, lb_sunpath, lb_comfortModels, lb_wind, resultCheckpoint):
     #Set up matrices to be filled.
     radTempMtx = ['Radiant Temperature;' + str(analysisPeriod[0]) + ";" + str(analysisPeriod[1])]
     airTempMtx = ['Air Temperature;' + str(analysisPeriod[0]) + ";" + str(analysisPeriod[1])]
@@ -1199,14 +1651,6 @@ def mainUTCI(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNu
         ghenv.Component.AddRuntimeMessage(w, warning)
         return -1
     else:
-        #Create placeholders for all of the hours.
-        for hour in HOYs:
-            radTempMtx.append(0)
-            airTempMtx.append(0)
-            UTCI_Mtx.append(0)
-            OutdoorComfMtx.append(0)
-            DegFromNeutralMtx.append(0)
-        
         #Make sure that the EPW Data does not include headers.
         outDryBulbTemp = outDryBulbTemp[7:]
         outRelHumid = outRelHumid[7:]
@@ -1234,6 +1678,7 @@ def mainUTCI(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNu
             skyPatchMeshes = []
             for patch in skyPatches:
                 skyPatchMeshes.append(rc.Geometry.Mesh.CreateFromBrep(patch, rc.Geometry.MeshingParameters.Coarse)[0])
+            skyPatchIndex = SkyPatchIndex(skyPatchMeshes)
             
             #Initiate the sun vector calculator.
             lb_sunpath.initTheClass(float(latitude), northAngle, rc.Geometry.Point3d.Origin, 100, float(longitude), float(timeZone))
@@ -1253,7 +1698,8 @@ def mainUTCI(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNu
                 sunVecs.append(sunVec)
                 altitudes.append(altitude)
                 azimuths.append(azimuth)
-            sunVecInfo = [sunVecs, altitudes, azimuths]
+            sunPatches = [skyPatchIndex.getPatch(sunVec) for sunVec in sunVecs]
+            sunVecInfo = [sunVecs, altitudes, azimuths, sunPatches]
         
         #Make a dictionary that will relate the testPtZoneNames to the air temperatures.
         try: airTempDict = createZoneDict(testPtZoneNames, "zoneName", "airTemp", airTempDataHeaders, airTempDataNumbers)
@@ -1275,7 +1721,10 @@ def mainUTCI(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNu
         #Run through every hour of the analysis to fill up the matrices.
         calcCancelled = False
         try:
-            def climateMapUTCI(count):
+            pointMRTMatrix = PointMRTMatrix(srfTempDict, testPtsViewFactor, outdoorClac, outSrfTempDict, outdoorNonSrfViewFac, outDryBulbTemp)
+            pointAirMatrix = PointAirMatrix(testPtZoneWeights, testPtsViewFactor, outdoorClac)
+            
+            def climateMapUTCI(count, pointMRTValues):
                 #Ability to cancel with Esc
                 if gh.GH_Document.IsEscapeKeyDown(): assert False
                 
@@ -1290,24 +1739,21 @@ def mainUTCI(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNu
                 for zoneVal in heatGainDataNumbers: heatGainValues.append(zoneVal[hour-1])
                 
                 #Compute the radiant temperature.
-                pointMRTValues = calculatePointMRT(srfTempDict, testPtsViewFactor, hour-1, originalHour-1, outdoorClac, outSrfTempDict, outdoorNonSrfViewFac, outDryBulbTemp)
                 if sum(zoneHasWindows) != 0:
-                    if allWindowShadesSame == True: pointMRTValues = calculateSolarAdjustedMRT(pointMRTValues, hour, originalHour, diffSolarRad, directSolarRad, globHorizRad, count, sunVecInfo, testPtSkyView, testPtBlockedVec, winTrans, cloA, floorR, skyPatchMeshes, zoneHasWindows, outdoorClac, horizInfraredRadiation, lb_comfortModels)
+                    if allWindowShadesSame == True: pointMRTValues = calculateSolarAdjustedMRT(pointMRTValues, hour, originalHour, diffSolarRad, directSolarRad, globHorizRad, count, sunVecInfo, testPtSkyView, testPtBlockedVec, winTrans, cloA, floorR, zoneHasWindows, outdoorClac, horizInfraredRadiation, lb_comfortModels)
                     else:
                         #To factor in the effect of blocked sunlight, I have to re-make the testPtSkyView and the testPtBlockedVec to reflect the conditions for the given hour.
                         hourTestPtSkyView, hourTestPtBlockedVec = computeHourShadeDrawing(hour, testPtSkyView, testPtBlockedVec, winShdDict, testPtBlockName, outdoorClac)
-                        pointMRTValues = calculateSolarAdjustedMRT(pointMRTValues, hour, originalHour, diffSolarRad, directSolarRad, globHorizRad, count, sunVecInfo, hourTestPtSkyView, hourTestPtBlockedVec, neutralWinTransList, cloA, floorR, skyPatchMeshes, zoneHasWindows, outdoorClac, horizInfraredRadiation, lb_comfortModels)
+                        pointMRTValues = calculateSolarAdjustedMRT(pointMRTValues, hour, originalHour, diffSolarRad, directSolarRad, globHorizRad, count, sunVecInfo, hourTestPtSkyView, hourTestPtBlockedVec, neutralWinTransList, cloA, floorR, zoneHasWindows, outdoorClac, horizInfraredRadiation, lb_comfortModels)
                 pointMRTValues = lb_preparation.flattenList(pointMRTValues)
-                radTempMtx[count+1] = pointMRTValues
                 
                 #Compute the air temperature.
-                pointAirTempValues = getAirPointValue(airTempDict, testPtZoneWeights, testPtsViewFactor, hour-1, originalHour-1, outdoorClac, outDryBulbTemp)
+                pointAirTempValues = pointAirMatrix.getValues(airTempDict, hour-1, originalHour-1, outDryBulbTemp)
                 if mixedAirOverride[hour-1] == 0: pointAirTempValues = warpByHeight(pointAirTempValues, ptHeightWeights, flowVolValues, heatGainValues, adjacentList, adjacentNameList, groupedInletArea, groupedZoneHeights, groupedGlzHeights, groupedWinCeilDiffs, outdoorClac, outDryBulbTemp)
                 pointAirTempValues = lb_preparation.flattenList(pointAirTempValues)
-                airTempMtx[count+1] = pointAirTempValues
                 
                 #Compute the relative humidity.
-                pointRelHumidValues = getAirPointValue(relHumidDict, testPtZoneWeights, testPtsViewFactor, hour-1, originalHour-1, outdoorClac, outRelHumid)
+                pointRelHumidValues = pointAirMatrix.getValues(relHumidDict, hour-1, originalHour-1, outRelHumid)
                 pointRelHumidValues = lb_preparation.flattenList(pointRelHumidValues)
                 
                 #Compute the wind speed.
@@ -1339,33 +1785,24 @@ def mainUTCI(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNu
                 # So we will do the same before calculating UTCI.
                 pointWindSpeedValues = [x * 1.5 for x in pointWindSpeedValues]
                 
-                #Compute the UTCI and comfort.
-                utciPointValues = []
-                outdoorComfPointValues = []
-                degNeutralPointValues = []
-                
-                for ptCount, airTemp in enumerate(pointAirTempValues):
-                    utci, comf, condition, stressVal = lb_comfortModels.comfUTCI(airTemp, pointMRTValues[ptCount], pointWindSpeedValues[ptCount], pointRelHumidValues[ptCount])
-                    utciPointValues.append(utci)
-                    outdoorComfPointValues.append(comf)
-                    degNeutralPointValues.append(utci-20)
+                #Collect the inputs of the UTCI model.  The model is evaluated for all the hours of the chunk at once.
+                comfInputs = [(airTemp, pointMRTValues[ptCount], pointWindSpeedValues[ptCount], pointRelHumidValues[ptCount]) for ptCount, airTemp in enumerate(pointAirTempValues)]
                 
-                UTCI_Mtx[count+1] = utciPointValues
-                OutdoorComfMtx[count+1] = outdoorComfPointValues
-                DegFromNeutralMtx[count+1] = degNeutralPointValues
+                return pointMRTValues, pointAirTempValues, comfInputs
+            
+            def comfortUTCI(airTemp, radTemp, windSpeed, relHumid):
+                #Compute the UTCI and comfort.
+                utci, comf, condition, stressVal = lb_comfortModels.comfUTCI(airTemp, radTemp, windSpeed, relHumid)
+                return utci, comf, utci-20
             
             #Run through every hour of the analysis to fill up the matrices.
-            if parallel_ == True and len(HOYs) != 1:
-                tasks.Parallel.ForEach(range(len(HOYs)), climateMapUTCI)
-            else:
-                for hour in range(len(HOYs)):
-                    #Ability to cancel with Esc
-                    if gh.GH_Document.IsEscapeKeyDown(): assert False
-                    climateMapUTCI(hour)
+            radTempMtx, airTempMtx, UTCI_Mtx, OutdoorComfMtx, DegFromNeutralMtx = runClimateMap(climateMapUTCI, HOYs, originalHOYs, pointMRTMatrix, [radTempMtx, airTempMtx, UTCI_Mtx, OutdoorComfMtx, DegFromNeutralMtx], resultCheckpoint, ComfortBatch(comfortUTCI))
         except:
             print "The calculation has been terminated by the user!"
             e = gh.GH_RuntimeMessageLevel.Warning
             ghenv.Component.AddRuntimeMessage(e, "The calculation has been terminated by the user!")
+            if resultCheckpoint != None and resultCheckpoint.hoursCompleted != 0:
+                print str(resultCheckpoint.hoursCompleted) + " hours of the analysis are saved.  Run the component again with the same inputs to resume the analysis."
             calcCancelled = True
         
         
@@ -1374,7 +1811,7 @@ def mainUTCI(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNu
         else:
             return -1
 
-def mainPET(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNumbers, airTempDataHeaders, flowVolDataHeaders, flowVolDataNumbers, heatGainDataHeaders, heatGainDataNumbers, relHumidDataHeaders, relHumidDataNumbers, zoneSrfNames, testPtsViewFactor, viewFactorMesh, latitude, longitude, timeZone, diffSolarRad, directSolarRad, globHorizRad, testPtSkyView, testPtBlockedVec, numSkyPatchDivs, winTrans, cloA, floorR, testPtZoneNames, testPtZoneWeights, ptHeightWeights, zoneInletInfo, inletHeightOverride, mixedAirOverride, zoneHasWindows, outdoorClac, outSrfTempHeaders, outSrfTempNumbers, outdoorNonSrfViewFac, outDryBulbTemp, outRelHumid, outWindSpeed, d, a, outdoorPtHeightWeights, allWindowShadesSame, winStatusHeaders, testPtBlockName, zoneWindowTransmiss, zoneWindowNames, allWindSpeedsSame, winSpeedNumbers, dataAnalysisPeriod, northAngle, bodyCharacteristics, climate, horizInfraredRadiation, lb_preparation, lb_sunpath, lb_comfortModels, lb_wind):
+def mainPET(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNumbers, airTempDataHeaders, flowVolDataHeaders, flowVolDataNumbers, heatGainDataHeaders, heatGainDataNumbers, relHumidDataHeaders, relHumidDataNumbers, zoneSrfNames, testPtsViewFactor, viewFactorMesh, latitude, longitude, timeZone, diffSolarRad, directSolarRad, globHorizRad, testPtSkyView, testPtBlockedVec, numSkyPatchDivs, winTrans, cloA, floorR, testPtZoneNames, testPtZoneWeights, ptHeightWeights, zoneInletInfo, inletHeightOverride, mixedAirOverride, zoneHasWindows, outdoorClac, outSrfTempHeaders, outSrfTempNumbers, outdoorNonSrfViewFac, outDryBulbTemp, outRelHumid, outWindSpeed, d, a, outdoorPtHeightWeights, allWindowShadesSame, winStatusHeaders, testPtBlockName, zoneWindowTransmiss, zoneWindowNames, allWindSpeedsSame, winSpeedNumbers, dataAnalysisPeriod, northAngle, bodyCharacteristics, climate, horizInfraredRadiation, lb_preparation, lb_sunpath, lb_comfortModels, lb_wind, resultCheckpoint):
     #Set up matrices to be filled.
     radTempMtx = ['Radiant Temperature;' + str(analysisPeriod[0]) + ";" + str(analysisPeriod[1])]
     airTempMtx = ['Air Temperature;' + str(analysisPeriod[0]) + ";" + str(analysisPeriod[1])]
@@ -1404,14 +1841,6 @@ def mainPET(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
         ghenv.Component.AddRuntimeMessage(w, warning)
         return -1
     else:
-        #Create placeholders for all of the hours.
-        for hour in HOYs:
-            radTempMtx.append(0)
-            airTempMtx.append(0)
-            PET_Mtx.append(0)
-            PET_ComfMtx.append(0)
-            PET_CategoryMtx.append(0)
-        
         #Make sure that the EPW Data does not include headers.
         outDryBulbTemp = outDryBulbTemp[7:]
         outRelHumid = outRelHumid[7:]
@@ -1439,6 +1868,7 @@ def mainPET(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
             skyPatchMeshes = []
             for patch in skyPatches:
                 skyPatchMeshes.append(rc.Geometry.Mesh.CreateFromBrep(patch, rc.Geometry.MeshingParameters.Coarse)[0])
+            skyPatchIndex = SkyPatchIndex(skyPatchMeshes)
             
             #Initiate the sun vector calculator.
             lb_sunpath.initTheClass(float(latitude), northAngle, rc.Geometry.Point3d.Origin, 100, float(longitude), float(timeZone))
@@ -1458,7 +1888,8 @@ def mainPET(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
                 sunVecs.append(sunVec)
                 altitudes.append(altitude)
                 azimuths.append(azimuth)
-            sunVecInfo = [sunVecs, altitudes, azimuths]
+            sunPatches = [skyPatchIndex.getPatch(sunVec) for sunVec in sunVecs]
+            sunVecInfo = [sunVecs, altitudes, azimuths, sunPatches]
         
         #Make a dictionary that will relate the testPtZoneNames to the air temperatures.
         try: airTempDict = createZoneDict(testPtZoneNames, "zoneName", "airTemp", airTempDataHeaders, airTempDataNumbers)
@@ -1480,7 +1911,10 @@ def mainPET(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
         #Run through every hour of the analysis to fill up the matrices.
         calcCancelled = False
         try:
-            def climateMapPET(count):
+            pointMRTMatrix = PointMRTMatrix(srfTempDict, testPtsViewFactor, outdoorClac, outSrfTempDict, outdoorNonSrfViewFac, outDryBulbTemp)
+            pointAirMatrix = PointAirMatrix(testPtZoneWeights, testPtsViewFactor, outdoorClac)
+            
+            def climateMapPET(count, pointMRTValues):
                 #Ability to cancel with Esc
                 if gh.GH_Document.IsEscapeKeyDown(): assert False
                 
@@ -1495,24 +1929,21 @@ def mainPET(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
                 for zoneVal in heatGainDataNumbers: heatGainValues.append(zoneVal[hour-1])
                 
                 #Compute the radiant temperature.
-                pointMRTValues = calculatePointMRT(srfTempDict, testPtsViewFactor, hour-1, originalHour-1, outdoorClac, outSrfTempDict, outdoorNonSrfViewFac, outDryBulbTemp)
                 if sum(zoneHasWindows) != 0:
-                    if allWindowShadesSame == True: pointMRTValues = calculateSolarAdjustedMRT(pointMRTValues, hour, originalHour, diffSolarRad, directSolarRad, globHorizRad, count, sunVecInfo, testPtSkyView, testPtBlockedVec, winTrans, cloA, floorR, skyPatchMeshes, zoneHasWindows, outdoorClac, horizInfraredRadiation, lb_comfortModels)
+                    if allWindowShadesSame == True: pointMRTValues = calculateSolarAdjustedMRT(pointMRTValues, hour, originalHour, diffSolarRad, directSolarRad, globHorizRad, count, sunVecInfo, testPtSkyView, testPtBlockedVec, winTrans, cloA, floorR, zoneHasWindows, outdoorClac, horizInfraredRadiation, lb_comfortModels)
                     else:
                         #To factor in the effect of blocked sunlight, I have to re-make the testPtSkyView and the testPtBlockedVec to reflect the conditions for the given hour.
                         hourTestPtSkyView, hourTestPtBlockedVec = computeHourShadeDrawing(hour, testPtSkyView, testPtBlockedVec, winShdDict, testPtBlockName, outdoorClac)
-                        pointMRTValues = calculateSolarAdjustedMRT(pointMRTValues, hour, originalHour, diffSolarRad, directSolarRad, globHorizRad, count, sunVecInfo, hourTestPtSkyView, hourTestPtBlockedVec, neutralWinTransList, cloA, floorR, skyPatchMeshes, zoneHasWindows, outdoorClac, horizInfraredRadiation, lb_comfortModels)
+                        pointMRTValues = calculateSolarAdjustedMRT(pointMRTValues, hour, originalHour, diffSolarRad, directSolarRad, globHorizRad, count, sunVecInfo, hourTestPtSkyView, hourTestPtBlockedVec, neutralWinTransList, cloA, floorR, zoneHasWindows, outdoorClac, horizInfraredRadiation, lb_comfortModels)
                 pointMRTValues = lb_preparation.flattenList(pointMRTValues)
-                radTempMtx[count+1] = pointMRTValues
                 
                 #Compute the air temperature.
-                pointAirTempValues = getAirPointValue(airTempDict, testPtZoneWeights, testPtsViewFactor, hour-1, originalHour-1, outdoorClac, outDryBulbTemp)
+                pointAirTempValues = pointAirMatrix.getValues(airTempDict, hour-1, originalHour-1, outDryBulbTemp)
                 if mixedAirOverride[hour-1] == 0: pointAirTempValues = warpByHeight(pointAirTempValues, ptHeightWeights, flowVolValues, heatGainValues, adjacentList, adjacentNameList, groupedInletArea, groupedZoneHeights, groupedGlzHeights, groupedWinCeilDiffs, outdoorClac, outDryBulbTemp)
                 pointAirTempValues = lb_preparation.flattenList(pointAirTempValues)
-                airTempMtx[count+1] = pointAirTempValues
                 
                 #Compute the relative humidity.
-                pointRelHumidValues = getAirPointValue(relHumidDict, testPtZoneWeights, testPtsViewFactor, hour-1, originalHour-1, outdoorClac, outRelHumid)
+                pointRelHumidValues = pointAirMatrix.getValues(relHumidDict, hour-1, originalHour-1, outRelHumid)
                 pointRelHumidValues = lb_preparation.flattenList(pointRelHumidValues)
                 
                 #Compute the wind speed.
@@ -1537,39 +1968,30 @@ def mainPET(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
                                 windFlowVal = lb_wind.powerLawWind(outWindSpeed[originalHour-1], outdoorPtHeightWeights[valCount], d, a, 270, 0.14)
                                 pointWindSpeedValues.append(windFlowVal)
                 
-                #Compute the UTCI and comfort.
-                petPointValues = []
-                petComfPointValues = []
-                petCategoryValues = []
+                #Collect the inputs of the PET model.  The model is evaluated for all the hours of the chunk at once.
+                Icl = bodyCharacteristics['Icl'][originalHour]
+                comfInputs = [(airTemp, pointMRTValues[ptCount], pointRelHumidValues[ptCount], pointWindSpeedValues[ptCount], Icl) for ptCount, airTemp in enumerate(pointAirTempValues)]
                 
-                for ptCount, airTemp in enumerate(pointAirTempValues):
-                    petObj = lb_comfortModels.physiologicalEquivalentTemperature(airTemp, pointMRTValues[ptCount], pointRelHumidValues[ptCount], pointWindSpeedValues[ptCount], bodyCharacteristics['age'], bodyCharacteristics['sex'], bodyCharacteristics['heightM'], bodyCharacteristics['weight'], bodyCharacteristics['bodyPosition'], bodyCharacteristics['Mmets'], bodyCharacteristics['Icl'][originalHour])
-                    respiration = petObj.inkoerp()
-                    coreTemperature, radiationBalance, convection, waterVaporDiffusion = petObj.berech()
-                    petObj.pet()
-                    skinTemperature, totalHeatLoss, skinSweating, internalHeat, sweatEvaporation, PET = petObj.tsk, petObj.wsum, petObj.wetsk, petObj.h, petObj.esw, petObj.tx
-                    effectPET, comfortablePET = petObj.thermalCategories(climate)
-                    
-                    petPointValues.append(PET)
-                    petComfPointValues.append(comfortablePET)
-                    petCategoryValues.append(effectPET)
-                
-                PET_Mtx[count+1] = petPointValues
-                PET_ComfMtx[count+1] = petComfPointValues
-                PET_CategoryMtx[count+1] = petCategoryValues
+                return pointMRTValues, pointAirTempValues, comfInputs
+            
+            def comfortPET(airTemp, radTemp, relHumid, windSpeed, Icl):
+                #Compute the PET and comfort.
+                petObj = lb_comfortModels.physiologicalEquivalentTemperature(airTemp, radTemp, relHumid, windSpeed, bodyCharacteristics['age'], bodyCharacteristics['sex'], bodyCharacteristics['heightM'], bodyCharacteristics['weight'], bodyCharacteristics['bodyPosition'], bodyCharacteristics['Mmets'], Icl)
+                respiration = petObj.inkoerp()
+                coreTemperature, radiationBalance, convection, waterVaporDiffusion = petObj.berech()
+                petObj.pet()
+                skinTemperature, totalHeatLoss, skinSweating, internalHeat, sweatEvaporation, PET = petObj.tsk, petObj.wsum, petObj.wetsk, petObj.h, petObj.esw, petObj.tx
+                effectPET, comfortablePET = petObj.thermalCategories(climate)
+                return PET, comfortablePET, effectPET
             
             #Run through every hour of the analysis to fill up the matrices.
-            if parallel_ == True and len(HOYs) != 1:
-                tasks.Parallel.ForEach(range(len(HOYs)), climateMapPET)
-            else:
-                for hour in range(len(HOYs)):
-                    #Ability to cancel with Esc
-                    if gh.GH_Document.IsEscapeKeyDown(): assert False
-                    climateMapPET(hour)
+            radTempMtx, airTempMtx, PET_Mtx, PET_ComfMtx, PET_CategoryMtx = runClimateMap(climateMapPET, HOYs, originalHOYs, pointMRTMatrix, [radTempMtx, airTempMtx, PET_Mtx, PET_ComfMtx, PET_CategoryMtx], resultCheckpoint, ComfortBatch(ComfortModelCache(comfortPET, comfortCachePrecisions["PET"] if roundComfortInputs else None, comfortCacheSize)))
         except:
             print "The calculation has been terminated by the user!"
             e = gh.GH_RuntimeMessageLevel.Warning
             ghenv.Component.AddRuntimeMessage(e, "The calculation has been terminated by the user!")
+            if resultCheckpoint != None and resultCheckpoint.hoursCompleted != 0:
+                print str(resultCheckpoint.hoursCompleted) + " hours of the analysis are saved.  Run the component again with the same inputs to resume the analysis."
             calcCancelled = True
         
         
@@ -1579,370 +2001,22 @@ def mainPET(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNum
             return -1
 
 
-def writeCSVAdapt(lb_preparation, directory, fileName, radTempMtx, airTempMtx, operativeTempMtx, adaptComfMtx, degFromTargetMtx):
-    #Find out the number of values in each hour.
-    valLen = len(radTempMtx[-1])-1
-    
-    #Set up a working directory.
-    workingDir = lb_preparation.makeWorkingDir(os.path.join(directory)) 
-    
-    #Create a csv Files.
-    radTempFile = fileName + "RadiantTemp.csv"
-    airTempFile = fileName + "AirTemp.csv"
-    opTempFile = fileName + "OperativeTemp.csv"
-    adaptComfFile = fileName + "AdaptComf.csv"
-    degFromTargetFile = fileName + "DegFromTarget.csv"
-    
-    #Write the radiant temperature result file.
-    if writeResultFile_ != 2:
-        radTempResult = os.path.join(workingDir, radTempFile)
-        radCSVfile = open(radTempResult, 'wb')
-        for lineCount, line in enumerate(radTempMtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                radCSVfile.write(lineStr)
-            else: radCSVfile.write(line + "\n")
-        radCSVfile.close()
-    else:
-        radTempResult = None
-    
-    #Write the air temperature result file.
-    if writeResultFile_ != 2:
-        airTempResult = os.path.join(workingDir, airTempFile)
-        airCSVfile = open(airTempResult, 'wb')
-        for lineCount, line in enumerate(airTempMtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                airCSVfile.write(lineStr)
-            else: airCSVfile.write(line + "\n")
-        airCSVfile.close()
-    else:
-        airTempResult = None
-    
-    #Write the operative temperature result file.
-    if writeResultFile_ != 2:
-        operativeTempResult = os.path.join(workingDir, opTempFile)
-        opCSVfile = open(operativeTempResult, 'wb')
-        for lineCount, line in enumerate(operativeTempMtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                opCSVfile.write(lineStr)
-            else: opCSVfile.write(line + "\n")
-        opCSVfile.close()
-    else:
-        operativeTempResult = None
-    
-    #Write the adaptive comfort result file.
-    adaptComfResult = os.path.join(workingDir, adaptComfFile)
-    comfCSVfile = open(adaptComfResult, 'wb')
-    for lineCount, line in enumerate(adaptComfMtx):
-        lineStr = ''
-        if lineCount != 0:
-            for valCt, val in enumerate(line):
-                if valCt != valLen: lineStr = lineStr + str(val) + ','
-                else: lineStr = lineStr + str(val) + "\n"
-            comfCSVfile.write(lineStr)
-        else: comfCSVfile.write(line + "\n")
-    comfCSVfile.close()
-    
-    #Write the deg from target result file.
-    degFromTargetResult = os.path.join(workingDir, degFromTargetFile)
-    degCSVfile = open(degFromTargetResult, 'wb')
-    for lineCount, line in enumerate(degFromTargetMtx):
-        lineStr = ''
-        if lineCount != 0:
-            for valCt, val in enumerate(line):
-                if valCt != valLen: lineStr = lineStr + str(val) + ','
-                else: lineStr = lineStr + str(val) + "\n"
-            degCSVfile.write(lineStr)
-        else: degCSVfile.write(line + "\n")
-    degCSVfile.close()
-    
-    
-    return radTempResult, airTempResult, operativeTempResult, adaptComfResult, degFromTargetResult
-
-
-def writeCSVPMV(lb_preparation, directory, fileName, radTempMtx, airTempMtx, SET_Mtx, PMVComfMtx, PMV_Mtx):
-    #Find out the number of values in each hour.
-    valLen = len(radTempMtx[-1])-1
-    
-    #Set up a working directory.
-    workingDir = lb_preparation.makeWorkingDir(os.path.join(directory)) 
-    
-    #Create a csv Files.
-    radTempFile = fileName + "RadiantTemp.csv"
-    airTempFile = fileName + "AirTemp.csv"
-    SETFile = fileName + "SET.csv"
-    PPDFile = fileName + "PPD.csv"
-    PMVFile = fileName + "PMV.csv"
-    
-    #Write the radiant temperature result file.
-    if writeResultFile_ != 2:
-        radTempResult = os.path.join(workingDir, radTempFile)
-        radCSVfile = open(radTempResult, 'wb')
-        for lineCount, line in enumerate(radTempMtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                radCSVfile.write(lineStr)
-            else: radCSVfile.write(line + "\n")
-        radCSVfile.close()
-    else:
-        radTempResult = None
-    
-    #Write the air temperature result file.
-    if writeResultFile_ != 2:
-        airTempResult = os.path.join(workingDir, airTempFile)
-        airCSVfile = open(airTempResult, 'wb')
-        for lineCount, line in enumerate(airTempMtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                airCSVfile.write(lineStr)
-            else: airCSVfile.write(line + "\n")
-        airCSVfile.close()
-    else:
-        airTempResult = None
-    
-    #Write the operative temperature result file.
-    if writeResultFile_ != 2:
-        SET_Result = os.path.join(workingDir, SETFile)
-        opCSVfile = open(SET_Result, 'wb')
-        for lineCount, line in enumerate(SET_Mtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                opCSVfile.write(lineStr)
-            else: opCSVfile.write(line + "\n")
-        opCSVfile.close()
-    else:
-        SET_Result = None
-    
-    #Write the adaptive comfort result file.
-    PPD_Result = os.path.join(workingDir, PPDFile)
-    comfCSVfile = open(PPD_Result, 'wb')
-    for lineCount, line in enumerate(PMVComfMtx):
-        lineStr = ''
-        if lineCount != 0:
-            for valCt, val in enumerate(line):
-                if valCt != valLen: lineStr = lineStr + str(val) + ','
-                else: lineStr = lineStr + str(val) + "\n"
-            comfCSVfile.write(lineStr)
-        else: comfCSVfile.write(line + "\n")
-    comfCSVfile.close()
-    
-    #Write the deg from target result file.
-    PMV_Result = os.path.join(workingDir, PMVFile)
-    degCSVfile = open(PMV_Result, 'wb')
-    for lineCount, line in enumerate(PMV_Mtx):
-        lineStr = ''
-        if lineCount != 0:
-            for valCt, val in enumerate(line):
-                if valCt != valLen: lineStr = lineStr + str(val) + ','
-                else: lineStr = lineStr + str(val) + "\n"
-            degCSVfile.write(lineStr)
-        else: degCSVfile.write(line + "\n")
-    degCSVfile.close()
-    
-    
-    return radTempResult, airTempResult, SET_Result, PPD_Result, PMV_Result
-
-def writeCSVUTCI(lb_preparation, directory, fileName, radTempMtx, airTempMtx, UTCI_Mtx, OutdoorComfMtx, DegFromNeutralMtx):
-    #Find out the number of values in each hour.
-    valLen = len(radTempMtx[-1])-1
-    
-    #Set up a working directory.
-    workingDir = lb_preparation.makeWorkingDir(os.path.join(directory)) 
-    
-    #Create a csv Files.
-    radTempFile = fileName + "RadiantTemp.csv"
-    airTempFile = fileName + "AirTemp.csv"
-    UTCIFile = fileName + "UTCI.csv"
-    OutdoorComfFile = fileName + "OutdoorComf.csv"
-    DegFromNeutralFile = fileName + "DegFromTarget.csv"
-    
-    #Write the radiant temperature result file.
-    if writeResultFile_ != 2:
-        radTempResult = os.path.join(workingDir, radTempFile)
-        radCSVfile = open(radTempResult, 'wb')
-        for lineCount, line in enumerate(radTempMtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                radCSVfile.write(lineStr)
-            else: radCSVfile.write(line + "\n")
-        radCSVfile.close()
-    else:
-        radTempResult = None
-    
-    #Write the air temperature result file.
-    if writeResultFile_ != 2:
-        airTempResult = os.path.join(workingDir, airTempFile)
-        airCSVfile = open(airTempResult, 'wb')
-        for lineCount, line in enumerate(airTempMtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                airCSVfile.write(lineStr)
-            else: airCSVfile.write(line + "\n")
-        airCSVfile.close()
-    else:
-        airTempResult = None
-    
-    #Write the operative temperature result file.
-    if writeResultFile_ != 2:
-        UTCI_Result = os.path.join(workingDir, UTCIFile)
-        opCSVfile = open(UTCI_Result, 'wb')
-        for lineCount, line in enumerate(UTCI_Mtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                opCSVfile.write(lineStr)
-            else: opCSVfile.write(line + "\n")
-        opCSVfile.close()
-    else:
-        UTCI_Result = None
-    
-    #Write the adaptive comfort result file.
-    OutdoorComfResult = os.path.join(workingDir, OutdoorComfFile)
-    comfCSVfile = open(OutdoorComfResult, 'wb')
-    for lineCount, line in enumerate(OutdoorComfMtx):
-        lineStr = ''
-        if lineCount != 0:
-            for valCt, val in enumerate(line):
-                if valCt != valLen: lineStr = lineStr + str(val) + ','
-                else: lineStr = lineStr + str(val) + "\n"
-            comfCSVfile.write(lineStr)
-        else: comfCSVfile.write(line + "\n")
-    comfCSVfile.close()
-    
-    #Write the deg from target result file.
-    DegFromNeutralResult = os.path.join(workingDir, DegFromNeutralFile)
-    degCSVfile = open(DegFromNeutralResult, 'wb')
-    for lineCount, line in enumerate(DegFromNeutralMtx):
-        lineStr = ''
-        if lineCount != 0:
-            for valCt, val in enumerate(line):
-                if valCt != valLen: lineStr = lineStr + str(val) + ','
-                else: lineStr = lineStr + str(val) + "\n"
-            degCSVfile.write(lineStr)
-        else: degCSVfile.write(line + "\n")
-    degCSVfile.close()
-    
-    
-    return radTempResult, airTempResult, UTCI_Result, OutdoorComfResult, DegFromNeutralResult
-
-def writeCSVPET(lb_preparation, directory, fileName, radTempMtx, airTempMtx, PET_Mtx, PETComfMtx, PETCategoryMtx):
-    #Find out the number of values in each hour.
-    valLen = len(radTempMtx[-1])-1
-    
-    #Set up a working directory.
-    workingDir = lb_preparation.makeWorkingDir(os.path.join(directory)) 
-    
-    #Create a csv Files.
-    radTempFile = fileName + "RadiantTemp.csv"
-    airTempFile = fileName + "AirTemp.csv"
-    PETFile = fileName + "PET.csv"
-    PETComfFile = fileName + "PETComf.csv"
-    PETCategoryFile = fileName + "PETCategory.csv"
-    
-    #Write the radiant temperature result file.
-    if writeResultFile_ != 2:
-        radTempResult = os.path.join(workingDir, radTempFile)
-        radCSVfile = open(radTempResult, 'wb')
-        for lineCount, line in enumerate(radTempMtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                radCSVfile.write(lineStr)
-            else: radCSVfile.write(line + "\n")
-        radCSVfile.close()
-    else:
-        radTempResult = None
-    
-    #Write the air temperature result file.
-    if writeResultFile_ != 2:
-        airTempResult = os.path.join(workingDir, airTempFile)
-        airCSVfile = open(airTempResult, 'wb')
-        for lineCount, line in enumerate(airTempMtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                airCSVfile.write(lineStr)
-            else: airCSVfile.write(line + "\n")
-        airCSVfile.close()
-    else:
-        airTempResult = None
-    
-    #Write the operative temperature result file.
-    if writeResultFile_ != 2:
-        PET_Result = os.path.join(workingDir, PETFile)
-        opCSVfile = open(PET_Result, 'wb')
-        for lineCount, line in enumerate(PET_Mtx):
-            lineStr = ''
-            if lineCount != 0:
-                for valCt, val in enumerate(line):
-                    if valCt != valLen: lineStr = lineStr + str(val) + ','
-                    else: lineStr = lineStr + str(val) + "\n"
-                opCSVfile.write(lineStr)
-            else: opCSVfile.write(line + "\n")
-        opCSVfile.close()
-    else:
-        PET_Result = None
-    
-    #Write the adaptive comfort result file.
-    PET_ComfResult = os.path.join(workingDir, PETComfFile)
-    comfCSVfile = open(PET_ComfResult, 'wb')
-    for lineCount, line in enumerate(PETComfMtx):
-        lineStr = ''
-        if lineCount != 0:
-            for valCt, val in enumerate(line):
-                if valCt != valLen: lineStr = lineStr + str(val) + ','
-                else: lineStr = lineStr + str(val) + "\n"
-            comfCSVfile.write(lineStr)
-        else: comfCSVfile.write(line + "\n")
-    comfCSVfile.close()
-    
-    #Write the deg from target result file.
-    PET_CategoryResult = os.path.join(workingDir, PETCategoryFile)
-    degCSVfile = open(PET_CategoryResult, 'wb')
-    for lineCount, line in enumerate(PETCategoryMtx):
-        lineStr = ''
-        if lineCount != 0:
-            for valCt, val in enumerate(line):
-                if valCt != valLen: lineStr = lineStr + str(val) + ','
-                else: lineStr = lineStr + str(val) + "\n"
-            degCSVfile.write(lineStr)
-        else: degCSVfile.write(line + "\n")
-    degCSVfile.close()
-    
-    
-    return radTempResult, airTempResult, PET_Result, PET_ComfResult, PET_CategoryResult
+def writeResultFiles(resultCheckpoint):
+    #Check the type of the result files.
+    if writeResultFile_ == None: writeType = 1
+    else: writeType = int(writeResultFile_)
+    
+    #The results are already saved into binary files during the analysis.  Convert them to csv files if the user has asked for them.
+    resultFiles = []
+    for mtxCount, filePath in enumerate(resultCheckpoint.filePaths):
+        if writeType % 2 == 0 and mtxCount < 3:
+            resultFiles.append(None)
+        elif writeType > 2:
+            resultFiles.append(resultCheckpoint.hb_MicroclimateMatrix(filePath).toCSV())
+        else:
+            resultFiles.append(filePath)
+    
+    return resultFiles
 
 
 #Import the classes, check the inputs, and generate default values for grid size if the user has given none.
@@ -1991,27 +2065,38 @@ if recipeRecognized == True and checkLB == True:
     checkData, HOYs, analysisPeriod, fileName, directory = setDefaults(lb_defaultFolder, lb_preparation)
 
 if checkData == True and _runIt == True:
+    #Save the results into files chunk by chunk so that an interrupted analysis can be resumed.
+    resultCheckpoint = None
+    if writeResultFile_ != 0:
+        if sc.sticky.has_key("honeybee_MicroclimateMatrixWriter"):
+            signature = getInputSignature([comfortModel, list(_comfAnalysisRecipe), HOYs, analysisPeriod])
+            resultCheckpoint = ResultCheckpoint(directory, fileName, resultFileNames[comfortModel], signature)
+        else:
+            warning = "You should let Honeybee fly to write the result files..."
+            print warning
+            ghenv.Component.AddRuntimeMessage(w, warning)
+    
     if comfortModel == "Adaptive":
-        result = mainAdapt(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNumbers, airTempDataHeaders, flowVolDataHeaders, flowVolDataNumbers, heatGainDataHeaders, heatGainDataNumbers, zoneSrfNames, testPtViewFactor, viewFactorMesh, latitude, longitude, timeZone, diffSolarRad, directSolarRad, globHorizRad, testPtSkyView, testPtBlockedVec, numSkyPatchDivs, winTrans, cloA, floorR, testPtZoneNames, testPtZoneWeights, ptHeightWeights, zoneInletInfo, inletHeightOverride, prevailingOutdoorTemp, ASHRAEorEN, comfClass, avgMonthOrRunMean, levelOfConditioning, mixedAirOverride, zoneHasWindows, outdoorClac, outSrfTempHeaders, outSrfTempNumbers, outdoorNonSrfViewFac, dataAnalysisPeriod, outWindSpeed, d, a, outdoorPtHeightWeights, allWindowShadesSame, winStatusHeaders, testPtBlockName, zoneWindowTransmiss, zoneWindowNames, allWindSpeedsSame, winSpeedNumbers, horizInfraredRadiation, northAngle, lb_preparation, lb_sunpath, lb_comfortModels, lb_wind)
+        result = mainAdapt(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNumbers, airTempDataHeaders, flowVolDataHeaders, flowVolDataNumbers, heatGainDataHeaders, heatGainDataNumbers, zoneSrfNames, testPtViewFactor, viewFactorMesh, latitude, longitude, timeZone, diffSolarRad, directSolarRad, globHorizRad, testPtSkyView, testPtBlockedVec, numSkyPatchDivs, winTrans, cloA, floorR, testPtZoneNames, testPtZoneWeights, ptHeightWeights, zoneInletInfo, inletHeightOverride, prevailingOutdoorTemp, ASHRAEorEN, comfClass, avgMonthOrRunMean, levelOfConditioning, mixedAirOverride, zoneHasWindows, outdoorClac, outSrfTempHeaders, outSrfTempNumbers, outdoorNonSrfViewFac, dataAnalysisPeriod, outWindSpeed, d, a, outdoorPtHeightWeights, allWindowShadesSame, winStatusHeaders, testPtBlockName, zoneWindowTransmiss, zoneWindowNames, allWindSpeedsSame, winSpeedNumbers, horizInfraredRadiation, northAngle, lb_preparation, lb_sunpath, lb_comfortModels, lb_wind, resultCheckpoint)
         if result != -1:
             radTempMtx, airTempMtx, operativeTempMtx, adaptComfMtx, degFromTargetMtx = result
-            if writeResultFile_ != 0:
-                radTempResult, airTempResult, operativeTempResult, adaptComfResult, degFromTargetResult = writeCSVAdapt(lb_preparation, directory, fileName, radTempMtx, airTempMtx, operativeTempMtx, adaptComfMtx, degFromTargetMtx)
+            if resultCheckpoint != None:
+                radTempResult, airTempResult, operativeTempResult, adaptComfResult, degFromTargetResult = writeResultFiles(resultCheckpoint)
     elif comfortModel == "PMV":
-        result = mainPMV(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNumbers, airTempDataHeaders, flowVolDataHeaders, flowVolDataNumbers, heatGainDataHeaders, heatGainDataNumbers, relHumidDataHeaders, relHumidDataNumbers, clothingLevel, metabolicRate, zoneSrfNames, testPtViewFactor, viewFactorMesh, latitude, longitude, timeZone, diffSolarRad, directSolarRad, globHorizRad, testPtSkyView, testPtBlockedVec, numSkyPatchDivs, winTrans, cloA, floorR, testPtZoneNames, testPtZoneWeights, ptHeightWeights, zoneInletInfo, inletHeightOverride, PPDComfortThresh, humidRatioUp, humidRatioLow, mixedAirOverride, zoneHasWindows, outdoorClac, outSrfTempHeaders, outSrfTempNumbers, outdoorNonSrfViewFac, outDryBulbTemp, outRelHumid, outWindSpeed, d, a, outdoorPtHeightWeights, allWindowShadesSame, winStatusHeaders, testPtBlockName, zoneWindowTransmiss, zoneWindowNames, allWindSpeedsSame, winSpeedNumbers, dataAnalysisPeriod, northAngle, horizInfraredRadiation, lb_preparation, lb_sunpath, lb_comfortModels, lb_wind)
+        result = mainPMV(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNumbers, airTempDataHeaders, flowVolDataHeaders, flowVolDataNumbers, heatGainDataHeaders, heatGainDataNumbers, relHumidDataHeaders, relHumidDataNumbers, clothingLevel, metabolicRate, zoneSrfNames, testPtViewFactor, viewFactorMesh, latitude, longitude, timeZone, diffSolarRad, directSolarRad, globHorizRad, testPtSkyView, testPtBlockedVec, numSkyPatchDivs, winTrans, cloA, floorR, testPtZoneNames, testPtZoneWeights, ptHeightWeights, zoneInletInfo, inletHeightOverride, PPDComfortThresh, humidRatioUp, humidRatioLow, mixedAirOverride, zoneHasWindows, outdoorClac, outSrfTempHeaders, outSrfTempNumbers, outdoorNonSrfViewFac, outDryBulbTemp, outRelHumid, outWindSpeed, d, a, outdoorPtHeightWeights, allWindowShadesSame, winStatusHeaders, testPtBlockName, zoneWindowTransmiss, zoneWindowNames, allWindSpeedsSame, winSpeedNumbers, dataAnalysisPeriod, northAngle, horizInfraredRadiation, lb_preparation, lb_sunpath, lb_comfortModels, lb_wind, resultCheckpoint)
         if result != -1:
             radTempMtx, airTempMtx, SET_Mtx, PMVComfMtx, PMV_Mtx = result
-            if writeResultFile_ != 0:
-                radTempResult, airTempResult, SET_Result, PMVComfResult, PMV_Result = writeCSVPMV(lb_preparation, directory, fileName, radTempMtx, airTempMtx, SET_Mtx, PMVComfMtx, PMV_Mtx)
+            if resultCheckpoint != None:
+                radTempResult, airTempResult, SET_Result, PMVComfResult, PMV_Result = writeResultFiles(resultCheckpoint)
     elif comfortModel == "UTCI":
-        result = mainUTCI(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNumbers, airTempDataHeaders, flowVolDataHeaders, flowVolDataNumbers, heatGainDataHeaders, heatGainDataNumbers, relHumidDataHeaders, relHumidDataNumbers, zoneSrfNames, testPtViewFactor, viewFactorMesh, latitude, longitude, timeZone, diffSolarRad, directSolarRad, globHorizRad, testPtSkyView, testPtBlockedVec, numSkyPatchDivs, winTrans, cloA, floorR, testPtZoneNames, testPtZoneWeights, ptHeightWeights, zoneInletInfo, inletHeightOverride, mixedAirOverride, zoneHasWindows, outdoorClac, outSrfTempHeaders, outSrfTempNumbers, outdoorNonSrfViewFac, outDryBulbTemp, outRelHumid, outWindSpeed, d, a, outdoorPtHeightWeights, allWindowShadesSame, winStatusHeaders, testPtBlockName, zoneWindowTransmiss, zoneWindowNames, allWindSpeedsSame, winSpeedNumbers, dataAnalysisPeriod, northAngle, horizInfraredRadiation, lb_preparation, lb_sunpath, lb_comfortModels, lb_wind)
+        result = mainUTCI(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNumbers, airTempDataHeaders, flowVolDataHeaders, flowVolDataNumbers, heatGainDataHeaders, heatGainDataNumbers, relHumidDataHeaders, relHumidDataNumbers, zoneSrfNames, testPtViewFactor, viewFactorMesh, latitude, longitude, timeZone, diffSolarRad, directSolarRad, globHorizRad, testPtSkyView, testPtBlockedVec, numSkyPatchDivs, winTrans, cloA, floorR, testPtZoneNames, testPtZoneWeights, ptHeightWeights, zoneInletInfo, inletHeightOverride, mixedAirOverride, zoneHasWindows, outdoorClac, outSrfTempHeaders, outSrfTempNumbers, outdoorNonSrfViewFac, outDryBulbTemp, outRelHumid, outWindSpeed, d, a, outdoorPtHeightWeights, allWindowShadesSame, winStatusHeaders, testPtBlockName, zoneWindowTransmiss, zoneWindowNames, allWindSpeedsSame, winSpeedNumbers, dataAnalysisPeriod, northAngle, horizInfraredRadiation, lb_preparation, lb_sunpath, lb_comfortModels, lb_wind, resultCheckpoint)
         if result != -1:
             radTempMtx, airTempMtx, UTCI_Mtx, OutdoorComfMtx, DegFromNeutralMtx = result
-            if writeResultFile_ != 0:
-                radTempResult, airTempResult, UTCI_Result, OutdoorComfResult, DegFromNeutralResult = writeCSVUTCI(lb_preparation, directory, fileName, radTempMtx, airTempMtx, UTCI_Mtx, OutdoorComfMtx, DegFromNeutralMtx)
+            if resultCheckpoint != None:
+                radTempResult, airTempResult, UTCI_Result, OutdoorComfResult, DegFromNeutralResult = writeResultFiles(resultCheckpoint)
     elif comfortModel == "PET":
-        result = mainPET(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNumbers, airTempDataHeaders, flowVolDataHeaders, flowVolDataNumbers, heatGainDataHeaders, heatGainDataNumbers, relHumidDataHeaders, relHumidDataNumbers, zoneSrfNames, testPtViewFactor, viewFactorMesh, latitude, longitude, timeZone, diffSolarRad, directSolarRad, globHorizRad, testPtSkyView, testPtBlockedVec, numSkyPatchDivs, winTrans, cloA, floorR, testPtZoneNames, testPtZoneWeights, ptHeightWeights, zoneInletInfo, inletHeightOverride, mixedAirOverride, zoneHasWindows, outdoorClac, outSrfTempHeaders, outSrfTempNumbers, outdoorNonSrfViewFac, outDryBulbTemp, outRelHumid, outWindSpeed, d, a, outdoorPtHeightWeights, allWindowShadesSame, winStatusHeaders, testPtBlockName, zoneWindowTransmiss, zoneWindowNames, allWindSpeedsSame, winSpeedNumbers, dataAnalysisPeriod, northAngle, bodyCharacteristics, climate, horizInfraredRadiation, lb_preparation, lb_sunpath, lb_comfortModels, lb_wind)
+        result = mainPET(HOYs, analysisPeriod, srfTempNumbers, srfTempHeaders, airTempDataNumbers, airTempDataHeaders, flowVolDataHeaders, flowVolDataNumbers, heatGainDataHeaders, heatGainDataNumbers, relHumidDataHeaders, relHumidDataNumbers, zoneSrfNames, testPtViewFactor, viewFactorMesh, latitude, longitude, timeZone, diffSolarRad, directSolarRad, globHorizRad, testPtSkyView, testPtBlockedVec, numSkyPatchDivs, winTrans, cloA, floorR, testPtZoneNames, testPtZoneWeights, ptHeightWeights, zoneInletInfo, inletHeightOverride, mixedAirOverride, zoneHasWindows, outdoorClac, outSrfTempHeaders, outSrfTempNumbers, outdoorNonSrfViewFac, outDryBulbTemp, outRelHumid, outWindSpeed, d, a, outdoorPtHeightWeights, allWindowShadesSame, winStatusHeaders, testPtBlockName, zoneWindowTransmiss, zoneWindowNames, allWindSpeedsSame, winSpeedNumbers, dataAnalysisPeriod, northAngle, bodyCharacteristics, climate, horizInfraredRadiation, lb_preparation, lb_sunpath, lb_comfortModels, lb_wind, resultCheckpoint)
         if result != -1:
             radTempMtx, airTempMtx, PET_Mtx, PET_ComfMtx, PET_CategoryMtx = result
-            if writeResultFile_ != 0:
-                radTempResult, airTempResult, PET_Result, PET_ComfResult, PET_CategoryResult = writeCSVPET(lb_preparation, directory, fileName, radTempMtx, airTempMtx, PET_Mtx, PET_ComfMtx, PET_CategoryMtx)
+            if resultCheckpoint != None:
+                radTempResult, airTempResult, PET_Result, PET_ComfResult, PET_CategoryResult = writeResultFiles(resultCheckpoint)
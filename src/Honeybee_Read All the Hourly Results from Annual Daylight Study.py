@@ -39,7 +39,7 @@ Provided by Honeybee 0.0.63
 """
 ghenv.Component.Name = "Honeybee_Read All the Hourly Results from Annual Daylight Study"
 ghenv.Component.NickName = 'readAllTheDSHourlyResults'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "04 | Daylight | Daylight"
@@ -51,6 +51,7 @@ except: pass
 
 
 import os
+import scriptcontext as sc
 from System import Object
 import Grasshopper.Kernel as gh
 from Grasshopper import DataTree
@@ -93,16 +94,18 @@ def convertIllFileDaraTreeIntoSortedDictionary(illFilesAddress):
     
     return illFileSets
 
-def main(illFilesAddress, testPoints, annualProfiles):
+def main(illFilesAddress, testPoints, annualProfiles, numOfPtsInEachSpace):
     msg = str.Empty
     
+    if not sc.sticky.has_key("honeybee_DynamicShadingResolver"):
+        msg = "You should first let Honeybee to fly..."
+        return msg, None
+    
+    hb_DynamicShadingResolver = sc.sticky["honeybee_DynamicShadingResolver"]
+    
     shadingProfiles = []
     shadingGroupsCount = 0 # assume there in no shading groups
     
-    #groups of groups here
-    for resultGroup in  range(testPoints.BranchCount):
-        shadingProfiles.append([])
-    
     # print len(shadingProfiles)
     if len(annualProfiles)!=0 and annualProfiles[0]!=None:
         # check if the number of profiles matches the number of spaces (point groups)
@@ -110,7 +113,7 @@ def main(illFilesAddress, testPoints, annualProfiles):
             msg = "Number of annual profiles doesn't match the number of point groups!\n" + \
                   "NOTE: If you have no idea what I'm talking about just disconnect the annual Profiles\n" + \
                   "In that case the component will give you the results with no dynamic shadings."
-            return msg, None, None
+            return msg, None
         
         # sort the annual profiles
         # there should be an annual profile for every single space
@@ -118,29 +121,10 @@ def main(illFilesAddress, testPoints, annualProfiles):
             annualProfiles = sorted(annualProfiles, key=lambda fileName: int(fileName.split(".")[-2].split("_")[-1]))
         except:
             pass
-            
+        
         # import the shading groups
-        # this is a copy-paste from Daysim annual profiles
-        for branchCount in range(len(annualProfiles)):
-            # open the file
-            filePath = annualProfiles[branchCount]
-            with open(filePath, "r") as inf:
-                for lineCount, line in enumerate(inf):
-                    if lineCount == 3:
-                        headings = line.strip().split(",")[3:]
-                        resultDict = {}
-                        for heading in range(len(headings)):
-                            resultDict[heading] = []
-                    elif lineCount> 3:
-                        results = line.strip().split(",")[3:]
-                        for resCount, result in enumerate(results):
-                            resultDict[resCount].append(float(result))
-                            
-                shadingCounter = 0
-                for headingCount, heading in enumerate(headings):
-                    if heading.strip().startswith("blind"):
-                        shadingProfiles[branchCount].append(resultDict[headingCount])
-                        shadingCounter += 1
+        shadingProfiles = [hb_DynamicShadingResolver.readShadingProfiles(filePath) for filePath in annualProfiles]
+        
         # make sure number of ill files matches the number of the shading groups
         # and sort them to work together
         shadingGroups = []
@@ -156,50 +140,25 @@ def main(illFilesAddress, testPoints, annualProfiles):
                 msg = "Number of annual profiles doesn't match the number of shading groups!\n" + \
                       "NOTE: If you have no idea what I'm talking about just disconnect the annual Profiles\n" + \
                       "In that case the component will give you the results with no dynamic shadings."
-                return msg, None, None
-                
-    elif illFilesAddress.BranchCount > 1 and illFilesAddress.BranchCount-1 != len(annualProfiles):
-        tempmsg = "Annual profile files are not provided.\nThe result will be only calculated for the original case with no blinds."
-        w = gh.GH_RuntimeMessageLevel.Warning
-        ghenv.Component.AddRuntimeMessage(w, tempmsg)
+                return msg, None
+        
+    else:
+        annualProfiles = []
+        if illFilesAddress.BranchCount > 1:
+            tempmsg = "Annual profile files are not provided.\nThe result will be only calculated for the original case with no blinds."
+            w = gh.GH_RuntimeMessageLevel.Warning
+            ghenv.Component.AddRuntimeMessage(w, tempmsg)
     
     illFileSets = convertIllFileDaraTreeIntoSortedDictionary(illFilesAddress)
     
-    # read the data for hour of the year and multiply it with the shading
-    numOfPts = testPoints.DataCount
-    
-    # 3 place holderd for the potential 3 outputs
-    # no blinds, shading group I and shading group II
-    illuminanceValues = {0: [],
-                         1: [],
-                         2: [],
-                         }
-    
-    # create a sublist for every shading state
-    for shadingGroupCount in illFileSets.keys():
-        for HOY in range(8760):
-            # separate list for every hour
-            illuminanceValues[shadingGroupCount].append([])
-            
-            # each file represnts one state of shading
-            for shadingState in illFileSets[shadingGroupCount]:
-                # add an empty list for each state
-                illuminanceValues[shadingGroupCount][HOY].append([])
+    # the results are read from the binary cache of the .ill files and the blind states
+    # for all the spaces are resolved in a single pass over the hours
+    try:
+        resolver = hb_DynamicShadingResolver(illFileSets, annualProfiles, numOfPtsInEachSpace)
+    except ValueError, e:
+        return str(e), None
     
-    totalPtCount = 0
-    ptsCountSoFar = 0
-    for shadingGroupCount in range(len(illFileSets.keys())):
-        for shadingState, resultFiles in enumerate(illFileSets[shadingGroupCount]):
-            for resultFile in resultFiles:
-                result = open(resultFile, 'r')
-                for HOY, line in enumerate(result):
-                   line = line.replace('\n', '', 10)
-                   lineSeg = line.Split(' ')
-                   for hourLuxValue in lineSeg[4:]:
-                      illuminanceValues[shadingGroupCount][HOY][shadingState].append(float(hourLuxValue))
-                result.close()
-
-    return msg, illuminanceValues, shadingProfiles
+    return msg, resolver
 
 
 if _illFilesAddress.DataCount!=0 and _illFilesAddress.Branch(0)[0]!=None and _testPoints:
@@ -211,7 +170,7 @@ if _illFilesAddress.DataCount!=0 and _illFilesAddress.Branch(0)[0]!=None and _te
     for branch in range(_testPoints.BranchCount):
         numOfPtsInEachSpace.append(len(_testPoints.Branch(branch)))
     
-    msg, illuminanceValues, shadingProfiles = main(_illFilesAddress, _testPoints, annualProfiles_)
+    msg, resolver = main(_illFilesAddress, _testPoints, annualProfiles_, numOfPtsInEachSpace)
 
     if msg!=str.Empty:
         w = gh.GH_RuntimeMessageLevel.Warning
@@ -223,46 +182,45 @@ if _illFilesAddress.DataCount!=0 and _illFilesAddress.Branch(0)[0]!=None and _te
         iIllumLevelsDynamicSHDGroupII = DataTree[Object]()
         iIlluminanceBasedOnOccupancy = DataTree[Object]()
         shadingGroupInEffect = DataTree[Object]()
-
+        
+        illuminanceValues = resolver.illResults
+        shadingProfiles = resolver.shadingProfiles
+        
+        # write illuminance values with blinds in effect next to the .ill files
+        inEffectFile = os.path.splitext(illuminanceValues[0][0].illFiles[0])[0] + "_inEffect.ill.hbc"
+        illumInEffect = resolver.resolve(inEffectFile)
+        
         # for each space
         for spaceCount in range(len(numOfPtsInEachSpace)):
-            for HOY in range(8760):
+            sensorStart = resolver.sensorOffsets[spaceCount]
+            sensorEnd = resolver.sensorOffsets[spaceCount + 1]
+            for HOY in range(illumInEffect.hourCount):
                 p = GH_Path(spaceCount, HOY)
-                stateInEffect = 0
-                blindsGroupInEffect = 0
-                shadingGroupInEffectForTheHour = "No blind"
-                iIllumLevelsNoDynamicSHD.AddRange(illuminanceValues[0][HOY][0][sum(numOfPtsInEachSpace[:spaceCount]):sum(numOfPtsInEachSpace[:spaceCount+1])], p)
+                iIllumLevelsNoDynamicSHD.AddRange(list(illuminanceValues[0][0].getHourValues(HOY, sensorStart, sensorEnd)), p)
                 
-                if illuminanceValues[1]!=[] and len(illuminanceValues[1][HOY])!=0 and shadingProfiles[spaceCount]!=[]:
-                    numberOfStates = len(illuminanceValues[1][HOY])
-                    if shadingProfiles[spaceCount][0][HOY] > 0:
-                        stateInEffect = int(round(numberOfStates * shadingProfiles[spaceCount][0][HOY]))
-                        blindsGroupInEffect = 1
-                        shadingGroupInEffectForTheHour = "Group_1_State:" + `stateInEffect`
+                # illuminance values when each shading group is closed
+                for shadingGroup, groupResults in ((1, iIllumLevelsDynamicSHDGroupI), (2, iIllumLevelsDynamicSHDGroupII)):
+                    if len(illuminanceValues.get(shadingGroup, []))==0 or len(shadingProfiles[spaceCount]) < shadingGroup:
+                        continue
+                    numberOfStates = len(illuminanceValues[shadingGroup])
+                    stateInEffect = 0
+                    if shadingProfiles[spaceCount][shadingGroup - 1][HOY] > 0:
+                        stateInEffect = int(round(numberOfStates * shadingProfiles[spaceCount][shadingGroup - 1][HOY]))
                     
+                    values = list(illuminanceValues[shadingGroup][stateInEffect-1].getHourValues(HOY, sensorStart, sensorEnd))
                     if numberOfStates>1:
                         for state in range(numberOfStates):
-                            pp = GH_Path(spaceCount, HOY, state)
-                            iIllumLevelsDynamicSHDGroupI.AddRange(illuminanceValues[1][HOY][stateInEffect-1][sum(numOfPtsInEachSpace[:spaceCount]):sum(numOfPtsInEachSpace[:spaceCount+1])], pp)
+                            groupResults.AddRange(values, GH_Path(spaceCount, HOY, state))
                     else:
-                        iIllumLevelsDynamicSHDGroupI.AddRange(illuminanceValues[1][HOY][stateInEffect-1][sum(numOfPtsInEachSpace[:spaceCount]):sum(numOfPtsInEachSpace[:spaceCount+1])], p)
-               
-                if illuminanceValues[2]!=[] and len(illuminanceValues[2][HOY])!=0 and shadingProfiles[spaceCount]!=[]:
-                    numberOfStates = len(illuminanceValues[2][HOY])
-                    
-                    if shadingProfiles[spaceCount][1][HOY] > 0:
-                        stateInEffect = int(round(numberOfStates * shadingProfiles[spaceCount][1][HOY]))
-                        blindsGroupInEffect = 2
-                        shadingGroupInEffectForTheHour = "Group_2_State:" + `stateInEffect`
-                    
-                    if numberOfStates>1:
-                        for state in range(numberOfStates):
-                            pp = GH_Path(spaceCount, HOY, state)
-                            iIllumLevelsDynamicSHDGroupII.AddRange(illuminanceValues[2][HOY][stateInEffect-1][sum(numOfPtsInEachSpace[:spaceCount]):sum(numOfPtsInEachSpace[:spaceCount+1])], pp)
-                    else:
-                        iIllumLevelsDynamicSHDGroupII.AddRange(illuminanceValues[2][HOY][stateInEffect-1][sum(numOfPtsInEachSpace[:spaceCount]):sum(numOfPtsInEachSpace[:spaceCount+1])], p)
+                        groupResults.AddRange(values, p)
                 
-                if stateInEffect!=0: stateInEffect-=1
-                iIlluminanceBasedOnOccupancy.AddRange(illuminanceValues[blindsGroupInEffect][HOY][stateInEffect][sum(numOfPtsInEachSpace[:spaceCount]):sum(numOfPtsInEachSpace[:spaceCount+1])], p)
+                iIlluminanceBasedOnOccupancy.AddRange(list(illumInEffect.getHourValues(HOY, sensorStart, sensorEnd)), p)
                 
-                shadingGroupInEffect.Add(shadingGroupInEffectForTheHour, p)
\ No newline at end of file
+                blindsGroupInEffect = resolver.groupInEffect[spaceCount][HOY]
+                if blindsGroupInEffect == 0:
+                    shadingGroupInEffect.Add("No blind", p)
+                else:
+                    shadingGroupInEffect.Add("Group_%d_State:%d"%(blindsGroupInEffect, resolver.stateInEffect[spaceCount][HOY]), p)
+        
+        illumInEffect.close()
+        resolver.close()
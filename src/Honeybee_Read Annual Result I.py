@@ -46,7 +46,7 @@ Provided by Honeybee 0.0.63
 """
 ghenv.Component.Name = "Honeybee_Read Annual Result I"
 ghenv.Component.NickName = 'readAnnualResultsI'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "04 | Daylight | Daylight"
@@ -137,6 +137,28 @@ def executeBatchFiles(batchFileNames, maxPRuns = None, shell = False, waitingTim
         print "Something went wrong: %s"%str(e) 
 
 
+def isDaysimResultCurrent(filePath, heaFileName, subProjectName, heaStr, sourceFiles):
+    """Check if Daysim results of a space are already calculated for the same inputs.
+    
+    The whole header file is compared including the illuminance threshold as
+    Daysim uses it for the annual profiles and the electric lighting results.
+    """
+    def getLines(hea):
+        return [line.strip() for line in hea.split("\n")]
+    
+    heaFile = os.path.join(filePath, heaFileName)
+    if not os.path.isfile(heaFile): return False
+    
+    lastModified = max(os.path.getmtime(f) for f in sourceFiles)
+    for resultFile in [subProjectName + "_intgain.csv", subProjectName + "_electriclighting.htm"]:
+        resultFile = os.path.join(filePath, resultFile)
+        if not os.path.isfile(resultFile) or os.path.getmtime(resultFile) < lastModified:
+            return False
+    
+    with open(heaFile, "r") as heainf:
+        return getLines(heainf.read()) == getLines(heaStr)
+
+
 def convertIllFileDaraTreeIntoSortedDictionary(illFilesAddress):
     
     # I should move this function into Honeybee_Honeybee #BadPractice!
@@ -191,10 +213,7 @@ def convertEPScheduleToDSSchedule(scheduleName, folder):
           "# month,day,time,occupancy (1=present/0=absent)\n"
 
     readSchedules = sc.sticky["honeybee_ReadSchedules"](scheduleName, 0)
-    dailyValues  = readSchedules.getScheduleValues()
-        
-    hourlyValues = []
-    for values in dailyValues: hourlyValues.extend(values)
+    hourlyValues = readSchedules.getAnnualValues()
     
     # create a temp folder inside folder will .ill files
     if not os.path.isdir(folder): os.mkdir(folder)
@@ -406,7 +425,36 @@ def main(illFilesAddress, testPts, testVecs, occFiles, lightingControlGroups, SH
         msg = "Number of points in ill files: " + `sum(numOfPtsInEachFile)` + \
               " doesn't match the number of points in point files: " + `numOfPts`
         return msg, None
-   
+    
+    # calculate daylight metrics from the binary cache of the .ill files. In case of
+    # dynamic shadings Daysim results are used since they include the blind states
+    metrics = None
+    if len(originalIllFilesSorted.keys()) == 1:
+        if not sc.sticky.has_key("honeybee_AnnualDaylightMetrics"):
+            msg = "You should first let Honeybee to fly..."
+            return msg, None
+        hb_AnnualIllResults = sc.sticky["honeybee_AnnualIllResults"]
+        hb_AnnualDaylightMetrics = sc.sticky["honeybee_AnnualDaylightMetrics"]
+        
+        illResults = hb_AnnualIllResults(originalIllFilesSorted[0][0])
+        occupancyProfiles = {}
+        metrics = []
+        for spaceCount in range(numOfSpaces):
+            try: occFile = occFiles[spaceCount]
+            except: occFile = occFiles[0]
+            if occFile not in occupancyProfiles:
+                occupancyProfiles[occFile] = hb_AnnualDaylightMetrics.readOccupancyFile(occFile, illResults.hourCount)
+            
+            try: illumT = DLAIllumThresholds[spaceCount]
+            except: illumT = DLAIllumThresholds[0]
+            
+            sensorStart = sum(numOfPtsInEachSpace[:spaceCount])
+            spaceMetrics = hb_AnnualDaylightMetrics([illumT])
+            spaceMetrics.calculate(illResults, occupancyProfiles[occFile], \
+                                   sensorStart, sensorStart + numOfPtsInEachSpace[spaceCount])
+            metrics.append(spaceMetrics)
+        illResults.close()
+    
     # find the heading files and creat multiple ill files for the study
     heaFiles = []
     filePath =  os.path.dirname(originalIllFilesSorted[0][0][0])
@@ -509,139 +557,8 @@ def main(illFilesAddress, testPts, testVecs, occFiles, lightingControlGroups, SH
     
     ##replace
     
-    # re-write the ill files based on the number of points in each space
-    # if the study is only for a single space then all the ill files should be merged
-    # considering the structure of .ill files and the fact that the files can be really 
-    # huge this part can take long. It is good to consider a new name for these files so
-    # in case the user has already ran the study for this folder the script just use the
-    # available files
-    
-    # generate new files for each space
-    # check if the files are already generated once
-    # not a good idea at all - many users don't really change the file name and run several
-    # studies with the same name in this case, results will always stay the same! Oops...
-    firstRun = True
-
-    newIllFileNamesDict = {}
-    for shdGroupCounter, illFileList in originalIllFilesSorted.items():
-        newIllFileNamesDict[shdGroupCounter] = []
-        for shadingStateCount in range(len(illFileList)):
-            for spaceCount in range(numOfSpaces):
-                newIllFileName  = illFileList[shadingStateCount][0].split(".ill")[0] + "_space_" + str(spaceCount) + ".ill"
-                newDcFileName  = illFileList[shadingStateCount][0].split(".ill")[0] + "_space_" + str(spaceCount) + ".dc"
-                newIllFileNamesDict[shdGroupCounter].append(newIllFileName) #collect ill files to calculate sDA
-                #if not (os.path.isfile(newIllFileName) and os.path.isfile(newDcFileName)):
-                #   firstRun = True
-                #   break
-    
-
-    # open all the available ill files and put them in the dictionary
-    illFilesDict = {}
-    newIllFilesDict = {}
-    if firstRun:
-        
-        for shdGroupCounter, illFileList in originalIllFilesSorted.items():
-            
-            for shadingStateCount, shadingStateFiles in enumerate(illFileList):
-                # create a place holder for new .ill files for each shading group
-                newIllFileNamesDict[shdGroupCounter] = []
-                
-                # open all the files for this shading state into memory
-                for counter, illFile in enumerate(illFileList[shadingStateCount]):
-                    illfile = open(illFile, "r")
-                    illFilesDict[counter] = illfile #put each ill file from each cpu separate/ I don't know why I have done this
-                
-                # open new ill files for each space and put them in the same directory
-                for spaceCount in range(numOfSpaces):
-                    newIllFileName  = illFileList[shadingStateCount][0].split(".ill")[0] + "_space_" + str(spaceCount) + ".ill"
-                    newIllFileNamesDict[shdGroupCounter].append(newIllFileName) #collect new ill file names to calculate sDA
-                    
-                    newIllFile = open(newIllFileName, "w")
-                    newIllFilesDict[spaceCount] = newIllFile
-                
-                # all the files will have the same length of 8760 lines for the hours of the year
-                for line in range(8760):
-                    # merge the line from all the source file
-                    mergedLine = []
-                    for illFileKey in illFilesDict.keys():
-                        line = illFilesDict[illFileKey].readline()
-                        
-                        if illFileKey==0:
-                            dateInfo = line.strip().split(" ")[:4]
-                        mergedLine.extend(line.strip().split(" ")[4:])
-                
-                
-                    # write the values to the target files
-                    for illFileKey in newIllFilesDict.keys():
-                        line = " ".join(dateInfo + mergedLine[sum(numOfPtsInEachSpace[:illFileKey]):sum(numOfPtsInEachSpace[:illFileKey+1])])
-                        newIllFilesDict[illFileKey].write(line + "\n")
-                
-                # close all the opened files
-                for illFileKey in illFilesDict.keys(): illFilesDict[illFileKey].close()
-                for illFileKey in newIllFilesDict.keys(): newIllFilesDict[illFileKey].close()
-        
-        
-        # print numOfPtsInEachSpace
-        # write the new .dc files for 
-        dcFilesDict = {}
-        newDcFilesDict = {}
-        
-        for shdGroupCounter, illFileList in originalIllFilesSorted.items():
-            
-            for shadingStateCount, shadingStateFiles in enumerate(illFileList):
-                #illFileDict[shaidngGroupCounter]
-                lenOfDCFiles = []
-                for counter, illFile in enumerate(shadingStateFiles):
-                    if illFile.endswith("_up.ill"):
-                        dcFile = illFile.replace("_up.ill", ".dc")
-                        
-                    elif illFile.endswith("_down.ill"):
-                        dcFile = illFile.replace("_down.ill", ".dc")
-                        
-                    else:
-                        dcFile = illFile.replace(".ill", ".dc")
-
-                    lenOfDCFile = getFilelength(dcFile) - 6 #Daysim files has 6 lines as header
-                    lenOfDCFiles.append(lenOfDCFile)
-                    dcfile = open(dcFile, "r")
-                    dcFilesDict[counter] = dcfile
-                
-                # open new ill files for each space and put them in the same directory
-                for spaceCount in range(numOfSpaces):
-                    newDcFileName  = illFileList[shadingStateCount][0].split(".ill")[0] + "_space_" + str(spaceCount) + ".dc"
-                    newDcFile = open(newDcFileName, "w")
-                    newDcFilesDict[spaceCount] = newDcFile
-                
-                heading = str.Empty
-                for line in dcFilesDict[0]:
-                    if line.startswith("#"):
-                        #make one instance of heading
-                        heading += line
-                    else:
-                        newDcFilesDict[0].write(heading)
-                        newDcFilesDict[0].write(line)
-                        break
-                
-                pointCount = 1
-                spaceCount = 0
-                for dcFileKey in dcFilesDict.keys():
-                    for line in dcFilesDict[dcFileKey]:
-                        if not line.startswith("#"):
-                            # write the line
-                            newDcFilesDict[spaceCount].write(line)
-                            pointCount+=1
-                            if pointCount == sum(numOfPtsInEachSpace[:spaceCount + 1]):
-                                # end of the file, start a new file
-                                spaceCount += 1
-                                try: newDcFilesDict[spaceCount].write(heading)
-                                except: pass
-                    
-                # close all the opened files
-                for dcFileKey in dcFilesDict.keys(): dcFilesDict[dcFileKey].close()
-                for dcFileKey in newDcFilesDict.keys(): newDcFilesDict[dcFileKey].close()
-        
-
     heaFileNames = []
+    daysimInputsChanged = False
     # write point files and heading files
     for spaceCount in range(numOfSpaces):
         tmpFolder = os.path.join(projectDirectory, "tmp_space_" + str(spaceCount))
@@ -774,9 +691,150 @@ def main(illFilesAddress, testPts, testVecs, occFiles, lightingControlGroups, SH
                            
         heaFileName = subProjectName + ".hea"
         heaFileNames.append(heaFileName)
+        
+        # check if any of the Daysim inputs have changed
+        if not daysimInputsChanged:
+            sourceFiles = [illFile for illFiles in originalIllFilesSorted[0] for illFile in illFiles]
+            sourceFiles.append(occFileFullPath)
+            daysimInputsChanged = not isDaysimResultCurrent(filePath, heaFileName, subProjectName, \
+                                                            modifiedHea, sourceFiles)
+        
         with open(os.path.join(filePath, heaFileName), "w") as heaf:
             heaf.write(modifiedHea)
             
+
+
+    # re-write the ill files based on the number of points in each space
+    # if the study is only for a single space then all the ill files should be merged
+    # considering the structure of .ill files and the fact that the files can be really 
+    # huge this part can take long. It is good to consider a new name for these files so
+    # in case the user has already ran the study for this folder the script just use the
+    # available files
+    
+    # generate new files for each space
+    # Daylight metrics are calculated by Honeybee so Daysim only needs to run again for
+    # annual profiles and electric lighting if any of its inputs have changed
+    firstRun = metrics is None or daysimInputsChanged
+
+    newIllFileNamesDict = {}
+    for shdGroupCounter, illFileList in originalIllFilesSorted.items():
+        newIllFileNamesDict[shdGroupCounter] = []
+        for shadingStateCount in range(len(illFileList)):
+            for spaceCount in range(numOfSpaces):
+                newIllFileName  = illFileList[shadingStateCount][0].split(".ill")[0] + "_space_" + str(spaceCount) + ".ill"
+                newDcFileName  = illFileList[shadingStateCount][0].split(".ill")[0] + "_space_" + str(spaceCount) + ".dc"
+                newIllFileNamesDict[shdGroupCounter].append(newIllFileName) #collect ill files to calculate sDA
+                #if not (os.path.isfile(newIllFileName) and os.path.isfile(newDcFileName)):
+                #   firstRun = True
+                #   break
+    
+
+    # open all the available ill files and put them in the dictionary
+    illFilesDict = {}
+    newIllFilesDict = {}
+    if firstRun:
+        
+        for shdGroupCounter, illFileList in originalIllFilesSorted.items():
+            
+            for shadingStateCount, shadingStateFiles in enumerate(illFileList):
+                # create a place holder for new .ill files for each shading group
+                newIllFileNamesDict[shdGroupCounter] = []
+                
+                # open all the files for this shading state into memory
+                for counter, illFile in enumerate(illFileList[shadingStateCount]):
+                    illfile = open(illFile, "r")
+                    illFilesDict[counter] = illfile #put each ill file from each cpu separate/ I don't know why I have done this
+                
+                # open new ill files for each space and put them in the same directory
+                for spaceCount in range(numOfSpaces):
+                    newIllFileName  = illFileList[shadingStateCount][0].split(".ill")[0] + "_space_" + str(spaceCount) + ".ill"
+                    newIllFileNamesDict[shdGroupCounter].append(newIllFileName) #collect new ill file names to calculate sDA
+                    
+                    newIllFile = open(newIllFileName, "w")
+                    newIllFilesDict[spaceCount] = newIllFile
+                
+                # all the files will have the same length of 8760 lines for the hours of the year
+                for line in range(8760):
+                    # merge the line from all the source file
+                    mergedLine = []
+                    for illFileKey in illFilesDict.keys():
+                        line = illFilesDict[illFileKey].readline()
+                        
+                        if illFileKey==0:
+                            dateInfo = line.strip().split(" ")[:4]
+                        mergedLine.extend(line.strip().split(" ")[4:])
+                
+                
+                    # write the values to the target files
+                    for illFileKey in newIllFilesDict.keys():
+                        line = " ".join(dateInfo + mergedLine[sum(numOfPtsInEachSpace[:illFileKey]):sum(numOfPtsInEachSpace[:illFileKey+1])])
+                        newIllFilesDict[illFileKey].write(line + "\n")
+                
+                # close all the opened files
+                for illFileKey in illFilesDict.keys(): illFilesDict[illFileKey].close()
+                for illFileKey in newIllFilesDict.keys(): newIllFilesDict[illFileKey].close()
+        
+        
+        # print numOfPtsInEachSpace
+        # write the new .dc files for 
+        dcFilesDict = {}
+        newDcFilesDict = {}
+        
+        for shdGroupCounter, illFileList in originalIllFilesSorted.items():
+            
+            for shadingStateCount, shadingStateFiles in enumerate(illFileList):
+                #illFileDict[shaidngGroupCounter]
+                lenOfDCFiles = []
+                for counter, illFile in enumerate(shadingStateFiles):
+                    if illFile.endswith("_up.ill"):
+                        dcFile = illFile.replace("_up.ill", ".dc")
+                        
+                    elif illFile.endswith("_down.ill"):
+                        dcFile = illFile.replace("_down.ill", ".dc")
+                        
+                    else:
+                        dcFile = illFile.replace(".ill", ".dc")
+
+                    lenOfDCFile = getFilelength(dcFile) - 6 #Daysim files has 6 lines as header
+                    lenOfDCFiles.append(lenOfDCFile)
+                    dcfile = open(dcFile, "r")
+                    dcFilesDict[counter] = dcfile
+                
+                # open new ill files for each space and put them in the same directory
+                for spaceCount in range(numOfSpaces):
+                    newDcFileName  = illFileList[shadingStateCount][0].split(".ill")[0] + "_space_" + str(spaceCount) + ".dc"
+                    newDcFile = open(newDcFileName, "w")
+                    newDcFilesDict[spaceCount] = newDcFile
+                
+                heading = str.Empty
+                for line in dcFilesDict[0]:
+                    if line.startswith("#"):
+                        #make one instance of heading
+                        heading += line
+                    else:
+                        newDcFilesDict[0].write(heading)
+                        newDcFilesDict[0].write(line)
+                        break
+                
+                pointCount = 1
+                spaceCount = 0
+                for dcFileKey in dcFilesDict.keys():
+                    for line in dcFilesDict[dcFileKey]:
+                        if not line.startswith("#"):
+                            # write the line
+                            newDcFilesDict[spaceCount].write(line)
+                            pointCount+=1
+                            if pointCount == sum(numOfPtsInEachSpace[:spaceCount + 1]):
+                                # end of the file, start a new file
+                                spaceCount += 1
+                                try: newDcFilesDict[spaceCount].write(heading)
+                                except: pass
+                    
+                # close all the opened files
+                for dcFileKey in dcFilesDict.keys(): dcFilesDict[dcFileKey].close()
+                for dcFileKey in newDcFilesDict.keys(): newDcFilesDict[dcFileKey].close()
+
+
     # write batch files
     batchFileNames = []
     pathStr = "SET RAYPATH=.;" + hb_RADLibPath + ";" + hb_DSPath + ";" + hb_DSLibPath + ";\nPATH=" + hb_RADPath + ";" + hb_DSPath + ";" + hb_DSLibPath + ";$PATH\n"
@@ -806,7 +864,8 @@ def main(illFilesAddress, testPts, testVecs, occFiles, lightingControlGroups, SH
         batchFileName = os.path.join(filePath, fileName)
         fileNames.append(batchFileName)
 
-    executeBatchFiles(fileNames, ncpus - 1, shell=runInBackground)
+    if firstRun:
+        executeBatchFiles(fileNames, ncpus - 1, shell=runInBackground)
     
     # calculate sDA    
     
@@ -889,7 +948,7 @@ def main(illFilesAddress, testPts, testVecs, occFiles, lightingControlGroups, SH
     try: overUDLILists = sorted(overUDLILists, key=lambda fileName: int(fileName.split(".")[-2].split("_")[-4]))
     except: pass
     
-    return None, [DLALists, underUDLILists, inRangeUDLILists, overUDLILists, CDALists, EPLSchLists, htmLists]
+    return None, [DLALists, underUDLILists, inRangeUDLILists, overUDLILists, CDALists, EPLSchLists, htmLists, metrics]
 
 def isAllNone(dataList):
     for item in dataList.AllData():
@@ -917,7 +976,7 @@ if _runIt and not isAllNone(_illFilesAddress) and not isAllNone(_testPoints):
             ghenv.Component.AddRuntimeMessage(w, msg)
             
         else:
-            DLALists, underUDLILists, inRangeUDLILists, overUDLILists, CDALists, EPLSchLists, htmLists = results
+            DLALists, underUDLILists, inRangeUDLILists, overUDLILists, CDALists, EPLSchLists, htmLists, metrics = results
             DLA = DataTree[Object]()
             UDLI_Less_100 = DataTree[Object]()    
             UDLI_100_2000 = DataTree[Object]()
@@ -945,13 +1004,23 @@ if _runIt and not isAllNone(_illFilesAddress) and not isAllNone(_testPoints):
             
             for branchNum in range(_testPoints.BranchCount):
                 p = GH_Path(branchNum)
-                DLARes = readDSStandardResults(DLALists[branchNum])
-                DLA.AddRange(DLARes, p)
-                UDLI_Less_100.AddRange(readDSStandardResults(underUDLILists[branchNum]), p)
-                UDLI_100_2000.AddRange(readDSStandardResults(inRangeUDLILists[branchNum]), p)
-                UDLI_More_2000.AddRange(readDSStandardResults(overUDLILists[branchNum]), p)
-                CDA.AddRange(readDSStandardResults(CDALists[branchNum]), p)
+                if metrics is not None:
+                    spaceMetrics = metrics[branchNum]
+                    DLA.AddRange(spaceMetrics.getDA(), p)
+                    underUDLI, inRangeUDLI, overUDLI = spaceMetrics.getUDI()
+                    UDLI_Less_100.AddRange(underUDLI, p)
+                    UDLI_100_2000.AddRange(inRangeUDLI, p)
+                    UDLI_More_2000.AddRange(overUDLI, p)
+                    CDA.AddRange(spaceMetrics.getCDA(), p)
+                    sDA.Add("%.2f"%spaceMetrics.getsDA(), p)
+                else:
+                    DLARes = readDSStandardResults(DLALists[branchNum])
+                    DLA.AddRange(DLARes, p)
+                    UDLI_Less_100.AddRange(readDSStandardResults(underUDLILists[branchNum]), p)
+                    UDLI_100_2000.AddRange(readDSStandardResults(inRangeUDLILists[branchNum]), p)
+                    UDLI_More_2000.AddRange(readDSStandardResults(overUDLILists[branchNum]), p)
+                    CDA.AddRange(readDSStandardResults(CDALists[branchNum]), p)
+                    sDA.Add(getsDA(DLARes), p)
                 annualProfiles.Add(EPLSchLists[branchNum], p)
-                sDA.Add(getsDA(DLARes), p)
                 htmReport.Add(htmLists[branchNum], p)
                     
\ No newline at end of file
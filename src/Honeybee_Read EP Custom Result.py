@@ -29,7 +29,7 @@ The component is built to bring in any result that you desire from the csv using
 Provided by Honeybee 0.0.63
     
     Args:
-        _resultFileAddress: The result file address that comes out of the "Export to OpenStudio" component.
+        _resultFileAddress: The result file address that comes out of the "Export to OpenStudio" component.  The address of an EnergyPlus .eso file can also be used to read the results without converting them to a .csv file.
         _keywords: keywords that will be used to bring in the results that you are interested in.  These words should be the name of the output that you are requesting or should correspond to words in the top row of the csv file.
     Returns:
         results: The result data from the csv file (formatted with a Ladybug header on it).
@@ -37,7 +37,7 @@ Provided by Honeybee 0.0.63
 
 ghenv.Component.Name = "Honeybee_Read EP Custom Result"
 ghenv.Component.NickName = 'EPCustomResult'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
@@ -153,44 +153,32 @@ if hbCheck and _resultFileAddress and _keywords and _resultFileAddress != None:
             keywords.append(word)
     
     try:
-        result = open(_resultFileAddress, 'r')
+        csvReader = sc.sticky["honeybee_EPCSVReader"].getReader(_resultFileAddress)
         
-        for lineCount, line in enumerate(result):
-            if lineCount == 0:
-                # PARSE THE FILE HEADING
-                colHeaders = []
-                for column in line.split(','):
-                    colHeaders.append(column)
-                # SEARCH THROUGH THE FILE HEADING
-                simOutputs = hb_EPMaterialAUX.searchListByKeyword(colHeaders, keywords)
-                simOutLower = []
-                for outp in simOutputs:
-                    simOutLower.append(outp.lower())
-                key = []
-                path = []
-                for outp in colHeaders:
-                    if outp.lower() in simOutLower:
-                        outpName = outp.split(' [')[0]
-                        timestep = outp.split('(')[-1].split(')')[0]
-                        units = outp.split('[')[-1].split(']')[0]
-                        makeHeader(results, resultCount, timestep, outpName, units)
-                        key.append(0)
-                        path.append(resultCount)
-                        resultCount += 1
-                    else:
-                        key.append(-1)
-                        path.append(-1)
-            else:
-                for columnCount, column in enumerate(line.split(',')):
-                    p = GH_Path(int(path[columnCount]))
-                    
-                    if key[columnCount] != -1:
-                        results.Add(float(column), p)
-        result.close()
+        # SEARCH THROUGH THE FILE HEADING
+        colHeaders = csvReader.header
+        simOutputs = hb_EPMaterialAUX.searchListByKeyword(colHeaders, keywords)
+        simOutLower = []
+        for outp in simOutputs:
+            simOutLower.append(outp.lower())
+        
+        resultColumns = []
+        for columnCount, outp in enumerate(colHeaders):
+            if outp.lower() in simOutLower:
+                outpName = outp.split(' [')[0]
+                timestep = outp.split('(')[-1].split(')')[0]
+                units = outp.split('[')[-1].split(']')[0]
+                makeHeader(results, resultCount, timestep, outpName, units)
+                resultColumns.append(columnCount)
+                resultCount += 1
+        
+        # only read the columns that match the keywords
+        for count, values in enumerate(csvReader.readColumns(resultColumns)):
+            p = GH_Path(count)
+            for value in values:
+                results.Add(value, p)
         parseSuccess = True
     except:
-        try: result.close()
-        except: pass
         parseSuccess = False
         warn = 'Failed to parse the result file.'
         print warn
@@ -29,7 +29,7 @@ This component reads only the results related to zones.  For results related to
 Provided by Honeybee 0.0.63
     
     Args:
-        _resultFileAddress: The result file address that comes out of the WriteIDF component.
+        _resultFileAddress: The result file address that comes out of the WriteIDF component.  The address of an EnergyPlus .eso file can also be used to read the results without converting them to a .csv file.
     Returns:
         totalThermalLoad: The total thermal energy used by each zone in kWh.  This includes cooling and heating.
         thermalLoadBalance: The thermal energy used by each zone in kWh.  Heating values are positive while cooling values are negative.
@@ -54,7 +54,7 @@ Provided by Honeybee 0.0.63
 
 ghenv.Component.Name = "Honeybee_Read EP Result"
 ghenv.Component.NickName = 'readEPResult'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
@@ -71,6 +71,14 @@ import scriptcontext as sc
 import copy
 import os
 
+
+#Honeybee check.
+hbCheck = True
+if not sc.sticky.has_key('honeybee_release'):
+    hbCheck = False
+    print "You should first let Honeybee fly..."
+    ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, "You should first let Honeybee fly...")
+
 #Check to be sure that the files exist.
 csvExists = True
 if _resultFileAddress and _resultFileAddress != None:
@@ -90,13 +98,8 @@ zoneNameList = []
 floorAreaList = []
 gotData = False
 
-if _resultFileAddress and csvExists == True:
+if hbCheck and _resultFileAddress and csvExists == True:
     try:
-        numZonesLine = 0
-        numZonesIndex = 0
-        zoneAreaLines = []
-        areaIndex = 0
-        
         eioFileAddress = _resultFileAddress[0:-3] + "eio"
         if not os.path.isfile(eioFileAddress):
             # try to find the file from the list
@@ -114,24 +117,12 @@ if _resultFileAddress and csvExists == True:
             elif "WeatherFileRunPeriod" in line:
                 start = (int(line.split(",")[3].split("/")[0]), int(line.split(",")[3].split("/")[1]), 1)
                 end = (int(line.split(",")[4].split("/")[0]), int(line.split(",")[4].split("/")[1]), 24)
-            elif "Zone Summary" in line and "Number of Zones" in line:
-                for index, text in enumerate(line.split(",")):
-                    numZonesLine = lineCount+1
-                    if "Number of Zones" in text: numZonesIndex = index
-                    else: pass
-            elif lineCount == numZonesLine:
-                numZones = line.split(",")[numZonesIndex]
-            elif "Zone Information" in line and "Floor Area {m2}" in line:
-                zoneAreaLines = range(lineCount+1, lineCount+1+int(numZones))
-                for index, text in enumerate(line.split(",")):
-                    if "Floor Area {m2}" in text: areaIndex = index
-                    else: pass
-            elif lineCount in zoneAreaLines:
-                zoneNameList.append(line.split(",")[1])
-                floorAreaList.append(float(line.split(",")[areaIndex]))
-                gotData = True
             else: pass
         eioResult.close()
+        
+        # read the zone names and the floor areas from the zone information table
+        zoneNameList, floorAreaList = sc.sticky["honeybee_EPCSVReader"].readZoneFloorAreas(eioFileAddress)
+        if len(zoneNameList) > 0: gotData = True
     except:
         try: eioResult.close()
         except: pass 
@@ -298,321 +289,320 @@ for name in zoneNameList:
 
 
 # PARSE THE RESULT FILE.
-if _resultFileAddress and gotData == True and csvExists == True:
+if hbCheck and _resultFileAddress and gotData == True and csvExists == True:
     try:
-        result = open(_resultFileAddress, 'r')
+        csvReader = sc.sticky["honeybee_EPCSVReader"].getReader(_resultFileAddress)
         
-        for lineCount, line in enumerate(result):
-            if lineCount == 0:
-                #ANALYZE THE FILE HEADING
-                key = []; path = []
-                for columnCount, column in enumerate(line.split(',')):
-                    
-                    if 'Zone Ideal Loads Supply Air Total Cooling Energy' in column or 'Zone Ideal Loads Supply Air Sensible Cooling Energy' in column or 'Zone Ideal Loads Supply Air Latent Cooling Energy' in column or 'Chiller Electric Energy' in column or 'Cooling Coil Electric Energy' in column or 'Zone VRF Air Terminal Cooling Electric Energy' in column or 'VRF Heat Pump Cooling Electric Energy' in column:
-                        
-                        if 'Zone Ideal Loads Supply Air Total Cooling Energy' in column and 'ZONE HVAC' in column:
-                            zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
-                            idealAirTrigger = True
-                        elif 'Zone Ideal Loads Supply Air Sensible Cooling Energy' in column and 'ZONE HVAC' in column:
-                            zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
-                            idealAirTrigger = True
-                        elif 'IDEAL LOADS AIR SYSTEM' in column:
-                            zoneName = checkZone(" " + ":".join(column.split(":")[:-1]).split(' IDEAL LOADS AIR SYSTEM')[0])
-                            idealAirTrigger = True
-                        else:
-                            zoneName = " " +column.split(":")[0]
-                            checkCustomName(coolingC)
-                        
-                        try:
-                            if idealAirTrigger == True:
-                                makeHeader(cooling, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Cooling Load", energyUnit, True)
-                            else:
-                                makeHeader(cooling, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Cooling Electric Energy", energyUnit, True)
-                            dataTypeList[2] = True
-                            key.append(0)
-                            coolingC += 1
-                        except:
-                            key.append(-1)
-                    
-                    elif 'Zone Ideal Loads Supply Air Total Heating Energy' in column or 'Zone Ideal Loads Supply Air Sensible Heating Energy' in column or 'Zone Ideal Loads Supply Air Latent Heating Energy' in column or 'Boiler Heating Energy' in column or 'Heating Coil Total Heating Energy' in column or 'Heating Coil Gas Energy' in column or 'Heating Coil Electric Energy' in column or 'Humidifier Electric Energy' in column or 'Zone VRF Air Terminal Heating Electric Energy' in column or 'VRF Heat Pump Heating Electric Energy' in column:
-                        idealAirTrigger = 2
-                        if 'Zone Ideal Loads Supply Air Total Heating Energy' in column and 'ZONE HVAC' in column:
-                            zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
-                            idealAirTrigger = True
-                        elif 'IDEAL LOADS AIR SYSTEM' in column:
-                            zoneName = checkZone(" " + ":".join(column.split(":")[:-1]).split(' IDEAL LOADS AIR SYSTEM')[0])
-                            idealAirTrigger = True
-                        elif 'Heating Coil Total Heating Energy' not in column:
-                            zoneName = " " +column.split(":")[0]
-                            checkCustomName(heatingC)
-                        else:
-                            zoneName = None
-                            path.append(0)
-                        
-                        if 'COIL HEATING GAS' in column and not 'Heating Coil Electric Energy' in column:
-                            idealAirTrigger = False
-                        elif 'Boiler Heating Energy' in column:
-                            idealAirTrigger = False
-                        
-                        try:
-                            if zoneName != None:
-                                if idealAirTrigger == True:
-                                    makeHeader(heating, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Heating Load", energyUnit, True)
-                                elif idealAirTrigger == False:
-                                    makeHeader(heating, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Heating Fuel Energy", energyUnit, False)
-                                else:
-                                    makeHeader(heating, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Heating Electric Energy", energyUnit, False)
-                                dataTypeList[3] = True
-                                key.append(1)
-                                heatingC += 1
-                            else:
-                                key.append(-1)
-                        except:
-                            key.append(-1)
-                    
-                    elif 'Zone Lights Electric Energy' in column:
-                        key.append(2)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        makeHeader(electricLight, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Electric Lighting Energy", energyUnit, True)
-                        dataTypeList[4] = True
-                    
-                    elif 'Zone Electric Equipment Electric Energy' in column:
-                        key.append(3)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        makeHeader(electricEquip, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Electric Equipment Energy", energyUnit, True)
-                        dataTypeList[5] = True
-                    
-                    elif 'Fan Electric Energy' in column:
-                        key.append(15)
-                        if 'FAN ON OFF' in column:
-                            zoneName = checkZoneSys(" " + ":".join(column.split(":")[:-1]).split('FAN ON OFF ')[-1], fanC)
-                            makeHeader(fanElectric, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Fan Electric Energy", energyUnit, False)
-                        else:
-                            zoneName = " " +column.split(":")[0]
-                            checkCustomName(fanC)
-                            makeHeader(fanElectric, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Fan Electric Energy", energyUnit, False)
-                        fanC += 1
-                        dataTypeList[6] = True
-                    
-                    elif 'Pump Electric Energy' in column:
-                        key.append(25)
-                        if 'PUMP CONSTANT SPEED' in column:
-                            zoneName = checkZoneSys(" " + ":".join(column.split(":")[:-1]).split('PUMP CONSTANT SPEED ')[-1])
-                            makeHeader(pumpElectric, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Pump Electric Energy", energyUnit, True)
-                        else:
-                            zoneName = " " + column.split(":")[0]
-                            checkCustomName(pumpC)
-                            makeHeader(pumpElectric, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Pump Electric Energy", energyUnit, True)
-                        pumpC += 1
-                        dataTypeList[7] = True
-                    
-                    elif 'Zone People Total Heating Energy' in column or 'Zone People Sensible Heating Energy' in column or 'Zone People Latent Gain Energy' in column:
-                        key.append(4)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        makeHeader(peopleGains, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "People Energy", energyUnit, True)
-                        dataTypeList[8] = True
-                    
-                    elif 'Zone Windows Total Transmitted Solar Radiation Energy' in column:
-                        key.append(5)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        makeHeader(totalSolarGain, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Total Solar Gain", energyUnit, True)
-                        dataTypeList[9] = True
-                    
-                    elif 'Zone Ventilation Sensible Heat Loss Energy ' in column:
-                        key.append(6)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        makeHeader(natVentEnergy, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Natural Ventilation Energy", energyUnit, True)
-                        dataTypeList[12] = True
-                    
-                    elif 'Zone Ventilation Sensible Heat Gain Energy' in column:
-                        key.append(7)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                    
-                    elif 'Zone Ideal Loads Zone Total Heating Energy' in column or 'Zone Ideal Loads Zone Sensible Heating Energy' in column or 'Zone Ideal Loads Zone Latent Heating Energy' in column:
-                        key.append(23)
-                        if 'Zone Ideal Loads Zone Total Heating Energy' in column and 'ZONE HVAC' in column:
-                            zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
-                        else:
-                            zoneName = checkZone(" " + ":".join(column.split(":")[:-1]).split(' IDEAL LOADS')[0])
-                        zoneHeatingEnergy[int(path[-1])].append(zoneName)
-                        zoneHeatingEnergy[int(path[-1])].append(column.split('(')[-1].split(')')[0])
-                    
-                    elif 'Zone Ideal Loads Zone Total Cooling Energy' in column or 'Zone Ideal Loads Zone Sensible Cooling Energy' in column or 'Zone Ideal Loads Zone Latent Cooling Energy' in column:
-                        key.append(24)
-                        if 'Zone Ideal Loads Zone Total Cooling Energy' in column and 'ZONE HVAC' in column:
-                            zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
+        #ANALYZE THE FILE HEADING
+        key = []; path = []
+        for columnCount, column in enumerate(csvReader.header):
+            
+            if 'Zone Ideal Loads Supply Air Total Cooling Energy' in column or 'Zone Ideal Loads Supply Air Sensible Cooling Energy' in column or 'Zone Ideal Loads Supply Air Latent Cooling Energy' in column or 'Chiller Electric Energy' in column or 'Cooling Coil Electric Energy' in column or 'Zone VRF Air Terminal Cooling Electric Energy' in column or 'VRF Heat Pump Cooling Electric Energy' in column:
+                
+                if 'Zone Ideal Loads Supply Air Total Cooling Energy' in column and 'ZONE HVAC' in column:
+                    zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
+                    idealAirTrigger = True
+                elif 'Zone Ideal Loads Supply Air Sensible Cooling Energy' in column and 'ZONE HVAC' in column:
+                    zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
+                    idealAirTrigger = True
+                elif 'IDEAL LOADS AIR SYSTEM' in column:
+                    zoneName = checkZone(" " + ":".join(column.split(":")[:-1]).split(' IDEAL LOADS AIR SYSTEM')[0])
+                    idealAirTrigger = True
+                else:
+                    zoneName = " " +column.split(":")[0]
+                    checkCustomName(coolingC)
+                
+                try:
+                    if idealAirTrigger == True:
+                        makeHeader(cooling, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Cooling Load", energyUnit, True)
+                    else:
+                        makeHeader(cooling, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Cooling Electric Energy", energyUnit, True)
+                    dataTypeList[2] = True
+                    key.append(0)
+                    coolingC += 1
+                except:
+                    key.append(-1)
+            
+            elif 'Zone Ideal Loads Supply Air Total Heating Energy' in column or 'Zone Ideal Loads Supply Air Sensible Heating Energy' in column or 'Zone Ideal Loads Supply Air Latent Heating Energy' in column or 'Boiler Heating Energy' in column or 'Heating Coil Total Heating Energy' in column or 'Heating Coil Gas Energy' in column or 'Heating Coil Electric Energy' in column or 'Humidifier Electric Energy' in column or 'Zone VRF Air Terminal Heating Electric Energy' in column or 'VRF Heat Pump Heating Electric Energy' in column:
+                idealAirTrigger = 2
+                if 'Zone Ideal Loads Supply Air Total Heating Energy' in column and 'ZONE HVAC' in column:
+                    zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
+                    idealAirTrigger = True
+                elif 'IDEAL LOADS AIR SYSTEM' in column:
+                    zoneName = checkZone(" " + ":".join(column.split(":")[:-1]).split(' IDEAL LOADS AIR SYSTEM')[0])
+                    idealAirTrigger = True
+                elif 'Heating Coil Total Heating Energy' not in column:
+                    zoneName = " " +column.split(":")[0]
+                    checkCustomName(heatingC)
+                else:
+                    zoneName = None
+                    path.append(0)
+                
+                if 'COIL HEATING GAS' in column and not 'Heating Coil Electric Energy' in column:
+                    idealAirTrigger = False
+                elif 'Boiler Heating Energy' in column:
+                    idealAirTrigger = False
+                
+                try:
+                    if zoneName != None:
+                        if idealAirTrigger == True:
+                            makeHeader(heating, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Heating Load", energyUnit, True)
+                        elif idealAirTrigger == False:
+                            makeHeader(heating, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Heating Fuel Energy", energyUnit, False)
                         else:
-                            zoneName = checkZone(" " + ":".join(column.split(":")[:-1]).split(' IDEAL LOADS')[0])
-                        zoneCoolingEnergy[int(path[-1])].append(zoneName)
-                        zoneCoolingEnergy[int(path[-1])].append(column.split('(')[-1].split(')')[0])
-                    
-                    elif 'Zone Infiltration Total Heat Loss Energy' in column or 'Zone Infiltration Sensible Heat Loss Energy' in column or 'Zone Infiltration Latent Heat Loss Energy' in column:
-                        key.append(8)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        makeHeader(infiltrationEnergy, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Infiltration Energy", energyUnit, True)
-                        dataTypeList[10] = True
-                    
-                    elif 'Zone Infiltration Total Heat Gain Energy' in column or 'Zone Infiltration Sensible Heat Gain Energy' in column or 'Zone Infiltration Latent Heat Gain Energy' in column:
-                        key.append(9)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                    
-                    elif 'Zone Operative Temperature' in column:
-                        key.append(10)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        makeHeader(operativeTemperature, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Operative Temperature", "C", False)
-                        dataTypeList[13] = True
-                    
-                    elif 'Zone Mean Air Temperature' in column:
-                        key.append(11)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        makeHeader(airTemperature, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Air Temperature", "C", False)
-                        dataTypeList[14] = True
-                    
-                    elif 'Zone Mean Radiant Temperature' in column:
-                        key.append(12)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        makeHeader(meanRadTemperature, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Radiant Temperature", "C", False)
-                        dataTypeList[15] = True
-                    
-                    elif 'Zone Air Relative Humidity' in column:
-                        key.append(13)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        makeHeader(relativeHumidity, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Relative Humidity", "%", False)
-                        dataTypeList[16] = True
-                    
-                    elif 'Zone Ventilation Standard Density Volume Flow Rate' in column:
-                        key.append(16)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        natVentFlow[int(path[-1])].append(zoneName)
-                        natVentFlow[int(path[-1])].append(column.split('(')[-1].split(')')[0])
-                    
-                    elif 'Zone Infiltration Standard Density Volume Flow Rate' in column:
-                        key.append(17)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        infiltrationFlow[int(path[-1])].append(zoneName)
-                        infiltrationFlow[int(path[-1])].append(column.split('(')[-1].split(')')[0])
-                    
-                    elif 'Zone Mechanical Ventilation Standard Density Volume Flow Rate' in column:
-                        key.append(22)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        mechSysAirFlow[int(path[-1])].append(zoneName)
-                        mechSysAirFlow[int(path[-1])].append(column.split('(')[-1].split(')')[0])
-                    
-                    elif 'Earth Tube Air Flow Volume' in column:
-                        key.append(21)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        earthTubeFlow[int(path[-1])].append(zoneName)
-                        earthTubeFlow[int(path[-1])].append(column.split('(')[-1].split(')')[0])
-                    
-                    elif 'Zone Air Heat Balance Internal Convective Heat Gain Rate' in column:
-                        key.append(18)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        internalAirGain[int(path[-1])].append(zoneName)
-                        internalAirGain[int(path[-1])].append(column.split('(')[-1].split(')')[0])
-                    
-                    elif 'Zone Air Heat Balance Surface Convection Rate' in column:
-                        key.append(19)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        surfaceAirGain[int(path[-1])].append(zoneName)
-                        surfaceAirGain[int(path[-1])].append(column.split('(')[-1].split(')')[0])
-                    
-                    elif 'Zone Air Heat Balance System Air Transfer Rate' in column:
-                        key.append(20)
-                        zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
-                        systemAirGain[int(path[-1])].append(zoneName)
-                        systemAirGain[int(path[-1])].append(column.split('(')[-1].split(')')[0])
-                    
+                            makeHeader(heating, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Heating Electric Energy", energyUnit, False)
+                        dataTypeList[3] = True
+                        key.append(1)
+                        heatingC += 1
                     else:
                         key.append(-1)
-                        path.append(-1)
+                except:
+                    key.append(-1)
+            
+            elif 'Zone Lights Electric Energy' in column:
+                key.append(2)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                makeHeader(electricLight, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Electric Lighting Energy", energyUnit, True)
+                dataTypeList[4] = True
+            
+            elif 'Zone Electric Equipment Electric Energy' in column:
+                key.append(3)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                makeHeader(electricEquip, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Electric Equipment Energy", energyUnit, True)
+                dataTypeList[5] = True
+            
+            elif 'Fan Electric Energy' in column:
+                key.append(15)
+                if 'FAN ON OFF' in column:
+                    zoneName = checkZoneSys(" " + ":".join(column.split(":")[:-1]).split('FAN ON OFF ')[-1], fanC)
+                    makeHeader(fanElectric, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Fan Electric Energy", energyUnit, False)
+                else:
+                    zoneName = " " +column.split(":")[0]
+                    checkCustomName(fanC)
+                    makeHeader(fanElectric, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Fan Electric Energy", energyUnit, False)
+                fanC += 1
+                dataTypeList[6] = True
+            
+            elif 'Pump Electric Energy' in column:
+                key.append(25)
+                if 'PUMP CONSTANT SPEED' in column:
+                    zoneName = checkZoneSys(" " + ":".join(column.split(":")[:-1]).split('PUMP CONSTANT SPEED ')[-1])
+                    makeHeader(pumpElectric, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Pump Electric Energy", energyUnit, True)
+                else:
+                    zoneName = " " + column.split(":")[0]
+                    checkCustomName(pumpC)
+                    makeHeader(pumpElectric, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Pump Electric Energy", energyUnit, True)
+                pumpC += 1
+                dataTypeList[7] = True
+            
+            elif 'Zone People Total Heating Energy' in column or 'Zone People Sensible Heating Energy' in column or 'Zone People Latent Gain Energy' in column:
+                key.append(4)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                makeHeader(peopleGains, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "People Energy", energyUnit, True)
+                dataTypeList[8] = True
+            
+            elif 'Zone Windows Total Transmitted Solar Radiation Energy' in column:
+                key.append(5)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                makeHeader(totalSolarGain, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Total Solar Gain", energyUnit, True)
+                dataTypeList[9] = True
+            
+            elif 'Zone Ventilation Sensible Heat Loss Energy ' in column:
+                key.append(6)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                makeHeader(natVentEnergy, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Natural Ventilation Energy", energyUnit, True)
+                dataTypeList[12] = True
+            
+            elif 'Zone Ventilation Sensible Heat Gain Energy' in column:
+                key.append(7)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+            
+            elif 'Zone Ideal Loads Zone Total Heating Energy' in column or 'Zone Ideal Loads Zone Sensible Heating Energy' in column or 'Zone Ideal Loads Zone Latent Heating Energy' in column:
+                key.append(23)
+                if 'Zone Ideal Loads Zone Total Heating Energy' in column and 'ZONE HVAC' in column:
+                    zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
+                else:
+                    zoneName = checkZone(" " + ":".join(column.split(":")[:-1]).split(' IDEAL LOADS')[0])
+                zoneHeatingEnergy[int(path[-1])].append(zoneName)
+                zoneHeatingEnergy[int(path[-1])].append(column.split('(')[-1].split(')')[0])
+            
+            elif 'Zone Ideal Loads Zone Total Cooling Energy' in column or 'Zone Ideal Loads Zone Sensible Cooling Energy' in column or 'Zone Ideal Loads Zone Latent Cooling Energy' in column:
+                key.append(24)
+                if 'Zone Ideal Loads Zone Total Cooling Energy' in column and 'ZONE HVAC' in column:
+                    zoneName = checkZoneSys(" " + (":".join(column.split(":")[:-1])).split('ZONE HVAC IDEAL LOADS AIR SYSTEM ')[-1])
+                else:
+                    zoneName = checkZone(" " + ":".join(column.split(":")[:-1]).split(' IDEAL LOADS')[0])
+                zoneCoolingEnergy[int(path[-1])].append(zoneName)
+                zoneCoolingEnergy[int(path[-1])].append(column.split('(')[-1].split(')')[0])
+            
+            elif 'Zone Infiltration Total Heat Loss Energy' in column or 'Zone Infiltration Sensible Heat Loss Energy' in column or 'Zone Infiltration Latent Heat Loss Energy' in column:
+                key.append(8)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                makeHeader(infiltrationEnergy, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Infiltration Energy", energyUnit, True)
+                dataTypeList[10] = True
+            
+            elif 'Zone Infiltration Total Heat Gain Energy' in column or 'Zone Infiltration Sensible Heat Gain Energy' in column or 'Zone Infiltration Latent Heat Gain Energy' in column:
+                key.append(9)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+            
+            elif 'Zone Operative Temperature' in column:
+                key.append(10)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                makeHeader(operativeTemperature, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Operative Temperature", "C", False)
+                dataTypeList[13] = True
+            
+            elif 'Zone Mean Air Temperature' in column:
+                key.append(11)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                makeHeader(airTemperature, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Air Temperature", "C", False)
+                dataTypeList[14] = True
+            
+            elif 'Zone Mean Radiant Temperature' in column:
+                key.append(12)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                makeHeader(meanRadTemperature, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Radiant Temperature", "C", False)
+                dataTypeList[15] = True
+            
+            elif 'Zone Air Relative Humidity' in column:
+                key.append(13)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                makeHeader(relativeHumidity, int(path[columnCount]), zoneName, column.split('(')[-1].split(')')[0], "Relative Humidity", "%", False)
+                dataTypeList[16] = True
+            
+            elif 'Zone Ventilation Standard Density Volume Flow Rate' in column:
+                key.append(16)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                natVentFlow[int(path[-1])].append(zoneName)
+                natVentFlow[int(path[-1])].append(column.split('(')[-1].split(')')[0])
+            
+            elif 'Zone Infiltration Standard Density Volume Flow Rate' in column:
+                key.append(17)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                infiltrationFlow[int(path[-1])].append(zoneName)
+                infiltrationFlow[int(path[-1])].append(column.split('(')[-1].split(')')[0])
+            
+            elif 'Zone Mechanical Ventilation Standard Density Volume Flow Rate' in column:
+                key.append(22)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                mechSysAirFlow[int(path[-1])].append(zoneName)
+                mechSysAirFlow[int(path[-1])].append(column.split('(')[-1].split(')')[0])
+            
+            elif 'Earth Tube Air Flow Volume' in column:
+                key.append(21)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                earthTubeFlow[int(path[-1])].append(zoneName)
+                earthTubeFlow[int(path[-1])].append(column.split('(')[-1].split(')')[0])
+            
+            elif 'Zone Air Heat Balance Internal Convective Heat Gain Rate' in column:
+                key.append(18)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                internalAirGain[int(path[-1])].append(zoneName)
+                internalAirGain[int(path[-1])].append(column.split('(')[-1].split(')')[0])
+            
+            elif 'Zone Air Heat Balance Surface Convection Rate' in column:
+                key.append(19)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                surfaceAirGain[int(path[-1])].append(zoneName)
+                surfaceAirGain[int(path[-1])].append(column.split('(')[-1].split(')')[0])
+            
+            elif 'Zone Air Heat Balance System Air Transfer Rate' in column:
+                key.append(20)
+                zoneName = checkZone(" " + ":".join(column.split(":")[:-1]))
+                systemAirGain[int(path[-1])].append(zoneName)
+                systemAirGain[int(path[-1])].append(column.split('(')[-1].split(')')[0])
             
             else:
-                for columnCount, column in enumerate(line.split(',')):
-                    if key[columnCount] != 14:
-                        try: p = GH_Path(int(path[columnCount]))
-                        except: p = GH_Path(int(path[columnCount][0]), int(path[columnCount][1]))
-                    else:
-                        p = GH_Path(int(path[columnCount][0]), int(path[columnCount][1]))
-                    
-                    if key[columnCount] == 0:
-                        try: cooling.Add((float(column)/3600000), p)
-                        except: dataTypeList[2] = False
-                    elif key[columnCount] == 1:
-                        try: heating.Add((float(column)/3600000), p)
-                        except: dataTypeList[3] = False
-                    elif key[columnCount] == 2:
-                        try: electricLight.Add((float(column)/3600000), p)
-                        except: dataTypeList[4] = False
-                    elif key[columnCount] == 3:
-                        try: electricEquip.Add((float(column)/3600000), p)
-                        except: dataTypeList[5] = False
-                    elif key[columnCount] == 4:
-                        try: peopleGains.Add((float(column)/3600000), p)
-                        except: dataTypeList[6] = False
-                    elif key[columnCount] == 5:
-                        try: totalSolarGain.Add((float(column)/3600000), p)
-                        except: dataTypeList[7] = False
-                    elif key[columnCount] == 6:
-                        try: natVentEnergy.Add((((float(column))*(-1)/3600000) + ((float( line.split(',')[columnCount+1] ))/3600000)), p)
-                        except: dataTypeList[11] = False
-                    elif key[columnCount] == 7:
-                        pass
-                    elif key[columnCount] == 23:
-                        try: zoneHeatingEnergy[int(path[columnCount])].append(float(column))
-                        except: pass
-                    elif key[columnCount] == 24:
-                        try: zoneCoolingEnergy[int(path[columnCount])].append(float(column))
-                        except: pass
-                    elif key[columnCount] == 8:
-                        try: infiltrationEnergy.Add((((float(column))*(-1)/3600000) + ((float( line.split(',')[columnCount+1] ))/3600000)), p)
-                        except: dataTypeList[9] = False
-                    elif key[columnCount] == 9:
-                        pass
-                    elif key[columnCount] == 10:
-                        try: operativeTemperature.Add(float(column), p)
-                        except: dataTypeList[12] = False
-                    elif key[columnCount] == 11:
-                        try: airTemperature.Add(float(column), p)
-                        except: dataTypeList[13] = False
-                    elif key[columnCount] == 12:
-                        try: meanRadTemperature.Add(float(column), p)
-                        except: dataTypeList[14] = False
-                    elif key[columnCount] == 13:
-                        try: relativeHumidity.Add(float(column), p)
-                        except: dataTypeList[15] = False
-                    elif key[columnCount] == 15:
-                        try: fanElectric.Add((float(column)/3600000), p)
-                        except: pass
-                    elif key[columnCount] == 25:
-                        try: pumpElectric.Add((float(column)/3600000), p)
-                        except: pass
-                    elif key[columnCount] == 16:
-                        try: natVentFlow[int(path[columnCount])].append(float(column))
-                        except: pass
-                    elif key[columnCount] == 17:
-                        try: infiltrationFlow[int(path[columnCount])].append(float(column))
-                        except: pass
-                    elif key[columnCount] == 22:
-                        try: mechSysAirFlow[int(path[columnCount])].append(float(column))
-                        except: pass
-                    elif key[columnCount] == 21:
-                        try: earthTubeFlow[int(path[columnCount])].append(float(column))
-                        except: pass
-                    elif key[columnCount] == 18:
-                        try: internalAirGain[int(path[columnCount])].append(float(column))
-                        except: pass
-                    elif key[columnCount] == 19:
-                        try: surfaceAirGain[int(path[columnCount])].append(float(column))
-                        except: pass
-                    elif key[columnCount] == 20:
-                        try: systemAirGain[int(path[columnCount])].append(float(column))
-                        except: pass
-                    
-        result.close()
+                key.append(-1)
+                path.append(-1)
+    
+        
+        # only go through the columns that are used by this component
+        readColumns = [columnCount for columnCount, k in enumerate(key) if k != -1]
+        for lineCount, row in enumerate(csvReader.iterRows(), 1):
+            for columnCount in readColumns:
+                column = row[columnCount]
+                if key[columnCount] != 14:
+                    try: p = GH_Path(int(path[columnCount]))
+                    except: p = GH_Path(int(path[columnCount][0]), int(path[columnCount][1]))
+                else:
+                    p = GH_Path(int(path[columnCount][0]), int(path[columnCount][1]))
+                
+                if key[columnCount] == 0:
+                    try: cooling.Add((float(column)/3600000), p)
+                    except: dataTypeList[2] = False
+                elif key[columnCount] == 1:
+                    try: heating.Add((float(column)/3600000), p)
+                    except: dataTypeList[3] = False
+                elif key[columnCount] == 2:
+                    try: electricLight.Add((float(column)/3600000), p)
+                    except: dataTypeList[4] = False
+                elif key[columnCount] == 3:
+                    try: electricEquip.Add((float(column)/3600000), p)
+                    except: dataTypeList[5] = False
+                elif key[columnCount] == 4:
+                    try: peopleGains.Add((float(column)/3600000), p)
+                    except: dataTypeList[6] = False
+                elif key[columnCount] == 5:
+                    try: totalSolarGain.Add((float(column)/3600000), p)
+                    except: dataTypeList[7] = False
+                elif key[columnCount] == 6:
+                    try: natVentEnergy.Add((((float(column))*(-1)/3600000) + ((float( row[columnCount+1] ))/3600000)), p)
+                    except: dataTypeList[11] = False
+                elif key[columnCount] == 7:
+                    pass
+                elif key[columnCount] == 23:
+                    try: zoneHeatingEnergy[int(path[columnCount])].append(float(column))
+                    except: pass
+                elif key[columnCount] == 24:
+                    try: zoneCoolingEnergy[int(path[columnCount])].append(float(column))
+                    except: pass
+                elif key[columnCount] == 8:
+                    try: infiltrationEnergy.Add((((float(column))*(-1)/3600000) + ((float( row[columnCount+1] ))/3600000)), p)
+                    except: dataTypeList[9] = False
+                elif key[columnCount] == 9:
+                    pass
+                elif key[columnCount] == 10:
+                    try: operativeTemperature.Add(float(column), p)
+                    except: dataTypeList[12] = False
+                elif key[columnCount] == 11:
+                    try: airTemperature.Add(float(column), p)
+                    except: dataTypeList[13] = False
+                elif key[columnCount] == 12:
+                    try: meanRadTemperature.Add(float(column), p)
+                    except: dataTypeList[14] = False
+                elif key[columnCount] == 13:
+                    try: relativeHumidity.Add(float(column), p)
+                    except: dataTypeList[15] = False
+                elif key[columnCount] == 15:
+                    try: fanElectric.Add((float(column)/3600000), p)
+                    except: pass
+                elif key[columnCount] == 25:
+                    try: pumpElectric.Add((float(column)/3600000), p)
+                    except: pass
+                elif key[columnCount] == 16:
+                    try: natVentFlow[int(path[columnCount])].append(float(column))
+                    except: pass
+                elif key[columnCount] == 17:
+                    try: infiltrationFlow[int(path[columnCount])].append(float(column))
+                    except: pass
+                elif key[columnCount] == 22:
+                    try: mechSysAirFlow[int(path[columnCount])].append(float(column))
+                    except: pass
+                elif key[columnCount] == 21:
+                    try: earthTubeFlow[int(path[columnCount])].append(float(column))
+                    except: pass
+                elif key[columnCount] == 18:
+                    try: internalAirGain[int(path[columnCount])].append(float(column))
+                    except: pass
+                elif key[columnCount] == 19:
+                    try: surfaceAirGain[int(path[columnCount])].append(float(column))
+                    except: pass
+                elif key[columnCount] == 20:
+                    try: systemAirGain[int(path[columnCount])].append(float(column))
+                    except: pass
+                
         parseSuccess = True
     except:
-        try: result.close()
-        except: pass
         parseSuccess = False
         warn = 'Failed to parse the result file.  Check the folder of the file address you are plugging into this component and make sure that there is a .csv file in the folder. \n'+ \
                   'If there is a file with no data in it (it is 0 kB), your simulation probably did not run correctly. \n' + \
@@ -40,7 +40,7 @@ Provided by Honeybee 0.0.63
 """
 ghenv.Component.Name = "Honeybee_Read Hourly Results from Annual Daylight Study"
 ghenv.Component.NickName = 'readDSHourlyResults'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "04 | Daylight | Daylight"
@@ -52,6 +52,7 @@ except: pass
 
 
 import os
+import scriptcontext as sc
 from System import Object
 import Grasshopper.Kernel as gh
 from Grasshopper import DataTree
@@ -97,6 +98,12 @@ def convertIllFileDaraTreeIntoSortedDictionary(illFilesAddress):
 def main(illFilesAddress, testPoints, HOY, annualProfiles):
     msg = str.Empty
     
+    if not sc.sticky.has_key("honeybee_AnnualIllResults"):
+        msg = "You should first let Honeybee to fly..."
+        return msg, None, None
+    
+    hb_AnnualIllResults = sc.sticky["honeybee_AnnualIllResults"]
+    
     shadingProfiles = []
     shadingGroupsCount = 0 # assume there in no shading groups
     
@@ -165,9 +172,6 @@ def main(illFilesAddress, testPoints, HOY, annualProfiles):
         ghenv.Component.AddRuntimeMessage(w, tempmsg)
     
     illFileSets = convertIllFileDaraTreeIntoSortedDictionary(illFilesAddress)
-        
-    # read the data for hour of the year and multiply it with the shading
-    numOfPts = testPoints.DataCount
     
     # 3 place holderd for the potential 3 outputs
     # no blinds, shading group I and shading group II
@@ -177,29 +181,13 @@ def main(illFilesAddress, testPoints, HOY, annualProfiles):
                          2: [],
                         }
     
-    # create a sublist for every shading state
-    for shadingGroupCount in range(len(illFileSets.keys())):
-        # each file represnts one state of shading
-        for resultFile in illFileSets[shadingGroupCount]:
-            # add an empty list for each state
-            illuminanceValues[shadingGroupCount].append([])
-    
-    totalPtCount = 0
-    ptsCountSoFar = 0
     for shadingGroupCount in range(len(illFileSets.keys())):
         # each file represnts one state of shading
         for stateCount, resultFiles in enumerate(illFileSets[shadingGroupCount]):
-            
-            for resultFile in resultFiles:
-                result = open(resultFile, 'r')
-                for lineCount, line in enumerate(result):
-                    if lineCount == int(HOY-1):
-                       line = line.replace('\n', '', 10)
-                       lineSeg = line.Split(' ')
-                       for hourLuxValue in lineSeg[4:]:
-                           illuminanceValues[shadingGroupCount][stateCount].append(float(hourLuxValue))
-                           
-                result.close()
+            # only read the target hour from the binary cache of the .ill files
+            illResults = hb_AnnualIllResults(resultFiles)
+            illuminanceValues[shadingGroupCount].append(list(illResults.getHourValues(int(HOY-1))))
+            illResults.close()
     
     return msg, illuminanceValues, shadingProfiles
 
@@ -26,14 +26,14 @@ This component reads the results of an Adaptive Indoor Comfort Analysis.  Note t
 Provided by Honeybee 0.0.63
     
     Args:
-        _comfResultFileAddress: Any one of the result file addresses that comes out of the 'Honeybee_Microclimate Map Analysis' component or the 'Honeybee_Thermal Comfort Autonomy Analysis' component.
+        _comfResultFileAddress: Any one of the result file addresses that comes out of the 'Honeybee_Microclimate Map Analysis' component or the 'Honeybee_Thermal Comfort Autonomy Analysis' component.  This can be either a binary .hbmtx file or a csv file.
     Returns:
-        comfResultsMtx: A matrix of comfort data that can be plugged into the "Visualize Comfort Results" component.
+        comfResultsMtx: A matrix of comfort data that can be plugged into the "Visualize Comfort Results" component.  The hours of binary .hbmtx files are only read once their values are needed.
 """
 
 ghenv.Component.Name = "Honeybee_Read Microclimate Matrix"
 ghenv.Component.NickName = 'readMicroclimateMtx'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
@@ -41,28 +41,38 @@ ghenv.Component.AdditionalHelpFromDocStrings = "6"
 
 
 import Grasshopper.Kernel as gh
+import scriptcontext as sc
 
 
 comfResultsMtx = []
 
 if _comfResultFileAddress:
-    try:
-        result = open(_comfResultFileAddress, 'r')
-        
-        for lineCount, line in enumerate(result):
-            if lineCount == 0: comfResultsMtx.append(line.split('\n')[0])
-            else:
-                #Pull out the data.
-                hourData = []
-                for columnCount, column in enumerate(line.split(',')):
-                    hourData.append(float(column))
-                comfResultsMtx.append(hourData)
-        result.close()
-    except:
-        try: result.close()
-        except: pass
-        warn = 'Failed to parse the result file.  The csv file might not have existed when connected or the simulation did not run correctly.'+ \
-                  'Try reconnecting the _resultfileAddress to this component or re-running your simulation.'
-        print warn
-        ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, warn)
+    hb_MicroclimateMatrix = sc.sticky.get("honeybee_MicroclimateMatrix")
+    if hb_MicroclimateMatrix != None and hb_MicroclimateMatrix.isMatrixFile(_comfResultFileAddress):
+        #Binary result files are read one chunk of hours at a time once the values of an hour are requested.
+        try:
+            comfResultsMtx = list(hb_MicroclimateMatrix(_comfResultFileAddress))
+        except Exception, e:
+            warn = 'Failed to read the result file:\n' + str(e)
+            print warn
+            ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, warn)
+    else:
+        try:
+            result = open(_comfResultFileAddress, 'r')
+            
+            for lineCount, line in enumerate(result):
+                if lineCount == 0: comfResultsMtx.append(line.split('\n')[0])
+                else:
+                    #Pull out the data.
+                    comfResultsMtx.append(map(float, line.split(',')))
+            result.close()
+        except:
+            try: result.close()
+            except: pass
+            warn = 'Failed to parse the result file.  The csv file might not have existed when connected or the simulation did not run correctly.'+ \
+                      'Try reconnecting the _resultfileAddress to this component or re-running your simulation.'
+            if hb_MicroclimateMatrix == None:
+                warn = warn + '  If this is a binary .hbmtx file, you should let Honeybee fly first.'
+            print warn
+            ghenv.Component.AddRuntimeMessage(gh.GH_RuntimeMessageLevel.Warning, warn)
 
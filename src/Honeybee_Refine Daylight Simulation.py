@@ -43,7 +43,7 @@ Provided by Honeybee 0.0.63
 
 ghenv.Component.Name = "Honeybee_Refine Daylight Simulation"
 ghenv.Component.NickName = 'refineDaylightAnalysis'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "04 | Daylight | Daylight"
@@ -183,7 +183,7 @@ def main(octFile, analysisRecipe, numOfCPUs, thisRunName, runIt):
     
     if runIt:
         hb_writeRAD.runBatchFiles(initBatchFileName, batchFilesName, \
-                                  fileNames, pcompBatchFile, waitingTime)
+                                  fileNames, pcompBatchFile)
         
         results = hb_writeRAD.collectResults(subWorkingDir, radFileName, \
                                 numOfCPUs, analysisRecipe, expectedResultFiles)
@@ -205,7 +205,6 @@ if _runIt == True and _analysisRecipe!=None and _octFile!=None and _thisRunName!
     
     report = ""
     done = False
-    waitingTime = 0.2 # waiting time between batch files in seconds
     try: numOfCPUs = int(_numOfCPUs_)
     except: numOfCPUs = 1
     
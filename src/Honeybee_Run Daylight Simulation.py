@@ -54,7 +54,7 @@ Provided by Honeybee 0.0.63
 
 ghenv.Component.Name = "Honeybee_Run Daylight Simulation"
 ghenv.Component.NickName = 'runDaylightAnalysis'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "04 | Daylight | Daylight"
@@ -80,7 +80,7 @@ ghenv.Component.Params.Output[3].NickName = "results"
 ghenv.Component.Params.Output[3].Name = "results"
 results = []
 
-def main(north, originalHBObjects, analysisRecipe, runRad, numOfCPUs, workingDir, radFileName, meshParameters, waitingTime, additionalRadFiles, overwriteResults, exportAirWalls):
+def main(north, originalHBObjects, analysisRecipe, runRad, numOfCPUs, workingDir, radFileName, meshParameters, additionalRadFiles, overwriteResults, exportAirWalls):
     # import the classes
     w = gh.GH_RuntimeMessageLevel.Warning
     
@@ -209,7 +209,7 @@ def main(north, originalHBObjects, analysisRecipe, runRad, numOfCPUs, workingDir
     
     if runRad:
         hb_writeRAD.runBatchFiles(initBatchFileName, batchFilesName, \
-                                  fileNames, pcompBatchFile, waitingTime, runRad > 1)
+                                  fileNames, pcompBatchFile, runRad > 1)
         
         results = hb_writeRAD.collectResults(subWorkingDir, radFileName, \
                                 numOfCPUs, analysisRecipe, expectedResultFiles)
@@ -236,7 +236,6 @@ if _writeRad == True and _analysisRecipe!=None and ((len(_HBObjects)!=0 and _HBO
     
     report = ""
     done = False
-    waitingTime = 0.2 # waiting time between batch files in seconds
     try: numOfCPUs = int(_numOfCPUs_)
     except: numOfCPUs = 1
     
@@ -251,7 +250,7 @@ if _writeRad == True and _analysisRecipe!=None and ((len(_HBObjects)!=0 and _HBO
     
     
     result = main(north_, _HBObjects, _analysisRecipe, runRad_, numOfCPUs, \
-                  _workingDir_, _radFileName_, meshSettings_, waitingTime, \
+                  _workingDir_, _radFileName_, meshSettings_, \
                   additionalRadFiles_, overwriteResults_, exportAirWalls_)
     
     if result!= -1:
@@ -38,7 +38,7 @@ Provided by Honeybee 0.0.63
 """
 ghenv.Component.Name = "Honeybee_Select by Type"
 ghenv.Component.NickName = 'selByType_'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "00 | Honeybee"
@@ -96,10 +96,17 @@ def main(HBZones):
     
     # call the objects from the lib
     hb_hive = sc.sticky["honeybee_Hive"]()
-    HBZoneObjects = hb_hive.callFromHoneybeeHive(_HBZones)
+    HBZoneObjects = hb_hive.callFromHoneybeeHive(_HBZones, readOnly=True)
     
     for zone in HBZoneObjects:
         
+        # surfaces that are added back to the hive get new IDs so only copy
+        # the zones that have any of them.
+        for srf in zone.surfaces:
+            if srf.type in showCases and not (srf.type == 0 and srf.hasChild):
+                zone = hb_hive.copyHBObject(zone)
+                break
+        
         # Extract surfaces from HBZones?
         for srf in zone.surfaces:
             print srf
@@ -34,12 +34,12 @@ Provided by Honeybee 0.0.63
         removeCurrentAdjc_: If you are using this component after already solving for the adjacencies between some of the zones previously, set this to "False" in order to remeber the previously determined adcacency conditions.  If set to "True", the current adjacencies will be removed. The default is set to "False" in order to remeber your previously-set adjacencies.
         _findAdjc: Set to "True" to solve adjacencies between zones.
     Returns:
-        readMe!: A report of the found adjacencies.
+        readMe!: A report of the found adjacencies and the number of surface pairs that were tested.
         HBZonesWADJ: A list of Honeybee zones with adjacencies solved.
 """
 ghenv.Component.Name = "Honeybee_Solve Adjacencies"
 ghenv.Component.NickName = 'solveAdjc'
-ghenv.Component.Message = 'VER 0.0.63\nMAR_03_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "00 | Honeybee"
@@ -53,6 +53,65 @@ import Rhino as rc
 import scriptcontext as sc
 import Grasshopper.Kernel as gh
 import uuid
+import math
+import time
+import itertools
+
+
+class SurfaceGrid(object):
+    """A spatial hash of surface bounding boxes.
+    
+    It is used as a broad phase to find the surfaces that can be adjacent to a
+    surface before running the ray and closest point tests.
+    """
+    def __init__(self, boxes, cellSize):
+        self.boxes = boxes
+        self.cellSize = cellSize
+        self.cells = {}
+        for count, box in enumerate(boxes):
+            for key in self.getCellKeys(box):
+                try: self.cells[key].append(count)
+                except KeyError: self.cells[key] = [count]
+    
+    @staticmethod
+    def getBox(geometry, tol):
+        # the fast bounding box always contains the geometry
+        bb = geometry.GetBoundingBox(False)
+        return (bb.Min.X - tol, bb.Min.Y - tol, bb.Min.Z - tol), \
+               (bb.Max.X + tol, bb.Max.Y + tol, bb.Max.Z + tol)
+    
+    def getCellKeys(self, box):
+        minPt, maxPt = box
+        ranges = [xrange(int(math.floor(minPt[i] / self.cellSize)), \
+                         int(math.floor(maxPt[i] / self.cellSize)) + 1) for i in range(3)]
+        return itertools.product(*ranges)
+    
+    def query(self, box):
+        """Return sorted indices of boxes that overlap box."""
+        minPt, maxPt = box
+        found = set()
+        for key in self.getCellKeys(box):
+            if key in self.cells: found.update(self.cells[key])
+        overlaps = []
+        for count in found:
+            otherMin, otherMax = self.boxes[count]
+            if otherMin[0] <= maxPt[0] and otherMax[0] >= minPt[0] and \
+               otherMin[1] <= maxPt[1] and otherMax[1] >= minPt[1] and \
+               otherMin[2] <= maxPt[2] and otherMax[2] >= minPt[2]:
+                overlaps.append(count)
+        overlaps.sort()
+        return overlaps
+
+def getCellSize(boxes, tol):
+    # use the median size of the surfaces so most surfaces only touch a few cells
+    sizes = sorted(max(maxPt[i] - minPt[i] for i in range(3)) for minPt, maxPt in boxes)
+    if len(sizes) == 0: return 1
+    return max(sizes[len(sizes) // 2], 4 * tol)
+
+def normalsMatch(surface, srf):
+    normalAngle = abs(rc.Geometry.Vector3d.VectorAngle(surface.normalVector, srf.normalVector))
+    revNormalAngle = abs(rc.Geometry.Vector3d.VectorAngle(surface.normalVector, -srf.normalVector))
+    return normalAngle==0  or revNormalAngle <= sc.doc.ModelAngleToleranceRadians
 
 def shootIt(rayList, geometry, tol = 0.01, bounce =1):
    # shoot a list of rays from surface to geometry
@@ -233,13 +292,43 @@ def main(HBZones, altConstruction, altWinConstr, altBC, tol, remCurrent):
                     srf.setBC('OUTDOORS')
                     srf.setBCObjectToOutdoors()
     
+    # put all the zone surfaces in a spatial hash
+    # closest points within tolerance are inside the boxes inflated by tolerance
+    startTime = time.time()
+    gridSurfaces = []
+    for zoneCount, HBZone in enumerate(HBZoneObjects):
+        for surface in HBZone.surfaces:
+            gridSurfaces.append((zoneCount, surface))
+    gridBoxes = [SurfaceGrid.getBox(surface.geometry, tol) for zoneCount, surface in gridSurfaces]
+    surfaceGrid = SurfaceGrid(gridBoxes, getCellSize(gridBoxes, tol))
+    
+    testedSrfCount = 0
+    bruteForcePairs = 0
+    candidatePairs = 0
+    zoneTests = 0
+    gridIndex = -1
+    
     # solve it zone by zone
-    for testZone in HBZoneObjects:
+    for testZoneCount, testZone in enumerate(HBZoneObjects):
         # mesh each surface and test if it will be adjacent to any surface
         # from other zones
         for srf in testZone.surfaces:
+            gridIndex += 1
             #print srf.type, srf.BC 
             if srf.BC.upper() == 'OUTDOORS' or srf.BC.upper() == 'GROUND' or srf.BC.upper() == 'ADIABATIC':
+                testedSrfCount += 1
+                bruteForcePairs += len(gridSurfaces) - len(testZone.surfaces)
+                
+                # find surfaces of other zones that overlap the surface and face it
+                # {zone index: [surfaces]}. indices are sorted so zones and surfaces keep their order
+                candidates = {}
+                for count in surfaceGrid.query(gridBoxes[gridIndex]):
+                    zoneCount, surface = gridSurfaces[count]
+                    if zoneCount == testZoneCount or not normalsMatch(surface, srf): continue
+                    try: candidates[zoneCount].append(surface)
+                    except KeyError: candidates[zoneCount] = [surface]
+                if len(candidates) == 0: continue
+                
                 #Create a mesh of surface to use center points as test points
                 meshPar = rc.Geometry.MeshingParameters.Default
                 BrepMesh = rc.Geometry.Mesh.CreateFromBrep(srf.geometry, meshPar)[0]
@@ -258,33 +347,30 @@ def main(HBZones, altConstruction, altWinConstr, altBC, tol, remCurrent):
                     
                     raysDict[meshSrfCen] = rc.Geometry.Ray3d(meshSrfCen, srfNormal)
                 
-                for targetZone in HBZoneObjects:
+                for zoneCount in sorted(candidates.keys()):
+                    targetZone = HBZoneObjects[zoneCount]
                     if notTheSameZone(targetZone, testZone):
+                        candidatePairs += len(candidates[zoneCount])
+                        zoneTests += 1
                         # check ray intersection to see if this zone is next to the surface
                         if shootIt(raysDict.values(), [targetZone.geometry], tol + sc.doc.ModelAbsoluteTolerance):
-                            for surface in targetZone.surfaces:
-                                # check if z value of center points matches
-                                #print abs(surface.cenPt.Z - srf.cenPt.Z)
-                                #if abs(surface.cenPt.Z - srf.cenPt.Z) < tol:
+                            for surface in candidates[zoneCount]:
                                 # check distance with the nearest point on each surface
                                 for pt in raysDict.keys():
                                     if surface.geometry.ClosestPoint(pt).DistanceTo(pt) <= tol:
-                                        # extra check for normal direction
-                                        normalAngle = abs(rc.Geometry.Vector3d.VectorAngle(surface.normalVector, srf.normalVector))
-                                        revNormalAngle = abs(rc.Geometry.Vector3d.VectorAngle(surface.normalVector, -srf.normalVector))
-                                        #print normalAngle
-                                        #print revNormalAngle
-                                        if normalAngle==0  or revNormalAngle <= sc.doc.ModelAngleToleranceRadians:
-                                            print 'Surface ' + srf.name + ' which is a ' + srf.srfType[srf.type] + \
-                                                  '\t-> is adjacent to <-\t' + surface.name + ' which is a ' + \
-                                                  surface.srfType[surface.type] + '.'
-                                            
-                                            updateAdj(srf, surface, altConstruction, altBC, altWinConstr, tol)                                        
-                                            if surface.type == 4:
-                                                flowRate = updateZoneMixing(surface, testZone, targetZone)
-                                                print "Air has been mixed between " + testZone.name + " and " + targetZone.name + " with a flow rate of " + str(flowRate) + " m3/s."
-                                            
-                                            break
+                                        print 'Surface ' + srf.name + ' which is a ' + srf.srfType[srf.type] + \
+                                              '\t-> is adjacent to <-\t' + surface.name + ' which is a ' + \
+                                              surface.srfType[surface.type] + '.'
+                                        
+                                        updateAdj(srf, surface, altConstruction, altBC, altWinConstr, tol)                                        
+                                        if surface.type == 4:
+                                            flowRate = updateZoneMixing(surface, testZone, targetZone)
+                                            print "Air has been mixed between " + testZone.name + " and " + targetZone.name + " with a flow rate of " + str(flowRate) + " m3/s."
+                                        
+                                        break
+    
+    print "\nTested %d surfaces against %d zone surfaces in %.2f seconds."%(testedSrfCount, len(gridSurfaces), time.time() - startTime) + \
+          "\nThe broad phase left %d candidate surface pairs out of %d and %d zone ray tests."%(candidatePairs, bruteForcePairs, zoneTests)
     
     # add zones to memory
     ModifiedHBZones  = hb_hive.addToHoneybeeHive(HBZoneObjects, ghenv.Component)
@@ -44,7 +44,7 @@ Provided by Honeybee 0.0.63
 """
 ghenv.Component.Name = "Honeybee_Surface Data Based On Type Detailed"
 ghenv.Component.NickName = 'srfDataByTypeDetailed'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
@@ -115,7 +115,7 @@ def getSrfNames(HBZones):
         # call the objects from the lib
         hb_hive = sc.sticky["honeybee_Hive"]()
         
-        zone = hb_hive.callFromHoneybeeHive([zone])[0]
+        zone = hb_hive.callFromHoneybeeHive([zone], readOnly=True)[0]
         
         for srf in zone.surfaces:
             # WALL
@@ -64,7 +64,7 @@ Provided by Honeybee 0.0.63
 
 ghenv.Component.Name = "Honeybee_Thermal Autonomy Analysis"
 ghenv.Component.NickName = 'ThermalAutonomy'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
@@ -114,7 +114,7 @@ def recallHBZoneProperties(HOYs, occupancyThere):
     HBScheduleList = sc.sticky["honeybee_ScheduleLib"].keys()
     
     for zoneCount, HZone in enumerate(_HBZones):
-        zone = hb_hive.callFromHoneybeeHive([HZone])[0]
+        zone = hb_hive.callFromHoneybeeHive([HZone], readOnly=True)[0]
         zoneNames.append(zone.name)
         values = []
         if occupancyThere == False:
@@ -128,7 +128,7 @@ def recallHBZoneProperties(HOYs, occupancyThere):
                     checkZones = False
                 else:
                     readSchedules = sc.sticky["honeybee_ReadSchedules"](zoneOccSched, 0)
-                    values  = readSchedules.getScheduleValues()
+                    values  = readSchedules.getAnnualValues()
             elif zoneOccSched.lower().endswith(".csv"):
                 # check if csv file exists.
                 if not os.path.isfile(zoneOccSched):
@@ -481,14 +481,19 @@ def main(viewFactorMesh, analysisPeriod, totEnergyHeaders, totEnergyNumbers, zon
         TA = []
         OverHeated = []
         UnderHeated = []
+        #Get the rows of the hour once.  Rows of binary result files are read from the file when they are first used.
+        try: comfValues = _comfResultsMtx[count + 1]
+        except IndexError: comfValues = []
+        try: degOrPMVValues = _degOrPMVMtx[count + 1]
+        except IndexError: degOrPMVValues = []
         for pointCount, pointZone in enumerate(pointZoneList):
             try:
-                _comfResultsMtx[count + 1][pointCount]
+                comfValues[pointCount]
                 #Check to see if the point's zone is occupied.  Otheriswe, it does not count for anything.
                 if occupancySchList[pointZone][count] > occupancyThreshold:
                     occHrsNum[pointCount] += 1
                     #Check to see if the point is comfortable.
-                    if _comfResultsMtx[count + 1][pointCount] > 0:
+                    if comfValues[pointCount] > 0:
                         occTCP.append(1)
                         OverHeated.append(0)
                         UnderHeated.append(0)
@@ -498,7 +503,7 @@ def main(viewFactorMesh, analysisPeriod, totEnergyHeaders, totEnergyNumbers, zon
                     else:
                         occTCP.append(0)
                         TA.append(0)
-                        if _degOrPMVMtx[count + 1][pointCount] > 0:
+                        if degOrPMVValues[pointCount] > 0:
                             OverHeated.append(1)
                             UnderHeated.append(0)
                         else:
@@ -49,7 +49,7 @@ Provided by Honeybee 0.0.63
 
 ghenv.Component.Name = "Honeybee_Visualize Microclimate Map"
 ghenv.Component.NickName = 'VisualizeMicroclimate'
-ghenv.Component.Message = 'VER 0.0.63\nJAN_20_2018'
+ghenv.Component.Message = 'VER 0.0.63\nOCT_18_2026'
 ghenv.Component.IconDisplayMode = ghenv.Component.IconDisplayMode.application
 ghenv.Component.Category = "Honeybee"
 ghenv.Component.SubCategory = "10 | Energy | Energy"
@@ -178,20 +178,23 @@ def restoreInputOutput():
         ghenv.Component.Params.Input[input].Description = inputsDict[input][1]
 
 
+def getHourRows(comfResultsMtx, HOYS):
+    #Only the requested hours are read so matrices from binary result files don't get loaded for the whole year.
+    return [comfResultsMtx[hour] for hour in sorted(set(HOYS)) if 0 <= hour < len(comfResultsMtx)]
+
+
 def computeComfValues(comfResultsMtx, analysisP, comfMtxAnalysisP, stepOfSimulation, annualData, simStepPossible, occDataType, percentOrTotal, totalAble, lb_preparation):
     #Create a list to be filled with values of comfort.
     comfortFactorVals = []
     
     if stepOfSimulation != None and simStepPossible == True:
-        comfortFactorVals = comfResultsMtx[stepOfSimulation]
+        comfortFactorVals = list(comfResultsMtx[stepOfSimulation])
     elif len(analysisP) > 0 and analysisP != comfMtxAnalysisP and annualData == True:
         #Get the HOYs of the analysis period
         HOYS, months, days = lb_preparation.getHOYsBasedOnPeriod(analysisP, 1)
         
         #Pick out just the hours that are in the analysis period.
-        newcomfResultsMtx = []
-        for lineCount, line in enumerate(comfResultsMtx):
-            if lineCount in HOYS: newcomfResultsMtx.append(line)
+        newcomfResultsMtx = getHourRows(comfResultsMtx, HOYS)
         
         #Transpose the matrix
         newcomfResultsMtx2 = zip(*newcomfResultsMtx)
@@ -238,10 +241,7 @@ def computeComfValues(comfResultsMtx, analysisP, comfMtxAnalysisP, stepOfSimulat
         else:
             
             #Pick out just the hours that are in the analysis period.
-            newcomfResultsMtx = []
-            for lineCount, line in enumerate(comfResultsMtx):
-                if lineCount in HOYS:
-                    newcomfResultsMtx.append(line)
+            newcomfResultsMtx = getHourRows(comfResultsMtx, HOYS)
             
             #Transpose the matrix
             newcomfResultsMtx2 = zip(*newcomfResultsMtx)